@@ -75,6 +75,34 @@ def create_app(test_config: Optional[Settings] = None) -> FastAPI:
     initialize_container(settings)
     app.state.container = get_container()
 
+    # Write saves still pending in the write-behind queue before exiting
+    container = app.state.container
+    app.add_event_handler(
+        "shutdown", lambda: container.get_game_state_repository().flush()
+    )
+
+    async def close_ai_connections() -> None:
+        ai_service = container.get_ai_service()
+        if ai_service is not None:
+            await ai_service.aclose()
+
+    app.add_event_handler("shutdown", close_ai_connections)
+
+    def stop_history_summarizer() -> None:
+        history_summarizer = container.get_history_summarizer()
+        if history_summarizer is not None:
+            history_summarizer.close()
+
+    app.add_event_handler("shutdown", stop_history_summarizer)
+
+    def stop_narration_workers() -> None:
+        container.get_tts_integration_service().close()
+        tts_service = container.get_tts_service()
+        if tts_service is not None:
+            tts_service.close()
+
+    app.add_event_handler("shutdown", stop_narration_workers)
+
     # Configure CORS
     app.add_middleware(
         CORSMiddleware,
@@ -84,6 +112,11 @@ def create_app(test_config: Optional[Settings] = None) -> FastAPI:
         allow_headers=["*"],
     )
 
+    # Bind each request to its game session (X-Session-ID / ?session_id=)
+    from app.api.session_middleware import SessionContextMiddleware
+
+    app.add_middleware(SessionContextMiddleware)
+
     # Mount static files
     app.mount("/static", StaticFiles(directory="static"), name="static")
 
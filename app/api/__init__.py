@@ -24,6 +24,7 @@ def initialize_fastapi_routes(app: FastAPI) -> None:
     from .d5e_routes import router as d5e_router
     from .frontend_routes import router as frontend_router
     from .game_routes import router as game_router
+    from .metrics_routes import router as metrics_router
     from .sse_routes import router as sse_router
     from .tts_routes import router as tts_router
 
@@ -36,6 +37,7 @@ def initialize_fastapi_routes(app: FastAPI) -> None:
     app.include_router(content_router)
     app.include_router(d5e_router)
     app.include_router(game_router)
+    app.include_router(metrics_router)
     app.include_router(sse_router)
 
     # Frontend router must be included last due to catch-all route
@@ -314,7 +314,8 @@ async def get_character_adventures(
                 else:
                     # For in-memory repositories, try to get from campaign saves
                     if hasattr(game_state_repo, "_campaign_saves"):
-                        game_state = game_state_repo._campaign_saves.get(instance.id)
+                        snapshot = game_state_repo._campaign_saves.get(instance.id)
+                        game_state = snapshot.restore() if snapshot else None
                     else:
                         game_state = None
             except Exception as e:
@@ -29,6 +29,8 @@ from app.core.repository_interfaces import (
     IGameStateRepository,
 )
 from app.core.system_interfaces import IEventQueue
+from app.providers.ai.base import BaseAIService
+from app.services.prompt_prefetcher import PromptPrefetcher
 from app.settings import Settings
 
 # --- Service Getters (return interfaces) ---
@@ -123,6 +125,16 @@ def get_settings() -> Settings:
     return get_container().settings
 
 
+def get_prompt_prefetcher() -> PromptPrefetcher:
+    """Get prompt prefetcher instance."""
+    return get_container().get_prompt_prefetcher()
+
+
+def get_ai_service() -> Optional[BaseAIService]:
+    """Get AI service instance."""
+    return get_container().get_ai_service()
+
+
 def get_rag_service() -> IRAGService:
     """Get RAG service instance."""
     return get_container().get_rag_service()
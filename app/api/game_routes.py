@@ -2,25 +2,32 @@
 Game API routes for handling game state, player actions, and dice rolls - FastAPI version.
 """
 
+import asyncio
 import logging
-from typing import Any, Tuple
+from typing import Any, Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 
 from app.api.dependencies import (
+    get_ai_service,
     get_character_service,
     get_dice_service,
     get_event_queue,
     get_game_orchestrator,
     get_game_state_repository,
+    get_prompt_prefetcher,
 )
 from app.core.domain_interfaces import ICharacterService, IDiceRollingService
 from app.core.orchestration_interfaces import IGameOrchestrator
 from app.core.repository_interfaces import IGameStateRepository
 from app.core.system_interfaces import IEventQueue
 from app.models.api import (
+    AIBackendsResponse,
     PerformRollRequest,
+    PersistenceStatusResponse,
     PlayerActionRequest,
+    PrefetchRequest,
+    PrefetchResponse,
     SaveGameResponse,
     SubmitRollsRequest,
 )
@@ -32,7 +39,11 @@ from app.models.events.game_events import (
     PlayerActionEventModel,
 )
 from app.models.game_state.main import GameStateModel
+from app.providers.ai.base import BaseAIService
+from app.providers.ai.manager import unwrap_ai_service
+from app.providers.ai.router_service import RoutingAIService
 from app.services.event_factory import create_game_state_snapshot_event
+from app.services.prompt_prefetcher import PromptPrefetcher
 from app.utils.event_helpers import emit_event
 
 logger = logging.getLogger(__name__)
@@ -40,9 +51,18 @@ logger = logging.getLogger(__name__)
 # Create router for game API routes
 router = APIRouter(prefix="/api", tags=["game"])
 
+# How often a running game event checks whether its client went away
+DISCONNECT_POLL_INTERVAL = 0.5
+
+# Seconds a manual save waits for the game state to reach storage
+MANUAL_SAVE_TIMEOUT = 10.0
+
 
 async def process_game_event(
-    event_type: GameEventType, data: Any, orchestrator: IGameOrchestrator
+    event_type: GameEventType,
+    data: Any,
+    orchestrator: IGameOrchestrator,
+    http_request: Optional[Request] = None,
 ) -> Tuple[GameEventResponseModel, int]:
     """
     Helper to process game events consistently across routes.
@@ -51,6 +71,8 @@ async def process_game_event(
         event_type: The type of game event
         data: Event-specific data
         orchestrator: Game orchestrator instance
+        http_request: The HTTP request; if given, processing is cancelled
+            (aborting any in-flight AI request) when the client disconnects
 
     Returns:
         Tuple of (response_model, http_status_code)
@@ -59,7 +81,10 @@ async def process_game_event(
     event = GameEventModel(type=event_type, data=data)
 
     # Process event through orchestrator
-    response = await orchestrator.handle_event(event)
+    if http_request is None:
+        response = await orchestrator.handle_event(event)
+    else:
+        response = await _handle_until_disconnected(orchestrator, event, http_request)
 
     # Extract status code
     status_code = response.status_code or 200
@@ -67,6 +92,25 @@ async def process_game_event(
     return response, status_code
 
 
+async def _handle_until_disconnected(
+    orchestrator: IGameOrchestrator, event: GameEventModel, http_request: Request
+) -> GameEventResponseModel:
+    """Process an event, cancelling it if the client disconnects meanwhile."""
+    task = asyncio.ensure_future(orchestrator.handle_event(event))
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_INTERVAL)
+            if done:
+                return task.result()
+            if await http_request.is_disconnected():
+                logger.info(f"Client disconnected, cancelling {event.type.value}")
+                task.cancel()
+                raise HTTPException(status_code=499, detail="Client disconnected")
+    finally:
+        if not task.done():
+            task.cancel()
+
+
 @router.get(
     "/game_state", response_model=GameStateModel, response_model_exclude_none=True
 )
@@ -117,6 +161,7 @@ async def get_game_state(
 async def player_action(
     request: PlayerActionRequest,
     response: Response,
+    http_request: Request,
     game_orchestrator: IGameOrchestrator = Depends(get_game_orchestrator),
 ) -> GameEventResponseModel:
     """Handle player actions."""
@@ -130,7 +175,7 @@ async def player_action(
 
         # Process through unified interface
         result, status_code = await process_game_event(
-            GameEventType.PLAYER_ACTION, action_model, game_orchestrator
+            GameEventType.PLAYER_ACTION, action_model, game_orchestrator, http_request
         )
 
         # Set the HTTP status code
@@ -158,6 +203,7 @@ async def player_action(
 async def submit_rolls(
     request: SubmitRollsRequest,
     response: Response,
+    http_request: Request,
     game_orchestrator: IGameOrchestrator = Depends(get_game_orchestrator),
 ) -> GameEventResponseModel:
     """Handle dice roll submissions."""
@@ -171,6 +217,7 @@ async def submit_rolls(
                 GameEventType.COMPLETED_ROLL_SUBMISSION,
                 {"roll_results": request.roll_results},
                 game_orchestrator,
+                http_request,
             )
         else:
             # Legacy format: roll requests that need to be processed
@@ -190,6 +237,7 @@ async def submit_rolls(
                 GameEventType.DICE_SUBMISSION,
                 {"rolls": roll_submissions},
                 game_orchestrator,
+                http_request,
             )
 
         # Set the HTTP status code
@@ -216,6 +264,7 @@ async def submit_rolls(
 )
 async def trigger_next_step(
     response: Response,
+    http_request: Request,
     game_orchestrator: IGameOrchestrator = Depends(get_game_orchestrator),
 ) -> GameEventResponseModel:
     """Trigger the next step in the game (usually for NPC turns)."""
@@ -225,6 +274,7 @@ async def trigger_next_step(
             GameEventType.NEXT_STEP,
             {},  # Empty dict for events without data
             game_orchestrator,
+            http_request,
         )
 
         # Set the HTTP status code
@@ -251,6 +301,7 @@ async def trigger_next_step(
 )
 async def retry_last_ai_request(
     response: Response,
+    http_request: Request,
     game_orchestrator: IGameOrchestrator = Depends(get_game_orchestrator),
 ) -> GameEventResponseModel:
     """Retry the last AI request that failed."""
@@ -260,6 +311,7 @@ async def retry_last_ai_request(
             GameEventType.RETRY,
             {},  # Empty dict for events without data
             game_orchestrator,
+            http_request,
         )
 
         # Set the HTTP status code
@@ -279,6 +331,22 @@ async def retry_last_ai_request(
         )
 
 
+@router.post("/game/prefetch", response_model=PrefetchResponse)
+async def prefetch_next_prompt(
+    request: PrefetchRequest,
+    prompt_prefetcher: PromptPrefetcher = Depends(get_prompt_prefetcher),
+) -> PrefetchResponse:
+    """Prepare the next AI prompt while the player types or rolls dice."""
+    try:
+        return await asyncio.to_thread(prompt_prefetcher.prefetch, request.draft_text)
+    except Exception as e:
+        logger.error(f"Error in prefetch_next_prompt: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error",
+        )
+
+
 @router.post("/perform_roll", response_model=DiceRollResultResponseModel)
 async def perform_roll(
     request: PerformRollRequest,
@@ -316,12 +384,26 @@ async def save_game_state(
     game_state_repo: IGameStateRepository = Depends(get_game_state_repository),
 ) -> SaveGameResponse:
     """Manually save the current game state."""
-    try:
-        # Get the current game state
-        game_state = game_state_repo.get_game_state()
 
-        # Save it (this will use the appropriate file path based on campaign_id)
+    def save() -> Tuple[GameStateModel, bool]:
+        # Save the current state (this will use the appropriate file path based
+        # on campaign_id) and wait for it to reach disk even if saves are
+        # written behind
+        game_state = game_state_repo.get_game_state()
         game_state_repo.save_game_state(game_state)
+        return game_state, game_state_repo.flush(timeout=MANUAL_SAVE_TIMEOUT)
+
+    try:
+        # Disk I/O must not block the event loop serving the other sessions
+        game_state, saved = await asyncio.to_thread(save)
+        if not saved:
+            logger.error(
+                f"Manual save of campaign {game_state.campaign_id} did not reach disk"
+            )
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Game state could not be written to disk",
+            )
 
         logger.info(f"Game state saved manually for campaign: {game_state.campaign_id}")
 
@@ -332,9 +414,30 @@ async def save_game_state(
             campaign_id=game_state.campaign_id,
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in save_game_state: {e}", exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e),
         )
+
+
+@router.get("/game_state/persistence", response_model=PersistenceStatusResponse)
+async def get_persistence_status(
+    game_state_repo: IGameStateRepository = Depends(get_game_state_repository),
+) -> PersistenceStatusResponse:
+    """Report pending game state saves and the durability lag."""
+    return game_state_repo.get_persistence_status()
+
+
+@router.get("/ai/backends", response_model=AIBackendsResponse)
+async def get_ai_backends(
+    ai_service: Optional[BaseAIService] = Depends(get_ai_service),
+) -> AIBackendsResponse:
+    """Report the state of the AI backends when routing over several servers."""
+    provider_service = unwrap_ai_service(ai_service)
+    if isinstance(provider_service, RoutingAIService):
+        return provider_service.get_stats()
+    return AIBackendsResponse()
@@ -0,0 +1,25 @@
+"""Metrics routes exposing provider instrumentation - FastAPI version."""
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+# Importing the AI metrics registers them, so they are listed before any request
+from app.providers.ai import metrics as _ai_metrics  # noqa: F401
+from app.utils.metrics import metrics_registry
+
+# Create router for metrics API routes
+router = APIRouter(prefix="/api", tags=["metrics"])
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics() -> PlainTextResponse:
+    """Get the application metrics in the Prometheus text format.
+
+    Covers AI requests: time to first token, tokens per second, prompt and
+    completion tokens, phase durations and structured output fallback rates.
+    """
+    return PlainTextResponse(
+        metrics_registry.render(), media_type=PROMETHEUS_CONTENT_TYPE
+    )
@@ -0,0 +1,78 @@
+"""
+ASGI middleware binding each request to its game session.
+
+Clients select a session with the ``X-Session-ID`` header or, for EventSource
+connections that cannot set headers, the ``session_id`` query parameter.
+Requests without a session id use the default session.
+"""
+
+import logging
+from typing import Optional
+from urllib.parse import parse_qs
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.container import get_container
+from app.core.session_context import (
+    is_valid_session_id,
+    reset_current_session_id,
+    set_current_session_id,
+)
+from app.exceptions import SessionLimitError
+
+logger = logging.getLogger(__name__)
+
+SESSION_HEADER = b"x-session-id"
+SESSION_QUERY_PARAM = "session_id"
+
+
+def extract_session_id(scope: Scope) -> Optional[str]:
+    """Read the session id from the request headers or query string."""
+    for name, value in scope.get("headers", []):
+        if name == SESSION_HEADER:
+            return str(value.decode("latin-1").strip()) or None
+
+    query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+    values = query.get(SESSION_QUERY_PARAM)
+    return values[0] if values else None
+
+
+class SessionContextMiddleware:
+    """Bind the request's session id to the context for downstream services."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        session_id = extract_session_id(scope)
+        if session_id is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not is_valid_session_id(session_id):
+            logger.warning(f"Rejected request with invalid session id: {session_id!r}")
+            response = JSONResponse(
+                status_code=400, content={"error": "Invalid session id"}
+            )
+            await response(scope, receive, send)
+            return
+
+        # Mark the session active (evicting another one to make room if needed)
+        try:
+            await get_container().get_session_registry().aget_session(session_id)
+        except SessionLimitError as e:
+            logger.warning(f"Rejected new session {session_id!r}: {e.message}")
+            response = JSONResponse(status_code=503, content={"error": e.message})
+            await response(scope, receive, send)
+            return
+
+        token = set_current_session_id(session_id)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            reset_current_session_id(token)
@@ -2,6 +2,7 @@
 Text-to-Speech API routes - FastAPI version.
 """
 
+import asyncio
 import logging
 from typing import Optional
 
@@ -99,6 +100,9 @@ async def get_narration_status(
     """Get current narration status."""
     try:
         enabled = tts_integration_service.is_narration_enabled()
+        if enabled:
+            # Narration is about to be used by the game being shown
+            tts_integration_service.warm_up_if_enabled()
         backend_auto = tts_integration_service.is_backend_auto_narration_enabled()
         voice = tts_integration_service.get_current_voice()
 
@@ -131,8 +135,10 @@ async def synthesize_speech(
         # Use provided voice or default
         voice_id = request.voice or "af_heart"
 
-        # Generate the audio file
-        audio_path = tts_service.synthesize_speech(request.text, voice_id)
+        # Generate the audio file (waits for the TTS worker, off the event loop)
+        audio_path = await asyncio.to_thread(
+            tts_service.synthesize_speech, request.text, voice_id
+        )
         if not audio_path:
             return TTSSynthesizeResponse(
                 success=False,
@@ -1,6 +1,7 @@
 """
 Combat context augmentor for RAG queries.
-Automatically adds queries for active combatants when in combat.
+Automatically adds queries for active combatants when in combat, unless their
+stat blocks are already part of the combat knowledge.
 """
 
 import logging
@@ -63,6 +64,14 @@ class CombatContextAugmentor:
         # Get unique creature types from active combatants
         creature_types = self._extract_combatant_creatures(game_state)
 
+        # Creatures retrieved with the combat knowledge need no query
+        known = game_state.combat.knowledge.creature_names()
+        creature_types = {
+            creature
+            for creature in creature_types
+            if not any(creature in name for name in known)
+        }
+
         if not creature_types:
             return queries
 
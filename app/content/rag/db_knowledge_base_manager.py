@@ -7,11 +7,12 @@ import logging
 import re
 import time
 from datetime import datetime, timezone
-from typing import TYPE_CHECKING, Dict, List, Optional, Type
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Type
 
 import numpy as np
 from langchain_core.documents import Document
 from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
 
 if TYPE_CHECKING:
     from sentence_transformers import SentenceTransformer as _SentenceTransformer
@@ -46,6 +47,7 @@ from app.content.rag.hybrid_search import MultiTableHybridSearch
 from app.content.rag.semantic_mapper import SemanticMapper
 from app.content.types import Vector
 from app.core.ai_interfaces import IKnowledgeBase
+from app.exceptions import DatabaseError
 from app.models.rag import KnowledgeResult, LoreDataModel, RAGResults
 from app.settings import get_settings
 
@@ -495,6 +497,53 @@ class DbKnowledgeBaseManager(IKnowledgeBase):
             execution_time_ms=execution_time,
         )
 
+    def get_entities(
+        self, entities: List[Tuple[str, str, str]]
+    ) -> List[KnowledgeResult]:
+        """
+        Fetch entities by primary key, without embedding the query.
+
+        Args:
+            entities: (table, index, content_pack_id) of each entity
+
+        Returns:
+            KnowledgeResults of the entities found, with a relevance of 1.0
+        """
+        results: List[KnowledgeResult] = []
+        try:
+            with self.db_manager.get_sessions() as (system, user):
+                # Homebrew packs live in the user database
+                sessions = [user] if user is system else [user, system]
+                for table_name, index, content_pack_id in entities:
+                    model_class = SOURCE_TO_MODEL.get(table_name)
+                    if model_class is None:
+                        continue
+                    for session in sessions:
+                        entity = (
+                            session.query(model_class)
+                            .filter_by(index=index, content_pack_id=content_pack_id)
+                            .first()
+                        )
+                        if entity:
+                            results.append(
+                                KnowledgeResult(
+                                    content=self._entity_to_text(entity, table_name),
+                                    source=table_name,
+                                    relevance_score=1.0,
+                                    metadata={
+                                        "index": entity.index,
+                                        "name": entity.name,
+                                        "table": table_name,
+                                        "content_pack_id": content_pack_id,
+                                        "lookup": "exact",
+                                    },
+                                )
+                            )
+                            break
+        except (SQLAlchemyError, DatabaseError) as e:
+            logger.error(f"Error fetching named entities: {e}")
+        return results
+
     def _entity_to_text(self, entity: BaseContent, entity_type: str) -> str:
         """Convert a database entity to text representation."""
         parts = [f"{entity_type.rstrip('s').title()}: {entity.name}"]
@@ -0,0 +1,453 @@
+"""
+Gazetteer of the named entities of the content packs.
+
+The names of the spells, monsters, equipment, classes and races of the active
+content packs (system and homebrew) are loaded from the content database and
+compiled, with their aliases, into one multi-pattern matcher. Player actions
+are scanned for whole-word occurrences of those names; words one typo away
+from a name (a letter missing, extra, wrong or swapped) are matched fuzzily,
+through precomputed one-letter deletions rather than pairwise comparisons.
+Ordinary words are often one typo from a name ("danger" and dagger), so fuzzy
+matches are flagged for callers to accept only where the context supports
+them (see SimpleQueryEngine.find_entities).
+Names can also be looked up directly, following a content pack priority, so
+named entities are fetched without a semantic search. The gazetteer is
+reloaded when content packs are added, removed, toggled or filled.
+"""
+
+import logging
+import math
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Collection,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+)
+
+from sqlalchemy import func
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.content.models import (
+    BaseContent,
+    CharacterClass,
+    ContentPack,
+    Equipment,
+    MagicItem,
+    Monster,
+    Race,
+    Spell,
+    Subrace,
+)
+from app.content.protocols import DatabaseManagerProtocol
+from app.exceptions import DatabaseError
+
+from .pattern_matcher import PatternMatcher
+
+logger = logging.getLogger(__name__)
+
+# Tables whose entity names are recognized in actions
+GAZETTEER_TABLES: Dict[str, Type[BaseContent]] = {
+    "spells": Spell,
+    "monsters": Monster,
+    "equipment": Equipment,
+    "magic_items": MagicItem,
+    "classes": CharacterClass,
+    "races": Race,
+    "subraces": Subrace,
+}
+
+# Tables whose names are also recognized in the plural ("goblins", "daggers")
+PLURAL_TABLES = {"monsters", "equipment", "magic_items"}
+
+MIN_ALIAS_LENGTH = 3
+FUZZY_MIN_LENGTH = 6
+FUZZY_MIN_WORD_LENGTH = 5
+FUZZY_MAX_WORDS = 3
+# Words that do not start or end a name, so fuzzy candidates skip them
+FUZZY_LINKING_WORDS = set(
+    "a an and at by for from i in is it my of on or the to up with".split()
+)
+
+# Same-length replacements, so spans in the normalized text match the action
+_TEXT_TRANSLATION = str.maketrans({"-": " ", "_": " ", "’": "'"})
+_WORD = re.compile(r"[a-z0-9']+")
+
+# (table, content_pack_id, is_active, updated_at) of the packs, then
+# (table, row count) of the gazetteer tables, for each database
+_Signature = Tuple[Tuple[object, ...], ...]
+
+
+@dataclass(frozen=True)
+class GazetteerEntity:
+    """A named entity of a content pack."""
+
+    name: str
+    index: str
+    table: str
+    content_pack_id: str
+    active: bool = True
+
+
+class EntityMatch(NamedTuple):
+    """An entity named in a text; text is the span as written."""
+
+    entity: GazetteerEntity
+    text: str
+    start: int
+    end: int
+    fuzzy: bool = False
+
+
+def normalize_name(name: str) -> str:
+    """Lowercase a name, with hyphens as spaces and single spaces."""
+    return " ".join(name.lower().translate(_TEXT_TRANSLATION).split())
+
+
+def _plural(name: str) -> str:
+    if name.endswith("y") and name[-2:-1] not in set("aeiou"):
+        return name[:-1] + "ies"
+    if name.endswith(("s", "x", "ch", "sh")):
+        return name + "es"
+    return name + "s"
+
+
+def entity_aliases(entity: GazetteerEntity) -> Set[str]:
+    """The normalized ways an action may name the entity."""
+    name = normalize_name(entity.name)
+    aliases = {name, normalize_name(entity.index)}
+    # "Giant Rat (Diseased)" -> "giant rat"
+    base = normalize_name(re.sub(r"\([^)]*\)", " ", name))
+    aliases.add(base)
+    # "Crossbow, light" -> "light crossbow"
+    head, comma, tail = base.partition(",")
+    if comma and tail.strip() and not tail.strip().startswith("+"):
+        aliases.add(normalize_name(f"{tail} {head}"))
+    aliases.update({alias.replace("'", "") for alias in aliases})
+    if entity.table in PLURAL_TABLES:
+        aliases.update({_plural(alias) for alias in aliases if "," not in alias})
+    return {alias for alias in aliases if len(alias) >= MIN_ALIAS_LENGTH}
+
+
+class _GazetteerIndex:
+    """Compiled names of one snapshot of the content packs."""
+
+    def __init__(self, entities: List[GazetteerEntity]) -> None:
+        self.entity_count = sum(entity.active for entity in entities)
+        # Entities of every pack, for lookups with a content pack priority
+        self.all_by_alias: Dict[str, List[GazetteerEntity]] = {}
+        self.by_alias: Dict[str, List[GazetteerEntity]] = {}
+        for entity in entities:
+            for alias in entity_aliases(entity):
+                self.all_by_alias.setdefault(alias, []).append(entity)
+                if not entity.active:
+                    continue
+                same_alias = self.by_alias.setdefault(alias, [])
+                # The first active pack providing a name wins within a table
+                if all(other.table != entity.table for other in same_alias):
+                    same_alias.append(entity)
+        self.matcher = PatternMatcher({"entity": self.by_alias.keys()})
+
+        # For fuzzy matches: one-word aliases without one of their letters,
+        # and longer aliases with one of their words left out
+        self.deletions: Dict[str, str] = {}
+        self.word_gaps: Dict[Tuple[str, ...], List[str]] = {}
+        for alias in self.by_alias:
+            words = alias.split()
+            if len(words) == 1:
+                if len(alias) >= FUZZY_MIN_LENGTH:
+                    for deletion in _deletions(alias):
+                        self.deletions.setdefault(deletion, alias)
+                continue
+            self.deletions.setdefault("".join(words), alias)
+            for i, word in enumerate(words):
+                if len(word) >= FUZZY_MIN_WORD_LENGTH:
+                    gap = (*words[:i], "", *words[i + 1 :])
+                    self.word_gaps.setdefault(gap, []).append(alias)
+
+    def close_alias(self, text: str) -> Optional[str]:
+        """An alias one typo away from the text, if any."""
+        words = text.split()
+        if len(words) > 1:
+            joined = "".join(words)
+            if joined in self.by_alias:
+                # "fire ball"
+                return joined
+            for i, word in enumerate(words):
+                gap = (*words[:i], "", *words[i + 1 :])
+                for alias in self.word_gaps.get(gap, []):
+                    if _is_one_typo(word, alias.split()[i]):
+                        return alias
+            return None
+
+        if len(text) < FUZZY_MIN_LENGTH:
+            return None
+        if text in self.deletions:
+            # A letter (or the space) is missing
+            return self.deletions[text]
+        for variant in _deletions(text):
+            # An extra letter, or a wrong one
+            if variant in self.by_alias:
+                return variant
+            if variant in self.deletions:
+                return self.deletions[variant]
+        for variant in _transpositions(text):
+            if variant in self.by_alias:
+                return variant
+        return None
+
+
+class EntityGazetteer:
+    """Finds the content pack entities named in player actions."""
+
+    def __init__(
+        self,
+        db_manager: DatabaseManagerProtocol,
+        refresh_interval: float = 30.0,
+        fuzzy: bool = True,
+    ) -> None:
+        """
+        Args:
+            db_manager: Database manager of the content packs
+            refresh_interval: Seconds between checks for content pack changes
+            fuzzy: Whether to match names with a typo
+        """
+        self.db_manager = db_manager
+        self.refresh_interval = refresh_interval
+        self.fuzzy = fuzzy
+        self._index = _GazetteerIndex([])
+        self._signature: Optional[_Signature] = None
+        self._checked_at = -math.inf
+        self._lock = threading.Lock()
+
+    @property
+    def entity_count(self) -> int:
+        return self._index.entity_count
+
+    def find(self, text: str) -> List[EntityMatch]:
+        """Entities named in the text, in order, longest name first on overlap."""
+        if not text:
+            return []
+        index = self._current_index()
+        normalized = text.lower().translate(_TEXT_TRANSLATION)
+        # Lowercasing rarely changes the length; spans then refer to it
+        original = text if len(normalized) == len(text) else normalized
+
+        found: List[EntityMatch] = []
+        covered_until = 0
+        spans = sorted(
+            (
+                (match.start, match.end, match.pattern)
+                for match in index.matcher.find_all(normalized)
+                if _is_whole_words(normalized, match.start, match.end)
+            ),
+            key=lambda span: (span[0], -span[1]),
+        )
+        for start, end, alias in spans:
+            if start < covered_until:
+                continue
+            covered_until = end
+            for entity in index.by_alias[alias]:
+                found.append(EntityMatch(entity, original[start:end], start, end))
+
+        if self.fuzzy:
+            found.extend(self._find_fuzzy(index, normalized, original, found))
+            found.sort(key=lambda match: match.start)
+        return found
+
+    def lookup(
+        self,
+        name: str,
+        tables: Collection[str],
+        content_pack_priority: Optional[Sequence[str]] = None,
+    ) -> Optional[GazetteerEntity]:
+        """
+        The entity of one of the tables with this name or alias, if any.
+
+        With a content pack priority, only the listed packs are considered and
+        the first of them providing the name wins; otherwise the first active
+        pack does, homebrew before system content.
+        """
+        candidates = [
+            entity
+            for entity in self._current_index().all_by_alias.get(
+                normalize_name(name), []
+            )
+            if entity.table in tables
+        ]
+        if content_pack_priority:
+            for pack_id in content_pack_priority:
+                for entity in candidates:
+                    if entity.content_pack_id == pack_id:
+                        return entity
+            return None
+        return next((entity for entity in candidates if entity.active), None)
+
+    def refresh(self) -> None:
+        """Reload the entity names now."""
+        with self._lock:
+            signature = self._read_signature()
+            if signature is not None:
+                self._reload(signature)
+            self._checked_at = time.monotonic()
+
+    def _current_index(self) -> _GazetteerIndex:
+        if time.monotonic() - self._checked_at >= self.refresh_interval:
+            with self._lock:
+                if time.monotonic() - self._checked_at >= self.refresh_interval:
+                    signature = self._read_signature()
+                    # On errors, keep the names we have until the next check
+                    if signature is not None and signature != self._signature:
+                        self._reload(signature)
+                    self._checked_at = time.monotonic()
+        return self._index
+
+    def _sessions(self, system: Session, user: Session) -> List[Session]:
+        # A single database manager hands out the same session twice
+        return [system] if user is system else [system, user]
+
+    def _read_signature(self) -> Optional[_Signature]:
+        try:
+            signature: List[Tuple[object, ...]] = []
+            with self.db_manager.get_sessions() as (system, user):
+                for session in self._sessions(system, user):
+                    packs: List[Any] = (
+                        session.query(
+                            ContentPack.id,
+                            ContentPack.is_active,
+                            ContentPack.updated_at,
+                        )
+                        .order_by(ContentPack.id)
+                        .all()
+                    )
+                    signature.extend(("content_packs", *row) for row in packs)
+                    for table, model in GAZETTEER_TABLES.items():
+                        count = session.query(func.count(model.index)).scalar()
+                        signature.append((table, count))
+            return tuple(signature)
+        except (SQLAlchemyError, DatabaseError) as e:
+            logger.error(f"Error checking content packs for the gazetteer: {e}")
+            return None
+
+    def _reload(self, signature: _Signature) -> None:
+        started = time.perf_counter()
+        entities: List[GazetteerEntity] = []
+        try:
+            with self.db_manager.get_sessions() as (system, user):
+                # User packs first, so homebrew takes precedence
+                for session in reversed(self._sessions(system, user)):
+                    entities.extend(self._load_entities(session))
+        except (SQLAlchemyError, DatabaseError) as e:
+            logger.error(f"Error loading entity names for the gazetteer: {e}")
+            return
+        self._index = _GazetteerIndex(entities)
+        self._signature = signature
+        logger.info(
+            f"Entity gazetteer loaded {len(entities)} names "
+            f"({self._index.matcher.pattern_count} aliases) in "
+            f"{(time.perf_counter() - started) * 1000:.0f}ms"
+        )
+
+    def _load_entities(self, session: Session) -> List[GazetteerEntity]:
+        entities: List[GazetteerEntity] = []
+        for table, model in GAZETTEER_TABLES.items():
+            results: List[Any] = (
+                session.query(
+                    model.name,
+                    model.index,
+                    model.content_pack_id,
+                    ContentPack.is_active,
+                )
+                .join(ContentPack, model.content_pack_id == ContentPack.id)
+                .order_by(model.content_pack_id, model.index)
+                .all()
+            )
+            entities.extend(
+                GazetteerEntity(result[0], result[1], table, result[2], bool(result[3]))
+                for result in results
+            )
+        return entities
+
+    def _find_fuzzy(
+        self,
+        index: _GazetteerIndex,
+        normalized: str,
+        original: str,
+        exact: List[EntityMatch],
+    ) -> List[EntityMatch]:
+        """Runs of up to FUZZY_MAX_WORDS unmatched words one typo from a name."""
+        words = [
+            word
+            for word in _WORD.finditer(normalized)
+            if not any(m.start < word.end() and word.start() < m.end for m in exact)
+        ]
+        linking = [word.group() in FUZZY_LINKING_WORDS for word in words]
+        found: List[EntityMatch] = []
+        used: Set[int] = set()
+        for size in range(FUZZY_MAX_WORDS, 0, -1):
+            for first in range(len(words) - size + 1):
+                run = range(first, first + size)
+                last = first + size - 1
+                # "potion of healing", but not "of healing" or "the goblin"
+                if linking[first] or linking[last] or used.intersection(run):
+                    continue
+                if not _adjacent(normalized, words, run):
+                    continue
+                start, end = words[first].start(), words[last].end()
+                candidate = " ".join(normalized[start:end].split())
+                alias = index.close_alias(candidate)
+                if alias is not None:
+                    used.update(run)
+                    for entity in index.by_alias[alias]:
+                        found.append(
+                            EntityMatch(entity, original[start:end], start, end, True)
+                        )
+        return found
+
+
+def _deletions(word: str) -> Set[str]:
+    return {word[:i] + word[i + 1 :] for i in range(len(word))}
+
+
+def _transpositions(word: str) -> Set[str]:
+    return {
+        word[:i] + word[i + 1] + word[i] + word[i + 2 :] for i in range(len(word) - 1)
+    }
+
+
+def _is_one_typo(word: str, name_word: str) -> bool:
+    if len(word) == len(name_word):
+        diffs = [i for i, (a, b) in enumerate(zip(word, name_word)) if a != b]
+        if len(diffs) == 2:
+            first, second = diffs
+            return (
+                second == first + 1
+                and word[first] == name_word[second]
+                and word[second] == name_word[first]
+            )
+        return len(diffs) == 1
+    shorter, longer = sorted((word, name_word), key=len)
+    return len(longer) == len(shorter) + 1 and shorter in _deletions(longer)
+
+
+def _is_whole_words(text: str, start: int, end: int) -> bool:
+    return (start == 0 or not text[start - 1].isalnum()) and (
+        end == len(text) or not text[end].isalnum()
+    )
+
+
+def _adjacent(text: str, words: List["re.Match[str]"], run: range) -> bool:
+    """Whether the words of the run are only separated by whitespace."""
+    return all(
+        not text[words[i].end() : words[i + 1].start()].strip() for i in run[:-1]
+    )
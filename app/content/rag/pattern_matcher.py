@@ -0,0 +1,113 @@
+"""
+Multi-pattern matcher for classifying player actions.
+
+All the keyword sets of the query engine are compiled into one Aho-Corasick
+automaton, so a single pass over the action text finds every occurrence of
+every pattern, with the categories it belongs to. Matching is by substring,
+like ``pattern in text``: overlapping patterns ("sword" in "longsword") are
+all reported.
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+
+# Patterns ending at a state, with their categories
+_Outputs = Tuple[Tuple[str, Tuple[str, ...]], ...]
+
+
+class PatternMatch(NamedTuple):
+    """An occurrence of a pattern; text[start:end] == pattern."""
+
+    pattern: str
+    category: str
+    start: int
+    end: int
+
+
+class PatternMatches:
+    """Everything one pass found in a text, by category."""
+
+    def __init__(self, matches: List[PatternMatch]) -> None:
+        self.matches = matches
+        # Category -> distinct patterns in order of first occurrence
+        self._patterns: Dict[str, List[str]] = {}
+        for match in matches:
+            patterns = self._patterns.setdefault(match.category, [])
+            if match.pattern not in patterns:
+                patterns.append(match.pattern)
+
+    def has(self, category: str) -> bool:
+        return category in self._patterns
+
+    def patterns(self, category: str) -> List[str]:
+        """Patterns of a category found in the text, in order of occurrence."""
+        return self._patterns.get(category, [])
+
+    def first(self, category: str) -> Optional[str]:
+        patterns = self._patterns.get(category)
+        return patterns[0] if patterns else None
+
+    def found(self, pattern: str) -> bool:
+        return any(match.pattern == pattern for match in self.matches)
+
+
+class PatternMatcher:
+    """Aho-Corasick automaton over named sets of lowercase patterns."""
+
+    def __init__(self, pattern_sets: Mapping[str, Iterable[str]]) -> None:
+        categories: Dict[str, List[str]] = {}
+        for category, patterns in pattern_sets.items():
+            for pattern in patterns:
+                if pattern and category not in categories.get(pattern, []):
+                    categories.setdefault(pattern, []).append(category)
+
+        # Trie of the patterns
+        self._goto: List[Dict[str, int]] = [{}]
+        own_outputs: List[List[Tuple[str, Tuple[str, ...]]]] = [[]]
+        for pattern, pattern_categories in categories.items():
+            state = 0
+            for char in pattern:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    own_outputs.append([])
+                state = next_state
+            own_outputs[state].append((pattern, tuple(pattern_categories)))
+
+        # Failure links, breadth first: the longest proper suffix in the trie
+        self._fail = [0] * len(self._goto)
+        self._outputs: List[_Outputs] = [tuple(outputs) for outputs in own_outputs]
+        pending = deque(self._goto[0].values())
+        while pending:
+            state = pending.popleft()
+            for char, next_state in self._goto[state].items():
+                pending.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._outputs[next_state] += self._outputs[self._fail[next_state]]
+
+        self.pattern_count = len(categories)
+
+    def find_all(self, text: str) -> List[PatternMatch]:
+        """Every (pattern, category, span) in the text, ordered by position."""
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        matches: List[PatternMatch] = []
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for pattern, pattern_categories in outputs[state]:
+                start = index + 1 - len(pattern)
+                for category in pattern_categories:
+                    matches.append(PatternMatch(pattern, category, start, index + 1))
+        matches.sort(key=lambda match: (match.start, match.end))
+        return matches
+
+    def scan(self, text: str) -> PatternMatches:
+        return PatternMatches(self.find_all(text))
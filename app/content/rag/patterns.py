@@ -385,3 +385,43 @@ RACE_PATTERNS: Set[str] = {
     "speed",
     "size",
 }
+
+# Generic spell casting words (the other spell patterns name spells)
+SPELL_CASTING_KEYWORDS: Set[str] = {
+    "cast",
+    "casting",
+    "spell",
+    "cantrip",
+    "ritual",
+}
+
+# Defensive combat actions
+DEFENSIVE_ACTION_PATTERNS: Set[str] = {
+    "dodge",
+    "parry",
+    "block",
+    "evade",
+    "defend",
+}
+
+# Melee and ranged attacks
+MELEE_ATTACK_PATTERNS: Set[str] = {
+    "melee",
+    "sword",
+    "axe",
+    "attack",
+    "strike",
+}
+
+RANGED_ATTACK_PATTERNS: Set[str] = {
+    "ranged",
+    "bow",
+    "shoot",
+}
+
+# Hidden features of the environment
+HIDDEN_FEATURE_PATTERNS: Set[str] = {
+    "trap",
+    "secret",
+    "hidden",
+}
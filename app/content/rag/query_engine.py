@@ -1,30 +1,68 @@
 """
 Simple query engine for RAG that analyzes player actions without LLM dependencies.
+
+Actions are classified with the keyword sets of the patterns module, compiled
+into one multi-pattern matcher: a single pass over the action finds every
+keyword, and the query types and queries are derived from those matches.
+With an entity gazetteer, the spells, monsters, items, classes and races of
+the content packs named in the action are also queried in their own table.
 """
 
 import logging
 import re
-from typing import List, Set
+from typing import Collection, Dict, List, Optional, Set, Tuple
 
+from app.models.combat.state import CombatStateModel
 from app.models.game_state.main import GameStateModel
-from app.models.rag import QueryType, RAGQuery
+from app.models.rag import CombatKnowledgeModel, QueryType, RAGQuery
 
+from .entity_gazetteer import EntityGazetteer, EntityMatch, normalize_name
 from .interfaces import IQueryEngine
+from .pattern_matcher import PatternMatcher, PatternMatches
 from .patterns import (
     CLASS_PATTERNS,
     COMBAT_PATTERNS,
     CREATURE_PATTERNS,
+    DEFENSIVE_ACTION_PATTERNS,
     EQUIPMENT_PATTERNS,
     EXPLORATION_PATTERNS,
+    HIDDEN_FEATURE_PATTERNS,
     LOCATION_PATTERNS,
+    MELEE_ATTACK_PATTERNS,
     RACE_PATTERNS,
+    RANGED_ATTACK_PATTERNS,
     SKILL_PATTERNS,
     SOCIAL_PATTERNS,
+    SPELL_CASTING_KEYWORDS,
     SPELL_PATTERNS,
 )
 
 logger = logging.getLogger(__name__)
 
+# Gazetteer table -> query type, knowledge bases and context key of its entities
+ENTITY_QUERY_ROUTES: Dict[str, Tuple[QueryType, List[str], str]] = {
+    "spells": (QueryType.SPELL_CASTING, ["spells"], "spell_name"),
+    "monsters": (QueryType.COMBAT, ["monsters"], "creature"),
+    "equipment": (QueryType.EQUIPMENT, ["equipment"], "item"),
+    "magic_items": (QueryType.EQUIPMENT, ["equipment"], "item"),
+    "classes": (QueryType.CHARACTER_INFO, ["character_options", "rules"], "class"),
+    "races": (QueryType.CHARACTER_INFO, ["character_options", "rules"], "race"),
+    "subraces": (QueryType.CHARACTER_INFO, ["character_options", "rules"], "race"),
+}
+
+# Keyword categories of an action that make a gazetteer name written with a
+# typo plausible: ordinary words are often one typo from a name ("danger" and
+# dagger, "tickle" and sickle)
+FUZZY_MATCH_CONTEXT: Dict[str, Tuple[str, ...]] = {
+    "spells": ("spell_casting",),
+    "monsters": ("creature", "combat"),
+    "equipment": ("equipment", "combat"),
+    "magic_items": ("equipment",),
+    "classes": ("class",),
+    "races": ("race",),
+    "subraces": ("race",),
+}
+
 
 class SimpleQueryEngine(IQueryEngine):
     """
@@ -32,8 +70,14 @@ class SimpleQueryEngine(IQueryEngine):
     and keyword extraction. No LLM required.
     """
 
-    def __init__(self) -> None:
-        """Initialize the query engine with patterns from the patterns module."""
+    def __init__(self, gazetteer: Optional[EntityGazetteer] = None) -> None:
+        """
+        Initialize the query engine with patterns from the patterns module.
+
+        Args:
+            gazetteer: Optional gazetteer of the content pack entity names
+        """
+        self.gazetteer = gazetteer
         # Import patterns from the patterns module
         self.spell_patterns = SPELL_PATTERNS
         self.skill_patterns = SKILL_PATTERNS
@@ -45,6 +89,118 @@ class SimpleQueryEngine(IQueryEngine):
         self.creature_keywords = CREATURE_PATTERNS
         self.class_patterns = CLASS_PATTERNS
         self.race_patterns = RACE_PATTERNS
+        self.spell_casting_keywords = SPELL_CASTING_KEYWORDS
+        self.defensive_action_patterns = DEFENSIVE_ACTION_PATTERNS
+        self.melee_attack_patterns = MELEE_ATTACK_PATTERNS
+        self.ranged_attack_patterns = RANGED_ATTACK_PATTERNS
+        self.hidden_feature_patterns = HIDDEN_FEATURE_PATTERNS
+        self._matcher_key: Tuple[Tuple[str, int, int], ...] = ()
+        self._matcher = self.refresh_patterns()
+
+    def _pattern_sets(self) -> Dict[str, Set[str]]:
+        """Category -> keywords, as matched in actions."""
+        return {
+            "spell": self.spell_patterns,
+            "spell_casting": self.spell_casting_keywords,
+            "skill": self.skill_patterns,
+            "combat": self.combat_patterns,
+            "defensive_action": self.defensive_action_patterns,
+            "melee_attack": self.melee_attack_patterns,
+            "ranged_attack": self.ranged_attack_patterns,
+            "equipment": self.equipment_patterns,
+            "social": self.social_patterns,
+            "exploration": self.exploration_patterns,
+            "hidden_feature": self.hidden_feature_patterns,
+            "location": self.location_patterns,
+            "creature": self.creature_keywords,
+            "class": self.class_patterns,
+            "race": self.race_patterns,
+        }
+
+    def refresh_patterns(self) -> PatternMatcher:
+        """
+        Compile the keyword sets into the matcher.
+
+        Replacing a set, or adding or removing keywords, is picked up on the
+        next action; call this after other in-place changes.
+        """
+        pattern_sets = self._pattern_sets()
+        self._matcher_key = self._pattern_sets_key(pattern_sets)
+        self._matcher = PatternMatcher(pattern_sets)
+        logger.debug(f"Compiled {self._matcher.pattern_count} action patterns")
+        return self._matcher
+
+    @staticmethod
+    def _pattern_sets_key(
+        pattern_sets: Dict[str, Set[str]],
+    ) -> Tuple[Tuple[str, int, int], ...]:
+        return tuple(
+            (category, id(patterns), len(patterns))
+            for category, patterns in pattern_sets.items()
+        )
+
+    def match_patterns(self, action: str) -> PatternMatches:
+        """Every keyword of every category found in the action, in one pass."""
+        if self._pattern_sets_key(self._pattern_sets()) != self._matcher_key:
+            self.refresh_patterns()
+        return self._matcher.scan(action.lower())
+
+    def find_entities(
+        self,
+        action: str,
+        matches: PatternMatches,
+        combatants: Collection[str] = (),
+    ) -> List[EntityMatch]:
+        """
+        Content pack entities named in the action, if there is a gazetteer.
+
+        Args:
+            action: The player's action text
+            matches: Keywords found in the action
+            combatants: Lowercase creature names of the current combat
+        """
+        if self.gazetteer is None:
+            return []
+        entities = []
+        for match in self.gazetteer.find(action):
+            # One-word spell names ("light", "command") are common words;
+            # they name the spell when capitalized or when casting
+            if (
+                match.entity.table == "spells"
+                and " " not in match.text.strip()
+                and not match.text[:1].isupper()
+                and not matches.has("spell_casting")
+            ):
+                continue
+            if match.fuzzy and not self._supports_fuzzy(
+                action, match, matches, combatants
+            ):
+                continue
+            entities.append(match)
+        return entities
+
+    @staticmethod
+    def _supports_fuzzy(
+        action: str,
+        match: EntityMatch,
+        matches: PatternMatches,
+        combatants: Collection[str],
+    ) -> bool:
+        """Whether the action supports a name written with a typo.
+
+        It does when the name is capitalized within a sentence, when keywords
+        of the action relate to the entity's table (casting for a spell), or
+        when the entity is a creature of the current combat.
+        """
+        before = action[: match.start].rstrip()
+        if match.text[:1].isupper() and before and before[-1] not in ".!?":
+            return True
+        if any(matches.has(c) for c in FUZZY_MATCH_CONTEXT.get(match.entity.table, ())):
+            return True
+        return (
+            match.entity.table == "monsters"
+            and normalize_name(match.entity.name) in combatants
+        )
 
     def analyze_action(self, action: str, game_state: GameStateModel) -> List[RAGQuery]:
         """
@@ -65,43 +221,52 @@ class SimpleQueryEngine(IQueryEngine):
 
         # Extract entities and keywords
         extracted_entities = self._extract_entities(action)
+        matches = self.match_patterns(action)
+        named_entities = self.find_entities(
+            action, matches, self._combatant_creatures(game_state)
+        )
+
+        # Entities of the content packs are looked up in their own table
+        queries.extend(self._generate_entity_queries(named_entities, matches))
 
         # Determine query types based on patterns
-        query_types = self._determine_query_types(action_lower, game_state)
+        query_types = self._determine_query_types(matches, game_state)
 
         # Generate queries based on extracted information
         for query_type in query_types:
             if query_type == QueryType.SPELL_CASTING:
                 queries.extend(
-                    self._generate_spell_queries(action_lower, extracted_entities)
+                    self._generate_spell_queries(
+                        action_lower, matches, extracted_entities, named_entities
+                    )
                 )
             elif query_type == QueryType.COMBAT:
                 queries.extend(
                     self._generate_combat_queries(
-                        action_lower, game_state, extracted_entities
+                        matches, game_state, extracted_entities
                     )
                 )
             elif query_type == QueryType.SKILL_CHECK:
                 queries.extend(
-                    self._generate_skill_queries(action_lower, extracted_entities)
+                    self._generate_skill_queries(matches, extracted_entities)
                 )
             elif query_type == QueryType.SOCIAL_INTERACTION:
                 queries.extend(
-                    self._generate_social_queries(action_lower, extracted_entities)
+                    self._generate_social_queries(matches, extracted_entities)
                 )
             elif query_type == QueryType.EXPLORATION:
                 queries.extend(
                     self._generate_exploration_queries(
-                        action_lower, game_state, extracted_entities
+                        action_lower, matches, game_state, extracted_entities
                     )
                 )
             elif query_type == QueryType.EQUIPMENT:
                 queries.extend(
-                    self._generate_equipment_queries(action_lower, extracted_entities)
+                    self._generate_equipment_queries(matches, extracted_entities)
                 )
             elif query_type == QueryType.CHARACTER_INFO:
                 queries.extend(
-                    self._generate_character_queries(action_lower, extracted_entities)
+                    self._generate_character_queries(matches, extracted_entities)
                 )
 
         # Always add a general query with the full action
@@ -109,20 +274,23 @@ class SimpleQueryEngine(IQueryEngine):
         kb_types = ["lore", "rules"]
 
         # Add specific knowledge bases based on detected patterns
-        if any(cls in action_lower for cls in self.class_patterns) or any(
-            race in action_lower for race in self.race_patterns
-        ):
+        if matches.has("class") or matches.has("race"):
             kb_types.append("character_options")
 
-        if any(item in action_lower for item in self.equipment_patterns):
+        if matches.has("equipment"):
             kb_types.append("equipment")
 
-        if any(creature in action_lower for creature in self.creature_keywords):
+        if matches.has("creature"):
             kb_types.append("monsters")
 
-        if any(spell in action_lower for spell in self.spell_patterns):
+        if matches.has("spell"):
             kb_types.append("spells")
 
+        for named in named_entities:
+            for kb_type in ENTITY_QUERY_ROUTES[named.entity.table][1]:
+                if kb_type not in kb_types:
+                    kb_types.append(kb_type)
+
         queries.append(
             RAGQuery(
                 query_text=action,
@@ -165,37 +333,29 @@ class SimpleQueryEngine(IQueryEngine):
         return entities
 
     def _determine_query_types(
-        self, action_lower: str, game_state: GameStateModel
+        self, matches: PatternMatches, game_state: GameStateModel
     ) -> List[QueryType]:
         """Determine what types of queries to generate based on the action."""
         query_types = []
 
         # Check for specific spell names first (highest priority)
-        for spell in self.spell_patterns:
-            if spell in action_lower and spell not in {
-                "cast",
-                "casting",
-                "spell",
-                "cantrip",
-                "ritual",
-            }:
-                return [QueryType.SPELL_CASTING]
+        if any(
+            spell not in self.spell_casting_keywords
+            for spell in matches.patterns("spell")
+        ):
+            return [QueryType.SPELL_CASTING]
 
         # Check for skills before combat - skills are more specific than general combat
-        if any(skill in action_lower for skill in self.skill_patterns):
+        if matches.has("skill"):
             query_types.append(QueryType.SKILL_CHECK)
 
         # Check for social interaction
-        if any(social in action_lower for social in self.social_patterns):
+        if matches.has("social"):
             query_types.append(QueryType.SOCIAL_INTERACTION)
 
         # Check for combat (including creature names)
-        has_creature = any(
-            creature in action_lower for creature in self.creature_keywords
-        )
-        has_combat_action = any(
-            combat in action_lower for combat in self.combat_patterns
-        )
+        has_creature = matches.has("creature")
+        has_combat_action = matches.has("combat")
 
         # Only add combat if it's not already covered by a skill check or social interaction
         if (
@@ -204,32 +364,29 @@ class SimpleQueryEngine(IQueryEngine):
             query_types.append(QueryType.COMBAT)
 
         # Check for exploration
-        if any(explore in action_lower for explore in self.exploration_patterns):
+        if matches.has("exploration"):
             query_types.append(QueryType.EXPLORATION)
 
         # Check for location queries
-        if any(loc in action_lower for loc in self.location_patterns):
+        if matches.has("location"):
             if QueryType.EXPLORATION not in query_types:
                 query_types.append(QueryType.EXPLORATION)
 
         # Check for spell casting keywords if no specific spell was found
-        if any(
-            spell in action_lower
-            for spell in {"cast", "casting", "spell", "cantrip", "ritual"}
-        ):
+        if matches.has("spell_casting"):
             if QueryType.SPELL_CASTING not in query_types:
                 query_types.append(QueryType.SPELL_CASTING)
 
         # Check for class-related queries
-        if any(cls in action_lower for cls in self.class_patterns):
+        if matches.has("class"):
             query_types.append(QueryType.CHARACTER_INFO)
 
         # Check for race-related queries
-        if any(race in action_lower for race in self.race_patterns):
+        if matches.has("race"):
             query_types.append(QueryType.CHARACTER_INFO)
 
         # Check for equipment/items
-        if any(item in action_lower for item in self.equipment_patterns):
+        if matches.has("equipment"):
             query_types.append(QueryType.EQUIPMENT)
 
         # Default to general if no specific type found
@@ -238,24 +395,80 @@ class SimpleQueryEngine(IQueryEngine):
 
         return query_types
 
+    @staticmethod
+    def _combatant_creatures(game_state: GameStateModel) -> Set[str]:
+        """Lowercase creature names of the active combat, if any."""
+        combat = getattr(game_state, "combat", None)
+        if not isinstance(combat, CombatStateModel) or not combat.is_active:
+            return set()
+        return {
+            CombatKnowledgeModel.creature_name(combatant.name)
+            for combatant in combat.combatants
+            if not combatant.is_player
+        }
+
+    def _generate_entity_queries(
+        self, named_entities: List[EntityMatch], matches: PatternMatches
+    ) -> List[RAGQuery]:
+        """Generate a query in the table of each entity named in the action."""
+        queries = []
+        creature = next(
+            (
+                normalize_name(named.entity.name)
+                for named in named_entities
+                if named.entity.table == "monsters"
+            ),
+            matches.first("creature"),
+        )
+
+        for named in named_entities:
+            query_type, kb_types, context_key = ENTITY_QUERY_ROUTES[named.entity.table]
+            name = normalize_name(named.entity.name)
+            context = {
+                context_key: name,
+                "entity_index": named.entity.index,
+                "entity_table": named.entity.table,
+            }
+            if query_type == QueryType.SPELL_CASTING and creature:
+                context["creature"] = creature
+            queries.append(
+                RAGQuery(
+                    query_text=name,
+                    query_type=query_type,
+                    knowledge_base_types=kb_types,
+                    context=context,
+                )
+            )
+
+        return queries
+
     def _generate_spell_queries(
-        self, action_lower: str, _entities: Set[str]
+        self,
+        action_lower: str,
+        matches: PatternMatches,
+        _entities: Set[str],
+        named_entities: List[EntityMatch],
     ) -> List[RAGQuery]:
         """Generate queries for spell casting actions."""
         queries = []
 
-        # Look for spell names
-        spell_name = None
-        for word in action_lower.split():
-            if word in self.spell_patterns and word not in {
-                "cast",
-                "casting",
-                "spell",
-                "cantrip",
-                "ritual",
-            }:
-                spell_name = word
-                break
+        # Look for spell names, of the content packs first
+        spell_name = next(
+            (
+                normalize_name(named.entity.name)
+                for named in named_entities
+                if named.entity.table == "spells"
+            ),
+            None,
+        )
+        if not spell_name:
+            for word in action_lower.split():
+                if (
+                    word in self.spell_patterns
+                    and word not in self.spell_casting_keywords
+                ):
+                    spell_name = word
+                    break
 
         # If no specific spell found, look for "cast X" pattern
         if not spell_name:
@@ -265,11 +478,7 @@ class SimpleQueryEngine(IQueryEngine):
 
         if spell_name:
             # Check if there's a creature target mentioned
-            creature_target = None
-            for creature in self.creature_keywords:
-                if creature in action_lower:
-                    creature_target = creature
-                    break
+            creature_target = matches.first("creature")
 
             context = {"spell_name": spell_name}
             if creature_target:
@@ -297,32 +506,27 @@ class SimpleQueryEngine(IQueryEngine):
         return queries
 
     def _generate_combat_queries(
-        self, action_lower: str, _game_state: GameStateModel, _entities: Set[str]
+        self,
+        matches: PatternMatches,
+        _game_state: GameStateModel,
+        _entities: Set[str],
     ) -> List[RAGQuery]:
         """Generate queries for combat actions."""
         queries = []
 
         # Look for specific actions first
-        defensive_actions = {"dodge", "parry", "block", "evade", "defend"}
-        for action in defensive_actions:
-            if action in action_lower:
-                queries.append(
-                    RAGQuery(
-                        query_text=f"{action} action rules",
-                        query_type=QueryType.COMBAT,
-                        knowledge_base_types=["rules"],
-                        context={"action": action},
-                    )
+        for action in matches.patterns("defensive_action"):
+            queries.append(
+                RAGQuery(
+                    query_text=f"{action} action rules",
+                    query_type=QueryType.COMBAT,
+                    knowledge_base_types=["rules"],
+                    context={"action": action},
                 )
+            )
 
         # Look for weapon or attack type
-        if (
-            "melee" in action_lower
-            or "sword" in action_lower
-            or "axe" in action_lower
-            or "attack" in action_lower
-            or "strike" in action_lower
-        ):
+        if matches.has("melee_attack"):
             queries.append(
                 RAGQuery(
                     query_text="melee attack rules",
@@ -331,9 +535,7 @@ class SimpleQueryEngine(IQueryEngine):
                     context={},
                 )
             )
-        elif (
-            "ranged" in action_lower or "bow" in action_lower or "shoot" in action_lower
-        ):
+        elif matches.has("ranged_attack"):
             queries.append(
                 RAGQuery(
                     query_text="ranged attack rules",
@@ -344,42 +546,40 @@ class SimpleQueryEngine(IQueryEngine):
             )
 
         # Look for specific creatures mentioned
-        for creature in self.creature_keywords:
-            if creature in action_lower:
-                queries.append(
-                    RAGQuery(
-                        query_text=creature,
-                        query_type=QueryType.COMBAT,
-                        knowledge_base_types=["monsters"],
-                        context={"creature": creature},
-                    )
+        for creature in matches.patterns("creature"):
+            queries.append(
+                RAGQuery(
+                    query_text=creature,
+                    query_type=QueryType.COMBAT,
+                    knowledge_base_types=["monsters"],
+                    context={"creature": creature},
                 )
+            )
 
         return queries
 
     def _generate_skill_queries(
-        self, action_lower: str, _entities: Set[str]
+        self, matches: PatternMatches, _entities: Set[str]
     ) -> List[RAGQuery]:
         """Generate queries for skill check actions."""
         queries = []
 
         # Find which skill is being used
-        for skill in self.skill_patterns:
-            if skill in action_lower:
-                queries.append(
-                    RAGQuery(
-                        query_text=f"{skill} skill check",
-                        query_type=QueryType.SKILL_CHECK,
-                        knowledge_base_types=["rules"],
-                        context={"skill": skill},
-                    )
+        skill = matches.first("skill")
+        if skill:
+            queries.append(
+                RAGQuery(
+                    query_text=f"{skill} skill check",
+                    query_type=QueryType.SKILL_CHECK,
+                    knowledge_base_types=["rules"],
+                    context={"skill": skill},
                 )
-                break
+            )
 
         return queries
 
     def _generate_social_queries(
-        self, _action_lower: str, entities: Set[str]
+        self, _matches: PatternMatches, entities: Set[str]
     ) -> List[RAGQuery]:
         """Generate queries for social interaction actions."""
         queries = []
@@ -410,25 +610,27 @@ class SimpleQueryEngine(IQueryEngine):
         return queries
 
     def _generate_exploration_queries(
-        self, action_lower: str, game_state: GameStateModel, entities: Set[str]
+        self,
+        action_lower: str,
+        matches: PatternMatches,
+        game_state: GameStateModel,
+        entities: Set[str],
     ) -> List[RAGQuery]:
         """Generate queries for exploration actions."""
         queries = []
 
         # For location queries like "Where is X", extract the location name
-        if "where" in action_lower:
-            # Try to extract location after "where is"
-            match = re.search(r"where\s+is\s+(\w+(?:\s+\w+)*)", action_lower)
-            if match:
-                location_name = match.group(1).strip()
-                queries.append(
-                    RAGQuery(
-                        query_text=location_name,
-                        query_type=QueryType.EXPLORATION,
-                        knowledge_base_types=["lore"],
-                        context={"location": location_name},
-                    )
+        match = re.search(r"where\s+is\s+(\w+(?:\s+\w+)*)", action_lower)
+        if match:
+            location_name = match.group(1).strip()
+            queries.append(
+                RAGQuery(
+                    query_text=location_name,
+                    query_type=QueryType.EXPLORATION,
+                    knowledge_base_types=["lore"],
+                    context={"location": location_name},
                 )
+            )
 
         # Also search for any capitalized words that might be locations
         for entity in entities:
@@ -454,7 +656,7 @@ class SimpleQueryEngine(IQueryEngine):
             )
 
         # Search for exploration rules
-        if any(word in action_lower for word in ["trap", "secret", "hidden"]):
+        if matches.has("hidden_feature"):
             queries.append(
                 RAGQuery(
                     query_text="traps secret doors detection",
@@ -467,32 +669,31 @@ class SimpleQueryEngine(IQueryEngine):
         return queries
 
     def _generate_equipment_queries(
-        self, action_lower: str, _entities: Set[str]
+        self, matches: PatternMatches, _entities: Set[str]
     ) -> List[RAGQuery]:
         """Generate queries for equipment and item-related actions."""
         queries = []
 
         # Find specific equipment mentioned
         mentioned_items: List[str] = []
-        for item in self.equipment_patterns:
-            if item in action_lower:
-                # Skip generic terms when specific items are mentioned
-                if (
-                    item
-                    in {
-                        "item",
-                        "items",
-                        "equipment",
-                        "gear",
-                        "weapon",
-                        "weapons",
-                        "armor",
-                        "armour",
-                    }
-                    and mentioned_items
-                ):
-                    continue
-                mentioned_items.append(item)
+        for item in matches.patterns("equipment"):
+            # Skip generic terms when specific items are mentioned
+            if (
+                item
+                in {
+                    "item",
+                    "items",
+                    "equipment",
+                    "gear",
+                    "weapon",
+                    "weapons",
+                    "armor",
+                    "armour",
+                }
+                and mentioned_items
+            ):
+                continue
+            mentioned_items.append(item)
 
         # Generate queries for specific items - prioritize them
         for item in mentioned_items:
@@ -521,13 +722,13 @@ class SimpleQueryEngine(IQueryEngine):
         return queries
 
     def _generate_character_queries(
-        self, action_lower: str, _entities: Set[str]
+        self, matches: PatternMatches, _entities: Set[str]
     ) -> List[RAGQuery]:
         """Generate queries for character-related actions (classes, races, etc.)."""
         queries = []
 
         # Special handling for hit dice queries
-        if "hit dice" in action_lower or "hit die" in action_lower:
+        if matches.found("hit dice") or matches.found("hit die"):
             queries.append(
                 RAGQuery(
                     query_text="hit die",
@@ -539,27 +740,26 @@ class SimpleQueryEngine(IQueryEngine):
 
         # Find mentioned classes
         mentioned_classes: List[str] = []
-        for class_kw in self.class_patterns:
-            if class_kw in action_lower:
-                # Skip generic terms when specific classes are mentioned
-                if (
-                    class_kw
-                    in {
-                        "class",
-                        "classes",
-                        "subclass",
-                        "subclasses",
-                        "level",
-                        "levels",
-                        "feature",
-                        "features",
-                        "hit dice",
-                        "hit die",
-                    }
-                    and mentioned_classes
-                ):
-                    continue
-                mentioned_classes.append(class_kw)
+        for class_kw in matches.patterns("class"):
+            # Skip generic terms when specific classes are mentioned
+            if (
+                class_kw
+                in {
+                    "class",
+                    "classes",
+                    "subclass",
+                    "subclasses",
+                    "level",
+                    "levels",
+                    "feature",
+                    "features",
+                    "hit dice",
+                    "hit die",
+                }
+                and mentioned_classes
+            ):
+                continue
+            mentioned_classes.append(class_kw)
 
         # Generate queries for specific classes
         for class_name in mentioned_classes:
@@ -586,16 +786,14 @@ class SimpleQueryEngine(IQueryEngine):
 
         # Find mentioned races
         mentioned_races: List[str] = []
-        for race_kw in self.race_patterns:
-            if race_kw in action_lower:
-                # Skip generic terms when specific races are mentioned
-                if (
-                    race_kw
-                    in {"race", "races", "subrace", "subraces", "traits", "racial"}
-                    and mentioned_races
-                ):
-                    continue
-                mentioned_races.append(race_kw)
+        for race_kw in matches.patterns("race"):
+            # Skip generic terms when specific races are mentioned
+            if (
+                race_kw in {"race", "races", "subrace", "subraces", "traits", "racial"}
+                and mentioned_races
+            ):
+                continue
+            mentioned_races.append(race_kw)
 
         # Generate queries for specific races
         for race_name in mentioned_races:
@@ -5,11 +5,14 @@ Separated from prompts.py for better organization and testability.
 
 import logging
 import re
-from typing import List, Optional
+from typing import Hashable, List, Optional, Tuple
 
 from app.core.ai_interfaces import IRAGService
+from app.core.session_context import get_current_session_id
 from app.models.game_state.main import GameStateModel
 from app.models.shared import ChatMessageModel
+from app.settings import get_settings
+from app.utils.prefetch_cache import PrefetchCache
 
 logger = logging.getLogger(__name__)
 
@@ -64,6 +67,11 @@ class RAGContextBuilder:
             "survival",
         ]
 
+        # RAG context retrieved ahead of time, e.g. while the player types
+        self.prefetched_contexts: PrefetchCache[str] = PrefetchCache(
+            ttl_seconds=get_settings().prompt.prefetch_ttl_seconds
+        )
+
     def extract_rag_query(
         self, player_action_input: Optional[str], messages: List["ChatMessageModel"]
     ) -> str:
@@ -150,45 +158,144 @@ class RAGContextBuilder:
                 game_state._last_rag_context = None
             return ""
 
+        # Use the context retrieved while the player was typing, if it matches
+        prefetched = self.prefetched_contexts.take(
+            self._prefetch_key(game_state),
+            self._prefetch_fingerprint(query, game_state),
+        )
+        if prefetched is not None:
+            logger.info(f"Using prefetched RAG context for query: {query[:50]}...")
+            if hasattr(game_state, "_last_rag_context"):
+                game_state._last_rag_context = prefetched or None
+            return prefetched
+
         # Get relevant knowledge using semantic search
         try:
-            # Get content pack priority from game state
-            content_pack_priority = getattr(game_state, "content_pack_priority", None)
-            results = rag_service.get_relevant_knowledge(
-                query, game_state, content_pack_priority
+            formatted_context = self._retrieve_rag_context(
+                query, game_state, rag_service
             )
+        except Exception as e:
+            logger.error(f"Error retrieving RAG context: {e}", exc_info=True)
+            formatted_context = ""
 
-            if results.has_results():
-                # Format results for prompt inclusion
-                formatted_context = results.format_for_prompt()
+        # Store the context for future use (e.g., during dice roll submission),
+        # or clear it if nothing was found
+        if hasattr(game_state, "_last_rag_context"):
+            game_state._last_rag_context = formatted_context or None
+        return formatted_context
 
-                # Store the context for future use (e.g., during dice roll submission)
-                if hasattr(game_state, "_last_rag_context"):
-                    game_state._last_rag_context = formatted_context
+    def prefetch_rag_context(
+        self,
+        game_state: GameStateModel,
+        rag_service: IRAGService,
+        player_action_input: Optional[str],
+        messages: List[ChatMessageModel],
+    ) -> bool:
+        """
+        Retrieve the RAG context of the next prompt ahead of time.
 
-                logger.info("=== LANGCHAIN RAG CONTEXT ===")
-                logger.info(f"Query: {query[:100]}{'...' if len(query) > 100 else ''}")
-                logger.info(
-                    f"Retrieved {len(results.results)} results in {results.execution_time_ms:.1f}ms"
-                )
-                logger.info(f"Context preview: {formatted_context[:200]}...")
-                logger.info("=== END RAG CONTEXT ===")
+        The context is used by get_rag_context_for_prompt if the query and
+        the game state it depends on are unchanged by then, e.g. when the
+        player sends the draft the context was prefetched for.
 
-                return formatted_context
-            else:
-                # Clear stored context if no results found
-                if hasattr(game_state, "_last_rag_context"):
-                    game_state._last_rag_context = None
-                logger.debug(f"No RAG context found for query: {query[:50]}...")
-                return ""
+        Args:
+            game_state: Current game state
+            rag_service: RAG service to query
+            player_action_input: Player action being written, or None for the
+                prompt of a dice roll submission
+            messages: Chat history
 
+        Returns:
+            True if a retrieval was done
+        """
+        if not rag_service or self.prefetched_contexts.ttl_seconds <= 0:
+            return False
+        # Dice roll submissions reuse the stored context
+        if not player_action_input and getattr(game_state, "_last_rag_context", None):
+            return False
+
+        query = self.extract_rag_query(player_action_input, messages)
+        if not query:
+            return False
+
+        future = self.prefetched_contexts.start(
+            self._prefetch_key(game_state),
+            self._prefetch_fingerprint(query, game_state),
+        )
+        if future is None:
+            logger.debug("RAG context already prefetched for this query")
+            return False
+        try:
+            future.set_result(
+                self._retrieve_rag_context(query, game_state, rag_service)
+            )
         except Exception as e:
-            logger.error(f"Error retrieving RAG context: {e}", exc_info=True)
-            # Clear stored context on error
-            if hasattr(game_state, "_last_rag_context"):
-                game_state._last_rag_context = None
+            logger.error(f"Error prefetching RAG context: {e}", exc_info=True)
+            future.set_exception(e)
+        return True
+
+    def _retrieve_rag_context(
+        self, query: str, game_state: GameStateModel, rag_service: IRAGService
+    ) -> str:
+        """Search the knowledge bases and format the results for the prompt."""
+        # Get content pack priority from game state
+        content_pack_priority = getattr(game_state, "content_pack_priority", None)
+        results = rag_service.get_relevant_knowledge(
+            query, game_state, content_pack_priority
+        )
+
+        # Stat blocks and rules of the combat, retrieved once per combat
+        combat_context = ""
+        if game_state.combat.is_active:
+            combat_knowledge = rag_service.get_combat_knowledge(
+                game_state, content_pack_priority
+            )
+            if combat_knowledge is not None:
+                combat_context = combat_knowledge.format_for_prompt()
+
+        if not results.has_results() and not combat_context:
+            logger.debug(f"No RAG context found for query: {query[:50]}...")
             return ""
 
+        # Format results for prompt inclusion
+        formatted_context = "\n\n".join(
+            section
+            for section in (combat_context, results.format_for_prompt())
+            if section
+        )
+
+        logger.info("=== LANGCHAIN RAG CONTEXT ===")
+        logger.info(f"Query: {query[:100]}{'...' if len(query) > 100 else ''}")
+        logger.info(
+            f"Retrieved {len(results.results)} results in {results.execution_time_ms:.1f}ms"
+        )
+        logger.info(f"Context preview: {formatted_context[:200]}...")
+        logger.info("=== END RAG CONTEXT ===")
+
+        return formatted_context
+
+    @staticmethod
+    def _prefetch_key(game_state: GameStateModel) -> str:
+        """Key of the campaign played in the current session."""
+        return f"{get_current_session_id() or 'default'}:{game_state.campaign_id}"
+
+    @staticmethod
+    def _prefetch_fingerprint(
+        query: str, game_state: GameStateModel
+    ) -> Tuple[Hashable, ...]:
+        """The query and the parts of the game state the retrieval depends on."""
+        return (
+            " ".join(query.split()),
+            game_state.current_location.name,
+            game_state.in_combat,
+            tuple(game_state.content_pack_priority),
+            game_state.active_lore_id,
+            tuple(
+                (combatant.id, combatant.name)
+                for combatant in game_state.combat.combatants
+            ),
+        )
+
     def clear_stored_rag_context(self, game_state: GameStateModel) -> None:
         """Clear stored RAG context when starting a new player action."""
         if hasattr(game_state, "_last_rag_context"):
@@ -4,19 +4,57 @@ Greatly simplified from the previous keyword-based approach.
 """
 
 import logging
+import threading
 import time
-from typing import Any, List, Optional
+import weakref
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 from app.core.ai_interfaces import IKnowledgeBase, IRAGService
+from app.core.session_context import get_current_session_id
+from app.models.combat.state import CombatStateModel
 from app.models.game_state.main import GameStateModel
-from app.models.rag import EventMetadataModel, QueryType, RAGQuery, RAGResults
+from app.models.rag import (
+    CombatKnowledgeModel,
+    EventMetadataModel,
+    KnowledgeResult,
+    QueryType,
+    RAGQuery,
+    RAGResults,
+)
 from app.settings import get_settings
 from app.utils.knowledge_loader import load_lore_info
 
+from .entity_gazetteer import EntityGazetteer, GazetteerEntity, normalize_name
 from .interfaces import IQueryEngine, IReranker
 
 logger = logging.getLogger(__name__)
 
+# Query context keys naming an entity, and the tables it is looked up in
+ENTITY_CONTEXT_TABLES: Dict[str, List[str]] = {
+    "spell_name": ["spells"],
+    "creature": ["monsters"],
+    "item": ["equipment", "magic_items"],
+    "class": ["classes"],
+    "race": ["races", "subraces"],
+}
+
+# Knowledge base searched for the entities of each table
+ENTITY_TABLE_KB_TYPES: Dict[str, str] = {
+    "spells": "spells",
+    "monsters": "monsters",
+    "equipment": "equipment",
+    "magic_items": "equipment",
+    "classes": "character_options",
+    "races": "character_options",
+    "subraces": "character_options",
+}
+
+# Rules searched once per combat, as part of its knowledge
+COMBAT_RULES_QUERIES = ("melee attack rules", "ranged attack rules")
+
+# (context key, normalized name)
+_NamedEntity = Tuple[str, str]
+
 
 class RAGService(IRAGService):
     """
@@ -31,8 +69,14 @@ class RAGService(IRAGService):
         kb_manager: Optional[IKnowledgeBase] = None,
         reranker: Optional[IReranker] = None,
         query_engine: Optional[IQueryEngine] = None,
+        gazetteer: Optional[EntityGazetteer] = None,
     ) -> None:
-        """Initialize the RAG service with optional repository dependencies."""
+        """Initialize the RAG service with optional repository dependencies.
+
+        With a gazetteer, entities named in the queries are fetched directly
+        instead of through a semantic search. In combat, the stat blocks of the
+        combatants and the combat rules are retrieved once per combat.
+        """
         # Mark unused parameters that are kept for interface compatibility
         _ = ruleset_repo
         _ = lore_repo
@@ -48,9 +92,15 @@ class RAGService(IRAGService):
 
         # Query engine will be injected by the container
         self._query_engine: Optional[IQueryEngine] = query_engine
+        self.gazetteer = gazetteer
         self.max_results_per_query = settings.rag.max_results_per_query
         self.max_total_results = settings.rag.max_total_results
         self.score_threshold = settings.rag.score_threshold
+        self.combat_knowledge_enabled = settings.rag.combat_knowledge_enabled
+        # A turn and the prefetch of the next one can fill the same knowledge,
+        # so it is filled under a lock per session (dropped once unused)
+        self._combat_knowledge_locks: "weakref.WeakValueDictionary[Optional[str], threading.Lock]" = weakref.WeakValueDictionary()
+        self._combat_knowledge_locks_guard = threading.Lock()
 
         # Repository dependencies (for future campaign-specific knowledge)
         self.game_state_repo = game_state_repo
@@ -139,9 +189,44 @@ class RAGService(IRAGService):
                     f"  Query {i + 1}: type={query.query_type}, text='{query.query_text}', context={query.context}"
                 )
 
-            # Execute semantic search for each query
-            all_results = []
-            seen_content = set()  # Track content to prevent duplicates
+            # The knowledge of the combat is retrieved once and added to the
+            # prompt on its own, so it is left out of the results
+            combat_knowledge = self.get_combat_knowledge(
+                game_state, content_pack_priority
+            )
+            combat_creatures: Set[str] = set()
+            combat_rules: Tuple[str, ...] = ()
+            if combat_knowledge is not None:
+                combat_creatures = {
+                    normalize_name(name) for name in combat_knowledge.creature_names()
+                }
+                if combat_knowledge.rules_retrieved:
+                    combat_rules = COMBAT_RULES_QUERIES
+
+            # Entities named in the queries are fetched directly
+            named = self._fetch_named_entities(
+                queries, content_pack_priority, combat_creatures
+            )
+            fetched_kb_types = {
+                ENTITY_TABLE_KB_TYPES.get(result.source, result.source)
+                for result in named.values()
+            }
+            if combat_creatures:
+                fetched_kb_types.add("monsters")
+            # A knowledge base still has to be searched for the named entities
+            # that could not be fetched
+            fetched_kb_types -= {
+                ENTITY_TABLE_KB_TYPES[table]
+                for query in queries
+                for key, name in self._named_entities(query)
+                if (key, name) not in named
+                and not (key == "creature" and name in combat_creatures)
+                for table in ENTITY_CONTEXT_TABLES[key]
+            }
+
+            # Execute semantic search for what is left of each query
+            all_results: List[KnowledgeResult] = []
+            seen_content: Set[str] = set()  # Track content to prevent duplicates
 
             for query in queries:
                 # Determine which knowledge bases to search
@@ -149,11 +234,23 @@ class RAGService(IRAGService):
                     query.knowledge_base_types if query.knowledge_base_types else None
                 )
 
+                fetched_names = set()
+                for key, name in self._named_entities(query):
+                    if key == "creature" and name in combat_creatures:
+                        fetched_names.add(name)
+                    elif (key, name) in named:
+                        fetched_names.add(name)
+                        self._add_results(
+                            [named[key, name]], query, seen_content, all_results
+                        )
+
                 # For spell queries, prioritize exact spell name matches
-                if query.query_type == QueryType.SPELL_CASTING and query.context.get(
-                    "spell_name"
+                spell_name = query.context.get("spell_name")
+                if (
+                    query.query_type == QueryType.SPELL_CASTING
+                    and spell_name
+                    and normalize_name(spell_name) not in fetched_names
                 ):
-                    spell_name = query.context["spell_name"]
                     # Search for the specific spell first
                     spell_results = self.kb_manager.search(
                         query=spell_name,  # Just the spell name for better matching
@@ -162,17 +259,13 @@ class RAGService(IRAGService):
                         score_threshold=0.1,  # Lower threshold for specific searches
                         content_pack_priority=content_pack_priority,
                     )
-                    for result in spell_results.results:
-                        content_key = f"{result.source}:{result.content[:100]}"
-                        if content_key not in seen_content:
-                            seen_content.add(content_key)
-                            # Add query context to metadata for reranking
-                            result.metadata["query_context"] = query.context
-                            all_results.append(result)
+                    self._add_results(
+                        spell_results.results, query, seen_content, all_results
+                    )
 
                 # For any queries with creatures (including spell casting), search for the creature
-                if query.context.get("creature"):
-                    creature_name = query.context["creature"]
+                creature_name = query.context.get("creature")
+                if creature_name and normalize_name(creature_name) not in fetched_names:
                     creature_results = self.kb_manager.search(
                         query=creature_name,  # Just the creature name
                         kb_types=["monsters"],
@@ -180,47 +273,46 @@ class RAGService(IRAGService):
                         score_threshold=0.1,
                         content_pack_priority=content_pack_priority,
                     )
-                    for result in creature_results.results:
-                        content_key = f"{result.source}:{result.content[:100]}"
-                        if content_key not in seen_content:
-                            seen_content.add(content_key)
-                            # Add query context to metadata for reranking
-                            result.metadata["query_context"] = query.context
-                            all_results.append(result)
+                    self._add_results(
+                        creature_results.results, query, seen_content, all_results
+                    )
 
                 # For character info queries, prioritize exact class/race name matches
                 if query.query_type == QueryType.CHARACTER_INFO:
-                    if query.context.get("class"):
-                        class_name = query.context["class"]
-                        class_results = self.kb_manager.search(
-                            query=class_name,
+                    for key in ("class", "race"):
+                        option = query.context.get(key)
+                        if not option or normalize_name(option) in fetched_names:
+                            continue
+                        option_results = self.kb_manager.search(
+                            query=option,
                             kb_types=["character_options"],
                             k=3,
                             score_threshold=0.1,
                             content_pack_priority=content_pack_priority,
                         )
-                        for result in class_results.results:
-                            content_key = f"{result.source}:{result.content[:100]}"
-                            if content_key not in seen_content:
-                                seen_content.add(content_key)
-                                result.metadata["query_context"] = query.context
-                                all_results.append(result)
-
-                    if query.context.get("race"):
-                        race_name = query.context["race"]
-                        race_results = self.kb_manager.search(
-                            query=race_name,
-                            kb_types=["character_options"],
-                            k=3,
-                            score_threshold=0.1,
-                            content_pack_priority=content_pack_priority,
+                        self._add_results(
+                            option_results.results, query, seen_content, all_results
                         )
-                        for result in race_results.results:
-                            content_key = f"{result.source}:{result.content[:100]}"
-                            if content_key not in seen_content:
-                                seen_content.add(content_key)
-                                result.metadata["query_context"] = query.context
-                                all_results.append(result)
+
+                if query.query_type == QueryType.GENERAL:
+                    # The fetched entities stand in for their knowledge bases
+                    # when every entity named from them was fetched
+                    if kb_types and fetched_kb_types:
+                        kb_types = [
+                            kb_type
+                            for kb_type in kb_types
+                            if kb_type not in fetched_kb_types
+                        ]
+                        if not kb_types:
+                            continue
+                elif normalize_name(query.query_text) in fetched_names:
+                    # The query was only the name of a fetched entity
+                    continue
+                elif (
+                    query.query_type == QueryType.COMBAT
+                    and query.query_text in combat_rules
+                ):
+                    continue
 
                 # Also perform the general semantic search
                 search_results = self.kb_manager.search(
@@ -230,15 +322,9 @@ class RAGService(IRAGService):
                     score_threshold=self.score_threshold,
                     content_pack_priority=content_pack_priority,
                 )
-
-                # Merge results with deduplication
-                for result in search_results.results:
-                    content_key = f"{result.source}:{result.content[:100]}"
-                    if content_key not in seen_content:
-                        seen_content.add(content_key)
-                        # Add query context to metadata for reranking
-                        result.metadata["query_context"] = query.context
-                        all_results.append(result)
+                self._add_results(
+                    search_results.results, query, seen_content, all_results
+                )
 
             # Apply reranking if available
             if self.reranker:
@@ -268,6 +354,193 @@ class RAGService(IRAGService):
             logger.error(f"Error in RAG knowledge retrieval: {e}", exc_info=True)
             return RAGResults(execution_time_ms=(time.time() - start_time) * 1000)
 
+    def _named_entities(self, query: RAGQuery) -> List[_NamedEntity]:
+        """(context key, normalized name) of the entities the query names."""
+        return [
+            (key, normalize_name(query.context[key]))
+            for key in ENTITY_CONTEXT_TABLES
+            if isinstance(query.context.get(key), str) and query.context[key]
+        ]
+
+    def _fetch_named_entities(
+        self,
+        queries: List[RAGQuery],
+        content_pack_priority: Optional[List[str]],
+        combat_creatures: Set[str],
+    ) -> Dict[_NamedEntity, KnowledgeResult]:
+        """Look the entities named in the queries up by name, and fetch them."""
+        if self.gazetteer is None:
+            return {}
+
+        found: Dict[_NamedEntity, GazetteerEntity] = {}
+        for query in queries:
+            for key, name in self._named_entities(query):
+                if key == "creature" and name in combat_creatures:
+                    continue
+                if (key, name) not in found:
+                    entity = self.gazetteer.lookup(
+                        name, ENTITY_CONTEXT_TABLES[key], content_pack_priority
+                    )
+                    if entity is not None:
+                        found[key, name] = entity
+        if not found:
+            return {}
+
+        fetched = {
+            (
+                result.metadata.get("table"),
+                result.metadata.get("index"),
+                result.metadata.get("content_pack_id"),
+            ): result
+            for result in self.kb_manager.get_entities(
+                [
+                    (entity.table, entity.index, entity.content_pack_id)
+                    for entity in found.values()
+                ]
+            )
+        }
+        named: Dict[_NamedEntity, KnowledgeResult] = {}
+        for named_entity, entity in found.items():
+            result = fetched.get((entity.table, entity.index, entity.content_pack_id))
+            # Entities that could not be fetched are searched for as before
+            if result is not None:
+                named[named_entity] = result
+        logger.debug(f"Fetched {len(named)} named entities without searching")
+        return named
+
+    def get_combat_knowledge(
+        self,
+        game_state: GameStateModel,
+        content_pack_priority: Optional[List[str]] = None,
+    ) -> Optional[CombatKnowledgeModel]:
+        """
+        Get the knowledge of the active combat, retrieving what is missing.
+
+        The stat blocks of the creatures fighting and the combat rules are
+        retrieved on the first call of a combat; later calls only retrieve the
+        creatures that joined since. The knowledge lives on the combat state,
+        so it is dropped when the combat ends. Filling it is serialized per
+        session, so a turn and the prefetch of the next one never retrieve the
+        same creature, while other sessions retrieve theirs concurrently.
+
+        Args:
+            game_state: Current game state
+            content_pack_priority: List of content pack IDs in priority order
+
+        Returns:
+            The combat knowledge, or None out of combat or when disabled
+        """
+        combat = getattr(game_state, "combat", None)
+        if (
+            not self.combat_knowledge_enabled
+            or not isinstance(combat, CombatStateModel)
+            or not combat.is_active
+        ):
+            return None
+
+        with self._combat_knowledge_lock():
+            knowledge = combat.knowledge
+            priority = list(content_pack_priority) if content_pack_priority else None
+            if knowledge.content_pack_priority != priority:
+                knowledge.reset(priority)
+            # Combats resumed from a save were not followed by the state updaters
+            knowledge.track_combatants(combat.combatants)
+
+            pending = knowledge.pending_creatures()
+            if not pending and knowledge.rules_retrieved:
+                return knowledge
+
+            start_time = time.time()
+            for creature in pending:
+                knowledge.set_creature(
+                    creature, self._retrieve_creature(creature, priority)
+                )
+            if not knowledge.rules_retrieved:
+                rules: List[KnowledgeResult] = []
+                seen_content: Set[str] = set()
+                for query_text in COMBAT_RULES_QUERIES:
+                    rule_results = self.kb_manager.search(
+                        query=query_text,
+                        kb_types=["rules"],
+                        k=self.max_results_per_query,
+                        score_threshold=self.score_threshold,
+                        content_pack_priority=priority,
+                    )
+                    for result in rule_results.results:
+                        content_key = f"{result.source}:{result.content[:100]}"
+                        if content_key not in seen_content:
+                            seen_content.add(content_key)
+                            rules.append(result)
+                knowledge.set_rules(rules)
+            logger.info(
+                f"Retrieved combat knowledge for {len(pending)} new creatures in "
+                f"{(time.time() - start_time) * 1000:.1f}ms"
+            )
+        return knowledge
+
+    def _combat_knowledge_lock(self) -> threading.Lock:
+        """Lock serializing the filling of the current session's combat knowledge."""
+        session_id = get_current_session_id()
+        with self._combat_knowledge_locks_guard:
+            lock = self._combat_knowledge_locks.get(session_id)
+            if lock is None:
+                lock = threading.Lock()
+                self._combat_knowledge_locks[session_id] = lock
+            return lock
+
+    def _retrieve_creature(
+        self, creature: str, content_pack_priority: Optional[List[str]]
+    ) -> List[KnowledgeResult]:
+        """Stat block of a creature fighting, fetched by name when possible."""
+        if self.gazetteer is not None:
+            entity = self.gazetteer.lookup(
+                creature, ["monsters"], content_pack_priority
+            )
+            if entity is None:
+                # "Goblin Raider", "Grukk the goblin chief"
+                named = next(
+                    (
+                        match.entity
+                        for match in self.gazetteer.find(creature)
+                        if match.entity.table == "monsters"
+                    ),
+                    None,
+                )
+                if named is not None:
+                    entity = self.gazetteer.lookup(
+                        named.name, ["monsters"], content_pack_priority
+                    )
+            if entity is not None:
+                results = self.kb_manager.get_entities(
+                    [(entity.table, entity.index, entity.content_pack_id)]
+                )
+                if results:
+                    return results
+
+        return self.kb_manager.search(
+            query=creature,
+            kb_types=["monsters"],
+            k=1,
+            score_threshold=self.score_threshold,
+            content_pack_priority=content_pack_priority,
+        ).results
+
+    def _add_results(
+        self,
+        results: List[KnowledgeResult],
+        query: RAGQuery,
+        seen_content: Set[str],
+        all_results: List[KnowledgeResult],
+    ) -> None:
+        """Merge results with deduplication."""
+        for result in results:
+            content_key = f"{result.source}:{result.content[:100]}"
+            if content_key not in seen_content:
+                seen_content.add(content_key)
+                # Add query context to metadata for reranking
+                result.metadata["query_context"] = query.context
+                all_results.append(result)
+
     def analyze_action(self, action: str, game_state: GameStateModel) -> List[RAGQuery]:
         """
         Analyze a player action and generate relevant queries.
@@ -10,6 +10,8 @@ from typing import Dict, List, Optional, Tuple
 from app.models.dice import DiceRequestModel
 from app.models.game_state.main import GameStateModel
 from app.models.rag import (
+    CombatKnowledgeModel,
+    KnowledgeResult,
     LoreDataModel,
     RAGQuery,
     RAGResults,
@@ -60,6 +62,22 @@ class IRAGService(ABC):
         """Analyze a player action and generate relevant RAG queries."""
         pass
 
+    def get_combat_knowledge(
+        self,
+        game_state: GameStateModel,
+        content_pack_priority: Optional[List[str]] = None,
+    ) -> Optional[CombatKnowledgeModel]:
+        """Get the knowledge of the active combat, retrieving what is missing.
+
+        Args:
+            game_state: Current game state
+            content_pack_priority: List of content pack IDs in priority order
+
+        Returns:
+            The combat knowledge, or None out of combat or if not supported
+        """
+        return None
+
 
 class IKnowledgeBase(ABC):
     """Protocol for knowledge base managers."""
@@ -87,6 +105,20 @@ class IKnowledgeBase(ABC):
         """
         pass
 
+    def get_entities(
+        self, entities: List[Tuple[str, str, str]]
+    ) -> List[KnowledgeResult]:
+        """Fetch known entities directly, without searching.
+
+        Args:
+            entities: (table, index, content_pack_id) of each entity
+
+        Returns:
+            Results for the entities found, at full relevance; knowledge
+            bases that cannot fetch entities return none
+        """
+        return []
+
     @abstractmethod
     def add_campaign_lore(self, campaign_id: str, lore_data: LoreDataModel) -> None:
         """Add campaign-specific lore."""
@@ -29,6 +29,12 @@ from app.core.repository_interfaces import (
     ICharacterTemplateRepository,
     IGameStateRepository,
 )
+from app.core.sqlite_backend import (
+    SqliteEventQueue,
+    SqliteSharedStateStore,
+    SqliteStateDatabase,
+)
+from app.core.system_interfaces import IEventQueue
 from app.domain.campaigns.campaign_factory import CampaignFactory
 from app.domain.campaigns.campaign_service import CampaignService
 from app.domain.characters.character_factory import CharacterFactory
@@ -74,9 +80,13 @@ from app.services.event_handlers.next_step_handler import NextStepHandler
 from app.services.event_handlers.player_action_handler import PlayerActionHandler
 from app.services.event_handlers.retry_handler import RetryHandler
 from app.services.game_orchestrator import GameOrchestrator
+from app.services.history_summarizer import HistorySummarizer
+from app.services.prompt_prefetcher import PromptPrefetcher
+from app.services.session_registry import SessionRegistry
 from app.services.shared_state_manager import SharedStateManager
 from app.services.tts_integration_service import TTSIntegrationService
 from app.settings import Settings, get_settings
+from app.utils.save_serializer import SaveSerializer
 
 logger = logging.getLogger(__name__)
 
@@ -103,13 +113,14 @@ class ServiceContainer:
 
         logger.info("Initializing service container...")
 
+        # Shared state database, used when state is shared between workers
+        self._state_database: Optional[SqliteStateDatabase] = None
+
         # Create event queue (needed by many services)
-        self._event_queue = EventQueue(
-            maxsize=self.settings.system.event_queue_max_size
-        )
+        self._event_queue = self._create_event_queue()
 
         # Create shared state manager
-        self._shared_state_manager = SharedStateManager()
+        self._shared_state_manager = self._create_shared_state_manager()
 
         # Create AI service early (needed by many services)
         self._ai_service = self._create_ai_service()
@@ -129,6 +140,10 @@ class ServiceContainer:
         # Create TTS Service first (needed by chat service)
         self._tts_service = self._create_tts_service()
         self._tts_integration_service = self._create_tts_integration_service()
+        self._tts_integration_service.warm_up_if_enabled()
+
+        # Create session registry (per-session locks and idle eviction)
+        self._session_registry = self._create_session_registry()
 
         # Create content service (manages all D&D 5e content)
         self._content_service = self._create_content_service()
@@ -160,10 +175,12 @@ class ServiceContainer:
 
         # Create RAG service (may use D5e services)
         self._rag_service = self._create_rag_service()
+        self._history_summarizer = self._create_history_summarizer()
 
         # Create higher-level services
         self._ai_response_processor = self._create_ai_response_processor()
         self._game_orchestrator = self._create_game_orchestrator()
+        self._prompt_prefetcher = self._create_prompt_prefetcher()
 
         # Validate database at the end
         self._validate_database()
@@ -208,6 +225,12 @@ class ServiceContainer:
 
     def cleanup(self) -> None:
         """Clean up resources held by the container."""
+        if hasattr(self, "_session_registry") and self._session_registry is not None:
+            self._session_registry.close()
+            self._session_registry.evict_all()
+            logger.info("Persisted active game sessions")
+        if hasattr(self, "_game_state_repo") and self._game_state_repo is not None:
+            self._game_state_repo.flush()
         if hasattr(self, "_database_manager") and self._database_manager is not None:
             self._database_manager.dispose()
             logger.info("Disposed database connections")
@@ -289,7 +312,7 @@ class ServiceContainer:
         self._ensure_initialized()
         return self._rag_service
 
-    def get_event_queue(self) -> EventQueue:
+    def get_event_queue(self) -> IEventQueue:
         """Get the event queue."""
         self._ensure_initialized()
         return self._event_queue
@@ -299,6 +322,11 @@ class ServiceContainer:
         self._ensure_initialized()
         return self._shared_state_manager
 
+    def get_session_registry(self) -> SessionRegistry:
+        """Get the registry of active game sessions."""
+        self._ensure_initialized()
+        return self._session_registry
+
     def get_content_service(self) -> ContentService:
         """Get the content service for D&D 5e operations.
 
@@ -327,6 +355,16 @@ class ServiceContainer:
         self._ensure_initialized()
         return self._indexing_service
 
+    def get_history_summarizer(self) -> Optional[HistorySummarizer]:
+        """Get the history summarizer (None unless summarization is enabled)."""
+        self._ensure_initialized()
+        return self._history_summarizer
+
+    def get_prompt_prefetcher(self) -> PromptPrefetcher:
+        """Get the prefetcher preparing prompts while players act."""
+        self._ensure_initialized()
+        return self._prompt_prefetcher
+
     def get_ai_service(self) -> Optional[BaseAIService]:
         """Get the AI service.
 
@@ -341,6 +379,30 @@ class ServiceContainer:
         if not self._initialized:
             self.initialize()
 
+    def _get_state_database(self) -> SqliteStateDatabase:
+        """Get the SQLite database shared between workers, opening it once."""
+        if self._state_database is None:
+            self._state_database = SqliteStateDatabase(
+                self.settings.storage.state_db_path,
+                busy_timeout_ms=self.settings.database.sqlite_busy_timeout,
+            )
+        return self._state_database
+
+    def _create_event_queue(self) -> IEventQueue:
+        """Create the event queue."""
+        maxsize = self.settings.system.event_queue_max_size
+        if self.settings.storage.shared_state_backend == "sqlite":
+            return SqliteEventQueue(self._get_state_database(), maxsize=maxsize)
+        return EventQueue(maxsize=maxsize)
+
+    def _create_shared_state_manager(self) -> SharedStateManager:
+        """Create the shared state manager."""
+        if self.settings.storage.shared_state_backend == "sqlite":
+            return SharedStateManager(
+                SqliteSharedStateStore(self._get_state_database())
+            )
+        return SharedStateManager()
+
     def _create_database_manager(self) -> DualDatabaseManager:
         """Create the dual database manager."""
         # System database URL (read-only)
@@ -385,17 +447,39 @@ class ServiceContainer:
         """Create the game state repository."""
         repo_type = self.settings.storage.game_state_repo_type
         base_save_dir = self.settings.storage.saves_dir
+        serializer = SaveSerializer.from_settings(self.settings)
 
         if repo_type == "file":
             return GameStateRepositoryFactory.create_repository(
-                "file", base_save_dir=base_save_dir
+                "file",
+                base_save_dir=base_save_dir,
+                serializer=serializer,
+                write_behind_delay=self.settings.storage.save_write_behind_delay,
+            )
+        elif repo_type == "sqlite":
+            return GameStateRepositoryFactory.create_repository(
+                "sqlite",
+                base_save_dir=base_save_dir,
+                database=self._get_state_database(),
             )
         else:
             # For in-memory repo, we'll set campaign_service later to avoid circular dependency
             return GameStateRepositoryFactory.create_repository(
-                "memory", base_save_dir=base_save_dir
+                "memory", base_save_dir=base_save_dir, serializer=serializer
             )
 
+    def _create_session_registry(self) -> SessionRegistry:
+        """Create the game session registry."""
+        return SessionRegistry(
+            self._game_state_repo,
+            self._event_queue,
+            self._shared_state_manager,
+            idle_timeout=self.settings.storage.session_idle_timeout,
+            sweep_interval=self.settings.storage.session_sweep_interval,
+            tts_integration_service=self._tts_integration_service,
+            max_sessions=self.settings.storage.session_max_active,
+        )
+
     # Campaign repository removed - using campaign template repository instead
 
     def _create_character_template_repository(self) -> ICharacterTemplateRepository:
@@ -504,7 +588,13 @@ class ServiceContainer:
 
     def _create_tts_integration_service(self) -> TTSIntegrationService:
         """Create the TTS integration service."""
-        return TTSIntegrationService(self._tts_service, self._game_state_repo)
+        return TTSIntegrationService(
+            self._tts_service,
+            self._game_state_repo,
+            self._event_queue,
+            max_workers=self.settings.tts.workers,
+            stream_segments=self.settings.tts.stream_segments,
+        )
 
     def _create_ai_response_processor(self) -> IAIResponseProcessor:
         """Create the AI response processor."""
@@ -595,7 +685,15 @@ class ServiceContainer:
             from app.content.rag.rerankers import EntityMatchReranker
 
             # Create shared components
-            query_engine = SimpleQueryEngine()
+            gazetteer = None
+            if self.settings.rag.entity_gazetteer_enabled:
+                from app.content.rag.entity_gazetteer import EntityGazetteer
+
+                gazetteer = EntityGazetteer(
+                    self._database_manager,
+                    refresh_interval=self.settings.rag.entity_refresh_seconds,
+                )
+            query_engine = SimpleQueryEngine(gazetteer=gazetteer)
             reranker = (
                 EntityMatchReranker()
             )  # Using EntityMatchReranker to preserve existing behavior
@@ -618,6 +716,7 @@ class ServiceContainer:
                     kb_manager=d5e_kb_manager,
                     reranker=reranker,
                     query_engine=query_engine,
+                    gazetteer=gazetteer,
                 )
 
                 logger.info("D5e database-backed RAG service initialized successfully")
@@ -635,6 +734,7 @@ class ServiceContainer:
                     kb_manager=db_kb_manager,
                     reranker=reranker,
                     query_engine=query_engine,
+                    gazetteer=gazetteer,
                 )
                 logger.info(
                     "Standard database-backed RAG service initialized successfully"
@@ -676,6 +776,7 @@ class ServiceContainer:
             dice_submission_handler,
             next_step_handler,
             retry_handler,
+            self._session_registry,
         )
 
     def _create_content_service(self) -> ContentService:
@@ -709,6 +810,7 @@ class ServiceContainer:
             self._campaign_service,
             self._event_queue,
             self._rag_service,
+            self._history_summarizer,
         )
 
     def _create_dice_submission_handler(self) -> DiceSubmissionHandler:
@@ -723,6 +825,7 @@ class ServiceContainer:
             self._campaign_service,
             self._event_queue,
             self._rag_service,
+            self._history_summarizer,
         )
 
     def _create_next_step_handler(self) -> NextStepHandler:
@@ -737,6 +840,7 @@ class ServiceContainer:
             self._campaign_service,
             self._event_queue,
             self._rag_service,
+            self._history_summarizer,
         )
 
     def _create_retry_handler(self) -> RetryHandler:
@@ -751,6 +855,31 @@ class ServiceContainer:
             self._campaign_service,
             self._event_queue,
             self._rag_service,
+            self._history_summarizer,
+        )
+
+    def _create_history_summarizer(self) -> Optional[HistorySummarizer]:
+        """Create the background history summarizer, if enabled."""
+        if not self.settings.prompt.history_summarization:
+            return None
+        from app.providers.ai.manager import get_summary_ai_service
+
+        summary_ai_service = get_summary_ai_service(self.settings, self._ai_service)
+        if summary_ai_service is None:
+            logger.warning("History summarization is enabled but no AI is available")
+            return None
+        return HistorySummarizer(
+            summary_ai_service,
+            segment_size=self.settings.prompt.history_chunk_size,
+            max_blocks=self.settings.prompt.history_summary_max_blocks,
+        )
+
+    def _create_prompt_prefetcher(self) -> PromptPrefetcher:
+        """Create the prompt prefetcher, building prompts like player actions."""
+        return PromptPrefetcher(
+            self._game_state_repo,
+            self._create_player_action_handler(),
+            self._shared_state_manager,
         )
 
     def _create_ai_service(self) -> Optional[BaseAIService]:
@@ -8,6 +8,7 @@ import threading
 import uuid
 from typing import Callable, Dict, List, Optional
 
+from app.core.session_context import get_current_session_id
 from app.core.system_interfaces import IEventQueue
 from app.models.events.base import BaseGameEvent
 
@@ -17,6 +18,10 @@ logger = logging.getLogger(__name__)
 class EventQueue(IEventQueue):
     """Thread-safe FIFO queue for game update events.
 
+    Each game session gets its own event stream. Events are routed to the
+    session bound to the calling context (see app.core.session_context), and
+    callers without a session share the default stream.
+
     Implements IEventQueue interface.
     """
 
@@ -25,13 +30,28 @@ class EventQueue(IEventQueue):
         Initialize the event queue.
 
         Args:
-            maxsize: Maximum queue size (0 for unlimited)
+            maxsize: Maximum queue size per session (0 for unlimited)
         """
-        self._queue: queue.Queue[BaseGameEvent] = queue.Queue(maxsize=maxsize)
+        self._maxsize = maxsize
+        self._queues: Dict[Optional[str], queue.Queue[BaseGameEvent]] = {
+            None: queue.Queue(maxsize=maxsize)
+        }
         self._lock = threading.RLock()
         self._subscribers: Dict[str, Callable[[BaseGameEvent], None]] = {}
         self._all_subscribers: List[Callable[[BaseGameEvent], None]] = []
 
+    @property
+    def _queue(self) -> queue.Queue[BaseGameEvent]:
+        """The event stream of the session bound to the current context."""
+        session_id = get_current_session_id()
+        session_queue = self._queues.get(session_id)
+        if session_queue is None:
+            with self._lock:
+                session_queue = self._queues.setdefault(
+                    session_id, queue.Queue(maxsize=self._maxsize)
+                )
+        return session_queue
+
     def put_event(self, event: BaseGameEvent) -> None:
         """
         Add an event to the queue.
@@ -87,7 +107,7 @@ class EventQueue(IEventQueue):
         """Clear all events from the queue."""
         with self._lock:
             # Create new queue to clear
-            self._queue = queue.Queue(maxsize=self._queue.maxsize)
+            self._queues[get_current_session_id()] = queue.Queue(maxsize=self._maxsize)
             logger.info("Event queue cleared")
 
     def peek(self) -> Optional[BaseGameEvent]:
@@ -98,11 +118,12 @@ class EventQueue(IEventQueue):
             The next event or None if empty
         """
         with self._lock:
+            session_queue = self._queue
             try:
                 # Get the item
-                item = self._queue.get_nowait()
+                item = session_queue.get_nowait()
                 # Put it back immediately
-                self._queue.put(item)
+                session_queue.put(item)
                 return item
             except queue.Empty:
                 return None
@@ -125,3 +146,12 @@ class EventQueue(IEventQueue):
             handler = self._subscribers.pop(subscription_id, None)
             if handler and handler in self._all_subscribers:
                 self._all_subscribers.remove(handler)
+
+    def drop_session(self, session_id: str) -> None:
+        """Discard the event stream of a session that is no longer active."""
+        with self._lock:
+            dropped = self._queues.pop(session_id, None)
+        if dropped is not None and not dropped.empty():
+            logger.info(
+                f"Dropped {dropped.qsize()} undelivered events for session '{session_id}'"
+            )
@@ -4,8 +4,9 @@ This module defines interfaces for external services like
 text-to-speech and other third-party integrations.
 """
 
+import threading
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Callable, List, Optional
 
 from app.models.utils import VoiceInfoModel
 
@@ -22,6 +23,36 @@ class ITTSService(ABC):
         """
         pass
 
+    def synthesize_speech_segments(
+        self,
+        text: str,
+        voice_id: str,
+        on_segment: Callable[[int, str], None],
+        cancel: Optional[threading.Event] = None,
+    ) -> Optional[str]:
+        """
+        Synthesizes speech sentence by sentence, for playback to start early.
+        Calls on_segment(index, path) with the audio of each segment as soon as
+        it is ready, then returns the path to the audio of the whole text like
+        synthesize_speech. Services that cannot stream report the whole audio
+        as a single segment. Once cancel is set, synthesis stops as soon as
+        possible and None is returned.
+        """
+        if cancel is not None and cancel.is_set():
+            return None
+        audio_path = self.synthesize_speech(text, voice_id)
+        if audio_path:
+            on_segment(0, audio_path)
+        return audio_path
+
+    def warm_up(self) -> None:
+        """Starts loading the model ahead of the first request, if supported."""
+        pass
+
+    def close(self) -> None:
+        """Releases the resources of the service (workers, models)."""
+        pass
+
     @abstractmethod
     def get_available_voices(
         self, lang_code: Optional[str] = None
@@ -51,6 +82,11 @@ class ITTSIntegrationService(ABC):
         """Enable/disable narration for the current game session."""
         pass
 
+    @abstractmethod
+    def warm_up_if_enabled(self) -> None:
+        """Start loading the TTS model if narration is enabled."""
+        pass
+
     @abstractmethod
     def generate_tts_for_message(
         self, message_content: str, message_id: str
@@ -26,6 +26,13 @@ class IPlayerActionHandler(ABC):
         """
         pass
 
+    @abstractmethod
+    async def ahandle(
+        self, action_data: PlayerActionEventModel
+    ) -> GameEventResponseModel:
+        """Async variant of handle that does not block a thread on AI calls."""
+        pass
+
 
 class IDiceSubmissionHandler(ABC):
     """Interface for handling dice submissions."""
@@ -56,6 +63,20 @@ class IDiceSubmissionHandler(ABC):
         """
         pass
 
+    @abstractmethod
+    async def ahandle(
+        self, rolls: List[DiceRollSubmissionModel]
+    ) -> GameEventResponseModel:
+        """Async variant of handle that does not block a thread on AI calls."""
+        pass
+
+    @abstractmethod
+    async def ahandle_completed_rolls(
+        self, results: List[DiceRollResultResponseModel]
+    ) -> GameEventResponseModel:
+        """Async variant of handle_completed_rolls."""
+        pass
+
 
 class INextStepHandler(ABC):
     """Interface for handling next step triggers."""
@@ -69,6 +90,11 @@ class INextStepHandler(ABC):
         """
         pass
 
+    @abstractmethod
+    async def ahandle(self) -> GameEventResponseModel:
+        """Async variant of handle that does not block a thread on AI calls."""
+        pass
+
 
 class IRetryHandler(ABC):
     """Interface for handling retry requests."""
@@ -81,3 +107,8 @@ class IRetryHandler(ABC):
             Game event response
         """
         pass
+
+    @abstractmethod
+    async def ahandle(self) -> GameEventResponseModel:
+        """Async variant of handle that does not block a thread on AI calls."""
+        pass
@@ -10,6 +10,7 @@ from typing import Any, List, Optional, Protocol, TypeVar
 
 from pydantic import BaseModel
 
+from app.models.api import PersistenceStatusResponse
 from app.models.campaign.instance import CampaignInstanceModel
 from app.models.campaign.template import CampaignTemplateModel
 from app.models.character.instance import CharacterInstanceModel
@@ -234,6 +235,35 @@ class IGameStateRepository(ABC):
         """Load a specific campaign's game state."""
         pass
 
+    @abstractmethod
+    def evict_session(self, session_id: str) -> bool:
+        """Persist a session's active state to disk and release it from memory.
+
+        The session's state is restored from its campaign save the next time
+        the session is accessed.
+
+        Args:
+            session_id: The session to evict
+
+        Returns:
+            True if the session had state in memory, False otherwise
+        """
+        pass
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Write any saves that have not reached durable storage yet.
+
+        Repositories that persist synchronously have nothing to flush.
+
+        Returns:
+            True if every save reached storage before the timeout
+        """
+        return True
+
+    def get_persistence_status(self) -> PersistenceStatusResponse:
+        """Report how saves are persisted and how far storage lags behind."""
+        return PersistenceStatusResponse(mode="sync")
+
 
 class ID5eRepository(Protocol[TModel]):
     """Protocol for D&D 5e data repositories.
@@ -0,0 +1,63 @@
+"""
+Session context tracking for serving several game tables from one process.
+
+The active game session is carried in a context variable so that services
+which were written for a single table (repositories, event queue, shared
+state) can scope their data to the session that issued the current request.
+``asyncio.to_thread`` copies the context, so handlers running in the thread
+pool see the same session as the request that dispatched them.
+
+A session id of ``None`` is the default session, which preserves the original
+single-table behavior for clients that never send a session id.
+"""
+
+import re
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Iterator, Optional
+
+# Session ids are chosen by clients, so keep them to a conservative charset
+SESSION_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+_current_session_id: ContextVar[Optional[str]] = ContextVar(
+    "current_session_id", default=None
+)
+
+
+def is_valid_session_id(session_id: str) -> bool:
+    """Check whether a client supplied session id is acceptable."""
+    return bool(SESSION_ID_PATTERN.match(session_id))
+
+
+def get_current_session_id() -> Optional[str]:
+    """Get the session id bound to the current context (None for default)."""
+    return _current_session_id.get()
+
+
+def set_current_session_id(session_id: Optional[str]) -> Token[Optional[str]]:
+    """Bind a session id to the current context.
+
+    Returns:
+        Token that must be passed to reset_current_session_id()
+
+    Raises:
+        ValueError: If the session id is not acceptable
+    """
+    if session_id is not None and not is_valid_session_id(session_id):
+        raise ValueError(f"Invalid session id: {session_id!r}")
+    return _current_session_id.set(session_id)
+
+
+def reset_current_session_id(token: Token[Optional[str]]) -> None:
+    """Restore the session id that was active before set_current_session_id()."""
+    _current_session_id.reset(token)
+
+
+@contextmanager
+def session_scope(session_id: Optional[str]) -> Iterator[None]:
+    """Run a block of code on behalf of the given session."""
+    token = set_current_session_id(session_id)
+    try:
+        yield
+    finally:
+        reset_current_session_id(token)
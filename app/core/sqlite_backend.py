@@ -0,0 +1,347 @@
+"""
+SQLite (WAL mode) backend for sharing runtime state between worker processes.
+
+Running several uvicorn workers on one host requires the event bus and the
+per-session flags to live outside process memory. This module provides
+implementations of IEventQueue and ISharedStateStore on top of a single SQLite
+database in WAL mode, which allows concurrent readers alongside one writer and
+works across processes without an external broker. The game state repository
+counterpart is SqliteGameStateRepository.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from app.core.session_context import get_current_session_id
+from app.core.system_interfaces import IEventQueue, ISharedStateStore
+from app.models.events.base import BaseGameEvent
+from app.models.events.event_utils import get_event_class_by_type
+from app.models.events.game_events import SharedSessionStateModel
+
+logger = logging.getLogger(__name__)
+
+# How often a blocking get_event() polls the database for new events
+EVENT_POLL_INTERVAL = 0.05
+
+# The default session is stored under an empty key since NULL keys do not compare
+DEFAULT_SESSION_KEY = ""
+
+# Seconds after which shared rows nobody touched are removed. Evicting a session
+# from one worker must not delete rows another worker still serves, so shared
+# rows only expire by age.
+SHARED_ROW_MAX_AGE = 24 * 3600.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS session_states (
+    session_key TEXT PRIMARY KEY,
+    campaign_id TEXT,
+    version INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS campaign_states (
+    campaign_id TEXT PRIMARY KEY,
+    version INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS shared_flags (
+    session_key TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_key TEXT NOT NULL,
+    event_type TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_events_session ON events (session_key, id);
+"""
+
+
+def session_key(session_id: Optional[str]) -> str:
+    """Map a session id to its database key."""
+    return session_id if session_id is not None else DEFAULT_SESSION_KEY
+
+
+class SqliteStateDatabase:
+    """Connection management for the shared state database.
+
+    Each thread gets its own connection; SQLite serializes writers across
+    threads and processes using the busy timeout.
+    """
+
+    def __init__(self, path: str, busy_timeout_ms: int = 5000) -> None:
+        self.path = path
+        self.busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.connection().executescript(_SCHEMA)
+        logger.info(f"Shared state database ready at {path}")
+
+    def connection(self) -> sqlite3.Connection:
+        """Get the calling thread's connection, opening it on first use."""
+        conn: Optional[sqlite3.Connection] = getattr(self._local, "conn", None)
+        if conn is None:
+            # Autocommit mode; write transactions are opened explicitly
+            conn = sqlite3.connect(
+                self.path,
+                timeout=self.busy_timeout_ms / 1000,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run statements in a write transaction (BEGIN IMMEDIATE)."""
+        conn = self.connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        else:
+            conn.execute("COMMIT")
+
+
+class SqliteSharedStateStore(ISharedStateStore):
+    """Stores per-session processing flags and retry context in SQLite."""
+
+    def __init__(
+        self, database: SqliteStateDatabase, max_age: float = SHARED_ROW_MAX_AGE
+    ) -> None:
+        self.database = database
+        self.max_age = max_age
+
+    def load(self, session_id: Optional[str]) -> Optional[SharedSessionStateModel]:
+        row = (
+            self.database.connection()
+            .execute(
+                "SELECT data FROM shared_flags WHERE session_key = ?",
+                (session_key(session_id),),
+            )
+            .fetchone()
+        )
+        if row is None:
+            return None
+        return SharedSessionStateModel.model_validate_json(row[0])
+
+    def save(self, session_id: Optional[str], state: SharedSessionStateModel) -> None:
+        with self.database.transaction() as conn:
+            conn.execute(
+                "INSERT INTO shared_flags (session_key, data, updated_at) "
+                "VALUES (?, ?, ?) ON CONFLICT(session_key) DO UPDATE SET "
+                "data = excluded.data, updated_at = excluded.updated_at",
+                (session_key(session_id), state.model_dump_json(), time.time()),
+            )
+
+    def try_set_ai_processing(self, session_id: Optional[str]) -> bool:
+        key = session_key(session_id)
+        now = time.time()
+        with self.database.transaction() as conn:
+            conn.execute(
+                "INSERT INTO shared_flags (session_key, data, updated_at) "
+                "VALUES (?, ?, ?) ON CONFLICT(session_key) DO NOTHING",
+                (key, SharedSessionStateModel().model_dump_json(), now),
+            )
+            cursor = conn.execute(
+                "UPDATE shared_flags SET "
+                "data = json_set(data, '$.ai_processing', json('true')), "
+                "updated_at = ? WHERE session_key = ? "
+                "AND NOT json_extract(data, '$.ai_processing')",
+                (now, key),
+            )
+            return cursor.rowcount == 1
+
+    def delete(self, session_id: Optional[str]) -> None:
+        with self.database.transaction() as conn:
+            conn.execute(
+                "DELETE FROM shared_flags WHERE session_key = ?",
+                (session_key(session_id),),
+            )
+
+    def release(self, session_id: Optional[str]) -> None:
+        # Other workers may still serve the session; only expire stale rows
+        with self.database.transaction() as conn:
+            cursor = conn.execute(
+                "DELETE FROM shared_flags WHERE updated_at < ?",
+                (time.time() - self.max_age,),
+            )
+        if cursor.rowcount:
+            logger.info(f"Expired the shared flags of {cursor.rowcount} sessions")
+
+    def clear(self) -> None:
+        with self.database.transaction() as conn:
+            conn.execute("DELETE FROM shared_flags")
+
+
+class SqliteEventQueue(IEventQueue):
+    """Event bus backed by SQLite so every worker can deliver every event.
+
+    Events are appended to a table and removed when read, giving the same
+    per-session FIFO semantics as EventQueue. Delivered events are restamped
+    with the row id as sequence number, which is ordered across workers.
+    Subscribers registered with subscribe_all() are local to this process.
+    """
+
+    def __init__(
+        self,
+        database: SqliteStateDatabase,
+        maxsize: int = 0,
+        max_age: float = SHARED_ROW_MAX_AGE,
+    ) -> None:
+        self.database = database
+        self._maxsize = maxsize
+        self.max_age = max_age
+        self._lock = threading.RLock()
+        self._subscribers: Dict[str, Callable[[BaseGameEvent], None]] = {}
+        self._all_subscribers: List[Callable[[BaseGameEvent], None]] = []
+
+    def _key(self) -> str:
+        return session_key(get_current_session_id())
+
+    def put_event(self, event: BaseGameEvent) -> None:
+        key = self._key()
+        with self.database.transaction() as conn:
+            if self._maxsize > 0:
+                (count,) = conn.execute(
+                    "SELECT COUNT(*) FROM events WHERE session_key = ?", (key,)
+                ).fetchone()
+                if count >= self._maxsize:
+                    logger.error(
+                        f"Event queue is full, dropping event: {event.event_type}"
+                    )
+                    return
+            conn.execute(
+                "INSERT INTO events (session_key, event_type, payload, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, event.event_type, event.model_dump_json(), time.time()),
+            )
+
+        # Notify local subscribers
+        with self._lock:
+            for subscriber in self._all_subscribers:
+                try:
+                    subscriber(event)
+                except Exception as e:
+                    logger.error(f"Subscriber error: {e}")
+
+    def emit(self, event: BaseGameEvent) -> None:
+        """Alias for put_event for compatibility."""
+        self.put_event(event)
+
+    def get_event(
+        self, block: bool = True, timeout: Optional[float] = None
+    ) -> Optional[BaseGameEvent]:
+        key = self._key()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            row = self._pop(key)
+            if row is not None:
+                return self._deserialize(*row)
+            if not block:
+                return None
+            if deadline is not None and time.monotonic() >= deadline:
+                return None
+            time.sleep(EVENT_POLL_INTERVAL)
+
+    def _pop(self, key: str) -> Optional[Tuple[int, str, str]]:
+        """Atomically remove and return the oldest event of a session."""
+        # Idle polls only read, so they do not take the writer lock
+        pending = (
+            self.database.connection()
+            .execute("SELECT id FROM events WHERE session_key = ? LIMIT 1", (key,))
+            .fetchone()
+        )
+        if pending is None:
+            return None
+        with self.database.transaction() as conn:
+            row = conn.execute(
+                "DELETE FROM events WHERE id = (SELECT id FROM events "
+                "WHERE session_key = ? ORDER BY id LIMIT 1) "
+                "RETURNING id, event_type, payload",
+                (key,),
+            ).fetchone()
+        return None if row is None else (row[0], row[1], row[2])
+
+    def _deserialize(
+        self, row_id: int, event_type: str, payload: str
+    ) -> Optional[BaseGameEvent]:
+        event_class = get_event_class_by_type(event_type) or BaseGameEvent
+        try:
+            event = event_class.model_validate_json(payload)
+        except Exception as e:
+            logger.error(f"Failed to decode {event_type} event {row_id}: {e}")
+            return None
+        event.sequence_number = row_id
+        return event
+
+    def qsize(self) -> int:
+        (count,) = (
+            self.database.connection()
+            .execute(
+                "SELECT COUNT(*) FROM events WHERE session_key = ?", (self._key(),)
+            )
+            .fetchone()
+        )
+        return int(count)
+
+    def clear(self) -> None:
+        with self.database.transaction() as conn:
+            conn.execute("DELETE FROM events WHERE session_key = ?", (self._key(),))
+        logger.info("Event queue cleared")
+
+    def peek(self) -> Optional[BaseGameEvent]:
+        row = (
+            self.database.connection()
+            .execute(
+                "SELECT id, event_type, payload FROM events "
+                "WHERE session_key = ? ORDER BY id LIMIT 1",
+                (self._key(),),
+            )
+            .fetchone()
+        )
+        return None if row is None else self._deserialize(row[0], row[1], row[2])
+
+    def is_empty(self) -> bool:
+        return self.qsize() == 0
+
+    def subscribe_all(self, handler: Callable[[BaseGameEvent], None]) -> str:
+        subscription_id = str(uuid.uuid4())
+        with self._lock:
+            self._all_subscribers.append(handler)
+            self._subscribers[subscription_id] = handler
+        return subscription_id
+
+    def unsubscribe(self, subscription_id: str) -> None:
+        with self._lock:
+            handler = self._subscribers.pop(subscription_id, None)
+            if handler and handler in self._all_subscribers:
+                self._all_subscribers.remove(handler)
+
+    def drop_session(self, session_id: str) -> None:
+        # Other workers may still serve the session; only expire stale events
+        with self.database.transaction() as conn:
+            cursor = conn.execute(
+                "DELETE FROM events WHERE created_at < ?",
+                (time.time() - self.max_age,),
+            )
+        if cursor.rowcount:
+            logger.info(f"Expired {cursor.rowcount} undelivered events")
@@ -8,6 +8,7 @@ from abc import ABC, abstractmethod
 from typing import Callable, Optional
 
 from app.models.events.base import BaseGameEvent
+from app.models.events.game_events import SharedSessionStateModel
 
 
 class IEventQueue(ABC):
@@ -59,3 +60,56 @@ class IEventQueue(ABC):
     def unsubscribe(self, subscription_id: str) -> None:
         """Unsubscribe from events."""
         pass
+
+    @abstractmethod
+    def drop_session(self, session_id: str) -> None:
+        """Discard this process's event stream of a session it no longer serves.
+
+        Streams shared with other workers are left to them.
+        """
+        pass
+
+
+class ISharedStateStore(ABC):
+    """Interface for storing per-session processing flags and retry context.
+
+    Implementations decide where the state lives: process memory for a single
+    worker, or a shared backend so several workers see the same flags.
+    """
+
+    @abstractmethod
+    def load(self, session_id: Optional[str]) -> Optional[SharedSessionStateModel]:
+        """Load the shared state of a session (None is the default session)."""
+        pass
+
+    @abstractmethod
+    def save(self, session_id: Optional[str], state: SharedSessionStateModel) -> None:
+        """Store the shared state of a session."""
+        pass
+
+    @abstractmethod
+    def try_set_ai_processing(self, session_id: Optional[str]) -> bool:
+        """Set the AI processing flag of a session unless it is already set.
+
+        The check and the update are one atomic operation, so two callers
+        racing for the same session cannot both get True.
+        """
+        pass
+
+    @abstractmethod
+    def delete(self, session_id: Optional[str]) -> None:
+        """Remove the shared state of a session."""
+        pass
+
+    def release(self, session_id: Optional[str]) -> None:
+        """Forget a session this process no longer serves.
+
+        Process local stores delete its state; stores shared with other
+        workers keep it for them.
+        """
+        self.delete(session_id)
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove the shared state of every session."""
+        pass
@@ -134,6 +134,17 @@ class DuplicateEntityError(DatabaseError):
         )
 
 
+class StaleStateError(DatabaseError):
+    """Raised when a save is based on a state another writer already replaced."""
+
+    def __init__(
+        self,
+        message: str = "State was modified by another writer",
+        details: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        super().__init__(message, code="STALE_STATE", details=details)
+
+
 class ValidationError(ApplicationError):
     """Raised when data validation fails."""
 
@@ -328,6 +339,17 @@ class RateLimitError(ApplicationError):
 
 
 # HTTP-specific exceptions for API layer
+class SessionLimitError(ApplicationError):
+    """Raised when no more game sessions can be held in memory."""
+
+    def __init__(self, max_sessions: int) -> None:
+        super().__init__(
+            f"All {max_sessions} game sessions are busy",
+            code="SESSION_LIMIT",
+            details={"max_sessions": max_sessions},
+        )
+
+
 class HTTPException(ApplicationError):
     """Base class for HTTP exceptions with status codes."""
 
@@ -11,6 +11,7 @@ from app.models.api.requests import (
     CreateCampaignFromTemplateRequest,
     PerformRollRequest,
     PlayerActionRequest,
+    PrefetchRequest,
     RAGQueryRequest,
     SubmitRollsRequest,
 )
@@ -19,6 +20,8 @@ from app.models.api.requests import (
 from app.models.api.responses import (
     AdventureCharacterData,
     AdventureInfo,
+    AIBackendsResponse,
+    AIBackendStatsModel,
     CharacterAdventuresResponse,
     CharacterCreationOptionsData,
     CharacterCreationOptionsMetadata,
@@ -29,6 +32,8 @@ from app.models.api.responses import (
     ContentUploadResponse,
     ContentUploadResult,
     CreateCampaignFromTemplateResponse,
+    PersistenceStatusResponse,
+    PrefetchResponse,
     RAGQueryResponse,
     SaveGameResponse,
     SSEHealthResponse,
@@ -43,10 +48,13 @@ __all__ = [
     "CreateCampaignFromTemplateRequest",
     "PerformRollRequest",
     "PlayerActionRequest",
+    "PrefetchRequest",
     "RAGQueryRequest",
     "SubmitRollsRequest",
     # Response models
     "AdventureCharacterData",
+    "AIBackendsResponse",
+    "AIBackendStatsModel",
     "AdventureInfo",
     "CharacterAdventuresResponse",
     "CharacterCreationOptionsData",
@@ -58,6 +66,8 @@ __all__ = [
     "ContentUploadResponse",
     "ContentUploadResult",
     "CreateCampaignFromTemplateResponse",
+    "PersistenceStatusResponse",
+    "PrefetchResponse",
     "RAGQueryResponse",
     "SaveGameResponse",
     "SSEHealthResponse",
@@ -22,6 +22,14 @@ class PlayerActionRequest(BaseModel):
     character_id: Optional[str] = Field(None, description="Optional character ID")
 
 
+class PrefetchRequest(BaseModel):
+    """Request to prepare the next prompt while the player is acting."""
+
+    draft_text: Optional[str] = Field(
+        None, description="Action the player is typing, if any"
+    )
+
+
 class SubmitRollsRequest(BaseModel):
     """Unified request model for dice roll submissions.
 
@@ -6,7 +6,7 @@ type safety and automatic API documentation generation.
 """
 
 from datetime import datetime
-from typing import Any, Dict, Generic, List, Optional, TypeVar, Union
+from typing import Any, Dict, Generic, List, Literal, Optional, TypeVar, Union
 
 from pydantic import BaseModel, Field, computed_field, field_serializer
 
@@ -169,6 +169,80 @@ class SaveGameResponse(BaseModel):
     campaign_id: Optional[str] = Field(None, description="ID of the saved campaign")
 
 
+class PersistenceStatusResponse(BaseModel):
+    """Response for GET /game_state/persistence."""
+
+    mode: Literal["memory", "sync", "write_behind"] = Field(
+        ..., description="How game state saves reach durable storage"
+    )
+    pending_saves: int = Field(0, description="Save files with unwritten changes")
+    durability_lag_seconds: float = Field(
+        0.0, description="Seconds the oldest unwritten save has been waiting"
+    )
+    saves: int = Field(0, description="Saves requested since startup")
+    writes: int = Field(0, description="Save files written since startup")
+    coalesced_saves: int = Field(
+        0, description="Saves merged into a later write instead of written"
+    )
+    failed_writes: int = Field(0, description="Writes that failed")
+    last_error: Optional[str] = Field(None, description="Last write error")
+    seconds_since_last_write: Optional[float] = Field(
+        None, description="Seconds since the last successful write"
+    )
+
+
+class AIBackendStatsModel(BaseModel):
+    """Observed state of one AI backend of the router."""
+
+    name: str = Field(..., description="Backend name (host and port)")
+    base_url: str = Field(..., description="OpenAI-compatible base URL")
+    healthy: bool = Field(..., description="Whether requests are routed to it")
+    unhealthy_for_seconds: float = Field(
+        0.0, description="Seconds before a failing backend is used again"
+    )
+    in_flight: int = Field(0, description="Requests being generated")
+    requests: int = Field(0, description="Requests sent since startup")
+    failures: int = Field(0, description="Requests without a valid response")
+    p50_latency_seconds: Optional[float] = Field(
+        None, description="Median latency of recent successful requests"
+    )
+    p95_latency_seconds: Optional[float] = Field(
+        None, description="95th percentile latency of recent successful requests"
+    )
+    tokens_per_second: Optional[float] = Field(
+        None, description="Average generation speed"
+    )
+    last_error: Optional[str] = Field(None, description="Last failure reason")
+
+
+class AIBackendsResponse(BaseModel):
+    """Response for GET /ai/backends."""
+
+    strategy: Optional[str] = Field(
+        None, description="Routing strategy (None without AI_PROVIDER=router)"
+    )
+    hedge_percentile: Optional[float] = Field(
+        None, description="Latency percentile after which requests are hedged"
+    )
+    hedged_requests: int = Field(
+        0, description="Requests also sent to a second backend"
+    )
+    backends: List[AIBackendStatsModel] = Field(
+        default_factory=list, description="State of each backend"
+    )
+
+
+class PrefetchResponse(BaseModel):
+    """Response for POST /game/prefetch."""
+
+    rag_context: bool = Field(
+        False, description="Whether RAG context was retrieved for the next prompt"
+    )
+    prompt_context: bool = Field(
+        False, description="Whether the next prompt's context sections were built"
+    )
+
+
 # SSE endpoint responses
 class SSEHealthResponse(BaseModel):
     """Response for SSE health check endpoint."""
@@ -6,9 +6,10 @@ This module contains the CombatStateModel and NextCombatantInfoModel.
 
 from typing import List, Optional
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
 
 from app.models.combat.combatant import CombatantModel
+from app.models.rag import CombatKnowledgeModel
 
 
 class NextCombatantInfoModel(BaseModel):
@@ -43,6 +44,13 @@ class CombatStateModel(BaseModel):
 
     # Private field for internal state tracking (not persisted)
     _combat_just_started_flag: bool = False
+    # Knowledge retrieved for this combat, reused on every turn
+    _knowledge: CombatKnowledgeModel = PrivateAttr(default_factory=CombatKnowledgeModel)
+
+    @property
+    def knowledge(self) -> CombatKnowledgeModel:
+        """Stat blocks and rules retrieved for this combat (not persisted)."""
+        return self._knowledge
 
     def get_current_combatant(self) -> Optional[CombatantModel]:
         """Get the combatant whose turn it is."""
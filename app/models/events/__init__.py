@@ -49,6 +49,7 @@ from app.models.events.game_events import (
     GameEventModel,
     GameEventResponseModel,
     PlayerActionEventModel,
+    SharedSessionStateModel,
 )
 
 # Game state events
@@ -60,7 +61,13 @@ from app.models.events.game_state import (
 )
 
 # Narrative events
-from app.models.events.narrative import MessageSupersededEvent, NarrativeAddedEvent
+from app.models.events.narrative import (
+    MessageSupersededEvent,
+    NarrationReadyEvent,
+    NarrationSegmentEvent,
+    NarrativeAddedEvent,
+    NarrativeChunkEvent,
+)
 
 # System events
 from app.models.events.system import (
@@ -82,11 +89,15 @@ __all__ = [
     "PlayerActionEventModel",
     "GameEventResponseModel",
     "AIRequestContextModel",
+    "SharedSessionStateModel",
     # Utils
     "CharacterChangesModel",
     "ErrorContextModel",
     # Narrative
     "NarrativeAddedEvent",
+    "NarrativeChunkEvent",
+    "NarrationReadyEvent",
+    "NarrationSegmentEvent",
     "MessageSupersededEvent",
     # Combat
     "CombatStartedEvent",
@@ -27,7 +27,13 @@ from .game_state import (
     PartyMemberUpdatedEvent,
     QuestUpdatedEvent,
 )
-from .narrative import MessageSupersededEvent, NarrativeAddedEvent
+from .narrative import (
+    MessageSupersededEvent,
+    NarrationReadyEvent,
+    NarrationSegmentEvent,
+    NarrativeAddedEvent,
+    NarrativeChunkEvent,
+)
 from .system import BackendProcessingEvent, GameErrorEvent, GameStateSnapshotEvent
 
 
@@ -36,6 +42,9 @@ def get_all_event_types() -> List[Type[BaseGameEvent]]:
     """Get all event class types for validation."""
     event_types = [
         NarrativeAddedEvent,
+        NarrativeChunkEvent,
+        NarrationReadyEvent,
+        NarrationSegmentEvent,
         MessageSupersededEvent,
         CombatStartedEvent,
         CombatEndedEvent,
@@ -52,6 +52,23 @@ class AIRequestContextModel(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
 
+class SharedSessionStateModel(BaseModel):
+    """Per-session processing flags and retry context shared between workers."""
+
+    ai_processing: bool = Field(False, description="Whether an AI call is running")
+    needs_backend_trigger: bool = Field(
+        False, description="Whether the backend should auto-trigger"
+    )
+    last_ai_request_context: Optional[AIRequestContextModel] = Field(
+        None, description="Context of the last AI request, kept for retry"
+    )
+    last_ai_request_timestamp: Optional[float] = Field(
+        None, description="Unix time the last AI request context was stored"
+    )
+
+    model_config = ConfigDict(extra="forbid")
+
+
 class GameEventResponseModel(BaseModel):
     """Response model from game event handling."""
 
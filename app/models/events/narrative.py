@@ -16,9 +16,51 @@ class NarrativeAddedEvent(BaseGameEvent):
     gm_thought: Optional[str] = None
     audio_path: Optional[str] = None
     message_id: Optional[str] = None
+    # Audio is being synthesized and follows as a NarrationReadyEvent
+    narration_pending: bool = False
+
+
+class NarrativeChunkEvent(BaseGameEvent):
+    """Narrative text of an AI response that is still being generated.
+
+    Chunks of one response share its correlation_id and are appended in
+    chunk_index order; chunk_index 0 starts a new (or restarted) response. The
+    complete message follows as a NarrativeAddedEvent.
+    """
+
+    event_type: Literal["narrative_chunk"] = "narrative_chunk"
+    content: str
+    chunk_index: int = 0
 
 
 class MessageSupersededEvent(BaseGameEvent):
     event_type: Literal["message_superseded"] = "message_superseded"
     message_id: str
     reason: str = "retry"
+
+
+class NarrationReadyEvent(BaseGameEvent):
+    """Audio narration of a chat message, synthesized in the background.
+
+    Follows the NarrativeAddedEvent of message_id that was sent with
+    narration_pending. audio_path is relative to the static folder, like the
+    audio_path of chat messages.
+    """
+
+    event_type: Literal["narration_ready"] = "narration_ready"
+    message_id: str
+    audio_path: str
+
+
+class NarrationSegmentEvent(BaseGameEvent):
+    """One sentence of the narration of a chat message, ready to be played.
+
+    Segments of a narration are sent in segment_index order as soon as they
+    are synthesized, so playback can start after the first sentence; the
+    NarrationReadyEvent with the audio of the whole message follows.
+    """
+
+    event_type: Literal["narration_segment"] = "narration_segment"
+    message_id: str
+    segment_index: int
+    audio_path: str
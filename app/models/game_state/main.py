@@ -14,7 +14,7 @@ from pydantic import BaseModel, ConfigDict, Field, field_validator
 from app.models.character.instance import CharacterInstanceModel
 from app.models.combat.state import CombatStateModel
 from app.models.dice import DiceRequestModel
-from app.models.shared import ChatMessageModel
+from app.models.shared import ChatMessageModel, HistorySummaryModel
 from app.models.utils import LocationModel, NPCModel, QuestModel
 
 
@@ -43,6 +43,8 @@ class GameStateModel(BaseModel):
 
     # Chat and dice - properly typed
     chat_history: List[ChatMessageModel] = Field(default_factory=list)
+    # Summaries of the oldest chat history, in order, for prompts
+    history_summaries: List[HistorySummaryModel] = Field(default_factory=list)
     pending_player_dice_requests: List[DiceRequestModel] = Field(default_factory=list)
 
     # Combat
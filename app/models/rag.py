@@ -4,12 +4,16 @@ RAG (Retrieval-Augmented Generation) related type definitions.
 This module contains all RAG-related model definitions.
 """
 
+import re
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Set
 
 from langchain_core.documents import Document
 from pydantic import BaseModel, ConfigDict, Field
 
+if TYPE_CHECKING:
+    from app.models.combat.combatant import CombatantModel
+
 # ===== Enums =====
 
 
@@ -74,7 +78,7 @@ class RAGResults(BaseModel):
     def has_results(self) -> bool:
         return len(self.results) > 0
 
-    def format_for_prompt(self) -> str:
+    def format_for_prompt(self, title: str = "RELEVANT KNOWLEDGE") -> str:
         """Format results for injection into AI prompt."""
         if not self.results:
             return ""
@@ -103,7 +107,7 @@ class RAGResults(BaseModel):
                 + "\n".join(f"- {item}" for item in current_items)
             )
 
-        return "RELEVANT KNOWLEDGE:\n" + "\n\n".join(formatted_sections)
+        return f"{title}:\n" + "\n\n".join(formatted_sections)
 
     def debug_format(self) -> str:
         """Format results for debug logging."""
@@ -120,6 +124,102 @@ class RAGResults(BaseModel):
         return "\n".join(lines)
 
 
+class CombatKnowledgeModel(BaseModel):
+    """Knowledge of a combat, retrieved once and reused on every turn.
+
+    Holds the stat blocks of the creatures fighting and the combat rules.
+    The creatures follow the combatants as they join and leave, so only the
+    new ones need retrieving. Updates replace the dicts instead of changing
+    them, so a prompt being built from the knowledge in another thread never
+    iterates a dict that changes size.
+    """
+
+    # Combatant ID -> creature name ("Goblin 2" -> "goblin")
+    combatant_creatures: Dict[str, str] = Field(default_factory=dict)
+    # Creature name -> stat blocks, for the creatures retrieved so far
+    creatures: Dict[str, List[KnowledgeResult]] = Field(default_factory=dict)
+    rules: List[KnowledgeResult] = Field(default_factory=list)
+    rules_retrieved: bool = False
+    content_pack_priority: Optional[List[str]] = None
+
+    _formatted: Optional[str] = None
+
+    @staticmethod
+    def creature_name(combatant_name: str) -> str:
+        """Creature of a combatant, without its numbering."""
+        return re.sub(r"\s*#?\d+$", "", " ".join(combatant_name.lower().split()))
+
+    def track_combatants(self, combatants: Iterable["CombatantModel"]) -> None:
+        """Follow the non-player combatants, dropping creatures no longer fighting."""
+        self.combatant_creatures = {
+            combatant.id: self.creature_name(combatant.name)
+            for combatant in combatants
+            if not combatant.is_player
+        }
+        present = set(self.combatant_creatures.values())
+        if not present.issuperset(self.creatures):
+            self.creatures = {
+                name: results
+                for name, results in self.creatures.items()
+                if name in present
+            }
+            self._formatted = None
+
+    def pending_creatures(self) -> List[str]:
+        """Creatures of the combatants whose knowledge is not retrieved yet."""
+        return sorted(set(self.combatant_creatures.values()) - set(self.creatures))
+
+    def set_creature(self, creature: str, results: List[KnowledgeResult]) -> None:
+        self.creatures = {**self.creatures, creature: results}
+        self._formatted = None
+
+    def set_rules(self, results: List[KnowledgeResult]) -> None:
+        self.rules = results
+        self.rules_retrieved = True
+        self._formatted = None
+
+    def reset(self, content_pack_priority: Optional[List[str]] = None) -> None:
+        """Forget the retrieved knowledge, e.g. when the content packs change."""
+        self.creatures = {}
+        self.rules = []
+        self.rules_retrieved = False
+        self.content_pack_priority = content_pack_priority
+        self._formatted = None
+
+    def creature_names(self) -> Set[str]:
+        """Lowercase names the creature knowledge covers, as fought and as found."""
+        names: Set[str] = set()
+        for creature, results in self.creatures.items():
+            if results:
+                names.add(creature)
+                names.update(
+                    str(result.metadata["name"]).lower()
+                    for result in results
+                    if result.metadata.get("name")
+                )
+        return names
+
+    def results(self) -> List[KnowledgeResult]:
+        """Stat blocks of the creatures fighting, then the rules, once each."""
+        results: List[KnowledgeResult] = []
+        seen: Set[str] = set()
+        for creature in sorted(set(self.combatant_creatures.values())):
+            for result in self.creatures.get(creature, []):
+                content_key = f"{result.source}:{result.content[:100]}"
+                if content_key not in seen:
+                    seen.add(content_key)
+                    results.append(result)
+        return results + self.rules
+
+    def format_for_prompt(self) -> str:
+        """The knowledge for the prompt, rendered once until it changes."""
+        if self._formatted is None:
+            self._formatted = RAGResults(results=self.results()).format_for_prompt(
+                "COMBAT KNOWLEDGE"
+            )
+        return self._formatted
+
+
 class EventMetadataModel(BaseModel):
     """Metadata for RAG events."""
 
@@ -5,6 +5,6 @@ This package contains models that need to be shared between different
 parts of the application to avoid circular dependencies.
 """
 
-from app.models.shared.chat import ChatMessageModel
+from app.models.shared.chat import ChatMessageModel, HistorySummaryModel
 
-__all__ = ["ChatMessageModel"]
+__all__ = ["ChatMessageModel", "HistorySummaryModel"]
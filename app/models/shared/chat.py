@@ -30,4 +30,17 @@ class ChatMessageModel(BaseModel):
     )
     audio_path: Optional[str] = Field(None, description="Path to audio file for TTS")
 
-    model_config = ConfigDict(extra="forbid")
+    # Messages are never edited once added to the history, which lets
+    # game state snapshots share them instead of copying.
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
+
+class HistorySummaryModel(BaseModel):
+    """Condensed account of a run of chat messages too old to fit in prompts."""
+
+    first_message_id: str = Field(..., description="First chat message covered")
+    last_message_id: str = Field(..., description="Last chat message covered")
+    message_count: int = Field(..., ge=1, description="Number of messages covered")
+    content: str = Field(..., description="Summary text")
+
+    model_config = ConfigDict(extra="forbid", frozen=True)
@@ -1,6 +1,7 @@
+import asyncio
 import logging
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Callable, List, Optional
 
 from app.models.common import MessageDict
 
@@ -22,3 +23,79 @@ class BaseAIService(ABC):
             AIResponse | None: The parsed Pydantic model or None if an error occurred.
         """
         pass
+
+    def get_text_response(self, messages: List[MessageDict]) -> Optional[str]:
+        """
+        Sends messages to the AI and returns its plain text answer.
+
+        Used for auxiliary tasks such as summarizing history, where the answer
+        is not a game response. The default asks for a regular response and
+        returns its narrative.
+
+        Args:
+            messages (list[Any]): A list of message dictionaries conforming to the API standard.
+
+        Returns:
+            str | None: The answer text or None if an error occurred.
+        """
+        response = self.get_response(messages)
+        return response.narrative if response else None
+
+    def get_streaming_response(
+        self,
+        messages: List[MessageDict],
+        on_narrative_chunk: Callable[[str], None],
+    ) -> Optional[AIResponse]:
+        """
+        Like get_response, but reports the narrative while it is generated.
+
+        ``on_narrative_chunk`` is called with each piece of narrative text as
+        soon as it has been decoded from the streamed response. Providers that
+        cannot stream fall back to a blocking request and report nothing.
+
+        Args:
+            messages (list[Any]): A list of message dictionaries conforming to the API standard.
+            on_narrative_chunk: Callback receiving narrative text increments.
+
+        Returns:
+            AIResponse | None: The parsed Pydantic model or None if an error occurred.
+        """
+        return self.get_response(messages)
+
+    async def aget_response(self, messages: List[MessageDict]) -> Optional[AIResponse]:
+        """
+        Async variant of get_response.
+
+        Providers with a native async client override this so that waiting for
+        the AI does not occupy a thread. The default runs get_response in a
+        worker thread.
+
+        Args:
+            messages (list[Any]): A list of message dictionaries conforming to the API standard.
+
+        Returns:
+            AIResponse | None: The parsed Pydantic model or None if an error occurred.
+        """
+        return await asyncio.to_thread(self.get_response, messages)
+
+    async def aget_streaming_response(
+        self,
+        messages: List[MessageDict],
+        on_narrative_chunk: Callable[[str], None],
+    ) -> Optional[AIResponse]:
+        """
+        Async variant of get_streaming_response.
+
+        Args:
+            messages (list[Any]): A list of message dictionaries conforming to the API standard.
+            on_narrative_chunk: Callback receiving narrative text increments.
+
+        Returns:
+            AIResponse | None: The parsed Pydantic model or None if an error occurred.
+        """
+        return await asyncio.to_thread(
+            self.get_streaming_response, messages, on_narrative_chunk
+        )
+
+    async def aclose(self) -> None:
+        """Release connections held by the async client, if any."""
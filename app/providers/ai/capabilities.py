@@ -0,0 +1,162 @@
+"""
+Structured output capabilities of the models behind AI services.
+
+In strict mode a request first asks for function calling, then JSON mode,
+then falls back to flexible parsing. A model that does not support a method
+fails the same way on every request, and each failure can be a full round
+trip. ``StructuredOutputCapabilities`` remembers which methods failed for
+each (provider, model) so later requests skip them, persists what it learned
+so restarts do not probe again, and probes a failed method again once
+``reprobe_seconds`` have passed (servers and models get upgraded).
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Literal, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+StructuredOutputMethod = Literal["function_calling", "json_mode"]
+
+# Methods in the order they are tried
+STRUCTURED_OUTPUT_METHODS: Tuple[StructuredOutputMethod, ...] = (
+    "function_calling",
+    "json_mode",
+)
+
+# HTTP statuses of requests the server rejects because of what they ask
+UNSUPPORTED_STATUS_CODES = {400, 404, 405, 422, 501}
+
+# Request parameters a rejection must name to be about structured output;
+# other rejections (context too long, bad message, ...) say nothing about it
+STRUCTURED_OUTPUT_PARAMETERS = (
+    "response_format",
+    "json_schema",
+    "json_object",
+    "tools",
+    "tool_choice",
+    "function_call",
+    "functions",
+)
+
+
+def is_unsupported_error(error: BaseException) -> bool:
+    """
+    Whether an error tells that a structured output method is not supported.
+
+    Timeouts, rate limits and server errors say nothing about the model, so
+    they do not count against the method, and neither do rejections that do
+    not name a structured output parameter.
+    """
+    if isinstance(error, NotImplementedError):
+        return True
+    if getattr(error, "status_code", None) not in UNSUPPORTED_STATUS_CODES:
+        return False
+    body = getattr(error, "body", None)
+    text = f"{error} {body if body is not None else ''}".lower()
+    return any(parameter in text for parameter in STRUCTURED_OUTPUT_PARAMETERS)
+
+
+class StructuredOutputCapabilities:
+    """
+    What each model supports, persisted as JSON.
+
+    Entries are keyed on the provider (its base URL) and the model name, and
+    record the method that last worked and when each method last failed.
+    """
+
+    def __init__(self, path: Optional[str], reprobe_seconds: float) -> None:
+        self.path = Path(path) if path else None
+        self.reprobe_seconds = reprobe_seconds
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, object]] = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, object]]:
+        if self.path is None or not self.path.is_file():
+            return {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                return data
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable capabilities file {self.path}: {e}")
+        return {}
+
+    def _save(self) -> None:
+        if self.path is None:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.path.with_suffix(".json.tmp")
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f, indent=2, sort_keys=True)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not save model capabilities to {self.path}: {e}")
+
+    @staticmethod
+    def _key(provider: str, model: str) -> str:
+        return f"{provider}|{model}"
+
+    def _failures(self, key: str) -> Dict[str, float]:
+        entry = self._entries.setdefault(key, {})
+        failed = entry.setdefault("failed", {})
+        assert isinstance(failed, dict)
+        return failed
+
+    def methods_to_try(self, provider: str, model: str) -> List[StructuredOutputMethod]:
+        """
+        Structured output methods worth trying, in order.
+
+        Methods that failed less than ``reprobe_seconds`` ago are skipped; an
+        empty list means going straight to flexible parsing.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(self._key(provider, model), {})
+            failed = entry.get("failed", {})
+            assert isinstance(failed, dict)
+            return [
+                method
+                for method in STRUCTURED_OUTPUT_METHODS
+                if now - failed.get(method, 0.0) >= self.reprobe_seconds
+            ]
+
+    def working_method(self, provider: str, model: str) -> Optional[str]:
+        """The method that produced the last structured response, if any."""
+        with self._lock:
+            entry = self._entries.get(self._key(provider, model), {})
+            method = entry.get("working")
+            return method if isinstance(method, str) else None
+
+    def record_success(
+        self, provider: str, model: str, method: StructuredOutputMethod
+    ) -> None:
+        key = self._key(provider, model)
+        with self._lock:
+            failures = self._failures(key)
+            if self._entries[key].get("working") == method and method not in failures:
+                return
+            failures.pop(method, None)
+            self._entries[key]["working"] = method
+            self._save()
+        logger.info(f"Model {model} at {provider} supports {method} structured output")
+
+    def record_failure(
+        self, provider: str, model: str, method: StructuredOutputMethod
+    ) -> None:
+        key = self._key(provider, model)
+        with self._lock:
+            self._failures(key)[method] = time.time()
+            if self._entries[key].get("working") == method:
+                self._entries[key]["working"] = None
+            self._save()
+        logger.info(
+            f"Model {model} at {provider} does not support {method} structured "
+            f"output; skipping it for {self.reprobe_seconds:.0f}s"
+        )
@@ -0,0 +1,162 @@
+"""
+Incremental formatting and token counting of a campaign's chat history.
+
+Every prompt includes the chat history, which only grows by a few messages
+per turn. Instead of converting and tokenizing every message again for each
+prompt, the cache keeps the LangChain message and token count of each chat
+message, keyed by message id and content hash, together with running token
+prefix sums. An update only processes the messages that changed since the
+previous prompt, and the prompt builder finds the history that fits a token
+budget by binary search over the prefix sums.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from langchain_core.messages import BaseMessage
+
+from app.models.shared.chat import ChatMessageModel
+
+MessageKey = Tuple[str, str, bool, int, int]
+FormatMessage = Callable[[ChatMessageModel], Optional[BaseMessage]]
+CountTokens = Callable[[BaseMessage], int]
+
+
+def _message_key(msg: ChatMessageModel) -> MessageKey:
+    return (
+        msg.id,
+        msg.role,
+        bool(msg.is_dice_result),
+        hash(msg.content),
+        hash(msg.ai_response_json),
+    )
+
+
+class HistoryView(NamedTuple):
+    """Formatted chat history with token prefix sums, as of one update."""
+
+    # Formatted messages (chat messages excluded from prompts are left out)
+    messages: List[BaseMessage]
+    # prefix_tokens[i] is the token count of messages[:i]
+    prefix_tokens: List[int]
+    # formatted_before[i] is the number of formatted messages before chat message i
+    formatted_before: List[int]
+    tokens_by_message_id: Dict[int, int]
+
+    def tokens(self, start: int, end: int) -> int:
+        """Token count of messages[start:end]."""
+        return self.prefix_tokens[end] - self.prefix_tokens[start]
+
+    def tokens_for(self, message: BaseMessage) -> Optional[int]:
+        """Cached token count of a message of this view, if it is one."""
+        return self.tokens_by_message_id.get(id(message))
+
+
+class HistoryTokenCache:
+    """Formatted messages and token counts for the chat history of one campaign."""
+
+    def __init__(self) -> None:
+        self._keys: List[MessageKey] = []
+        self._formatted: List[Optional[BaseMessage]] = []
+        self._messages: List[BaseMessage] = []
+        self._prefix_tokens: List[int] = [0]
+        self._formatted_before: List[int] = [0]
+        self._tokens_by_message_id: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def update(
+        self,
+        chat_history: Sequence[ChatMessageModel],
+        format_message: FormatMessage,
+        count_tokens: CountTokens,
+    ) -> HistoryView:
+        """
+        Bring the cache up to date with the chat history.
+
+        Messages before the first one that differs from the previous update
+        are reused. Later messages are looked up by key, so messages that
+        only moved (e.g. after a deletion) are not tokenized again.
+        """
+        keys = [_message_key(msg) for msg in chat_history]
+        with self._lock:
+            unchanged = 0
+            limit = min(len(keys), len(self._keys))
+            while unchanged < limit and keys[unchanged] == self._keys[unchanged]:
+                unchanged += 1
+            reusable = self._truncate(unchanged)
+
+            for index in range(unchanged, len(keys)):
+                key = keys[index]
+                cached = reusable.pop(key, None)
+                if cached is None:
+                    formatted = format_message(chat_history[index])
+                    tokens = count_tokens(formatted) if formatted is not None else 0
+                    cached = (formatted, tokens)
+                self._append(key, *cached)
+
+            return HistoryView(
+                messages=list(self._messages),
+                prefix_tokens=list(self._prefix_tokens),
+                formatted_before=list(self._formatted_before),
+                tokens_by_message_id=dict(self._tokens_by_message_id),
+            )
+
+    def _truncate(
+        self, length: int
+    ) -> Dict[MessageKey, Tuple[Optional[BaseMessage], int]]:
+        """
+        Forget the chat messages from index ``length`` on.
+
+        Returns:
+            The forgotten entries by key, for reuse by the update
+        """
+        reusable: Dict[MessageKey, Tuple[Optional[BaseMessage], int]] = {}
+        for index in range(length, len(self._keys)):
+            formatted = self._formatted[index]
+            tokens = 0
+            if formatted is not None:
+                tokens = self._tokens_by_message_id.pop(id(formatted))
+            reusable[self._keys[index]] = (formatted, tokens)
+
+        kept_messages = self._formatted_before[length]
+        del self._keys[length:]
+        del self._formatted[length:]
+        del self._formatted_before[length + 1 :]
+        del self._messages[kept_messages:]
+        del self._prefix_tokens[kept_messages + 1 :]
+        return reusable
+
+    def _append(
+        self, key: MessageKey, formatted: Optional[BaseMessage], tokens: int
+    ) -> None:
+        self._keys.append(key)
+        self._formatted.append(formatted)
+        if formatted is not None:
+            self._messages.append(formatted)
+            self._prefix_tokens.append(self._prefix_tokens[-1] + tokens)
+            self._tokens_by_message_id[id(formatted)] = tokens
+        self._formatted_before.append(len(self._messages))
+
+
+class HistoryTokenCaches:
+    """History caches of the most recently used campaigns."""
+
+    def __init__(self, max_campaigns: int = 32) -> None:
+        self.max_campaigns = max_campaigns
+        self._caches: "OrderedDict[str, HistoryTokenCache]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> HistoryTokenCache:
+        """Get the cache for a campaign, creating it if needed."""
+        with self._lock:
+            cache = self._caches.pop(key, None) or HistoryTokenCache()
+            self._caches[key] = cache
+            while len(self._caches) > self.max_campaigns:
+                self._caches.popitem(last=False)
+            return cache
+
+    def clear(self) -> None:
+        """Drop all cached histories."""
+        with self._lock:
+            self._caches.clear()
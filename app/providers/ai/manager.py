@@ -1,20 +1,107 @@
 import logging
-from typing import Optional, cast
+from typing import Any, Dict, Optional, cast
 
 from app.providers.ai.base import BaseAIService
+from app.providers.ai.capabilities import StructuredOutputCapabilities
 from app.providers.ai.openai_service import OpenAIService
+from app.providers.ai.replay_service import (
+    RecordingAIService,
+    ReplayAIService,
+    ResponseRecordings,
+)
+from app.providers.ai.response_cache import AIResponseCache, CachingAIService
+from app.providers.ai.router_service import AIBackend, RoutingAIService
+from app.providers.ai.schemas import ai_response_json_schema
 from app.settings import Settings
 
 logger = logging.getLogger(__name__)
 
+# One store per file, shared by the services of all containers
+_capabilities: Dict[str, StructuredOutputCapabilities] = {}
+
+
+def get_llamacpp_cache_hints(settings: Settings) -> Optional[Dict[str, Any]]:
+    """
+    Request fields that let the Llama.cpp server reuse its KV cache.
+
+    With cache_prompt the server only evaluates the part of the prompt after
+    the prefix it already processed, and id_slot keeps requests on the slot
+    holding that prefix.
+    """
+    hints: Dict[str, Any] = {}
+    if settings.ai.llama_cache_prompt:
+        hints["cache_prompt"] = True
+    if settings.ai.llama_slot_id is not None:
+        hints["id_slot"] = settings.ai.llama_slot_id
+    if hints:
+        logger.debug(f"Sending Llama.cpp prompt cache hints: {hints}")
+    return hints or None
+
+
+def get_llamacpp_response_schema(settings: Settings) -> Optional[Dict[str, Any]]:
+    """
+    JSON schema the Llama.cpp server constrains answers parsed from text to.
+
+    The server compiles it into a grammar, so flexible and streamed answers
+    always parse instead of being repaired or retried.
+    """
+    if not settings.ai.llama_constrained_decoding:
+        return None
+    return ai_response_json_schema()
+
+
+def get_structured_output_capabilities(
+    settings: Settings,
+) -> StructuredOutputCapabilities:
+    """The store of structured output methods each model supports."""
+    path = settings.ai.capabilities_file or ""
+    reprobe_seconds = settings.ai.capabilities_reprobe_hours * 3600
+    capabilities = _capabilities.get(path)
+    if capabilities is None or capabilities.reprobe_seconds != reprobe_seconds:
+        capabilities = StructuredOutputCapabilities(path or None, reprobe_seconds)
+        _capabilities[path] = capabilities
+    return capabilities
+
 
 def get_ai_service(settings: Settings) -> Optional[BaseAIService]:
     """Factory function to get the configured AI service instance."""
     provider = settings.ai.provider.lower()
+    if provider == "replay":
+        logger.info("Configuring ReplayAIService with recorded responses...")
+        return ReplayAIService(
+            ResponseRecordings(settings.ai.replay_dir),
+            on_miss=settings.ai.replay_on_miss,
+        )
+
+    ai_service = _get_openai_service(settings, provider)
+    if ai_service is None:
+        return None
+    if settings.ai.response_cache_enabled:
+        ai_service = CachingAIService(
+            ai_service,
+            AIResponseCache(
+                settings.ai.response_cache_dir,
+                int(settings.ai.response_cache_max_mb * 1024 * 1024),
+            ),
+        )
+    if settings.ai.record_responses:
+        ai_service = RecordingAIService(
+            ai_service, ResponseRecordings(settings.ai.replay_dir)
+        )
+    return ai_service
+
+
+def _get_openai_service(settings: Settings, provider: str) -> Optional[BaseAIService]:
+    """Create the OpenAI-compatible service of a model provider."""
+    if provider == "router":
+        return _get_router_service(settings)
+
     parsing_mode = settings.ai.response_parsing_mode
     api_key = None
     base_url = None
     model_name = None
+    extra_body: Optional[Dict[str, Any]] = None
+    response_schema: Optional[Dict[str, Any]] = None
 
     logger.debug(
         f"Attempting to configure AI provider: '{provider}', Parsing Mode: '{parsing_mode}'"
@@ -35,6 +122,8 @@ def get_ai_service(settings: Settings) -> Optional[BaseAIService]:
         if not base_url.endswith("/v1"):
             base_url = base_url.rstrip("/") + "/v1"
             logger.debug(f"Appended /v1 to LLAMA_SERVER_URL: {base_url}")
+        extra_body = get_llamacpp_cache_hints(settings)
+        response_schema = get_llamacpp_response_schema(settings)
 
     elif provider == "openrouter":
         logger.info("Configuring OpenAIService for OpenRouter...")
@@ -72,6 +161,9 @@ def get_ai_service(settings: Settings) -> Optional[BaseAIService]:
             model_name=model_name,
             parsing_mode=parsing_mode,
             temperature=temperature,
+            extra_body=extra_body,
+            capabilities=get_structured_output_capabilities(settings),
+            response_schema=response_schema,
         )
     except Exception as e:
         logger.critical(
@@ -79,3 +171,100 @@ def get_ai_service(settings: Settings) -> Optional[BaseAIService]:
             exc_info=True,
         )
         return None
+
+
+def unwrap_ai_service(ai_service: Optional[BaseAIService]) -> Optional[BaseAIService]:
+    """The provider service behind the caching and recording wrappers."""
+    while isinstance(ai_service, (CachingAIService, RecordingAIService)):
+        ai_service = ai_service.ai_service
+    return ai_service
+
+
+def _get_router_service(settings: Settings) -> Optional[BaseAIService]:
+    """Create the router over the servers of AI_ROUTER_BACKENDS."""
+    urls = [url.strip() for url in settings.ai.router_backends.split(",")]
+    urls = [url for url in urls if url]
+    if not urls:
+        logger.error("AI_ROUTER_BACKENDS is not configured for the router provider.")
+        return None
+
+    # Each backend makes a single attempt: the router retries on another one
+    backend_settings = settings.model_copy(
+        update={"ai": settings.ai.model_copy(update={"max_retries": 1})}
+    )
+    try:
+        backends = []
+        for url in urls:
+            base_url = url.rstrip("/")
+            if not base_url.endswith("/v1"):
+                base_url += "/v1"
+            name = base_url.split("://", 1)[-1].removesuffix("/v1")
+            service = OpenAIService(
+                settings=backend_settings,
+                api_key=None,
+                base_url=base_url,
+                model_name="local-llamacpp-model",
+                parsing_mode=settings.ai.response_parsing_mode,
+                temperature=settings.ai.temperature,
+                extra_body=get_llamacpp_cache_hints(settings),
+                capabilities=get_structured_output_capabilities(settings),
+                response_schema=get_llamacpp_response_schema(settings),
+            )
+            backends.append(AIBackend(name, service))
+        return RoutingAIService(
+            backends,
+            strategy=settings.ai.router_strategy,
+            hedge_percentile=settings.ai.router_hedge_percentile,
+            unhealthy_seconds=settings.ai.router_unhealthy_seconds,
+            max_attempts=max(settings.ai.max_retries, len(backends)),
+        )
+    except Exception as e:
+        logger.critical(f"Failed to initialize the AI router: {e}", exc_info=True)
+        return None
+
+
+def get_summary_ai_service(
+    settings: Settings, ai_service: Optional[BaseAIService]
+) -> Optional[BaseAIService]:
+    """
+    Get the AI service used to summarize chat history.
+
+    Summaries can be made by a cheaper model: AI_SUMMARY_BASE_URL points at
+    another OpenAI-compatible server (e.g. a small local model) and
+    AI_SUMMARY_MODEL_NAME selects another model. Without either, the main
+    AI service is used.
+    """
+    base_url = settings.ai.summary_base_url
+    model_name = settings.ai.summary_model_name
+    if not base_url and not model_name:
+        return ai_service
+
+    main_service = unwrap_ai_service(ai_service)
+    api_key: Optional[str] = None
+    if base_url:
+        if not base_url.endswith("/v1"):
+            base_url = base_url.rstrip("/") + "/v1"
+        model_name = model_name or "local-summary-model"
+    elif isinstance(main_service, OpenAIService):
+        # Another model of the main provider
+        api_key = main_service.api_key
+        base_url = main_service.base_url
+    else:
+        logger.warning(
+            "AI_SUMMARY_MODEL_NAME needs the main AI service; using it for summaries."
+        )
+        return ai_service
+
+    try:
+        logger.info(f"Configuring history summaries with model '{model_name}'")
+        return OpenAIService(
+            settings=settings,
+            api_key=api_key,
+            base_url=base_url,
+            model_name=cast(str, model_name),
+            parsing_mode="flexible",
+            temperature=0.3,
+        )
+    except Exception as e:
+        logger.error(f"Failed to initialize the summary AI service: {e}")
+        return ai_service
@@ -0,0 +1,254 @@
+"""
+Instrumentation of AI requests.
+
+Every request to an AI service (a get_response call, with its retries and
+structured output fallbacks) is traced: the model calls it made and how long
+each took, the tokens used, the time to the first streamed token, the time
+spent parsing and the path that produced the response. Finished traces are
+aggregated into the metrics exposed at ``/api/metrics``.
+
+Phases of a request:
+- queue: time not spent calling the model or parsing (retry backoff, client
+  overhead)
+- prompt: time to the first streamed token (prompt processing); only
+  observed for streamed requests
+- generation: time calling the model, after the first token when streamed
+- parse: time spent extracting and validating the response
+"""
+
+import functools
+import inspect
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator, List, Optional, TypeVar, cast
+
+from app.utils.metrics import metrics_registry
+
+logger = logging.getLogger(__name__)
+
+TOKEN_SPEED_BUCKETS = (1, 5, 10, 20, 40, 80, 160, 320)
+CALLS_PER_REQUEST_BUCKETS = (1, 2, 3, 4, 6, 9)
+
+request_duration = metrics_registry.histogram(
+    "ai_request_duration_seconds",
+    "Duration of AI requests, including retries and fallbacks",
+    ["model", "outcome"],
+)
+phase_duration = metrics_registry.histogram(
+    "ai_request_phase_seconds",
+    "Time AI requests spend queued, processing the prompt, generating and parsing",
+    ["model", "phase"],
+)
+time_to_first_token = metrics_registry.histogram(
+    "ai_time_to_first_token_seconds",
+    "Time to the first token of streamed AI responses",
+    ["model"],
+)
+tokens_per_second = metrics_registry.histogram(
+    "ai_completion_tokens_per_second",
+    "Generation speed of AI model calls",
+    ["model"],
+    buckets=TOKEN_SPEED_BUCKETS,
+)
+calls_per_request = metrics_registry.histogram(
+    "ai_model_calls_per_request",
+    "Model round trips per AI request (retries and structured output fallbacks)",
+    ["model"],
+    buckets=CALLS_PER_REQUEST_BUCKETS,
+)
+model_calls = metrics_registry.counter(
+    "ai_model_calls_total",
+    "Model round trips by method (function_calling, json_mode, flexible, stream)",
+    ["model", "method"],
+)
+response_paths = metrics_registry.counter(
+    "ai_response_path_total",
+    "AI responses by the method that produced them",
+    ["model", "path"],
+)
+retries = metrics_registry.counter(
+    "ai_retries_total",
+    "Attempts of AI requests after the first one",
+    ["model"],
+)
+response_parses = metrics_registry.counter(
+    "ai_response_parses_total",
+    "AI answers parsed from text, by decoding (constrained to the schema or free) and outcome",
+    ["model", "decoding", "outcome"],
+)
+prompt_tokens = metrics_registry.counter(
+    "ai_prompt_tokens_total", "Prompt tokens sent to the AI", ["model"]
+)
+completion_tokens = metrics_registry.counter(
+    "ai_completion_tokens_total", "Completion tokens generated by the AI", ["model"]
+)
+
+
+@dataclass
+class AIRequestTrace:
+    """What happened during one AI request."""
+
+    model: str
+    started: float = field(default_factory=time.perf_counter)
+    attempts: int = 0
+    methods: List[str] = field(default_factory=list)
+    model_seconds: float = 0.0
+    first_token_seconds: Optional[float] = None
+    parse_seconds: float = 0.0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    path: Optional[str] = None
+
+
+_current_trace: ContextVar[Optional[AIRequestTrace]] = ContextVar(
+    "ai_request_trace", default=None
+)
+
+
+@contextmanager
+def trace_request(model: str) -> Iterator[AIRequestTrace]:
+    """
+    Trace an AI request; the recorded path tells whether it succeeded.
+
+    A request made while another is traced (e.g. the blocking request a
+    failed stream falls back to) is part of the outer request.
+    """
+    outer = _current_trace.get()
+    if outer is not None:
+        yield outer
+        return
+    trace = AIRequestTrace(model=model)
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+        _observe(trace)
+
+
+def current_trace() -> Optional[AIRequestTrace]:
+    return _current_trace.get()
+
+
+def record_attempt() -> None:
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.attempts += 1
+
+
+@contextmanager
+def model_call(method: str) -> Iterator[None]:
+    """Time a round trip to the model."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.methods.append(method)
+            trace.model_seconds += time.perf_counter() - started
+
+
+@contextmanager
+def parsing() -> Iterator[None]:
+    """Time the parsing of a model answer."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.parse_seconds += time.perf_counter() - started
+
+
+def record_first_token(seconds: float) -> None:
+    trace = _current_trace.get()
+    if trace is not None and trace.first_token_seconds is None:
+        trace.first_token_seconds = seconds
+
+
+def record_usage(message: Any) -> None:
+    """Count the tokens reported in the usage metadata of a model message."""
+    trace = _current_trace.get()
+    usage = getattr(message, "usage_metadata", None)
+    if trace is None or not usage:
+        return
+    trace.prompt_tokens += int(usage.get("input_tokens", 0) or 0)
+    trace.completion_tokens += int(usage.get("output_tokens", 0) or 0)
+
+
+def record_parse(model: str, constrained: bool, success: bool) -> None:
+    """Count an answer parsed from text, to compare parse failure rates."""
+    response_parses.inc(
+        model=model,
+        decoding="constrained" if constrained else "free",
+        outcome="success" if success else "failure",
+    )
+
+
+def record_path(path: str) -> None:
+    """Record the method that produced the response."""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.path = path
+
+
+def _observe(trace: AIRequestTrace) -> None:
+    model = trace.model
+    total = time.perf_counter() - trace.started
+    outcome = "success" if trace.path else "failure"
+    request_duration.observe(total, model=model, outcome=outcome)
+
+    generation = trace.model_seconds
+    if trace.first_token_seconds is not None:
+        time_to_first_token.observe(trace.first_token_seconds, model=model)
+        phase_duration.observe(trace.first_token_seconds, model=model, phase="prompt")
+        generation = max(0.0, generation - trace.first_token_seconds)
+    phase_duration.observe(generation, model=model, phase="generation")
+    phase_duration.observe(trace.parse_seconds, model=model, phase="parse")
+    queue = max(0.0, total - trace.model_seconds - trace.parse_seconds)
+    phase_duration.observe(queue, model=model, phase="queue")
+
+    calls_per_request.observe(len(trace.methods), model=model)
+    for method in trace.methods:
+        model_calls.inc(model=model, method=method)
+    if trace.path:
+        response_paths.inc(model=model, path=trace.path)
+    if trace.attempts > 1:
+        retries.inc(trace.attempts - 1, model=model)
+
+    prompt_tokens.inc(trace.prompt_tokens, model=model)
+    completion_tokens.inc(trace.completion_tokens, model=model)
+    if trace.completion_tokens and generation > 0:
+        tokens_per_second.observe(trace.completion_tokens / generation, model=model)
+
+    logger.debug(
+        f"AI request {outcome} in {total:.2f}s: {len(trace.methods)} model calls "
+        f"({', '.join(trace.methods) or 'none'}), path {trace.path}, "
+        f"{trace.prompt_tokens}+{trace.completion_tokens} tokens"
+    )
+
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def traced_request(method: F) -> F:
+    """Trace each call of an AI service method as one request."""
+    if inspect.iscoroutinefunction(method):
+
+        @functools.wraps(method)
+        async def atraced(self: Any, *args: Any, **kwargs: Any) -> Any:
+            with trace_request(getattr(self, "model_name", "unknown")):
+                return await method(self, *args, **kwargs)
+
+        return cast(F, atraced)
+
+    @functools.wraps(method)
+    def traced(self: Any, *args: Any, **kwargs: Any) -> Any:
+        with trace_request(getattr(self, "model_name", "unknown")):
+            return method(self, *args, **kwargs)
+
+    return cast(F, traced)
@@ -2,22 +2,38 @@
 OpenAI-compatible AI service implementation using LangChain.
 """
 
+import asyncio
 import logging
 import time
-from typing import List, Optional
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
+import httpx
 from langchain_core.exceptions import OutputParserException
+from langchain_core.language_models import LanguageModelInput
 from langchain_core.messages import BaseMessage
+from langchain_core.runnables import Runnable, RunnableConfig
 from langchain_openai import ChatOpenAI
 from pydantic import ValidationError
 
 from app.models.common import MessageDict
+from app.providers.ai import metrics as ai_metrics
 from app.providers.ai.base import BaseAIService
+from app.providers.ai.capabilities import (
+    STRUCTURED_OUTPUT_METHODS,
+    StructuredOutputCapabilities,
+    StructuredOutputMethod,
+    is_unsupported_error,
+)
 from app.providers.ai.schemas import AIResponse
 from app.settings import Settings
 from app.utils.message_converter import MessageConverter
+from app.utils.narrative_stream_parser import NarrativeStreamParser
 from app.utils.robust_json_parser import RobustJsonOutputParser
-from app.utils.token_monitor import CompletionTokenMonitor
+from app.utils.token_monitor import (
+    CompletionTokenMonitor,
+    current_token_monitor,
+    request_token_monitor,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -25,10 +41,47 @@ logger = logging.getLogger(__name__)
 logging.getLogger("openai._base_client").setLevel(logging.WARNING)
 
 
+class _StreamCollector:
+    """Collects streamed response text and reports the narrative as it arrives."""
+
+    def __init__(self, on_narrative_chunk: Callable[[str], None]) -> None:
+        self.on_narrative_chunk = on_narrative_chunk
+        self.parser = NarrativeStreamParser()
+        self.parts: List[str] = []
+        self.started = time.monotonic()
+        self.first_narrative_at: Optional[float] = None
+
+    def add(self, content: Any) -> None:
+        text = OpenAIService._chunk_text(content)
+        if not text:
+            return
+        if not self.parts:
+            ai_metrics.record_first_token(time.monotonic() - self.started)
+        self.parts.append(text)
+        narrative = self.parser.feed(text)
+        if narrative:
+            if self.first_narrative_at is None:
+                self.first_narrative_at = time.monotonic()
+                logger.info(
+                    "First narrative text after "
+                    f"{self.first_narrative_at - self.started:.2f}s"
+                )
+            self.on_narrative_chunk(narrative)
+
+    @property
+    def content(self) -> str:
+        return "".join(self.parts)
+
+
 class OpenAIService(BaseAIService):
     """
     OpenAI-compatible AI service implementation using LangChain's ChatOpenAI client.
     Supports both strict (structured output) and flexible (JSON parsing) modes.
+
+    Blocking calls (get_response) use a synchronous client. The async methods
+    (aget_response) use an async client whose keep-alive connection pool is
+    shared by all requests on the running event loop, so waiting for the AI
+    does not hold a thread.
     """
 
     def __init__(
@@ -39,6 +92,9 @@ class OpenAIService(BaseAIService):
         model_name: str,
         parsing_mode: str = "strict",
         temperature: float = 0.7,
+        extra_body: Optional[Dict[str, Any]] = None,
+        capabilities: Optional[StructuredOutputCapabilities] = None,
+        response_schema: Optional[Dict[str, Any]] = None,
     ):
         """
         Initialize the AI service.
@@ -50,27 +106,32 @@ class OpenAIService(BaseAIService):
             model_name: Name of the model to use
             parsing_mode: 'strict' for structured output, 'flexible' for JSON parsing
             temperature: Temperature for generation
+            extra_body: Provider specific fields added to every request body
+                (e.g. Llama.cpp prompt cache hints)
+            capabilities: Structured output methods known to fail for a model,
+                skipped in strict mode (without it every method is tried)
+            response_schema: JSON schema the server constrains answers parsed
+                from text to (Llama.cpp ``json_schema``), so they always parse
         """
         self.settings = settings
         self.model_name = model_name
         self.base_url = base_url
         self.parsing_mode = parsing_mode
         self.temperature = temperature
-
-        # Initialize token monitor callback
-        self.token_monitor = CompletionTokenMonitor()
-        self.callbacks = [self.token_monitor]
+        self._api_key = api_key
+        self.extra_body = extra_body
+        self.capabilities = capabilities
+        self.response_schema = response_schema
 
         # Initialize ChatOpenAI client
-        self.llm = ChatOpenAI(
-            api_key=api_key or "dummy",  # Some providers need non-None
-            base_url=base_url,
-            model=model_name,
-            temperature=temperature,
-            callbacks=self.callbacks,
-            max_retries=0,  # We handle retries ourselves
-            request_timeout=float(settings.ai.request_timeout),
-        )
+        self.llm = self._create_llm()
+
+        # Async client, created on first use for the running event loop
+        self._async_llm: Optional[ChatOpenAI] = None
+        self._async_http_client: Optional[httpx.AsyncClient] = None
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Closing of clients replaced when the event loop changed
+        self._closing: Set["asyncio.Future[None]"] = set()
 
         # Initialize parser for flexible mode
         self.robust_parser: RobustJsonOutputParser = RobustJsonOutputParser(
@@ -78,22 +139,122 @@ class OpenAIService(BaseAIService):
         )
 
         logger.info(
-            f"Initialized OpenAIService - Model: {model_name}, "
+            f"Initialized OpenAIService - Model: {self.model_name}, "
             f"Mode: {self.parsing_mode}, Temperature: {temperature}"
+            + (", Constrained decoding" if response_schema else "")
         )
 
-    def get_response(self, messages: List[MessageDict]) -> Optional[AIResponse]:
+    @property
+    def api_key(self) -> Optional[str]:
+        """API key sent to the provider, e.g. to reuse it for another model."""
+        return self._api_key
+
+    def _create_llm(
+        self, http_async_client: Optional[httpx.AsyncClient] = None
+    ) -> ChatOpenAI:
+        """Create a ChatOpenAI client for the configured endpoint."""
+        return ChatOpenAI(
+            api_key=self._api_key or "dummy",  # Some providers need non-None
+            base_url=self.base_url,
+            model=self.model_name,
+            temperature=self.temperature,
+            max_retries=0,  # We handle retries ourselves
+            request_timeout=float(self.settings.ai.request_timeout),
+            http_async_client=http_async_client,
+            extra_body=self.extra_body,
+        )
+
+    @staticmethod
+    def _call_config() -> RunnableConfig:
+        """Config of a model call, counting its tokens for the current request."""
+        monitor = current_token_monitor()
+        return RunnableConfig(callbacks=[monitor] if monitor is not None else [])
+
+    def _constrained(
+        self, llm: ChatOpenAI
+    ) -> Runnable[LanguageModelInput, BaseMessage]:
+        """The client for answers parsed from text, constrained to the schema."""
+        if self.response_schema is None:
+            return llm
+        return llm.bind(
+            extra_body={**(self.extra_body or {}), "json_schema": self.response_schema}
+        )
+
+    def _get_async_llm(self) -> ChatOpenAI:
         """
-        Send messages to the AI and return the parsed response.
+        Get the async client for the running event loop.
 
-        Args:
-            messages: List of message dictionaries with 'role' and 'content' keys
+        Connections of an httpx pool belong to the loop that opened them, so
+        the client (and its pool) is recreated if called from another loop,
+        and the previous one is closed.
+        """
+        loop = asyncio.get_running_loop()
+        if self._async_llm is None or self._async_loop is not loop:
+            if self._async_http_client is not None:
+                self._close_replaced_client(self._async_http_client, self._async_loop)
+            max_connections = self.settings.ai.http_max_connections
+            self._async_http_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_connections,
+                    keepalive_expiry=self.settings.ai.http_keepalive_expiry,
+                ),
+                timeout=float(self.settings.ai.request_timeout),
+            )
+            self._async_llm = self._create_llm(self._async_http_client)
+            self._async_loop = loop
+            logger.debug(
+                f"Created async AI client with up to {max_connections} pooled connections"
+            )
+        return self._async_llm
 
-        Returns:
-            Parsed AIResponse or None if all attempts fail
+    def _close_replaced_client(
+        self,
+        http_client: httpx.AsyncClient,
+        loop: Optional[asyncio.AbstractEventLoop],
+    ) -> None:
         """
+        Close an async client replaced because the event loop changed.
+
+        It is closed on the loop that opened its connections while that loop
+        still runs (in another thread), otherwise on the running loop.
+        """
+        future: "asyncio.Future[None]"
+        if loop is not None and loop.is_running() and not loop.is_closed():
+            future = asyncio.wrap_future(
+                asyncio.run_coroutine_threadsafe(http_client.aclose(), loop)
+            )
+        else:
+            future = asyncio.ensure_future(http_client.aclose())
+        self._closing.add(future)
+        future.add_done_callback(self._closed_replaced_client)
+
+    def _closed_replaced_client(self, future: "asyncio.Future[None]") -> None:
+        self._closing.discard(future)
+        if not future.cancelled() and future.exception() is not None:
+            logger.debug(
+                f"Closing replaced async AI client failed: {future.exception()}"
+            )
+
+    async def aclose(self) -> None:
+        """Close the pooled connections of the async client."""
+        http_client = self._async_http_client
+        self._async_llm = None
+        self._async_http_client = None
+        self._async_loop = None
+        loop = asyncio.get_running_loop()
+        closing = [f for f in self._closing if f.get_loop() is loop]
+        if closing:
+            await asyncio.gather(*closing, return_exceptions=True)
+        if http_client is not None:
+            await http_client.aclose()
+
+    def _prepare_messages(
+        self, messages: List[MessageDict], caller: str
+    ) -> Optional[List[BaseMessage]]:
+        """Validate and convert messages to LangChain format."""
         if not messages:
-            logger.error("No messages provided to get_response")
+            logger.error(f"No messages provided to {caller}")
             return None
 
         # Convert to LangChain format
@@ -109,44 +270,274 @@ class OpenAIService(BaseAIService):
             f"Sending AI request: {len(messages)} messages (~{int(approx_tokens)} tokens) "
             f"to {self.model_name}"
         )
+        return lc_messages
+
+    def _retry_delay_after_empty(
+        self, attempt: int, retry_delay: float, monitor: CompletionTokenMonitor
+    ) -> Tuple[Optional[float], float]:
+        """
+        Decide how long to wait after an attempt without a valid response.
+
+        Args:
+            attempt: Index of the failed attempt
+            retry_delay: Current retry delay
+            monitor: Token monitor of the request
+
+        Returns:
+            Seconds to wait before the next attempt (None if it was the last
+            attempt) and the retry delay to use from now on
+        """
+        is_last = attempt >= self.settings.ai.max_retries - 1
+        # Check for rate limiting
+        if monitor.last_completion_tokens == 0:
+            logger.warning(
+                f"Attempt {attempt + 1} detected rate limiting. "
+                f"Waiting {retry_delay} seconds before retry..."
+            )
+            if is_last:
+                return None, retry_delay
+            # Increase delay for subsequent retries
+            return float(retry_delay), 10.0
+        logger.warning(f"Attempt {attempt + 1} returned empty response")
+        # Short delay for non-rate-limit failures
+        return (None if is_last else 2.0), retry_delay
+
+    @ai_metrics.traced_request
+    def get_response(self, messages: List[MessageDict]) -> Optional[AIResponse]:
+        """
+        Send messages to the AI and return the parsed response.
+
+        Args:
+            messages: List of message dictionaries with 'role' and 'content' keys
+
+        Returns:
+            Parsed AIResponse or None if all attempts fail
+        """
+        lc_messages = self._prepare_messages(messages, "get_response")
+        if lc_messages is None:
+            return None
 
         # Retry logic with rate limit detection
         max_retries = self.settings.ai.max_retries
         retry_delay = self.settings.ai.retry_delay
 
-        for attempt in range(max_retries):
-            try:
-                # Reset token monitor for this attempt
-                self.token_monitor.reset()
+        with request_token_monitor() as monitor:
+            for attempt in range(max_retries):
+                ai_metrics.record_attempt()
+                try:
+                    # Reset token monitor for this attempt
+                    monitor.reset()
 
-                response = self._get_response_attempt(lc_messages)
-                if response:
-                    return response
+                    response = self._get_response_attempt(lc_messages)
+                    if response:
+                        return response
 
-                # Check for rate limiting
-                if self.token_monitor.last_completion_tokens == 0:
-                    logger.warning(
-                        f"Attempt {attempt + 1} detected rate limiting. "
-                        f"Waiting {retry_delay} seconds before retry..."
+                    wait, retry_delay = self._retry_delay_after_empty(
+                        attempt, retry_delay, monitor
+                    )
+                    if wait is not None:
+                        time.sleep(wait)
+
+                except Exception as e:
+                    logger.error(
+                        f"Error in get_response attempt {attempt + 1}: {e}",
+                        exc_info=True,
                     )
                     if attempt < max_retries - 1:
                         time.sleep(float(retry_delay))
-                        retry_delay = 10.0  # Increase delay for subsequent retries
-                else:
-                    logger.warning(f"Attempt {attempt + 1} returned empty response")
-                    if attempt < max_retries - 1:
-                        time.sleep(2.0)  # Short delay for non-rate-limit failures
 
-            except Exception as e:
-                logger.error(
-                    f"Error in get_response attempt {attempt + 1}: {e}", exc_info=True
-                )
-                if attempt < max_retries - 1:
-                    time.sleep(float(retry_delay))
+        logger.error(f"All {max_retries} attempts failed to get a valid response")
+        return None
+
+    @ai_metrics.traced_request
+    async def aget_response(self, messages: List[MessageDict]) -> Optional[AIResponse]:
+        """
+        Send messages to the AI without blocking a thread.
+
+        Same retry policy as get_response, but requests go through the pooled
+        async client and backoff uses asyncio.sleep. Cancelling the calling
+        task (e.g. when the client disconnects) aborts the in-flight request.
+
+        Args:
+            messages: List of message dictionaries with 'role' and 'content' keys
+
+        Returns:
+            Parsed AIResponse or None if all attempts fail
+        """
+        lc_messages = self._prepare_messages(messages, "aget_response")
+        if lc_messages is None:
+            return None
+
+        max_retries = self.settings.ai.max_retries
+        retry_delay = self.settings.ai.retry_delay
+
+        with request_token_monitor() as monitor:
+            for attempt in range(max_retries):
+                ai_metrics.record_attempt()
+                try:
+                    monitor.reset()
+
+                    response = await self._aget_response_attempt(lc_messages)
+                    if response:
+                        return response
+
+                    wait, retry_delay = self._retry_delay_after_empty(
+                        attempt, retry_delay, monitor
+                    )
+                    if wait is not None:
+                        await asyncio.sleep(wait)
+
+                except Exception as e:
+                    logger.error(
+                        f"Error in aget_response attempt {attempt + 1}: {e}",
+                        exc_info=True,
+                    )
+                    if attempt < max_retries - 1:
+                        await asyncio.sleep(float(retry_delay))
 
         logger.error(f"All {max_retries} attempts failed to get a valid response")
         return None
 
+    @ai_metrics.traced_request
+    def get_text_response(self, messages: List[MessageDict]) -> Optional[str]:
+        """
+        Send messages to the AI and return the text of its answer, unparsed.
+
+        Args:
+            messages: List of message dictionaries with 'role' and 'content' keys
+
+        Returns:
+            The answer text or None on error
+        """
+        lc_messages = self._prepare_messages(messages, "get_text_response")
+        if lc_messages is None:
+            return None
+        try:
+            logger.info(f"Sending text request to {self.model_name}...")
+            with request_token_monitor(), ai_metrics.model_call("text"):
+                response = self.llm.invoke(lc_messages, self._call_config())
+            ai_metrics.record_usage(response)
+        except Exception as e:
+            logger.error(f"Text request failed: {e}", exc_info=True)
+            return None
+        text = self._chunk_text(response.content).strip()
+        if text:
+            ai_metrics.record_path("text")
+        return text or None
+
+    @ai_metrics.traced_request
+    def get_streaming_response(
+        self,
+        messages: List[MessageDict],
+        on_narrative_chunk: Callable[[str], None],
+    ) -> Optional[AIResponse]:
+        """
+        Stream the response, reporting narrative text as it is generated.
+
+        The raw JSON is streamed as plain completion content and the narrative
+        field is decoded incrementally. The complete text is parsed into an
+        AIResponse once the stream ends. If streaming fails or the result
+        cannot be parsed, the blocking request (with its retries) is used.
+
+        Args:
+            messages: List of message dictionaries with 'role' and 'content' keys
+            on_narrative_chunk: Callback receiving narrative text increments
+
+        Returns:
+            Parsed AIResponse or None if all attempts fail
+        """
+        lc_messages = self._prepare_messages(messages, "get_streaming_response")
+        if lc_messages is None:
+            return None
+
+        collector = _StreamCollector(on_narrative_chunk)
+        try:
+            with request_token_monitor(), ai_metrics.model_call("stream"):
+                llm = self._constrained(self.llm)
+                for chunk in llm.stream(lc_messages, self._call_config()):
+                    collector.add(chunk.content)
+                    ai_metrics.record_usage(chunk)
+        except Exception as e:
+            logger.warning(f"Streaming request failed, retrying without streaming: {e}")
+            return self.get_response(messages)
+
+        response = self._parse_streamed(collector)
+        if response is None:
+            return self.get_response(messages)
+        return response
+
+    @ai_metrics.traced_request
+    async def aget_streaming_response(
+        self,
+        messages: List[MessageDict],
+        on_narrative_chunk: Callable[[str], None],
+    ) -> Optional[AIResponse]:
+        """
+        Async variant of get_streaming_response using the pooled async client.
+
+        Args:
+            messages: List of message dictionaries with 'role' and 'content' keys
+            on_narrative_chunk: Callback receiving narrative text increments
+
+        Returns:
+            Parsed AIResponse or None if all attempts fail
+        """
+        lc_messages = self._prepare_messages(messages, "aget_streaming_response")
+        if lc_messages is None:
+            return None
+
+        collector = _StreamCollector(on_narrative_chunk)
+        try:
+            with request_token_monitor(), ai_metrics.model_call("stream"):
+                llm = self._constrained(self._get_async_llm())
+                async for chunk in llm.astream(lc_messages, self._call_config()):
+                    collector.add(chunk.content)
+                    ai_metrics.record_usage(chunk)
+        except Exception as e:
+            logger.warning(f"Streaming request failed, retrying without streaming: {e}")
+            return await self.aget_response(messages)
+
+        response = self._parse_streamed(collector)
+        if response is None:
+            return await self.aget_response(messages)
+        return response
+
+    def _parse_streamed(self, collector: _StreamCollector) -> Optional[AIResponse]:
+        """Parse the complete text of a streamed response."""
+        content = collector.content
+        logger.debug(f"Received streamed response content:\n{content}")
+        response = (
+            self._parse_flexible(content, free_form=True) if content.strip() else None
+        )
+        if response is None:
+            logger.warning(
+                "Streamed response could not be parsed, retrying without streaming"
+            )
+            return None
+
+        logger.info(
+            "Streamed response complete after "
+            f"{time.monotonic() - collector.started:.2f}s"
+        )
+        ai_metrics.record_path("stream")
+        return response
+
+    @staticmethod
+    def _chunk_text(content: Any) -> str:
+        """Extract the text of a streamed message chunk."""
+        if isinstance(content, str):
+            return content
+        if isinstance(content, list):
+            return "".join(
+                item
+                if isinstance(item, str)
+                else str(item.get("text", ""))
+                if isinstance(item, dict)
+                else ""
+                for item in content
+            )
+        return ""
+
     def _get_response_attempt(
         self, messages: List[BaseMessage]
     ) -> Optional[AIResponse]:
@@ -171,11 +562,25 @@ class OpenAIService(BaseAIService):
             logger.error(f"Error in _get_response_attempt: {e}", exc_info=True)
             return None
 
+    async def _aget_response_attempt(
+        self, messages: List[BaseMessage]
+    ) -> Optional[AIResponse]:
+        """Async variant of _get_response_attempt."""
+        try:
+            if self.parsing_mode == "strict":
+                return await self._aget_structured_response(messages)
+            else:
+                return await self._aget_flexible_response(messages)
+
+        except Exception as e:
+            logger.error(f"Error in _aget_response_attempt: {e}", exc_info=True)
+            return None
+
     def _get_structured_response(
         self, messages: List[BaseMessage]
     ) -> Optional[AIResponse]:
         """
-        Get response using structured output (function calling).
+        Get response using structured output (function calling, then JSON mode).
         Falls back to flexible parsing if structured output fails.
 
         Args:
@@ -191,63 +596,26 @@ class OpenAIService(BaseAIService):
 
             # Note: Removed OpenAI beta.parse optimization for simplicity
 
-            # Try structured output with function calling
-            try:
-                structured_llm = self.llm.with_structured_output(
-                    AIResponse, method="function_calling", include_raw=True
-                )
-
-                result = structured_llm.invoke(messages)
-            except Exception as e:
-                # Some models/providers don't support function calling (e.g., Gemini via OpenRouter)
-                logger.warning(
-                    f"Function calling failed, trying JSON mode: {str(e)[:100]}"
-                )
-                # Try with json_mode instead
+            for method in self._structured_output_methods():
                 try:
                     structured_llm = self.llm.with_structured_output(
-                        AIResponse, method="json_mode", include_raw=True
+                        AIResponse, method=method, include_raw=True
                     )
-                    result = structured_llm.invoke(messages)
-                except Exception as e2:
-                    logger.warning(f"JSON mode also failed: {str(e2)[:100]}")
-                    # Fall back to flexible parsing
-                    return self._get_flexible_response(messages)
-
-            # Check if we got a parsed result
-            if isinstance(result, dict) and result.get("parsed"):
-                logger.info("Successfully received structured response")
-                parsed = result["parsed"]
-                if isinstance(parsed, AIResponse):
-                    return parsed
-                return None
-
-            # If no parsed result but we have raw, try flexible parsing
-            if isinstance(result, dict) and result.get("raw"):
-                logger.warning(
-                    "Structured output failed, falling back to flexible parsing"
-                )
-                raw = result["raw"]
-                # Extract content from raw response
-                if hasattr(raw, "content"):
-                    content = raw.content
-                else:
-                    content = str(raw)
-                return self._parse_flexible(content)
-
-            # If result is directly an AIResponse (some implementations might do this)
-            if isinstance(result, AIResponse):
-                logger.info("Successfully received structured response (direct)")
-                return result
-
-            logger.error(
-                f"Unexpected result format from structured output: {type(result)}"
-            )
+                    with ai_metrics.model_call(method):
+                        result = structured_llm.invoke(messages, self._call_config())
+                except Exception as e:
+                    # Some models/providers don't support function calling (e.g., Gemini via OpenRouter)
+                    self._structured_output_failed(method, e)
+                    continue
+
+                handled, response = self._interpret_structured_result(result, method)
+                if handled:
+                    return response
+                # An unexpected result is not a rejection, so it is not
+                # remembered against the method
+                break
 
             # Last resort: try calling without structured output
-            logger.warning(
-                "Falling back to flexible mode due to structured output issues"
-            )
             return self._get_flexible_response(messages)
 
         except NotImplementedError:
@@ -262,6 +630,130 @@ class OpenAIService(BaseAIService):
             # Fall back to flexible mode
             return self._get_flexible_response(messages)
 
+    async def _aget_structured_response(
+        self, messages: List[BaseMessage]
+    ) -> Optional[AIResponse]:
+        """Async variant of _get_structured_response."""
+        llm = self._get_async_llm()
+        try:
+            logger.info(
+                f"Sending request to {self.model_name} (Strict/Structured Mode, async)..."
+            )
+            for method in self._structured_output_methods():
+                try:
+                    structured_llm = llm.with_structured_output(
+                        AIResponse, method=method, include_raw=True
+                    )
+                    with ai_metrics.model_call(method):
+                        result = await structured_llm.ainvoke(
+                            messages, self._call_config()
+                        )
+                except Exception as e:
+                    self._structured_output_failed(method, e)
+                    continue
+
+                handled, response = self._interpret_structured_result(result, method)
+                if handled:
+                    return response
+                # An unexpected result is not a rejection, so it is not
+                # remembered against the method
+                break
+
+            return await self._aget_flexible_response(messages)
+
+        except NotImplementedError:
+            logger.warning(
+                f"Model {self.model_name} doesn't support structured output, "
+                "falling back to flexible mode"
+            )
+            return await self._aget_flexible_response(messages)
+        except Exception as e:
+            logger.error(f"Structured output failed: {e}")
+            return await self._aget_flexible_response(messages)
+
+    def _structured_output_methods(self) -> List[StructuredOutputMethod]:
+        """Structured output methods to try, without those known to fail."""
+        if self.capabilities is None:
+            return list(STRUCTURED_OUTPUT_METHODS)
+        methods = self.capabilities.methods_to_try(self.base_url or "", self.model_name)
+        if not methods:
+            logger.debug(
+                f"No structured output method works for {self.model_name}, "
+                "using flexible mode"
+            )
+        return methods
+
+    def _structured_output_failed(
+        self, method: StructuredOutputMethod, error: Exception
+    ) -> None:
+        """Log a failed structured output call and remember unsupported methods."""
+        logger.warning(f"Structured output with {method} failed: {str(error)[:100]}")
+        if is_unsupported_error(error):
+            self._record_capability(method, supported=False)
+
+    def _record_capability(
+        self, method: StructuredOutputMethod, supported: bool
+    ) -> None:
+        if self.capabilities is None:
+            return
+        provider = self.base_url or ""
+        if supported:
+            self.capabilities.record_success(provider, self.model_name, method)
+        else:
+            self.capabilities.record_failure(provider, self.model_name, method)
+
+    def _interpret_structured_result(
+        self, result: Any, method: StructuredOutputMethod
+    ) -> Tuple[bool, Optional[AIResponse]]:
+        """
+        Extract the AIResponse from a structured output result.
+
+        Args:
+            result: Result of the structured output call
+            method: Structured output method that produced it
+
+        Returns:
+            Whether the result could be handled, and the parsed response. An
+            unhandled result should be retried in flexible mode.
+        """
+        if isinstance(result, dict):
+            ai_metrics.record_usage(result.get("raw"))
+
+        # Check if we got a parsed result
+        if isinstance(result, dict) and result.get("parsed"):
+            logger.info("Successfully received structured response")
+            parsed = result["parsed"]
+            if isinstance(parsed, AIResponse):
+                ai_metrics.record_path(method)
+                self._record_capability(method, supported=True)
+                return True, parsed
+            return True, None
+
+        # If no parsed result but we have raw, try flexible parsing
+        if isinstance(result, dict) and result.get("raw"):
+            logger.warning("Structured output failed, falling back to flexible parsing")
+            raw = result["raw"]
+            # Extract content from raw response
+            if hasattr(raw, "content"):
+                content = raw.content
+            else:
+                content = str(raw)
+            response = self._parse_flexible(content)
+            if response is not None:
+                ai_metrics.record_path(f"{method}_raw")
+            return True, response
+
+        # If result is directly an AIResponse (some implementations might do this)
+        if isinstance(result, AIResponse):
+            logger.info("Successfully received structured response (direct)")
+            ai_metrics.record_path(method)
+            self._record_capability(method, supported=True)
+            return True, result
+
+        logger.error(f"Unexpected result format from structured output: {type(result)}")
+        logger.warning("Falling back to flexible mode due to structured output issues")
+        return False, None
+
     def _get_flexible_response(
         self, messages: List[BaseMessage]
     ) -> Optional[AIResponse]:
@@ -278,55 +770,113 @@ class OpenAIService(BaseAIService):
             logger.info(f"Sending request to {self.model_name} (Flexible Mode)...")
 
             # Get raw response
-            response = self.llm.invoke(messages)
+            with ai_metrics.model_call("flexible"):
+                response = self._constrained(self.llm).invoke(
+                    messages, self._call_config()
+                )
+            return self._parse_flexible_message(response)
 
-            # Extract content
-            if hasattr(response, "content"):
-                content = response.content
-            else:
-                content = str(response)
+        except Exception as e:
+            logger.error(f"Flexible mode error: {e}", exc_info=True)
+            return None
 
-            logger.debug(f"Received raw response content (Flexible Mode):\n{content}")
+    async def _aget_flexible_response(
+        self, messages: List[BaseMessage]
+    ) -> Optional[AIResponse]:
+        """Async variant of _get_flexible_response."""
+        try:
+            logger.info(
+                f"Sending request to {self.model_name} (Flexible Mode, async)..."
+            )
+            with ai_metrics.model_call("flexible"):
+                llm = self._constrained(self._get_async_llm())
+                response = await llm.ainvoke(messages, self._call_config())
+            return self._parse_flexible_message(response)
 
-            # Check for empty response and ensure content is string
-            if not content:
-                logger.warning("AI returned empty response content")
-                return None
+        except Exception as e:
+            logger.error(f"Flexible mode error: {e}", exc_info=True)
+            return None
 
-            # Handle case where content might be a list (some providers do this)
-            if isinstance(content, list):
-                # Try to find the actual content string
-                content_str = ""
-                for item in content:
-                    if isinstance(item, str):
-                        content_str = item
-                        break
-                    elif isinstance(item, dict) and "text" in item:
-                        content_str = item["text"]
-                        break
-                if not content_str:
-                    logger.error(
-                        f"Could not extract string content from list: {content}"
-                    )
-                    return None
-                content = content_str
+    def _parse_flexible_message(self, response: Any) -> Optional[AIResponse]:
+        """
+        Extract the text of a raw AI message and parse it into an AIResponse.
 
-            # Ensure content is string and not empty
-            if not isinstance(content, str) or content.strip() == "":
-                logger.warning(f"AI returned invalid or empty content: {type(content)}")
-                return None
+        Args:
+            response: Message returned by the chat model
+
+        Returns:
+            Parsed AIResponse or None
+        """
+        ai_metrics.record_usage(response)
 
-            # Parse using our robust parser
-            return self._parse_flexible(content)
+        # Extract content
+        if hasattr(response, "content"):
+            content = response.content
+        else:
+            content = str(response)
 
-        except Exception as e:
-            logger.error(f"Flexible mode error: {e}", exc_info=True)
+        logger.debug(f"Received raw response content (Flexible Mode):\n{content}")
+
+        # Check for empty response and ensure content is string
+        if not content:
+            logger.warning("AI returned empty response content")
             return None
 
-    def _parse_flexible(self, content: str) -> Optional[AIResponse]:
+        # Handle case where content might be a list (some providers do this)
+        if isinstance(content, list):
+            # Try to find the actual content string
+            content_str = ""
+            for item in content:
+                if isinstance(item, str):
+                    content_str = item
+                    break
+                elif isinstance(item, dict) and "text" in item:
+                    content_str = item["text"]
+                    break
+            if not content_str:
+                logger.error(f"Could not extract string content from list: {content}")
+                return None
+            content = content_str
+
+        # Ensure content is string and not empty
+        if not isinstance(content, str) or content.strip() == "":
+            logger.warning(f"AI returned invalid or empty content: {type(content)}")
+            return None
+
+        # Parse using our robust parser
+        parsed = self._parse_flexible(content, free_form=True)
+        if parsed is not None:
+            ai_metrics.record_path("flexible")
+        return parsed
+
+    def _parse_flexible(
+        self, content: str, free_form: bool = False
+    ) -> Optional[AIResponse]:
         """
         Parse raw text content into AIResponse using robust JSON parser.
 
+        Args:
+            content: Raw text content from the AI
+            free_form: Whether the content answers a request without
+                structured output (counted in the parse failure rates)
+
+        Returns:
+            Parsed AIResponse or None
+        """
+        with ai_metrics.parsing():
+            response = self._parse_flexible_content(content)
+        if free_form:
+            ai_metrics.record_parse(
+                self.model_name,
+                constrained=self.response_schema is not None,
+                success=response is not None,
+            )
+        return response
+
+    def _parse_flexible_content(self, content: str) -> Optional[AIResponse]:
+        """
+        Extract and validate the JSON of the AI answer.
+
         Args:
             content: Raw text content from the AI
 
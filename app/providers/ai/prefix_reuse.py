@@ -0,0 +1,94 @@
+"""
+Tracking of how much of a prompt repeats the previous prompt of a session.
+
+Servers with a prompt cache (e.g. Llama.cpp with ``cache_prompt``) only need
+to evaluate the tokens after the longest prefix shared with the prompt they
+processed last. The tracker remembers the last prompt of each session and
+reports the share of the new prompt covered by that common prefix, which is
+an estimate of the prompt cache hit rate.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+
+class PrefixReuse(NamedTuple):
+    """Common prefix of a prompt and the previous prompt of its session."""
+
+    reused_messages: int
+    reused_tokens: int
+    total_tokens: int
+
+    @property
+    def ratio(self) -> float:
+        """Share of the prompt tokens covered by the common prefix."""
+        if self.total_tokens <= 0:
+            return 0.0
+        return self.reused_tokens / self.total_tokens
+
+
+class PrefixReuseTracker:
+    """Remembers the last prompt per session to measure prefix reuse.
+
+    Only a hash and the token count of each message are kept, for at most
+    ``max_sessions`` sessions. Python's string hash is cached on the string,
+    so hashing history messages that are reused between prompts is cheap.
+    """
+
+    def __init__(self, max_sessions: int = 64) -> None:
+        self.max_sessions = max_sessions
+        self._prompts: "OrderedDict[str, List[Tuple[int, int]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _digest(role: str, content: str) -> int:
+        return hash((role, content))
+
+    def record(
+        self,
+        key: str,
+        messages: Sequence[Tuple[str, str]],
+        token_counts: Sequence[int],
+    ) -> Optional[PrefixReuse]:
+        """Store a prompt and compare it with the previous one for ``key``.
+
+        Args:
+            key: Session the prompt belongs to
+            messages: (role, content) of each prompt message
+            token_counts: Token count of each message
+
+        Returns:
+            The reuse relative to the previous prompt, or None for the first
+            prompt of the session
+        """
+        current = [
+            (self._digest(role, content), tokens)
+            for (role, content), tokens in zip(messages, token_counts)
+        ]
+        with self._lock:
+            previous = self._prompts.pop(key, None)
+            self._prompts[key] = current
+            while len(self._prompts) > self.max_sessions:
+                self._prompts.popitem(last=False)
+
+        if previous is None:
+            return None
+
+        reused_messages = 0
+        reused_tokens = 0
+        for (digest, tokens), (previous_digest, _) in zip(current, previous):
+            if digest != previous_digest:
+                break
+            reused_messages += 1
+            reused_tokens += tokens
+        return PrefixReuse(
+            reused_messages=reused_messages,
+            reused_tokens=reused_tokens,
+            total_tokens=sum(tokens for _, tokens in current),
+        )
+
+    def clear(self) -> None:
+        """Forget all remembered prompts."""
+        with self._lock:
+            self._prompts.clear()
@@ -1,24 +1,49 @@
 """
 Prompt builder implementation using LangChain for token-aware message truncation.
-Uses ChatPromptTemplate and trim_messages for intelligent context management.
+Uses ChatPromptTemplate for the message layout. Formatted history messages and
+their token counts are cached per campaign, and the history that fits the
+token budget is found by binary search over running token sums. History that
+does not fit is replaced by the campaign's history summaries, if any.
+
+Two message layouts are available. The default layout places the trimmed
+history right after the system prompt. The cache_aware layout orders messages
+from the most to the least stable (system prompt, campaign context, history,
+then the per-turn status, RAG context and instruction) and drops old history
+in aligned chunks, so consecutive prompts share a long prefix that servers
+with a prompt cache do not need to evaluate again.
 """
 
 import logging
-from typing import TYPE_CHECKING, Dict, List, Optional
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 import tiktoken
-from langchain_core.messages import BaseMessage, SystemMessage, trim_messages
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 
 from app.core.repository_interfaces import ICharacterTemplateRepository
+from app.core.session_context import get_current_session_id
 from app.models.character.instance import CharacterInstanceModel
 from app.models.combat.state import CombatStateModel
 from app.models.common import MessageDict
 from app.models.game_state.main import GameStateModel
-from app.models.shared.chat import ChatMessageModel
+from app.models.shared.chat import ChatMessageModel, HistorySummaryModel
 from app.models.utils import NPCModel, QuestModel
+from app.providers.ai.history_token_cache import HistoryTokenCaches, HistoryView
+from app.providers.ai.prefix_reuse import PrefixReuseTracker
 from app.settings import get_settings
 from app.utils.message_converter import MessageConverter
+from app.utils.prefetch_cache import PrefetchCache
 
 from . import system_prompt as initial_data
 
@@ -33,6 +58,28 @@ settings = get_settings()
 LAST_X_HISTORY_MESSAGES = settings.prompt.last_x_history_messages
 MAX_PROMPT_TOKENS_BUDGET = settings.prompt.max_tokens_budget
 TOKENS_PER_MESSAGE_OVERHEAD = settings.prompt.tokens_per_message_overhead
+PROMPT_LAYOUT = settings.prompt.layout
+PROMPT_HISTORY_CHUNK_SIZE = settings.prompt.history_chunk_size
+
+# Last prompt of each session, to log how much of the next prompt it covers
+prefix_reuse_tracker = PrefixReuseTracker()
+# Formatted history messages and token counts of each campaign
+history_token_caches = HistoryTokenCaches()
+# Context sections built while the player was typing, per campaign
+prefetched_context_sections: "PrefetchCache[ContextSections]" = PrefetchCache(
+    ttl_seconds=settings.prompt.prefetch_ttl_seconds
+)
+# Game state fields the static and dynamic context sections are built from
+CONTEXT_SECTION_FIELDS = {
+    "campaign_goal",
+    "world_lore",
+    "active_quests",
+    "known_npcs",
+    "event_summary",
+    "party",
+    "current_location",
+    "combat",
+}
 
 try:
     # Using cl100k_base as it's common for GPT-3.5/4 and compatible models
@@ -45,18 +92,48 @@ except Exception as e:
     tokenizer = None  # type: ignore[assignment]
 
 
+class ContextSections(NamedTuple):
+    """Campaign context and current status messages of a prompt."""
+
+    static_context: List[HumanMessage]
+    dynamic_context: List[HumanMessage]
+
+
+@lru_cache(maxsize=512)
+def _count_text_tokens(text: str) -> int:
+    """Token count of a text, memoised for repeated context blocks."""
+    return len(tokenizer.encode(text))
+
+
 class PromptBuilder:
     """
     Prompt builder using LangChain's ChatPromptTemplate and message utilities.
     Maintains exact compatibility with the original prompts.py functionality.
     """
 
-    def __init__(self) -> None:
-        """Initialize the LangChain-based prompt builder."""
+    def __init__(
+        self,
+        layout: Optional[str] = None,
+        history_chunk_size: Optional[int] = None,
+    ) -> None:
+        """
+        Initialize the LangChain-based prompt builder.
+
+        Args:
+            layout: 'default' or 'cache_aware' (defaults to PROMPT_LAYOUT)
+            history_chunk_size: Messages dropped at a time by the cache_aware
+                layout (defaults to PROMPT_HISTORY_CHUNK_SIZE)
+        """
+        self.layout = layout or PROMPT_LAYOUT
+        self.history_chunk_size = max(
+            1, history_chunk_size or PROMPT_HISTORY_CHUNK_SIZE
+        )
+
         # Create the prompt template with placeholders for different sections
         self.prompt_template = ChatPromptTemplate.from_messages(
             [
                 ("system", "{system_prompt}"),
+                MessagesPlaceholder("history_summary", optional=True),
                 MessagesPlaceholder("main_history", optional=True),
                 MessagesPlaceholder("static_context", optional=True),
                 MessagesPlaceholder("dynamic_context", optional=True),
@@ -65,7 +142,20 @@ class PromptBuilder:
             ]
         )
 
-        logger.info("Initialized PromptBuilder")
+        # Most stable sections first so that consecutive prompts share a prefix
+        self.cache_aware_prompt_template = ChatPromptTemplate.from_messages(
+            [
+                ("system", "{system_prompt}"),
+                MessagesPlaceholder("static_context", optional=True),
+                MessagesPlaceholder("history_summary", optional=True),
+                MessagesPlaceholder("main_history", optional=True),
+                MessagesPlaceholder("recent_history", optional=True),
+                MessagesPlaceholder("dynamic_context", optional=True),
+                MessagesPlaceholder("rag_context", optional=True),
+            ]
+        )
+
+        logger.info(f"Initialized PromptBuilder ({self.layout} layout)")
 
     def format_character_for_prompt(
         self,
@@ -232,57 +322,92 @@ class PromptBuilder:
         try:
             content = message.content
             if isinstance(content, str):
-                return len(tokenizer.encode(content)) + TOKENS_PER_MESSAGE_OVERHEAD
+                return _count_text_tokens(content) + TOKENS_PER_MESSAGE_OVERHEAD
             else:
                 # Convert non-string content to string
-                return len(tokenizer.encode(str(content))) + TOKENS_PER_MESSAGE_OVERHEAD
+                return _count_text_tokens(str(content)) + TOKENS_PER_MESSAGE_OVERHEAD
         except Exception as e:
             logger.warning(f"Error calculating token count for message: {e}")
             return 0
 
-    def build_ai_prompt_context(
+    def _format_history_summary(
         self,
-        game_state: GameStateModel,
-        event_handler: "BaseEventHandler",
-        player_action_for_rag_query: Optional[str] = None,
-        initial_instruction: Optional[str] = None,
-    ) -> List[MessageDict]:
+        omitted_messages: Sequence[BaseMessage],
+        summaries: Sequence[HistorySummaryModel] = (),
+    ) -> HumanMessage:
         """
-        Builds the list of messages to send to the AI based on the current GameStateModel model.
+        Create the block standing in for history dropped from the prompt.
 
         Args:
-            game_state: Current game state
-            event_handler: Event handler instance (for accessing services)
-            player_action_for_rag_query: Raw player action text used solely for RAG query generation
-            initial_instruction: System-generated instruction to guide AI for the current step
-
-        Returns messages in dict format for compatibility with existing AI services.
-        Uses LangChain internally for message management and token budgeting.
+            omitted_messages: Dropped messages that no summary covers
+            summaries: Summaries of the dropped messages before those
         """
-        from langchain_core.messages import HumanMessage
-
-        # 1. System Prompt
-        system_prompt = initial_data.SYSTEM_PROMPT
-
-        # 2. Process chat history
-        all_chat_history = game_state.chat_history.copy()
-        num_last_x_messages = min(LAST_X_HISTORY_MESSAGES, len(all_chat_history))
+        parts = [summary.content for summary in summaries]
+        if omitted_messages:
+            omitted_player_messages = sum(
+                1 for msg in omitted_messages if msg.type == "human"
+            )
+            if summaries:
+                parts.append(
+                    f"{len(omitted_messages)} later messages "
+                    f"({omitted_player_messages} from the players) were omitted to "
+                    "fit the context budget; the conversation continues below."
+                )
+            else:
+                parts.append(
+                    f"{len(omitted_messages)} earlier messages "
+                    f"({omitted_player_messages} from the players) were omitted to "
+                    "fit the context budget. The Event Summary in the context above "
+                    "records what happened in them; the conversation continues below."
+                )
+        return HumanMessage(content="EARLIER HISTORY SUMMARY:\n" + "\n\n".join(parts))
 
-        if num_last_x_messages > 0:
-            main_history_block = all_chat_history[:-num_last_x_messages]
-            last_x_history_block = all_chat_history[-num_last_x_messages:]
-        else:
-            main_history_block = all_chat_history
-            last_x_history_block = []
+    @staticmethod
+    def _summary_ends(game_state: GameStateModel) -> List[int]:
+        """
+        Chat history position just after each summary, for the summaries
+        whose messages are still in the history.
+        """
+        summaries = game_state.history_summaries
+        ends: List[int] = []
+        if not summaries:
+            return ends
+        for index, msg in enumerate(game_state.chat_history):
+            if msg.id == summaries[len(ends)].last_message_id:
+                ends.append(index + 1)
+                if len(ends) == len(summaries):
+                    break
+        return ends
+
+    def _message_tokens(
+        self, message: BaseMessage, history_view: Optional[HistoryView] = None
+    ) -> int:
+        """Token count of a message, taken from the history cache if it has it."""
+        if history_view is not None:
+            tokens = history_view.tokens_for(message)
+            if tokens is not None:
+                return tokens
+        return self._calculate_message_tokens(message)
+
+    def _get_history_view(self, game_state: GameStateModel) -> HistoryView:
+        """Formatted chat history and token sums from the campaign's cache."""
+        cache = history_token_caches.get(self._campaign_key(game_state))
+        return cache.update(
+            game_state.chat_history,
+            self._format_message_for_history,
+            self._calculate_message_tokens,
+        )
 
-        # Convert main history to LangChain messages
-        main_history_messages: List[BaseMessage] = []
-        for msg in main_history_block:
-            formatted_msg = self._format_message_for_history(msg)
-            if formatted_msg:
-                main_history_messages.append(formatted_msg)
+    @staticmethod
+    def _campaign_key(game_state: GameStateModel) -> str:
+        """Key of the campaign played in the current session."""
+        return f"{get_current_session_id() or 'default'}:{game_state.campaign_id}"
 
-        # 3. Build static context
+    def build_context_sections(
+        self, game_state: GameStateModel, event_handler: "BaseEventHandler"
+    ) -> ContextSections:
+        """Build the campaign context and current status messages."""
+        # Static context
         static_context_parts: List[str] = []
         static_context_parts.append(f"Campaign Goal: {game_state.campaign_goal}")
         logger.debug(f"Campaign goal: {game_state.campaign_goal}")
@@ -320,7 +445,7 @@ class PromptBuilder:
         else:
             logger.debug("No static context parts to include")
 
-        # 4. Build dynamic context
+        # Dynamic context
         dynamic_context_parts: List[str] = []
         # Get template repository from handler
         template_repo = event_handler.get_character_template_repository()
@@ -348,6 +473,161 @@ class PromptBuilder:
             f"Created dynamic context message with {len(dynamic_context_parts)} parts"
         )
 
+        return ContextSections(static_context_messages, dynamic_context_messages)
+
+    def prefetch_context(
+        self, game_state: GameStateModel, event_handler: "BaseEventHandler"
+    ) -> bool:
+        """
+        Prepare the parts of the next prompt that do not depend on the action.
+
+        Formats and counts the tokens of the chat history not seen yet, and
+        builds the context sections for the next prompt of the campaign, which
+        uses them unless the game state changes in the meantime.
+
+        Returns:
+            True if the context sections were built
+        """
+        self._get_history_view(game_state)
+        if prefetched_context_sections.ttl_seconds <= 0:
+            return False
+
+        future = prefetched_context_sections.start(
+            self._campaign_key(game_state), self._context_fingerprint(game_state)
+        )
+        if future is None:
+            return False
+        try:
+            sections = self.build_context_sections(game_state, event_handler)
+            for msg in sections.static_context + sections.dynamic_context:
+                self._calculate_message_tokens(msg)
+            future.set_result(sections)
+        except Exception as e:
+            logger.error(f"Error prefetching prompt context: {e}", exc_info=True)
+            future.set_exception(e)
+        return True
+
+    def _take_prefetched_context(
+        self, game_state: GameStateModel
+    ) -> Optional[ContextSections]:
+        """Context sections prefetched for the current game state, if any."""
+        key = self._campaign_key(game_state)
+        if key not in prefetched_context_sections:
+            return None
+        sections = prefetched_context_sections.take(
+            key, self._context_fingerprint(game_state)
+        )
+        if sections is not None:
+            logger.debug("Using prefetched static and dynamic context")
+        return sections
+
+    @staticmethod
+    def _context_fingerprint(game_state: GameStateModel) -> str:
+        """Serialized game state fields the context sections are built from."""
+        return game_state.model_dump_json(include=CONTEXT_SECTION_FIELDS)
+
+    def _trim_history_in_chunks(
+        self,
+        history_messages: List[BaseMessage],
+        max_tokens: int,
+        prefix_tokens: Optional[Sequence[int]] = None,
+        summary_for_cut: Optional[Callable[[int], Optional[BaseMessage]]] = None,
+        chunk_size: Optional[int] = None,
+    ) -> Tuple[List[BaseMessage], List[BaseMessage]]:
+        """
+        Drop the oldest history in whole chunks until the rest fits the budget.
+
+        The cut is aligned to a multiple of the chunk size counted from the
+        start of the history, so it stays put while the history grows and the
+        prompt prefix only changes when another whole chunk has to go.
+
+        Args:
+            history_messages: History to trim, oldest first
+            max_tokens: Token budget for the kept history and the summary
+            prefix_tokens: Running token sums of history_messages (prefix_tokens[i]
+                is the size of the first i messages), computed if not given
+            summary_for_cut: Creates the summary block for the first ``cut``
+                messages being dropped (None for no block); by default a note
+                on the number of dropped messages
+            chunk_size: Messages dropped at a time (default history_chunk_size)
+
+        Returns:
+            Tuple of (kept history messages, summary block for the dropped ones)
+        """
+        if prefix_tokens is None:
+            sums = [0]
+            for msg in history_messages:
+                sums.append(sums[-1] + self._calculate_message_tokens(msg))
+            prefix_tokens = sums
+        total_tokens = prefix_tokens[len(history_messages)]
+        if total_tokens <= max_tokens:
+            return history_messages, []
+
+        if summary_for_cut is None:
+
+            def summary_for_cut(cut: int) -> Optional[BaseMessage]:
+                return self._format_history_summary(history_messages[:cut])
+
+        # The first cut leaving at most max_tokens, rounded up to a chunk boundary
+        first_cut = bisect_left(
+            prefix_tokens, total_tokens - max_tokens, 0, len(history_messages)
+        )
+        chunk = chunk_size or self.history_chunk_size
+        first_aligned_cut = max(chunk, -(-first_cut // chunk) * chunk)
+
+        for cut in range(first_aligned_cut, len(history_messages) + chunk, chunk):
+            cut = min(cut, len(history_messages))
+            kept_tokens = total_tokens - prefix_tokens[cut]
+            summary = summary_for_cut(cut)
+            summary_tokens = self._calculate_message_tokens(summary) if summary else 0
+            if kept_tokens + summary_tokens <= max_tokens:
+                logger.debug(
+                    f"Dropped {cut} older history messages "
+                    f"({chunk}-message chunks) due to token budget"
+                )
+                return history_messages[cut:], [summary] if summary else []
+        return [], []
+
+    def build_ai_prompt_context(
+        self,
+        game_state: GameStateModel,
+        event_handler: "BaseEventHandler",
+        player_action_for_rag_query: Optional[str] = None,
+        initial_instruction: Optional[str] = None,
+    ) -> List[MessageDict]:
+        """
+        Builds the list of messages to send to the AI based on the current GameStateModel model.
+
+        Args:
+            game_state: Current game state
+            event_handler: Event handler instance (for accessing services)
+            player_action_for_rag_query: Raw player action text used solely for RAG query generation
+            initial_instruction: System-generated instruction to guide AI for the current step
+
+        Returns messages in dict format for compatibility with existing AI services.
+        Uses LangChain internally for message management and token budgeting.
+        """
+        # 1. System Prompt
+        system_prompt = initial_data.SYSTEM_PROMPT
+
+        # 2. Process chat history (formatting and token counts are cached)
+        all_chat_history = game_state.chat_history.copy()
+        num_last_x_messages = min(LAST_X_HISTORY_MESSAGES, len(all_chat_history))
+        history_view = self._get_history_view(game_state)
+
+        # Split the formatted history into the main and the last X messages
+        main_history_end = history_view.formatted_before[
+            len(all_chat_history) - num_last_x_messages
+        ]
+        main_history_messages = history_view.messages[:main_history_end]
+
+        # 3-4. Static and dynamic context, prepared ahead of time if prefetched
+        context_sections = self._take_prefetched_context(game_state)
+        if context_sections is None:
+            context_sections = self.build_context_sections(game_state, event_handler)
+        static_context_messages = context_sections.static_context
+        dynamic_context_messages = context_sections.dynamic_context
+
         # 5. RAG Context
         # Import here to avoid circular imports
         from app.content.rag.rag_context_builder import rag_context_builder
@@ -367,12 +647,8 @@ class PromptBuilder:
         if rag_context_content:
             rag_context_messages.append(HumanMessage(content=rag_context_content))
 
-        # 6. Convert last X history to LangChain messages
-        recent_history_messages: List[BaseMessage] = []
-        for msg in last_x_history_block:
-            formatted_msg = self._format_message_for_history(msg)
-            if formatted_msg:
-                recent_history_messages.append(formatted_msg)
+        # 6. Last X history messages
+        recent_history_messages = history_view.messages[main_history_end:]
 
         # Calculate tokens for fixed components
         fixed_messages = (
@@ -384,40 +660,48 @@ class PromptBuilder:
         )
 
         fixed_token_count: int = sum(
-            self._calculate_message_tokens(msg) for msg in fixed_messages
+            self._message_tokens(msg, history_view) for msg in fixed_messages
         )
 
         # Calculate remaining budget for main history
         remaining_budget: int = MAX_PROMPT_TOKENS_BUDGET - fixed_token_count
 
-        # Use LangChain's trim_messages for token-aware truncation of main history
+        # Dropped history is replaced by its summaries, if there are any. The
+        # cache-aware layout drops whole chunks and always marks the gap.
+        summaries = game_state.history_summaries
+        summary_ends = self._summary_ends(game_state)
+
+        def summary_for_cut(cut: int) -> Optional[BaseMessage]:
+            dropped = bisect_right(history_view.formatted_before, cut) - 1
+            usable = bisect_right(summary_ends, dropped)
+            covered = (
+                history_view.formatted_before[summary_ends[usable - 1]] if usable else 0
+            )
+            omitted = main_history_messages[covered:cut]
+            if not usable and (self.layout != "cache_aware" or not omitted):
+                return None
+            return self._format_history_summary(omitted, summaries[:usable])
+
+        trimmed_main_history: List[BaseMessage] = []
+        history_summary_messages: List[BaseMessage] = []
         if main_history_messages and remaining_budget > 0:
-            try:
-                # Trim messages to fit within budget, keeping most recent
-                trimmed_main_history: List[BaseMessage] = trim_messages(
+            trimmed_main_history, history_summary_messages = (
+                self._trim_history_in_chunks(
                     main_history_messages,
-                    max_tokens=remaining_budget,
-                    token_counter=self._calculate_message_tokens,
-                    strategy="last",  # Keep most recent messages
-                    allow_partial=False,  # Don't split messages
-                )
-            except Exception as e:
-                logger.warning(
-                    f"Error trimming messages with LangChain, falling back to manual trimming: {e}"
+                    remaining_budget,
+                    history_view.prefix_tokens[: main_history_end + 1],
+                    summary_for_cut,
+                    None if self.layout == "cache_aware" else 1,
                 )
-                # Fallback to manual trimming
-                trimmed_main_history = []
-                current_tokens = 0
-                history_msg: BaseMessage
-                for history_msg in reversed(main_history_messages):
-                    msg_tokens = self._calculate_message_tokens(history_msg)
-                    if current_tokens + msg_tokens <= remaining_budget:
-                        trimmed_main_history.insert(0, history_msg)
-                        current_tokens += msg_tokens
-                    else:
-                        break
-        else:
-            trimmed_main_history = []
+            )
+
+        # Have the history that fell out of the prompt summarized for later turns
+        dropped_history = len(main_history_messages) - len(trimmed_main_history)
+        if dropped_history and event_handler.history_summarizer is not None:
+            event_handler.history_summarizer.request(
+                game_state,
+                bisect_right(history_view.formatted_before, dropped_history) - 1,
+            )
 
         # Format the final prompt using the template
         prompt_values = {
@@ -427,7 +711,11 @@ class PromptBuilder:
             "dynamic_context": dynamic_context_messages,
             "rag_context": rag_context_messages,
             "recent_history": recent_history_messages,
+            "history_summary": history_summary_messages,
         }
+        prompt_template = self.prompt_template
+        if self.layout == "cache_aware":
+            prompt_template = self.cache_aware_prompt_template
 
         # Log what we're passing to the template
         logger.debug(
@@ -439,7 +727,7 @@ class PromptBuilder:
         )
 
         # Generate the final messages
-        prompt_value = self.prompt_template.invoke(prompt_values)
+        prompt_value = prompt_template.invoke(prompt_values)
         final_messages = prompt_value.to_messages()
 
         # Log what came out of the template
@@ -461,15 +749,18 @@ class PromptBuilder:
         logger.debug(f"After conversion: {len(final_dict_messages)} dict messages")
 
         # Calculate final token count for logging
-        total_tokens: int = sum(
-            self._calculate_message_tokens(msg) for msg in final_messages
-        )
+        message_tokens = [
+            self._message_tokens(msg, history_view) for msg in final_messages
+        ]
+        total_tokens: int = sum(message_tokens)
 
         # Log the final prompt construction
         logger.info(
             f"Built AI prompt with {len(final_dict_messages)} messages (~{total_tokens} tokens)"
         )
 
+        self._log_prefix_reuse(game_state, final_messages, message_tokens)
+
         # Log prompt info
         history_truncated = len(main_history_messages) - len(trimmed_main_history)
         if history_truncated > 0:
@@ -499,6 +790,8 @@ class PromptBuilder:
                 msg_type = "dynamic_context"
             elif content.startswith("RELEVANT KNOWLEDGE:"):
                 msg_type = "rag_context"
+            elif content.startswith("EARLIER HISTORY SUMMARY:"):
+                msg_type = "history_summary"
             else:
                 msg_type = "chat_history"
 
@@ -515,6 +808,26 @@ class PromptBuilder:
         # Convert dictionaries to MessageDict objects before returning
         return [MessageDict(**msg_dict) for msg_dict in final_dict_messages]
 
+    def _log_prefix_reuse(
+        self,
+        game_state: GameStateModel,
+        messages: List[BaseMessage],
+        message_tokens: List[int],
+    ) -> None:
+        """Log how much of this prompt repeats the session's previous prompt."""
+        reuse = prefix_reuse_tracker.record(
+            self._campaign_key(game_state),
+            [(msg.type, str(msg.content)) for msg in messages],
+            message_tokens,
+        )
+        if reuse is None:
+            return
+        logger.info(
+            f"Prompt prefix reuse ({self.layout} layout): {reuse.ratio:.1%} "
+            f"(~{reuse.reused_tokens}/{reuse.total_tokens} tokens, "
+            f"{reuse.reused_messages}/{len(messages)} messages)"
+        )
+
 
 # Module-level function for backward compatibility
 def build_ai_prompt_context(
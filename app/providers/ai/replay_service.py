@@ -0,0 +1,215 @@
+"""
+Recording and replay of AI responses.
+
+``RecordingAIService`` wraps a real AI service and stores every response it
+returns under a hash of the prompt. ``ReplayAIService`` (AI_PROVIDER=replay)
+serves those recordings without any model, so the game loop can be run,
+tested and load tested offline and deterministically. A prompt that was not
+recorded gets a recording chosen by its hash, or no response at all.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Literal, Optional
+
+from app.models.common import MessageDict
+
+from .base import BaseAIService
+from .schemas import AIResponse
+
+logger = logging.getLogger(__name__)
+
+# Words of narrative reported per chunk when replaying a streamed response
+REPLAY_STREAM_CHUNK_WORDS = 4
+
+
+def prompt_hash(messages: List[MessageDict]) -> str:
+    """Stable hash of the roles and contents of a prompt."""
+    payload = json.dumps(
+        [[msg.role, msg.content] for msg in messages],
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseRecordings:
+    """Directory of recorded AI responses, one JSON file per prompt hash."""
+
+    def __init__(self, directory: str) -> None:
+        self.directory = Path(directory)
+        self._responses: Dict[str, AIResponse] = {}
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self) -> None:
+        """(Re)load all recordings of the directory."""
+        responses: Dict[str, AIResponse] = {}
+        if self.directory.is_dir():
+            for path in sorted(self.directory.glob("*.json")):
+                try:
+                    with open(path, encoding="utf-8") as f:
+                        data = json.load(f)
+                    responses[data.get("prompt_hash", path.stem)] = (
+                        AIResponse.model_validate(data["response"])
+                    )
+                except Exception as e:
+                    logger.warning(f"Skipping unreadable AI recording {path}: {e}")
+        with self._lock:
+            self._responses = responses
+        logger.info(f"Loaded {len(responses)} AI recordings from {self.directory}")
+
+    def __len__(self) -> int:
+        return len(self._responses)
+
+    def get(self, key: str) -> Optional[AIResponse]:
+        """Recording of the prompt with this hash, if any."""
+        return self._responses.get(key)
+
+    def pick(self, key: str) -> Optional[AIResponse]:
+        """A recording chosen deterministically by the prompt hash."""
+        with self._lock:
+            if not self._responses:
+                return None
+            keys = sorted(self._responses)
+            return self._responses[keys[int(key, 16) % len(keys)]]
+
+    def save(self, key: str, response: AIResponse) -> None:
+        """Record a response for the prompt with this hash."""
+        data = {
+            "prompt_hash": key,
+            "recorded_at": datetime.now(timezone.utc).isoformat(),
+            "response": response.model_dump(mode="json"),
+        }
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"{key}.json"
+        temp_path = path.with_suffix(".json.tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        os.replace(temp_path, path)
+        with self._lock:
+            self._responses[key] = response
+
+
+class ReplayAIService(BaseAIService):
+    """Serves recorded responses instead of calling a model."""
+
+    def __init__(
+        self,
+        recordings: ResponseRecordings,
+        on_miss: Literal["pick", "error"] = "pick",
+    ) -> None:
+        """
+        Args:
+            recordings: Recorded responses to serve
+            on_miss: For prompts that were not recorded, 'pick' serves a
+                recording chosen by the prompt hash and 'error' fails the
+                request like an unavailable AI
+        """
+        self.recordings = recordings
+        self.on_miss = on_miss
+        self.hits = 0
+        self.misses = 0
+        logger.info(
+            f"Initialized ReplayAIService - {len(recordings)} recordings, "
+            f"on miss: {on_miss}"
+        )
+
+    def get_response(self, messages: List[MessageDict]) -> Optional[AIResponse]:
+        key = prompt_hash(messages)
+        response = self.recordings.get(key)
+        if response is not None:
+            self.hits += 1
+            logger.debug(f"Replaying recorded AI response {key[:12]}")
+            return response
+
+        self.misses += 1
+        if self.on_miss == "pick":
+            response = self.recordings.pick(key)
+        if response is None:
+            logger.error(f"No recorded AI response for prompt {key[:12]}")
+        else:
+            logger.debug(f"No recording for prompt {key[:12]}, replaying another")
+        return response
+
+    def get_streaming_response(
+        self,
+        messages: List[MessageDict],
+        on_narrative_chunk: Callable[[str], None],
+    ) -> Optional[AIResponse]:
+        response = self.get_response(messages)
+        if response is not None:
+            words = response.narrative.split(" ")
+            for start in range(0, len(words), REPLAY_STREAM_CHUNK_WORDS):
+                chunk = " ".join(words[start : start + REPLAY_STREAM_CHUNK_WORDS])
+                on_narrative_chunk(chunk if start == 0 else " " + chunk)
+        return response
+
+    async def aget_response(self, messages: List[MessageDict]) -> Optional[AIResponse]:
+        return self.get_response(messages)
+
+    async def aget_streaming_response(
+        self,
+        messages: List[MessageDict],
+        on_narrative_chunk: Callable[[str], None],
+    ) -> Optional[AIResponse]:
+        return self.get_streaming_response(messages, on_narrative_chunk)
+
+
+class RecordingAIService(BaseAIService):
+    """Wraps an AI service and records the responses it returns."""
+
+    def __init__(self, ai_service: BaseAIService, recordings: ResponseRecordings):
+        self.ai_service = ai_service
+        self.recordings = recordings
+        logger.info(
+            f"Recording AI responses of {type(ai_service).__name__} "
+            f"to {recordings.directory}"
+        )
+
+    def _record(
+        self, messages: List[MessageDict], response: Optional[AIResponse]
+    ) -> Optional[AIResponse]:
+        if response is not None:
+            try:
+                self.recordings.save(prompt_hash(messages), response)
+            except OSError as e:
+                logger.error(f"Failed to record AI response: {e}")
+        return response
+
+    def get_response(self, messages: List[MessageDict]) -> Optional[AIResponse]:
+        return self._record(messages, self.ai_service.get_response(messages))
+
+    def get_text_response(self, messages: List[MessageDict]) -> Optional[str]:
+        return self.ai_service.get_text_response(messages)
+
+    def get_streaming_response(
+        self,
+        messages: List[MessageDict],
+        on_narrative_chunk: Callable[[str], None],
+    ) -> Optional[AIResponse]:
+        return self._record(
+            messages,
+            self.ai_service.get_streaming_response(messages, on_narrative_chunk),
+        )
+
+    async def aget_response(self, messages: List[MessageDict]) -> Optional[AIResponse]:
+        return self._record(messages, await self.ai_service.aget_response(messages))
+
+    async def aget_streaming_response(
+        self,
+        messages: List[MessageDict],
+        on_narrative_chunk: Callable[[str], None],
+    ) -> Optional[AIResponse]:
+        return self._record(
+            messages,
+            await self.ai_service.aget_streaming_response(messages, on_narrative_chunk),
+        )
+
+    async def aclose(self) -> None:
+        await self.ai_service.aclose()
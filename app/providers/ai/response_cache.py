@@ -0,0 +1,328 @@
+"""
+Content-addressed cache of AI responses.
+
+Retries resend exactly the same messages, and identical requests recur (e.g.
+summaries of the same history in several sessions of a campaign). When the
+model's answer to such a request may be reused, ``CachingAIService`` serves it
+from a disk cache keyed on the model, parsing mode, temperature and a hash of
+the messages instead of generating it again.
+
+Only requests whose answer may be reused are cached: all requests of a
+temperature-0 model, and requests made inside ``idempotent_ai_requests()``.
+Requests made inside ``fresh_ai_requests()``, e.g. retries of an answer that
+failed, are always sent to the model and their answer replaces the cached one.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from app.models.common import MessageDict
+
+from .base import BaseAIService
+from .replay_service import prompt_hash
+from .schemas import AIResponse
+
+logger = logging.getLogger(__name__)
+
+_idempotent_requests: ContextVar[bool] = ContextVar(
+    "idempotent_ai_requests", default=False
+)
+_fresh_requests: ContextVar[bool] = ContextVar("fresh_ai_requests", default=False)
+
+
+@contextmanager
+def idempotent_ai_requests() -> Iterator[None]:
+    """Mark the AI requests made in this context as cacheable."""
+    token = _idempotent_requests.set(True)
+    try:
+        yield
+    finally:
+        _idempotent_requests.reset(token)
+
+
+@contextmanager
+def fresh_ai_requests() -> Iterator[None]:
+    """Generate new answers to the AI requests made in this context."""
+    token = _fresh_requests.set(True)
+    try:
+        yield
+    finally:
+        _fresh_requests.reset(token)
+
+
+@dataclass
+class CachedAIResponse:
+    """A cached answer and the time the provider took to generate it."""
+
+    response: Optional[AIResponse]
+    text: Optional[str]
+    latency_seconds: float
+
+
+class AIResponseCache:
+    """
+    Directory of cached responses, one JSON file per key.
+
+    The least recently used entries are evicted when the files exceed
+    ``max_bytes``.
+    """
+
+    def __init__(self, directory: str, max_bytes: int) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # Key -> (size in bytes, last use)
+        self._entries: Dict[str, Tuple[int, float]] = {}
+        self._total_bytes = 0
+        self._scan()
+
+    def _scan(self) -> None:
+        if not self.directory.is_dir():
+            return
+        for path in self.directory.glob("*.json"):
+            stat = path.stat()
+            self._entries[path.stem] = (stat.st_size, stat.st_mtime)
+            self._total_bytes += stat.st_size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str) -> Optional[CachedAIResponse]:
+        """Cached answer of a key, if any."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries[key] = (entry[0], time.time())
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            os.utime(path)
+            response = data.get("response")
+            return CachedAIResponse(
+                response=AIResponse.model_validate(response) if response else None,
+                text=data.get("text"),
+                latency_seconds=data.get("latency_seconds", 0.0),
+            )
+        except Exception as e:
+            logger.warning(f"Dropping unreadable cached AI response {key[:12]}: {e}")
+            self._remove(key)
+            return None
+
+    def put(self, key: str, cached: CachedAIResponse) -> None:
+        """Cache an answer, evicting the least recently used ones over the limit."""
+        data = {
+            "key": key,
+            "created_at": time.time(),
+            "latency_seconds": cached.latency_seconds,
+            "response": cached.response.model_dump(mode="json")
+            if cached.response
+            else None,
+            "text": cached.text,
+        }
+        payload = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        if len(payload) > self.max_bytes:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        temp_path = path.with_suffix(".json.tmp")
+        with open(temp_path, "wb") as f:
+            f.write(payload)
+        os.replace(temp_path, path)
+
+        with self._lock:
+            previous = self._entries.get(key)
+            if previous is not None:
+                self._total_bytes -= previous[0]
+            self._entries[key] = (len(payload), time.time())
+            self._total_bytes += len(payload)
+            evicted = self._select_evictions()
+        for evicted_key in evicted:
+            self._path(evicted_key).unlink(missing_ok=True)
+        if evicted:
+            logger.debug(f"Evicted {len(evicted)} cached AI responses")
+
+    def _select_evictions(self) -> List[str]:
+        """Forget the least recently used entries over the size limit."""
+        evicted: List[str] = []
+        if self._total_bytes <= self.max_bytes:
+            return evicted
+        for key, (size, _) in sorted(self._entries.items(), key=lambda e: e[1][1]):
+            if self._total_bytes <= self.max_bytes:
+                break
+            del self._entries[key]
+            self._total_bytes -= size
+            evicted.append(key)
+        return evicted
+
+    def _remove(self, key: str) -> None:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._total_bytes -= entry[0]
+        self._path(key).unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        with self._lock:
+            keys = list(self._entries)
+            self._entries.clear()
+            self._total_bytes = 0
+        for key in keys:
+            self._path(key).unlink(missing_ok=True)
+
+
+class CachingAIService(BaseAIService):
+    """Wraps an AI service and serves cacheable requests from a response cache."""
+
+    def __init__(self, ai_service: BaseAIService, cache: AIResponseCache) -> None:
+        self.ai_service = ai_service
+        self.cache = cache
+        self.hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+        self._stats_lock = threading.Lock()
+        logger.info(
+            f"Caching idempotent AI responses of {type(ai_service).__name__} "
+            f"in {cache.directory} ({len(cache)} cached)"
+        )
+
+    def _is_cacheable(self) -> bool:
+        temperature = getattr(self.ai_service, "temperature", None)
+        return temperature == 0 or _idempotent_requests.get()
+
+    def _key(self, kind: str, messages: List[MessageDict]) -> str:
+        identity = [
+            kind,
+            getattr(self.ai_service, "model_name", type(self.ai_service).__name__),
+            getattr(self.ai_service, "parsing_mode", None),
+            getattr(self.ai_service, "temperature", None),
+            prompt_hash(messages),
+        ]
+        return hashlib.sha256(json.dumps(identity).encode("utf-8")).hexdigest()
+
+    def _lookup(self, key: str) -> Optional[CachedAIResponse]:
+        if _fresh_requests.get():
+            return None
+        cached = self.cache.get(key)
+        with self._stats_lock:
+            if cached is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.saved_seconds += cached.latency_seconds
+            saved_seconds = self.saved_seconds
+        logger.info(
+            f"AI response cache hit {key[:12]}: saved {cached.latency_seconds:.2f}s "
+            f"({saved_seconds:.1f}s over {self.hits} hits)"
+        )
+        return cached
+
+    def _store(
+        self,
+        key: str,
+        started: float,
+        response: Optional[AIResponse] = None,
+        text: Optional[str] = None,
+    ) -> None:
+        if response is None and text is None:
+            return
+        cached = CachedAIResponse(response, text, time.perf_counter() - started)
+        try:
+            self.cache.put(key, cached)
+        except OSError as e:
+            logger.error(f"Failed to cache AI response: {e}")
+
+    def get_response(self, messages: List[MessageDict]) -> Optional[AIResponse]:
+        if not self._is_cacheable():
+            return self.ai_service.get_response(messages)
+        key = self._key("response", messages)
+        cached = self._lookup(key)
+        if cached is not None and cached.response is not None:
+            return cached.response
+        started = time.perf_counter()
+        response = self.ai_service.get_response(messages)
+        self._store(key, started, response=response)
+        return response
+
+    def get_text_response(self, messages: List[MessageDict]) -> Optional[str]:
+        if not self._is_cacheable():
+            return self.ai_service.get_text_response(messages)
+        key = self._key("text", messages)
+        cached = self._lookup(key)
+        if cached is not None and cached.text is not None:
+            return cached.text
+        started = time.perf_counter()
+        text = self.ai_service.get_text_response(messages)
+        self._store(key, started, text=text)
+        return text
+
+    def get_streaming_response(
+        self,
+        messages: List[MessageDict],
+        on_narrative_chunk: Callable[[str], None],
+    ) -> Optional[AIResponse]:
+        if not self._is_cacheable():
+            return self.ai_service.get_streaming_response(messages, on_narrative_chunk)
+        key = self._key("response", messages)
+        cached = self._lookup(key)
+        if cached is not None and cached.response is not None:
+            on_narrative_chunk(cached.response.narrative)
+            return cached.response
+        started = time.perf_counter()
+        response = self.ai_service.get_streaming_response(messages, on_narrative_chunk)
+        self._store(key, started, response=response)
+        return response
+
+    async def aget_response(self, messages: List[MessageDict]) -> Optional[AIResponse]:
+        if not self._is_cacheable():
+            return await self.ai_service.aget_response(messages)
+        key = self._key("response", messages)
+        cached = self._lookup(key)
+        if cached is not None and cached.response is not None:
+            return cached.response
+        started = time.perf_counter()
+        response = await self.ai_service.aget_response(messages)
+        self._store(key, started, response=response)
+        return response
+
+    async def aget_streaming_response(
+        self,
+        messages: List[MessageDict],
+        on_narrative_chunk: Callable[[str], None],
+    ) -> Optional[AIResponse]:
+        if not self._is_cacheable():
+            return await self.ai_service.aget_streaming_response(
+                messages, on_narrative_chunk
+            )
+        key = self._key("response", messages)
+        cached = self._lookup(key)
+        if cached is not None and cached.response is not None:
+            on_narrative_chunk(cached.response.narrative)
+            return cached.response
+        started = time.perf_counter()
+        response = await self.ai_service.aget_streaming_response(
+            messages, on_narrative_chunk
+        )
+        self._store(key, started, response=response)
+        return response
+
+    async def aclose(self) -> None:
+        await self.ai_service.aclose()
@@ -0,0 +1,469 @@
+"""
+Routing of AI requests over several OpenAI-compatible servers.
+
+``RoutingAIService`` (AI_PROVIDER=router) holds one ``OpenAIService`` per
+backend, e.g. several Llama.cpp servers started with launch_server.py. Each
+request goes to the backend with the fewest requests in flight, or to the one
+generating the most tokens per second. A request that takes longer than the
+configured latency percentile can be hedged: it is sent to a second backend
+as well and the first valid response wins. Backends that fail or are rate
+limited (as detected by their ``CompletionTokenMonitor``) are skipped for a
+while, and requests fail over to the other backends.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import (
+    Awaitable,
+    Callable,
+    Deque,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Set,
+    TypeVar,
+)
+
+from app.models.api import AIBackendsResponse, AIBackendStatsModel
+from app.models.common import MessageDict
+from app.utils.token_monitor import CompletionTokenMonitor, request_token_monitor
+
+from .base import BaseAIService
+from .openai_service import OpenAIService
+from .schemas import AIResponse
+
+logger = logging.getLogger(__name__)
+
+R = TypeVar("R")
+
+RoutingStrategy = Literal["least_inflight", "fastest"]
+
+# Latencies kept per backend to estimate the hedging delay
+LATENCY_WINDOW = 100
+# Latencies observed before requests are hedged
+HEDGE_MIN_SAMPLES = 10
+# Weight of the latest measurement in the tokens per second average
+TOKENS_PER_SECOND_SMOOTHING = 0.3
+
+
+def _percentile(samples: Sequence[float], percentile: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(percentile / 100 * len(ordered)))
+    return ordered[index]
+
+
+class AIBackend:
+    """An AI server of the pool and what has been observed of it."""
+
+    def __init__(self, name: str, service: OpenAIService) -> None:
+        self.name = name
+        self.service = service
+        self.in_flight = 0
+        self.requests = 0
+        self.failures = 0
+        self.latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self.tokens_per_second: Optional[float] = None
+        self.unhealthy_until = 0.0
+        self.last_error: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def is_healthy(self, now: float) -> bool:
+        return now >= self.unhealthy_until
+
+    def begin(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+            self.requests += 1
+
+    def end(
+        self, seconds: float, succeeded: bool, completion_tokens: Optional[int]
+    ) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            if not succeeded:
+                self.failures += 1
+                return
+            self.latencies.append(seconds)
+            if completion_tokens and seconds > 0:
+                speed = completion_tokens / seconds
+                if self.tokens_per_second is None:
+                    self.tokens_per_second = speed
+                else:
+                    self.tokens_per_second += TOKENS_PER_SECOND_SMOOTHING * (
+                        speed - self.tokens_per_second
+                    )
+
+    def cancel(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def mark_unhealthy(self, seconds: float, reason: str) -> None:
+        with self._lock:
+            self.unhealthy_until = time.monotonic() + seconds
+            self.last_error = reason
+        logger.warning(
+            f"AI backend {self.name} unavailable for {seconds:.0f}s: {reason}"
+        )
+
+    def get_stats(self) -> AIBackendStatsModel:
+        now = time.monotonic()
+        with self._lock:
+            latencies = list(self.latencies)
+            return AIBackendStatsModel(
+                name=self.name,
+                base_url=self.service.base_url or "",
+                healthy=self.is_healthy(now),
+                unhealthy_for_seconds=max(0.0, self.unhealthy_until - now),
+                in_flight=self.in_flight,
+                requests=self.requests,
+                failures=self.failures,
+                p50_latency_seconds=_percentile(latencies, 50) if latencies else None,
+                p95_latency_seconds=_percentile(latencies, 95) if latencies else None,
+                tokens_per_second=self.tokens_per_second,
+                last_error=self.last_error,
+            )
+
+
+class RoutingAIService(BaseAIService):
+    """Spreads AI requests over a pool of backends."""
+
+    def __init__(
+        self,
+        backends: List[AIBackend],
+        strategy: RoutingStrategy = "least_inflight",
+        hedge_percentile: Optional[float] = None,
+        unhealthy_seconds: float = 30.0,
+        max_attempts: int = 3,
+    ) -> None:
+        """
+        Args:
+            backends: Servers to route to
+            strategy: 'least_inflight' picks the backend with the fewest
+                requests in flight, 'fastest' the one with the best observed
+                tokens per second
+            hedge_percentile: Latency percentile after which a request is also
+                sent to a second backend (None disables hedging)
+            unhealthy_seconds: How long a failing backend is skipped
+            max_attempts: Backends tried before a request fails
+        """
+        if not backends:
+            raise ValueError("The AI router needs at least one backend")
+        self.backends = backends
+        self.strategy = strategy
+        self.hedge_percentile = hedge_percentile
+        self.unhealthy_seconds = unhealthy_seconds
+        self.max_attempts = max(1, max_attempts)
+        self.hedged_requests = 0
+        self._lock = threading.Lock()
+        self._hedge_executor: Optional[ThreadPoolExecutor] = None
+
+        # Identity of the answers, like a single OpenAIService
+        first = backends[0].service
+        self.model_name = first.model_name
+        self.parsing_mode = first.parsing_mode
+        self.temperature = first.temperature
+
+        logger.info(
+            f"Initialized RoutingAIService - {len(backends)} backends "
+            f"({', '.join(b.name for b in backends)}), strategy: {strategy}, "
+            f"hedging: {f'p{hedge_percentile:g}' if hedge_percentile else 'off'}"
+        )
+
+    # --- Backend selection ---
+
+    def _pick(self, exclude: Set[str]) -> Optional[AIBackend]:
+        """Choose the backend for a request, skipping the excluded ones."""
+        candidates = [b for b in self.backends if b.name not in exclude]
+        if not candidates:
+            return None
+        now = time.monotonic()
+        healthy = [b for b in candidates if b.is_healthy(now)]
+        if not healthy:
+            # Everything is failing: try the backend that recovers first
+            return min(candidates, key=lambda b: b.unhealthy_until)
+
+        if self.strategy == "fastest":
+            # Backends without measurements are tried first
+            unmeasured = [b for b in healthy if b.tokens_per_second is None]
+            if unmeasured:
+                return min(unmeasured, key=lambda b: (b.in_flight, b.requests))
+            return max(
+                healthy,
+                key=lambda b: (b.tokens_per_second or 0.0) / (b.in_flight + 1),
+            )
+        return min(healthy, key=lambda b: (b.in_flight, b.requests))
+
+    def _hedge_delay(self) -> Optional[float]:
+        """Seconds after which a request is also sent to another backend."""
+        if self.hedge_percentile is None or len(self.backends) < 2:
+            return None
+        latencies = [s for backend in self.backends for s in list(backend.latencies)]
+        if len(latencies) < HEDGE_MIN_SAMPLES:
+            return None
+        return _percentile(latencies, self.hedge_percentile)
+
+    def _after_request(
+        self,
+        backend: AIBackend,
+        started: float,
+        result: object,
+        error: str,
+        monitor: CompletionTokenMonitor,
+    ) -> None:
+        succeeded = result is not None
+        backend.end(
+            time.perf_counter() - started, succeeded, monitor.last_completion_tokens
+        )
+        if succeeded:
+            return
+        if monitor.rate_limit_detected:
+            error = "rate limited (no completion tokens generated)"
+        backend.mark_unhealthy(self.unhealthy_seconds, error)
+
+    # --- Blocking requests ---
+
+    def _run(
+        self, backend: AIBackend, call: Callable[[OpenAIService], Optional[R]]
+    ) -> Optional[R]:
+        backend.begin()
+        started = time.perf_counter()
+        result: Optional[R] = None
+        error = "no valid response"
+        # Tokens are counted per request, as calls run concurrently
+        with request_token_monitor(fresh=True) as monitor:
+            try:
+                result = call(backend.service)
+            except Exception as e:
+                error = str(e)
+                logger.error(f"AI backend {backend.name} failed: {e}")
+            finally:
+                self._after_request(backend, started, result, error, monitor)
+        return result
+
+    def _run_hedged(
+        self,
+        backend: AIBackend,
+        call: Callable[[OpenAIService], Optional[R]],
+        tried: Set[str],
+    ) -> Optional[R]:
+        delay = self._hedge_delay()
+        if delay is None:
+            return self._run(backend, call)
+
+        executor = self._get_hedge_executor()
+        primary: Future[Optional[R]] = executor.submit(lambda: self._run(backend, call))
+        done, _ = wait([primary], timeout=delay)
+        if done:
+            return primary.result()
+        second = self._pick(tried)
+        if second is None or not second.is_healthy(time.monotonic()):
+            return primary.result()
+
+        tried.add(second.name)
+        with self._lock:
+            self.hedged_requests += 1
+        logger.info(
+            f"AI request to {backend.name} slower than {delay:.1f}s, "
+            f"hedging on {second.name}"
+        )
+        # The slower request finishes in the background and is discarded
+        hedge: Future[Optional[R]] = executor.submit(lambda: self._run(second, call))
+        pending = {primary, hedge}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                if result is not None:
+                    return result
+        return None
+
+    def _get_hedge_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._hedge_executor is None:
+                self._hedge_executor = ThreadPoolExecutor(
+                    max_workers=4 * len(self.backends),
+                    thread_name_prefix="ai-router",
+                )
+            return self._hedge_executor
+
+    def _route(
+        self, call: Callable[[OpenAIService], Optional[R]], hedge: bool = True
+    ) -> Optional[R]:
+        """Send a request, failing over to other backends."""
+        tried: Set[str] = set()
+        for _ in range(self.max_attempts):
+            backend = self._pick(tried)
+            if backend is None:
+                break
+            tried.add(backend.name)
+            if hedge:
+                result = self._run_hedged(backend, call, tried)
+            else:
+                result = self._run(backend, call)
+            if result is not None:
+                return result
+        logger.error(f"No AI backend returned a response ({len(tried)} tried)")
+        return None
+
+    def get_response(self, messages: List[MessageDict]) -> Optional[AIResponse]:
+        return self._route(lambda service: service.get_response(messages))
+
+    def get_text_response(self, messages: List[MessageDict]) -> Optional[str]:
+        return self._route(lambda service: service.get_text_response(messages))
+
+    def get_streaming_response(
+        self,
+        messages: List[MessageDict],
+        on_narrative_chunk: Callable[[str], None],
+    ) -> Optional[AIResponse]:
+        # Not hedged, since two streams would interleave their narratives
+        streamed = False
+
+        def report(chunk: str) -> None:
+            nonlocal streamed
+            streamed = True
+            on_narrative_chunk(chunk)
+
+        tried: Set[str] = set()
+        for _ in range(self.max_attempts):
+            backend = self._pick(tried)
+            if backend is None:
+                break
+            tried.add(backend.name)
+            response = self._run(
+                backend,
+                lambda service: service.get_streaming_response(messages, report),
+            )
+            if response is not None or streamed:
+                return response
+        return None
+
+    # --- Async requests ---
+
+    async def _arun(
+        self,
+        backend: AIBackend,
+        call: Callable[[OpenAIService], Awaitable[Optional[R]]],
+    ) -> Optional[R]:
+        backend.begin()
+        started = time.perf_counter()
+        result: Optional[R] = None
+        error = "no valid response"
+        with request_token_monitor(fresh=True) as monitor:
+            try:
+                result = await call(backend.service)
+            except asyncio.CancelledError:
+                # Lost a hedged race or the client went away: not a failure
+                backend.cancel()
+                raise
+            except Exception as e:
+                error = str(e)
+                logger.error(f"AI backend {backend.name} failed: {e}")
+        self._after_request(backend, started, result, error, monitor)
+        return result
+
+    async def _arun_hedged(
+        self,
+        backend: AIBackend,
+        call: Callable[[OpenAIService], Awaitable[Optional[R]]],
+        tried: Set[str],
+    ) -> Optional[R]:
+        delay = self._hedge_delay()
+        if delay is None:
+            return await self._arun(backend, call)
+
+        primary = asyncio.ensure_future(self._arun(backend, call))
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done:
+            return primary.result()
+        second = self._pick(tried)
+        if second is None or not second.is_healthy(time.monotonic()):
+            return await primary
+
+        tried.add(second.name)
+        with self._lock:
+            self.hedged_requests += 1
+        logger.info(
+            f"AI request to {backend.name} slower than {delay:.1f}s, "
+            f"hedging on {second.name}"
+        )
+        pending = {primary, asyncio.ensure_future(self._arun(second, call))}
+        try:
+            while pending:
+                finished, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in finished:
+                    result = task.result()
+                    if result is not None:
+                        return result
+            return None
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _aroute(
+        self, call: Callable[[OpenAIService], Awaitable[Optional[R]]]
+    ) -> Optional[R]:
+        tried: Set[str] = set()
+        for _ in range(self.max_attempts):
+            backend = self._pick(tried)
+            if backend is None:
+                break
+            tried.add(backend.name)
+            result = await self._arun_hedged(backend, call, tried)
+            if result is not None:
+                return result
+        logger.error(f"No AI backend returned a response ({len(tried)} tried)")
+        return None
+
+    async def aget_response(self, messages: List[MessageDict]) -> Optional[AIResponse]:
+        return await self._aroute(lambda service: service.aget_response(messages))
+
+    async def aget_streaming_response(
+        self,
+        messages: List[MessageDict],
+        on_narrative_chunk: Callable[[str], None],
+    ) -> Optional[AIResponse]:
+        streamed = False
+
+        def report(chunk: str) -> None:
+            nonlocal streamed
+            streamed = True
+            on_narrative_chunk(chunk)
+
+        tried: Set[str] = set()
+        for _ in range(self.max_attempts):
+            backend = self._pick(tried)
+            if backend is None:
+                break
+            tried.add(backend.name)
+            response = await self._arun(
+                backend,
+                lambda service: service.aget_streaming_response(messages, report),
+            )
+            if response is not None or streamed:
+                return response
+        return None
+
+    async def aclose(self) -> None:
+        for backend in self.backends:
+            await backend.service.aclose()
+        with self._lock:
+            executor, self._hedge_executor = self._hedge_executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def get_stats(self) -> AIBackendsResponse:
+        """Observed state of every backend."""
+        return AIBackendsResponse(
+            strategy=self.strategy,
+            hedge_percentile=self.hedge_percentile,
+            hedged_requests=self.hedged_requests,
+            backends=[backend.get_stats() for backend in self.backends],
+        )
@@ -1,4 +1,5 @@
-from typing import List, Optional
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -94,3 +95,44 @@ class AIResponse(BaseModel):
     #         # raise ValueError('end_turn cannot be true if dice_requests is not empty')
     #         pass
     #     return v
+
+
+# Schema keywords that document a model but do not constrain its JSON
+_ANNOTATION_KEYWORDS = {"title", "description", "default", "examples"}
+
+
+def _strip_annotations(schema: Any) -> Any:
+    if isinstance(schema, list):
+        return [_strip_annotations(item) for item in schema]
+    if not isinstance(schema, dict):
+        return schema
+    stripped: Dict[str, Any] = {}
+    for key, value in schema.items():
+        if key in _ANNOTATION_KEYWORDS:
+            continue
+        if key in ("properties", "$defs"):
+            # Names of properties and definitions, not keywords
+            stripped[key] = {
+                name: _strip_annotations(sub) for name, sub in value.items()
+            }
+        else:
+            stripped[key] = _strip_annotations(value)
+    return stripped
+
+
+@lru_cache(maxsize=1)
+def ai_response_json_schema() -> Dict[str, Any]:
+    """
+    JSON schema constraining generation to a valid AIResponse.
+
+    Sent to servers that compile it into a sampling grammar (Llama.cpp), so
+    the answer always parses. Descriptions are left out since they do not
+    constrain anything and the schema is sent with every request, and the
+    reasoning is required so it is generated before the narrative. Do not
+    modify the returned dict: it is shared.
+    """
+    schema: Dict[str, Any] = _strip_annotations(AIResponse.model_json_schema())
+    required = schema.setdefault("required", [])
+    if "reasoning" not in required:
+        required.insert(0, "reasoning")
+    return schema
@@ -0,0 +1,105 @@
+"""
+Content-addressed cache of synthesized speech.
+
+Audio files are named after a hash of what produced them (text, voice,
+language and model version), so synthesizing the same line again (voice
+previews, repeated system lines, re-narration) reuses the file. The index
+keeps files in least recently used order and evicts the oldest ones once the
+cache grows past its size limit. Hits refresh the modification time of files,
+so the order survives restarts.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+class TTSAudioCache:
+    """Size-bounded LRU index of the audio files in a cache directory."""
+
+    def __init__(self, directory: str, max_bytes: int = 0) -> None:
+        """
+        Args:
+            directory: Directory holding the audio files
+            max_bytes: Size above which the oldest files are deleted (0: no limit)
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # File name -> size, least recently used first
+        self._files: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self._load()
+
+    @staticmethod
+    def key(text: str, voice_id: str, lang_code: str, model_version: str) -> str:
+        """Name of the audio of a text, without extension."""
+        content = "\0".join((model_version, lang_code, voice_id, text))
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()[:32]
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def _load(self) -> None:
+        """Index the files already in the directory, oldest first."""
+        if not os.path.isdir(self.directory):
+            return
+        entries = []
+        for entry in os.scandir(self.directory):
+            # Skip files still being written
+            if entry.is_file() and not entry.name.endswith(".tmp"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, entry.name, stat.st_size))
+        for _, name, size in sorted(entries):
+            self._files[name] = size
+            self._total_bytes += size
+        logger.info(
+            f"TTS cache holds {len(self._files)} file(s), "
+            f"{self._total_bytes / 1_000_000:.1f} MB"
+        )
+
+    def get(self, filename: str) -> bool:
+        """Whether the file is cached; marks it as recently used."""
+        with self._lock:
+            if filename not in self._files:
+                return False
+            path = os.path.join(self.directory, filename)
+            try:
+                os.utime(path)
+            except OSError:
+                # Deleted behind our back
+                self._total_bytes -= self._files.pop(filename)
+                return False
+            self._files.move_to_end(filename)
+            return True
+
+    def add(self, filename: str) -> None:
+        """Index a file just written to the directory and enforce the limit."""
+        path = os.path.join(self.directory, filename)
+        try:
+            size = os.path.getsize(path)
+        except OSError as e:
+            logger.warning(f"Cannot index TTS audio {path}: {e}")
+            return
+        with self._lock:
+            self._total_bytes += size - self._files.pop(filename, 0)
+            self._files[filename] = size
+            self._evict()
+
+    def _evict(self) -> None:
+        if not self.max_bytes:
+            return
+        # The newest file is kept even if it alone exceeds the limit
+        while self._total_bytes > self.max_bytes and len(self._files) > 1:
+            filename, size = self._files.popitem(last=False)
+            self._total_bytes -= size
+            try:
+                os.remove(os.path.join(self.directory, filename))
+                logger.debug(f"Evicted {filename} from the TTS cache")
+            except OSError as e:
+                logger.warning(f"Could not evict {filename} from the TTS cache: {e}")
@@ -1,16 +1,51 @@
 import logging
 import os
-import uuid
-from typing import Any, List, Optional, Type
+import threading
+import time
+from importlib import metadata
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
 
 import numpy as np
 import soundfile as sf
 
 from app.core.external_interfaces import ITTSService
 from app.models.utils import VoiceInfoModel
+from app.providers.tts.audio_cache import TTSAudioCache
+from app.providers.tts.synthesis_worker import SynthesisJob, TTSSynthesisWorker
+from app.utils.metrics import metrics_registry
 
 logger = logging.getLogger(__name__)
 
+# Kokoro synthesizes 24kHz audio
+SAMPLE_RATE = 24000
+
+AudioFormat = Literal["wav", "ogg"]
+
+# Texts up to this length queued together are synthesized in one pipeline run
+SHORT_TEXT_CHARS = 200
+
+# Kokoro splits its input with this pattern and yields one segment per part.
+# Its default only splits on newlines, so a paragraph would be a single
+# segment; splitting after each sentence lets playback start after the first.
+SENTENCE_SPLIT_PATTERN = r"(?<=[.!?])\s+|\n+"
+
+real_time_factor = metrics_registry.histogram(
+    "tts_real_time_factor",
+    "Synthesis time over duration of the synthesized audio",
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 1.5, 2.0, 4.0),
+)
+
 
 class KokoroTTSService(ITTSService):
     """TTS Service implementation using Kokoro."""
@@ -30,8 +65,17 @@ class KokoroTTSService(ITTSService):
         # {"id": "bm_george", "name": "George (UK Male)"},
     ]
 
-    def __init__(self, lang_code: str = "a", cache_dir: str = "static/tts_cache"):
+    def __init__(
+        self,
+        lang_code: str = "a",
+        cache_dir: str = "static/tts_cache",
+        max_cache_bytes: int = 0,
+        audio_format: AudioFormat = "wav",
+        max_batch: int = 8,
+        warm_up: bool = False,
+    ):
         self.lang_code: str = lang_code
+        self.audio_format: AudioFormat = audio_format
         self.pipeline: Optional[Any] = None  # Will be KPipeline once imported
         self.cache_dir_name: str = cache_dir.split("/")[-1]  # e.g., "tts_cache"
         self._kokoro_imported: bool = False
@@ -45,9 +89,22 @@ class KokoroTTSService(ITTSService):
         else:
             self.full_cache_dir = os.path.join(os.getcwd(), cache_dir)
 
-        # Don't import kokoro here - delay until first actual use
+        # Identical lines are synthesized once; old audio is evicted
+        self.cache = TTSAudioCache(self.full_cache_dir, max_cache_bytes)
+        self.model_version = self._get_model_version()
+
+        # One thread owns the pipeline; every session queues its requests there
+        self.worker = TTSSynthesisWorker(
+            self._run_batch, self._warm_up if warm_up else None, max_batch
+        )
+        # Don't import kokoro here - delay until narration is enabled or used
         logger.info("KokoroTTSService created with lazy loading enabled")
 
+    def warm_up(self) -> None:
+        """Load the model in the background instead of on the first request."""
+        if self.worker.warm_up is not None:
+            self.worker.start()
+
     def _ensure_kokoro_imported(self) -> None:
         """Ensure kokoro is imported and pipeline is initialized."""
         if not self._kokoro_imported:
@@ -84,75 +141,258 @@ class KokoroTTSService(ITTSService):
                 )
                 self.pipeline = None
 
-    def synthesize_speech(self, text: str, voice_id: str) -> Optional[str]:
+    @staticmethod
+    def _get_model_version() -> str:
+        """Version of the kokoro package; new releases may sound different."""
+        try:
+            return metadata.version("kokoro")
+        except metadata.PackageNotFoundError:
+            return "unknown"
+
+    def _pipeline_ready(self) -> bool:
         # Ensure kokoro is imported before synthesizing
         self._ensure_kokoro_imported()
         if not self.pipeline:
             logger.error("Kokoro pipeline not initialized. Cannot synthesize speech.")
-            return None
-        if not text:
-            logger.warning("Empty text provided for TTS synthesis.")
-            return None
+            return False
+        return True
 
-        # Validate voice_id
+    def _check_voice(self, voice_id: str) -> str:
+        """The voice to synthesize with."""
         if not any(v["id"] == voice_id for v in self.KOKORO_ENGLISH_VOICES):
             logger.warning(
                 f"Voice ID '{voice_id}' not found in available English voices. Using default 'af_heart'."
             )
-            voice_id = "af_heart"
+            return "af_heart"
+        return voice_id
 
-        try:
-            logger.info(
-                f"Synthesizing speech with Kokoro: voice='{voice_id}', text='{text[:50]}...'"
-            )
+    def _cache_key(self, text: str, voice_id: str) -> str:
+        return TTSAudioCache.key(text, voice_id, self.lang_code, self.model_version)
 
-            # Kokoro's generator yields segments at natural breaks (sentences, paragraphs)
-            # We need to concatenate all segments to get the full narrative
-            audio_segments = []
-            segment_count = 0
+    def _relative_path(self, filename: str) -> str:
+        # Path relative to static folder (e.g., "tts_cache/filename.wav")
+        return os.path.join(self.cache_dir_name, filename).replace("\\", "/")
 
-            # Collect all audio segments from the generator
-            # The generator yields (graphemes, phonemes, audio_tensor)
-            for _gs, _ps, audio_segment in self.pipeline(text, voice=voice_id):
-                audio_segments.append(audio_segment)
-                segment_count += 1
-                logger.debug(f"Collected audio segment {segment_count}")
+    def _cached(self, name: str) -> Optional[str]:
+        """Relative path of cached audio, if any."""
+        filename = f"{name}.{self.audio_format}"
+        if self.cache.get(filename):
+            logger.info(f"Using cached speech {filename}")
+            return self._relative_path(filename)
+        return None
 
-            if not audio_segments:
-                logger.error("Kokoro synthesis did not yield any audio data.")
-                return None
+    def _iter_segments(
+        self, text: Union[str, List[str]], voice_id: str
+    ) -> Iterator[Tuple[int, Any]]:
+        """(Index of the text, audio) of each segment as Kokoro synthesizes it."""
+        assert self.pipeline is not None
+        logger.info(
+            f"Synthesizing speech with Kokoro: voice='{voice_id}', text='{str(text)[:50]}...'"
+        )
+        synthesis_seconds = 0.0
+        audio_seconds = 0.0
+        started = time.perf_counter()
+        # Kokoro's generator yields a segment per sentence (and per long chunk)
+        # Results unpack as (graphemes, phonemes, audio_tensor)
+        for result in self.pipeline(
+            text, voice=voice_id, split_pattern=SENTENCE_SPLIT_PATTERN
+        ):
+            synthesis_seconds += time.perf_counter() - started
+            audio_segment = result[2]
+            audio_seconds += len(audio_segment) / SAMPLE_RATE
+            yield getattr(result, "text_index", None) or 0, audio_segment
+            started = time.perf_counter()
+        if audio_seconds:
+            real_time_factor.observe(synthesis_seconds / audio_seconds)
 
-            # Concatenate all segments into a single audio array
-            if len(audio_segments) == 1:
-                audio_data = audio_segments[0]
+    def _save_audio(self, audio_data: Any, name: str) -> str:
+        """Write audio to the cache; returns its path relative to the static folder."""
+        os.makedirs(self.full_cache_dir, exist_ok=True)
+        filename = f"{name}.{self.audio_format}"
+        full_output_path = os.path.join(self.full_cache_dir, filename)
+        # Written under a temporary name so the cache never serves partial files
+        temp_path = f"{full_output_path}.tmp"
+        try:
+            if self.audio_format == "ogg":
+                sf.write(
+                    temp_path, audio_data, SAMPLE_RATE, format="OGG", subtype="OPUS"
+                )
             else:
-                logger.info(f"Concatenating {len(audio_segments)} audio segments...")
-                audio_data = np.concatenate(audio_segments)
+                sf.write(temp_path, audio_data, SAMPLE_RATE, format="WAV")
+        except Exception as e:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            if self.audio_format != "ogg":
+                raise
+            # Opus needs libsndfile 1.0.31 or later
+            logger.warning(f"Cannot encode Opus audio ({e}); saving TTS audio as WAV")
+            self.audio_format = "wav"
+            return self._save_audio(audio_data, name)
+        os.replace(temp_path, full_output_path)
+        self.cache.add(filename)
+        logger.debug(f"Saved audio to {full_output_path}")
+        return self._relative_path(filename)
 
-            logger.info(
-                f"Generated audio with {len(audio_segments)} segment(s), total length: {len(audio_data) / 24000:.2f} seconds"
-            )
+    def _save_narrative(self, audio_segments: List[Any], name: str) -> Optional[str]:
+        """Concatenate all segments into the audio of the whole narrative."""
+        if not audio_segments:
+            logger.error("Kokoro synthesis did not yield any audio data.")
+            return None
 
-            filename = f"{uuid.uuid4().hex}.wav"
-            full_output_path = os.path.join(self.full_cache_dir, filename)
+        if len(audio_segments) == 1:
+            audio_data = audio_segments[0]
+        else:
+            logger.info(f"Concatenating {len(audio_segments)} audio segments...")
+            audio_data = np.concatenate(audio_segments)
 
-            sf.write(
-                full_output_path, audio_data, 24000
-            )  # Kokoro default sample rate is 24kHz
+        logger.info(
+            f"Generated audio with {len(audio_segments)} segment(s), total length: {len(audio_data) / SAMPLE_RATE:.2f} seconds"
+        )
+        relative_path = self._save_audio(audio_data, name)
+        logger.info(f"Speech synthesized. Relative path: {relative_path}")
+        return relative_path
 
-            # Return path relative to static folder (e.g., "tts_cache/filename.wav")
-            relative_path = os.path.join(self.cache_dir_name, filename).replace(
-                "\\", "/"
-            )
-            logger.info(
-                f"Speech synthesized and saved to {full_output_path}. Relative path: {relative_path}"
-            )
-            return relative_path
+    def synthesize_speech(self, text: str, voice_id: str) -> Optional[str]:
+        return self._synthesize(text, voice_id, None, None)
+
+    def synthesize_speech_segments(
+        self,
+        text: str,
+        voice_id: str,
+        on_segment: Callable[[int, str], None],
+        cancel: Optional[threading.Event] = None,
+    ) -> Optional[str]:
+        """
+        Save and report each segment as soon as Kokoro yields it, so the time
+        to the first audio is that of the first sentence whatever the length
+        of the text. The whole narrative is saved as well, for replays.
+        """
+        return self._synthesize(text, voice_id, on_segment, cancel)
 
+    def _synthesize(
+        self,
+        text: str,
+        voice_id: str,
+        on_segment: Optional[Callable[[int, str], None]],
+        cancel: Optional[threading.Event],
+    ) -> Optional[str]:
+        """Serve cached audio, or wait for the worker to synthesize it."""
+        if cancel is not None and cancel.is_set():
+            return None
+        if not text:
+            logger.warning("Empty text provided for TTS synthesis.")
+            return None
+        voice_id = self._check_voice(voice_id)
+        cached = self._cached(self._cache_key(text, voice_id))
+        if cached:
+            if on_segment is not None:
+                on_segment(0, cached)
+            return cached
+
+        try:
+            return self.worker.submit(text, voice_id, on_segment, cancel).result()
         except Exception as e:
             logger.error(f"Error during Kokoro speech synthesis: {e}", exc_info=True)
             return None
 
+    def _warm_up(self) -> None:
+        """Load the model and pin the voices in memory before the first request."""
+        if not self._pipeline_ready():
+            return
+        assert self.pipeline is not None
+        for voice in self.KOKORO_ENGLISH_VOICES:
+            try:
+                # KPipeline keeps the voices it loaded
+                self.pipeline.load_voice(voice["id"])
+            except Exception as e:
+                logger.warning(f"Could not load voice {voice['id']}: {e}")
+        # The first inference is much slower than the next ones
+        for _ in self.pipeline("Welcome, adventurer.", voice="af_heart"):
+            pass
+
+    def _run_batch(self, jobs: List[SynthesisJob]) -> None:
+        """Synthesize queued jobs on the worker, short texts of a voice together."""
+        if not self._pipeline_ready():
+            for job in jobs:
+                job.future.set_result(None)
+            return
+
+        short_jobs: Dict[str, List[SynthesisJob]] = {}
+        for job in jobs:
+            if len(job.text) <= SHORT_TEXT_CHARS:
+                short_jobs.setdefault(job.voice_id, []).append(job)
+        for voice_jobs in short_jobs.values():
+            if len(voice_jobs) > 1:
+                self._synthesize_together(voice_jobs)
+
+        for job in jobs:
+            if not job.future.done():
+                job.future.set_result(self._synthesize_job(job))
+
+    def _synthesize_job(self, job: SynthesisJob) -> Optional[str]:
+        name = self._cache_key(job.text, job.voice_id)
+        # Queued twice, or synthesized since it was queued
+        cached = self._cached(name)
+        if cached:
+            job.report_segment(0, cached)
+            return cached
+
+        try:
+            audio_segments = []
+            for index, (_, audio_segment) in enumerate(
+                self._iter_segments(job.text, job.voice_id)
+            ):
+                if job.cancelled:
+                    # Leaving the loop stops Kokoro before the next segment
+                    logger.debug(f"Synthesis cancelled after {index} segment(s)")
+                    return None
+                audio_segments.append(audio_segment)
+                if job.on_segment is not None:
+                    job.report_segment(
+                        index, self._save_audio(audio_segment, f"{name}_{index}")
+                    )
+            return self._save_narrative(audio_segments, name)
+        except Exception as e:
+            logger.error(f"Error during Kokoro speech synthesis: {e}", exc_info=True)
+            return None
+
+    def _synthesize_together(self, jobs: List[SynthesisJob]) -> None:
+        """
+        Synthesize short texts of one voice in a single pipeline run.
+
+        Jobs left unresolved (if the run fails) are synthesized one by one.
+        """
+        jobs_by_name: Dict[str, List[SynthesisJob]] = {}
+        for job in jobs:
+            name = self._cache_key(job.text, job.voice_id)
+            jobs_by_name.setdefault(name, []).append(job)
+        names = list(jobs_by_name)
+        texts = [jobs_by_name[name][0].text for name in names]
+        audio_segments: Dict[int, List[Any]] = {
+            index: [] for index in range(len(names))
+        }
+        logger.info(f"Synthesizing {len(texts)} short texts together")
+
+        try:
+            for index, audio_segment in self._iter_segments(texts, jobs[0].voice_id):
+                audio_segments[index].append(audio_segment)
+            paths = [
+                self._save_narrative(audio_segments[index], name)
+                for index, name in enumerate(names)
+            ]
+        except Exception as e:
+            logger.error(f"Error during batched speech synthesis: {e}", exc_info=True)
+            return
+
+        for name, path in zip(names, paths):
+            for job in jobs_by_name[name]:
+                if path:
+                    job.report_segment(0, path)
+                job.future.set_result(path)
+
+    def close(self) -> None:
+        self.worker.close()
+
     def get_available_voices(
         self, lang_code: Optional[str] = None
     ) -> List[VoiceInfoModel]:
@@ -30,7 +30,12 @@ def get_tts_service(settings: Settings) -> Optional[ITTSService]:
                 f"Initializing KokoroTTSService with lang_code='{lang_code}', cache_dir_name='{cache_dir_name}'"
             )
             return KokoroTTSService(
-                lang_code=lang_code, cache_dir=f"static/{cache_dir_name}"
+                lang_code=lang_code,
+                cache_dir=f"static/{cache_dir_name}",
+                max_cache_bytes=settings.tts.cache_max_mb * 1_000_000,
+                audio_format=settings.tts.audio_format,
+                max_batch=settings.tts.max_batch,
+                warm_up=settings.tts.warmup,
             )
         except ImportError as e:
             logger.warning(
@@ -0,0 +1,171 @@
+"""
+Dedicated worker thread for speech synthesis.
+
+The speech model runs on one thread that every session shares: requests are
+queued, and whatever is waiting when the worker becomes free is handed over
+as one batch, so the provider can synthesize short texts of the same voice
+together. The worker can warm the model up before the first request. Queue
+depth and waiting time are exposed at ``/api/metrics``.
+"""
+
+import contextvars
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+
+from app.utils.metrics import metrics_registry
+
+logger = logging.getLogger(__name__)
+
+QUEUE_WAIT_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+queue_depth = metrics_registry.gauge(
+    "tts_queue_depth", "Speech synthesis requests waiting for the TTS worker"
+)
+queue_wait = metrics_registry.histogram(
+    "tts_queue_wait_seconds",
+    "Time speech synthesis requests wait for the TTS worker",
+    buckets=QUEUE_WAIT_BUCKETS,
+)
+batch_size = metrics_registry.histogram(
+    "tts_batch_size",
+    "Speech synthesis requests handed to the TTS worker at once",
+    buckets=(1, 2, 4, 8, 16),
+)
+
+
+@dataclass
+class SynthesisJob:
+    """A queued synthesis request; its future receives the audio path."""
+
+    text: str
+    voice_id: str
+    on_segment: Optional[Callable[[int, str], None]] = None
+    # Set when the requester no longer wants the audio
+    cancel: Optional[threading.Event] = None
+    future: "Future[Optional[str]]" = field(default_factory=Future)
+    # Context of the caller, so callbacks emit events to its session
+    context: contextvars.Context = field(default_factory=contextvars.copy_context)
+    enqueued: float = field(default_factory=time.perf_counter)
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel is not None and self.cancel.is_set()
+
+    def report_segment(self, index: int, audio_path: str) -> None:
+        if self.on_segment is not None:
+            self.context.run(self.on_segment, index, audio_path)
+
+
+class TTSSynthesisWorker:
+    """Thread running batches of synthesis jobs one after the other."""
+
+    def __init__(
+        self,
+        run_batch: Callable[[List[SynthesisJob]], None],
+        warm_up: Optional[Callable[[], None]] = None,
+        max_batch: int = 8,
+    ) -> None:
+        """
+        Args:
+            run_batch: Synthesizes the jobs and resolves their futures
+            warm_up: Loads the model before the first job
+            max_batch: Most jobs handed to run_batch at once
+        """
+        self.run_batch = run_batch
+        self.warm_up = warm_up
+        self.max_batch = max(1, max_batch)
+        self._queue: "queue.Queue[Optional[SynthesisJob]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """Start the worker (and warm the model up) if not running yet."""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("The TTS worker is closed")
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="tts-synthesis", daemon=True
+                )
+                self._thread.start()
+
+    def submit(
+        self,
+        text: str,
+        voice_id: str,
+        on_segment: Optional[Callable[[int, str], None]] = None,
+        cancel: Optional[threading.Event] = None,
+    ) -> "Future[Optional[str]]":
+        """
+        Queue a synthesis; on_segment is called from the worker thread.
+
+        Once cancel is set, the job is skipped if not started yet, and
+        run_batch should stop it between segments otherwise.
+        """
+        job = SynthesisJob(text, voice_id, on_segment, cancel)
+        self.start()
+        queue_depth.inc()
+        self._queue.put(job)
+        return job.future
+
+    def close(self) -> None:
+        """Stop the worker after the jobs already queued."""
+        with self._lock:
+            if self._thread is not None and not self._closed:
+                self._queue.put(None)
+            self._closed = True
+
+    def _run(self) -> None:
+        if self.warm_up is not None:
+            started = time.perf_counter()
+            try:
+                self.warm_up()
+                logger.info(
+                    f"TTS model warmed up in {time.perf_counter() - started:.1f}s"
+                )
+            except Exception as e:
+                logger.error(f"TTS warm-up failed: {e}", exc_info=True)
+
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            batch = [job]
+            while len(batch) < self.max_batch:
+                try:
+                    next_job = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if next_job is None:
+                    # Finish this batch, then stop
+                    self._queue.put(None)
+                    break
+                batch.append(next_job)
+            self._run_batch(batch)
+
+    def _run_batch(self, batch: List[SynthesisJob]) -> None:
+        queue_depth.dec(len(batch))
+        now = time.perf_counter()
+        # Jobs cancelled while queued are skipped
+        jobs = [job for job in batch if job.future.set_running_or_notify_cancel()]
+        for job in [job for job in jobs if job.cancelled]:
+            job.future.set_result(None)
+            jobs.remove(job)
+        for job in jobs:
+            queue_wait.observe(now - job.enqueued)
+        if not jobs:
+            return
+        batch_size.observe(len(jobs))
+        try:
+            self.run_batch(jobs)
+        except Exception as e:
+            logger.error(f"TTS batch failed: {e}", exc_info=True)
+            for job in jobs:
+                if not job.future.done():
+                    job.future.set_exception(e)
@@ -6,7 +6,6 @@ This repository manages the metadata about these instances, while the actual
 game state is managed by IGameStateRepository.
 """
 
-import json
 import logging
 from datetime import datetime, timezone
 from pathlib import Path
@@ -16,6 +15,7 @@ from app.core.repository_interfaces import ICampaignInstanceRepository
 from app.models.campaign.instance import CampaignInstanceModel
 from app.models.utils import MigrationResultModel
 from app.settings import Settings
+from app.utils.save_serializer import SaveSerializer
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +25,7 @@ class CampaignInstanceRepository(ICampaignInstanceRepository):
 
     def __init__(self, settings: Settings) -> None:
         self.settings = settings
+        self.serializer = SaveSerializer.from_settings(settings)
         self.base_dir = Path(settings.storage.campaigns_dir)
         self._ensure_directory_exists()
 
@@ -67,8 +68,7 @@ class CampaignInstanceRepository(ICampaignInstanceRepository):
             return None
 
         try:
-            with open(instance_path, encoding="utf-8") as f:
-                data = json.load(f)
+            data = self.serializer.read(instance_path)
 
             # Check version and migrate if needed
             migration_result = self._check_version(data)
@@ -119,10 +119,7 @@ class CampaignInstanceRepository(ICampaignInstanceRepository):
                 instance.last_played = datetime.now(timezone.utc)
 
             # Save instance metadata
-            with open(instance_path, "w", encoding="utf-8") as f:
-                json.dump(
-                    instance.model_dump(mode="json"), f, indent=2, ensure_ascii=False
-                )
+            self.serializer.write(instance_path, instance.model_dump(mode="json"))
 
             logger.info(
                 f"{'Created' if is_new else 'Updated'} campaign instance {instance.id}"
@@ -4,7 +4,6 @@ This module provides file-based persistence for character instances,
 implementing the CharacterInstanceRepositoryProtocol.
 """
 
-import json
 import logging
 import os
 from datetime import datetime, timezone
@@ -14,6 +13,7 @@ from typing import List, Optional
 from app.core.repository_interfaces import ICharacterInstanceRepository
 from app.models.character.instance import CharacterInstanceModel
 from app.settings import Settings
+from app.utils.save_serializer import SaveSerializer
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +28,7 @@ class CharacterInstanceRepository(ICharacterInstanceRepository):
             settings: Application settings
         """
         self.settings = settings
+        self.serializer = SaveSerializer.from_settings(settings)
         # Character instances are stored under saves directory
         # This is intentionally hardcoded as it's not user-configurable
         self.base_dir = Path(
@@ -65,9 +66,8 @@ class CharacterInstanceRepository(ICharacterInstanceRepository):
             return None
 
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                return CharacterInstanceModel(**data)
+            data = self.serializer.read(file_path)
+            return CharacterInstanceModel(**data)
         except Exception as e:
             logger.error(f"Error loading character instance {instance_id}: {e}")
             return None
@@ -87,16 +87,9 @@ class CharacterInstanceRepository(ICharacterInstanceRepository):
             # Update last_played timestamp
             instance.last_played = datetime.now(timezone.utc)
 
-            # Convert to dict for JSON serialization
+            # Convert to dict for serialization; written atomically
             data = instance.model_dump(mode="json")
-
-            # Write to temporary file first for atomicity
-            temp_path = file_path.with_suffix(".tmp")
-            with open(temp_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-
-            # Atomic rename
-            temp_path.replace(file_path)
+            self.serializer.write(file_path, data)
 
             logger.info(f"Saved character instance {instance.id}")
             return True
@@ -118,10 +111,9 @@ class CharacterInstanceRepository(ICharacterInstanceRepository):
                 continue
 
             try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    instance = CharacterInstanceModel(**data)
-                    instances.append(instance)
+                data = self.serializer.read(file_path)
+                instance = CharacterInstanceModel(**data)
+                instances.append(instance)
 
             except Exception as e:
                 logger.error(f"Error loading instance from {file_path}: {e}")
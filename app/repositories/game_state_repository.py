@@ -2,16 +2,23 @@
 Game state repository implementation for managing game state persistence.
 """
 
-import json
 import logging
 import os
+import time
 from datetime import datetime, timezone
 from typing import Any, Dict, Optional
 
 from app.core.repository_interfaces import IGameStateRepository
+from app.core.session_context import get_current_session_id
+from app.core.sqlite_backend import SqliteStateDatabase, session_key
+from app.exceptions import StaleStateError
+from app.models.api import PersistenceStatusResponse
 from app.models.game_state.main import GameStateModel
 from app.models.shared import ChatMessageModel
 from app.models.utils import LocationModel, MigrationResultModel
+from app.repositories.game_state_snapshot import GameStateSnapshot
+from app.repositories.write_behind import WriteBehindWriter
+from app.utils.save_serializer import SaveSerializer
 
 logger = logging.getLogger(__name__)
 
@@ -19,8 +26,120 @@ logger = logging.getLogger(__name__)
 class BaseGameStateRepository(IGameStateRepository):
     """Base class with common functionality for game state repositories."""
 
-    def __init__(self, base_save_dir: str = "saves") -> None:
+    def __init__(
+        self, base_save_dir: str = "saves", serializer: Optional[SaveSerializer] = None
+    ) -> None:
         self.base_save_dir = base_save_dir
+        self.serializer = serializer or SaveSerializer()
+        # Active game state per session; the None key is the default session.
+        self._session_states: Dict[Optional[str], GameStateModel] = {}
+        # Campaign ids of sessions evicted to disk, restored on next access.
+        self._evicted_sessions: Dict[str, str] = {}
+
+    @property
+    def _active_game_state(self) -> GameStateModel:
+        """The active game state of the session bound to the current context."""
+        session_id = get_current_session_id()
+        state = self._session_states.get(session_id)
+        if state is None:
+            state = self._restore_session_state(session_id)
+            self._session_states[session_id] = state
+        return state
+
+    @_active_game_state.setter
+    def _active_game_state(self, state: GameStateModel) -> None:
+        self._session_states[get_current_session_id()] = state
+
+    def _restore_session_state(self, session_id: Optional[str]) -> GameStateModel:
+        """Create the active state for a session that has none in memory.
+
+        Sessions that were evicted are reloaded from their campaign save,
+        anything else starts from the default game state.
+        """
+        campaign_id = (
+            self._evicted_sessions.pop(session_id, None) if session_id else None
+        )
+        if campaign_id:
+            loaded_state = self._read_state_file(
+                self._get_campaign_save_path(campaign_id)
+            )
+            if loaded_state is not None:
+                logger.info(
+                    f"Restored session '{session_id}' from campaign '{campaign_id}' save."
+                )
+                return loaded_state
+            logger.warning(
+                f"Could not restore session '{session_id}' from campaign '{campaign_id}'; starting from default state."
+            )
+        return self._initialize_default_game_state()
+
+    def evict_session(self, session_id: str) -> bool:
+        """Persist a session's active state to disk and drop it from memory."""
+        state = self._session_states.get(session_id)
+        if state is None:
+            return False
+        if state.campaign_id:
+            # Write before dropping so a failed write keeps the state in memory
+            self._write_state_file(
+                state, self._get_campaign_save_path(state.campaign_id)
+            )
+            self._evicted_sessions[session_id] = state.campaign_id
+        del self._session_states[session_id]
+        logger.info(
+            f"Evicted session '{session_id}' (campaign '{state.campaign_id}') from memory."
+        )
+        return True
+
+    def _initialize_default_game_state(self) -> GameStateModel:
+        """Initialize default in-memory game state.
+
+        This creates a minimal default state that can be used when no campaign
+        is loaded.
+        """
+        logger.info("Initializing minimal default in-memory game state...")
+
+        # Create minimal default state
+        game_state = GameStateModel(
+            campaign_id=None,
+            campaign_name="Default Campaign",
+            current_location=LocationModel(
+                name="Tavern", description="A cozy tavern where adventures begin."
+            ),
+            campaign_goal="No specific goal set.",
+            narration_enabled=False,
+            tts_voice="af_heart",
+        )
+
+        # Add a simple welcome message
+        initial_message = ChatMessageModel(
+            id="welcome",
+            role="assistant",
+            content="Welcome! Please load or create a campaign to begin your adventure.",
+            timestamp=datetime.now(timezone.utc).isoformat(),
+            is_dice_result=False,
+        )
+        game_state.chat_history.append(initial_message)
+
+        logger.info("Default in-memory game state initialized.")
+        return game_state
+
+    def _read_state_file(self, path: str) -> Optional[GameStateModel]:
+        """Read and migrate a saved game state, returning None on failure."""
+        try:
+            data = self.serializer.read(path)
+
+            # Check version and migrate if needed
+            migration_result = self._check_version(data)
+
+            return GameStateModel(**migration_result.data)
+        except Exception as e:
+            logger.error(f"Failed to read game state from {path}: {e}")
+            return None
+
+    def _write_state_file(self, state: GameStateModel, path: str) -> None:
+        """Atomically write a game state to disk."""
+        # Use model_dump with mode='json' to properly serialize datetime fields
+        self.serializer.write(path, state.model_dump(mode="json"))
 
     def _get_campaign_save_path(self, campaign_id: str) -> str:
         """Get the path for a campaign's save file."""
@@ -58,45 +177,15 @@ class BaseGameStateRepository(IGameStateRepository):
 class InMemoryGameStateRepository(BaseGameStateRepository):
     """In-memory implementation of game state repository."""
 
-    def __init__(self, base_save_dir: str = "saves") -> None:
-        super().__init__(base_save_dir)
+    def __init__(
+        self, base_save_dir: str = "saves", serializer: Optional[SaveSerializer] = None
+    ) -> None:
+        super().__init__(base_save_dir, serializer)
         # active_game_state is the one currently being played.
-        # _campaign_saves stores copies for different campaigns.
-        self._active_game_state: GameStateModel = self._initialize_default_game_state()
-        self._campaign_saves: Dict[str, GameStateModel] = {}
-
-    def _initialize_default_game_state(self) -> GameStateModel:
-        """Initialize default in-memory game state.
-
-        This creates a minimal default state that can be used when no campaign
-        is loaded.
-        """
-        logger.info("Initializing minimal default in-memory game state...")
-
-        # Create minimal default state
-        game_state = GameStateModel(
-            campaign_id=None,
-            campaign_name="Default Campaign",
-            current_location=LocationModel(
-                name="Tavern", description="A cozy tavern where adventures begin."
-            ),
-            campaign_goal="No specific goal set.",
-            narration_enabled=False,
-            tts_voice="af_heart",
-        )
-
-        # Add a simple welcome message
-        initial_message = ChatMessageModel(
-            id="welcome",
-            role="assistant",
-            content="Welcome! Please load or create a campaign to begin your adventure.",
-            timestamp=datetime.now(timezone.utc).isoformat(),
-            is_dice_result=False,
-        )
-        game_state.chat_history.append(initial_message)
-
-        logger.info("Default in-memory game state initialized.")
-        return game_state
+        # _campaign_saves stores snapshots for different campaigns; each
+        # snapshot shares unchanged parts with the previous one.
+        self._active_game_state = self._initialize_default_game_state()
+        self._campaign_saves: Dict[str, GameStateSnapshot] = {}
 
     def get_game_state(self) -> GameStateModel:
         return self._active_game_state
@@ -104,7 +193,9 @@ class InMemoryGameStateRepository(BaseGameStateRepository):
     def save_game_state(self, state: GameStateModel) -> None:
         self._active_game_state = state  # Always update the active one
         if state.campaign_id:
-            self._campaign_saves[state.campaign_id] = state.model_copy(deep=True)
+            self._campaign_saves[state.campaign_id] = GameStateSnapshot.capture(
+                state, previous=self._campaign_saves.get(state.campaign_id)
+            )
             logger.debug(
                 f"Game state for campaign '{state.campaign_id}' saved to in-memory store."
             )
@@ -121,7 +212,7 @@ class InMemoryGameStateRepository(BaseGameStateRepository):
         """
         # Check if we have it in memory
         if campaign_id in self._campaign_saves:
-            loaded_state = self._campaign_saves[campaign_id].model_copy(deep=True)
+            loaded_state = self._campaign_saves[campaign_id].restore()
             self._active_game_state = loaded_state
             logger.info(
                 f"Game state for campaign '{campaign_id}' loaded from in-memory store and set as active."
@@ -132,8 +223,7 @@ class InMemoryGameStateRepository(BaseGameStateRepository):
         campaign_save_path = self._get_campaign_save_path(campaign_id)
         if os.path.exists(campaign_save_path):
             try:
-                with open(campaign_save_path, encoding="utf-8") as f:
-                    data = json.load(f)
+                data = self.serializer.read(campaign_save_path)
 
                 # Check version and migrate if needed
                 migration_result = self._check_version(data)
@@ -141,7 +231,9 @@ class InMemoryGameStateRepository(BaseGameStateRepository):
                 loaded_state = GameStateModel(**migration_result.data)
                 # Cache it in memory and set as active
                 self._active_game_state = loaded_state
-                self._campaign_saves[campaign_id] = loaded_state.model_copy(deep=True)
+                self._campaign_saves[campaign_id] = GameStateSnapshot.capture(
+                    loaded_state
+                )
                 logger.info(
                     f"Game state for campaign '{campaign_id}' loaded from disk into in-memory store and set as active."
                 )
@@ -158,23 +250,53 @@ class InMemoryGameStateRepository(BaseGameStateRepository):
         )
         return None
 
+    def get_persistence_status(self) -> PersistenceStatusResponse:
+        return PersistenceStatusResponse(mode="memory")
+
+    def evict_session(self, session_id: str) -> bool:
+        """Persist a session to disk and release its in-memory campaign copy."""
+        state = self._session_states.get(session_id)
+        if not super().evict_session(session_id):
+            return False
+        campaign_id = state.campaign_id if state else None
+        still_active = any(
+            other.campaign_id == campaign_id for other in self._session_states.values()
+        )
+        if campaign_id and not still_active:
+            self._campaign_saves.pop(campaign_id, None)
+        return True
 
-class FileGameStateRepository(BaseGameStateRepository):
-    """File-based implementation of game state repository with campaign-specific saves."""
 
-    def __init__(self, base_save_dir: str = "saves"):
-        super().__init__(base_save_dir)
+class FileGameStateRepository(BaseGameStateRepository):
+    """File-based implementation of game state repository with campaign-specific saves.
+
+    With a write-behind delay, saves update the in-memory state immediately and
+    are written to disk by a background writer that coalesces rapid saves of
+    the same campaign (see WriteBehindWriter). Reads from disk flush first.
+    """
+
+    def __init__(
+        self,
+        base_save_dir: str = "saves",
+        serializer: Optional[SaveSerializer] = None,
+        write_behind_delay: float = 0.0,
+    ):
+        super().__init__(base_save_dir, serializer)
         self.default_game_state_file = os.path.join(
             base_save_dir, "game_state_default_active.json"
         )
-        self._active_game_state: GameStateModel = self._load_or_initialize_default()
+        self._active_game_state = self._load_or_initialize_default()
         self._loaded_from_campaign_specific_file = False
+        self._writer: Optional[WriteBehindWriter] = (
+            WriteBehindWriter(self._write_state_file, write_behind_delay)
+            if write_behind_delay > 0
+            else None
+        )
 
     def _load_or_initialize_default(self) -> GameStateModel:
         if os.path.exists(self.default_game_state_file):
             try:
-                with open(self.default_game_state_file, encoding="utf-8") as f:
-                    data = json.load(f)
+                data = self.serializer.read(self.default_game_state_file)
 
                 # Check version and migrate if needed
                 migration_result = self._check_version(data)
@@ -188,12 +310,10 @@ class FileGameStateRepository(BaseGameStateRepository):
                     f"Failed to load default active game state from {self.default_game_state_file}: {e}. Initializing new."
                 )
 
-        # Fallback to InMemoryGameStateRepository's initialization logic for a true default
         logger.info(
             "Default active game state file not found. Initializing new default game state."
         )
-        temp_in_memory_repo = InMemoryGameStateRepository()
-        return temp_in_memory_repo.get_game_state()
+        return self._initialize_default_game_state()
 
     def get_game_state(self) -> GameStateModel:
         """Returns the current in-memory active state."""
@@ -205,28 +325,48 @@ class FileGameStateRepository(BaseGameStateRepository):
         save_path = self.default_game_state_file
         if state.campaign_id:
             save_path = self._get_campaign_save_path(state.campaign_id)
-            campaign_dir = os.path.dirname(save_path)
-            os.makedirs(campaign_dir, exist_ok=True)
-        else:
-            # Ensure base_save_dir exists if saving default
-            os.makedirs(self.base_save_dir, exist_ok=True)
+
+        if self._writer is not None:
+            self._writer.schedule(state, save_path)
+            return
 
         logger.debug(
             f"Saving game state for campaign '{state.campaign_id or 'Default'}' to {save_path}"
         )
         try:
-            temp_path = save_path + ".tmp"
-            with open(temp_path, "w", encoding="utf-8") as f:
-                # Use model_dump with mode='json' to properly serialize datetime fields
-                json.dump(
-                    state.model_dump(mode="json"), f, indent=2, ensure_ascii=False
-                )
-            os.replace(temp_path, save_path)
+            self._write_state_file(state, save_path)
             logger.info(f"Game state saved to {save_path}")
         except Exception as e:
             logger.error(f"Failed to save game state to {save_path}: {e}")
 
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Write pending write-behind saves to disk.
+
+        Returns:
+            False if a write failed or the timeout passed first
+        """
+        if self._writer is not None:
+            return self._writer.flush(timeout)
+        return True
+
+    def close(self) -> None:
+        """Flush pending saves and stop the background writer."""
+        if self._writer is not None:
+            self._writer.close()
+
+    def get_persistence_status(self) -> PersistenceStatusResponse:
+        if self._writer is not None:
+            return self._writer.status()
+        return PersistenceStatusResponse(mode="sync")
+
+    def evict_session(self, session_id: str) -> bool:
+        # Pending saves must land first so they cannot overwrite the eviction
+        self.flush()
+        return super().evict_session(session_id)
+
     def load_campaign_state(self, campaign_id: str) -> Optional[GameStateModel]:
+        # The save file on disk must include saves still waiting to be written
+        self.flush()
         campaign_specific_path = self._get_campaign_save_path(campaign_id)
         if not os.path.exists(campaign_specific_path):
             logger.info(
@@ -234,8 +374,7 @@ class FileGameStateRepository(BaseGameStateRepository):
             )
             return None
         try:
-            with open(campaign_specific_path, encoding="utf-8") as f:
-                data = json.load(f)
+            data = self.serializer.read(campaign_specific_path)
 
             # Check version and migrate if needed
             migration_result = self._check_version(data)
@@ -259,6 +398,160 @@ class FileGameStateRepository(BaseGameStateRepository):
             return None
 
 
+class SqliteGameStateRepository(BaseGameStateRepository):
+    """Game state repository shared by several workers through SQLite.
+
+    Every save bumps a per-session version number. Before returning the cached
+    state, a worker compares its cached version with the database and reloads
+    the state if another worker saved a newer one. A save only applies on top
+    of the version the worker last read, otherwise StaleStateError is raised
+    instead of silently overwriting the other worker's save. Campaign states are stored
+    alongside so any worker can load them; campaign saves written by the other
+    repositories are picked up from disk on first load.
+    """
+
+    def __init__(self, database: SqliteStateDatabase, base_save_dir: str = "saves"):
+        super().__init__(base_save_dir)
+        self.database = database
+        # Version of the cached state of each session, None key is the default
+        self._versions: Dict[Optional[str], int] = {}
+
+    def get_game_state(self) -> GameStateModel:
+        session_id = get_current_session_id()
+        conn = self.database.connection()
+        row = conn.execute(
+            "SELECT version FROM session_states WHERE session_key = ?",
+            (session_key(session_id),),
+        ).fetchone()
+        if row is None:
+            # Nothing saved yet; a save must not replace one made meanwhile
+            self._versions[session_id] = 0
+        elif row[0] != self._versions.get(session_id):
+            data_row = conn.execute(
+                "SELECT version, data FROM session_states WHERE session_key = ?",
+                (session_key(session_id),),
+            ).fetchone()
+            try:
+                self._active_game_state = GameStateModel.model_validate_json(
+                    data_row[1]
+                )
+                self._versions[session_id] = data_row[0]
+            except Exception as e:
+                logger.error(
+                    f"Failed to load shared game state for session '{session_id}': {e}"
+                )
+        return self._active_game_state
+
+    def save_game_state(self, state: GameStateModel) -> None:
+        self._save_state(state, check_version=True)
+
+    def _save_state(self, state: GameStateModel, check_version: bool) -> None:
+        """Store the state of the current session, bumping its version.
+
+        With check_version, the save only applies if the stored version is
+        still the one this worker last read.
+        """
+        session_id = get_current_session_id()
+        key = session_key(session_id)
+        expected = self._versions.get(session_id) if check_version else None
+        data = state.model_dump_json()
+        now = time.time()
+        with self.database.transaction() as conn:
+            if expected is None:
+                row = conn.execute(
+                    "INSERT INTO session_states "
+                    "(session_key, campaign_id, version, data, updated_at) "
+                    "VALUES (?, ?, 1, ?, ?) ON CONFLICT(session_key) DO UPDATE SET "
+                    "campaign_id = excluded.campaign_id, "
+                    "version = session_states.version + 1, "
+                    "data = excluded.data, updated_at = excluded.updated_at "
+                    "RETURNING version",
+                    (key, state.campaign_id, data, now),
+                ).fetchone()
+            elif expected == 0:
+                row = conn.execute(
+                    "INSERT INTO session_states "
+                    "(session_key, campaign_id, version, data, updated_at) "
+                    "VALUES (?, ?, 1, ?, ?) ON CONFLICT(session_key) DO NOTHING "
+                    "RETURNING version",
+                    (key, state.campaign_id, data, now),
+                ).fetchone()
+            else:
+                row = conn.execute(
+                    "UPDATE session_states SET campaign_id = ?, "
+                    "version = version + 1, data = ?, updated_at = ? "
+                    "WHERE session_key = ? AND version = ? RETURNING version",
+                    (state.campaign_id, data, now, key, expected),
+                ).fetchone()
+            if row is None:
+                logger.warning(
+                    f"Save of session '{session_id}' rejected: another worker saved "
+                    f"over version {expected} first."
+                )
+                raise StaleStateError(
+                    details={"session_id": session_id, "expected_version": expected}
+                )
+            if state.campaign_id:
+                conn.execute(
+                    "INSERT INTO campaign_states "
+                    "(campaign_id, version, data, updated_at) VALUES (?, 1, ?, ?) "
+                    "ON CONFLICT(campaign_id) DO UPDATE SET "
+                    "version = campaign_states.version + 1, "
+                    "data = excluded.data, updated_at = excluded.updated_at",
+                    (state.campaign_id, data, now),
+                )
+        self._active_game_state = state
+        self._versions[session_id] = row[0]
+        logger.debug(
+            f"Game state for campaign '{state.campaign_id or 'Default'}' saved to shared store (v{row[0]})."
+        )
+
+    def load_campaign_state(self, campaign_id: str) -> Optional[GameStateModel]:
+        """Load campaign state from the shared store, falling back to disk."""
+        row = (
+            self.database.connection()
+            .execute(
+                "SELECT data FROM campaign_states WHERE campaign_id = ?",
+                (campaign_id,),
+            )
+            .fetchone()
+        )
+        loaded_state: Optional[GameStateModel] = None
+        if row is not None:
+            try:
+                loaded_state = GameStateModel.model_validate_json(row[0])
+            except Exception as e:
+                logger.error(
+                    f"Failed to load game state for campaign '{campaign_id}' from shared store: {e}"
+                )
+                return None
+        else:
+            campaign_save_path = self._get_campaign_save_path(campaign_id)
+            if not os.path.exists(campaign_save_path):
+                logger.info(
+                    f"No saved state found for campaign '{campaign_id}' in shared store or on disk."
+                )
+                return None
+            loaded_state = self._read_state_file(campaign_save_path)
+            if loaded_state is None:
+                return None
+
+        # Saving makes the loaded campaign the active one for every worker
+        self._save_state(loaded_state, check_version=False)
+        logger.info(
+            f"Game state for campaign '{campaign_id}' loaded from shared store and set as active."
+        )
+        return loaded_state
+
+    def evict_session(self, session_id: str) -> bool:
+        """Drop a session's cached state; it stays in the shared store."""
+        if self._session_states.pop(session_id, None) is None:
+            return False
+        self._versions.pop(session_id, None)
+        logger.info(f"Released cached state of session '{session_id}'.")
+        return True
+
+
 class GameStateRepositoryFactory:
     """Factory for creating game state repositories."""
 
@@ -268,10 +561,22 @@ class GameStateRepositoryFactory:
     ) -> IGameStateRepository:
         if repo_type == "memory":
             base_dir = kwargs.get("base_save_dir", "saves")
-            return InMemoryGameStateRepository(base_save_dir=base_dir)
+            return InMemoryGameStateRepository(
+                base_save_dir=base_dir, serializer=kwargs.get("serializer")
+            )
         elif repo_type == "file":
             base_dir = kwargs.get("base_save_dir", "saves")
-            return FileGameStateRepository(base_save_dir=base_dir)
+            return FileGameStateRepository(
+                base_save_dir=base_dir,
+                serializer=kwargs.get("serializer"),
+                write_behind_delay=kwargs.get("write_behind_delay", 0.0),
+            )
+        elif repo_type == "sqlite":
+            base_dir = kwargs.get("base_save_dir", "saves")
+            database = kwargs.get("database") or SqliteStateDatabase(
+                kwargs.get("db_path", os.path.join(base_dir, "state.db"))
+            )
+            return SqliteGameStateRepository(database, base_save_dir=base_dir)
         else:
             raise ValueError(f"Unknown repository type: {repo_type}")
 
@@ -283,4 +588,5 @@ __all__ = [
     "IGameStateRepository",
     "GameStateRepositoryFactory",
     "InMemoryGameStateRepository",
+    "SqliteGameStateRepository",
 ]
@@ -0,0 +1,189 @@
+"""
+Structural-sharing snapshots of game state.
+
+InMemoryGameStateRepository keeps a copy of every saved campaign that must not
+change when the active state is mutated afterwards. Deep-copying the whole
+GameStateModel on every save makes save latency grow with the chat history and
+the party. A snapshot instead shares whatever did not change since the
+previous snapshot of the same campaign:
+
+- Chat messages are immutable, so the history is stored as sealed segments of
+  message references. Sealed segments are reused as long as the history keeps
+  them in place; only the open tail segment is rebuilt.
+- Party members, NPCs and quests are versioned per entry. An entry is copied
+  only when it differs from the copy held by the previous snapshot.
+- Remaining sections are copied only when they changed.
+"""
+
+import copy
+from typing import Any, Dict, List, Mapping, Optional, Set, Tuple
+
+from pydantic import BaseModel
+
+from app.models.character.instance import CharacterInstanceModel
+from app.models.game_state.main import GameStateModel
+from app.models.shared import ChatMessageModel
+
+# Number of messages in a sealed chat segment
+CHAT_SEGMENT_SIZE = 64
+
+# Dictionary sections whose entries are copied independently
+ENTRY_SECTIONS = ("party", "known_npcs", "active_quests")
+
+# Mutable sections copied as a whole when they change
+COPIED_SECTIONS = (
+    "current_location",
+    "pending_player_dice_requests",
+    "combat",
+    "world_lore",
+    "event_summary",
+    "history_summaries",
+    "content_pack_priority",
+)
+
+# Everything else holds immutable values and is stored by reference
+SCALAR_FIELDS = tuple(
+    name
+    for name in GameStateModel.model_fields
+    if name not in ENTRY_SECTIONS + COPIED_SECTIONS + ("chat_history",)
+)
+
+ChatSegment = Tuple[ChatMessageModel, ...]
+
+
+def _clone(value: Any) -> Any:
+    """Deep copy a section value."""
+    if isinstance(value, BaseModel):
+        return value.model_copy(deep=True)
+    return copy.deepcopy(value)
+
+
+class GameStateSnapshot:
+    """An immutable copy of a game state sharing structure with its predecessor."""
+
+    __slots__ = (
+        "scalars",
+        "chat_segments",
+        "chat_tail",
+        "entries",
+        "sections",
+        "private",
+        "fields_set",
+    )
+
+    def __init__(
+        self,
+        scalars: Dict[str, Any],
+        chat_segments: Tuple[ChatSegment, ...],
+        chat_tail: ChatSegment,
+        entries: Dict[str, Dict[str, BaseModel]],
+        sections: Dict[str, Any],
+        private: Optional[Dict[str, Any]],
+        fields_set: Set[str],
+    ) -> None:
+        self.scalars = scalars
+        self.chat_segments = chat_segments
+        self.chat_tail = chat_tail
+        self.entries = entries
+        self.sections = sections
+        self.private = private
+        self.fields_set = fields_set
+
+    @classmethod
+    def capture(
+        cls, state: GameStateModel, previous: Optional["GameStateSnapshot"] = None
+    ) -> "GameStateSnapshot":
+        """Take a snapshot of a state, reusing unchanged parts of a previous one."""
+        chat_segments, chat_tail = cls._capture_chat(
+            state.chat_history, previous.chat_segments if previous else ()
+        )
+
+        entries: Dict[str, Dict[str, BaseModel]] = {}
+        for name in ENTRY_SECTIONS:
+            previous_entries = previous.entries[name] if previous else {}
+            current: Dict[str, BaseModel] = getattr(state, name)
+            section: Dict[str, BaseModel] = {}
+            for key, value in current.items():
+                kept = previous_entries.get(key)
+                # Copy on write: only entries that changed get a new copy
+                section[key] = (
+                    kept if kept is not None and kept == value else _clone(value)
+                )
+            entries[name] = section
+
+        sections: Dict[str, Any] = {}
+        for name in COPIED_SECTIONS:
+            value = getattr(state, name)
+            kept = previous.sections[name] if previous else None
+            sections[name] = (
+                kept if kept is not None and kept == value else _clone(value)
+            )
+
+        return cls(
+            scalars={name: getattr(state, name) for name in SCALAR_FIELDS},
+            chat_segments=chat_segments,
+            chat_tail=chat_tail,
+            entries=entries,
+            sections=sections,
+            private=copy.deepcopy(state.__pydantic_private__),
+            fields_set=set(state.model_fields_set),
+        )
+
+    @staticmethod
+    def _capture_chat(
+        history: List[ChatMessageModel], previous_segments: Tuple[ChatSegment, ...]
+    ) -> Tuple[Tuple[ChatSegment, ...], ChatSegment]:
+        """Split the chat history into sealed segments and an open tail.
+
+        The history is append-only apart from dropping the last messages, so a
+        previous segment still in place at both ends is reused as is.
+        """
+        segments: List[ChatSegment] = []
+        for segment in previous_segments:
+            start = len(segments) * CHAT_SEGMENT_SIZE
+            end = start + CHAT_SEGMENT_SIZE
+            if (
+                end > len(history)
+                or history[start] is not segment[0]
+                or history[end - 1] is not segment[-1]
+            ):
+                break
+            segments.append(segment)
+
+        sealed = len(segments) * CHAT_SEGMENT_SIZE
+        while len(history) - sealed >= CHAT_SEGMENT_SIZE:
+            segments.append(tuple(history[sealed : sealed + CHAT_SEGMENT_SIZE]))
+            sealed += CHAT_SEGMENT_SIZE
+        return tuple(segments), tuple(history[sealed:])
+
+    @property
+    def campaign_id(self) -> Optional[str]:
+        campaign_id: Optional[str] = self.scalars["campaign_id"]
+        return campaign_id
+
+    @property
+    def party(self) -> Mapping[str, CharacterInstanceModel]:
+        """Read-only view of the party; entries must not be modified."""
+        party: Dict[str, CharacterInstanceModel] = self.entries["party"]  # type: ignore[assignment]
+        return party
+
+    def restore(self) -> GameStateModel:
+        """Build an independent, mutable game state from the snapshot."""
+        chat_history = [
+            message for segment in self.chat_segments for message in segment
+        ]
+        chat_history.extend(self.chat_tail)
+
+        values: Dict[str, Any] = dict(self.scalars)
+        values["chat_history"] = chat_history
+        for name, section in self.entries.items():
+            values[name] = {key: _clone(value) for key, value in section.items()}
+        for name, value in self.sections.items():
+            values[name] = _clone(value)
+
+        state = GameStateModel.model_construct(
+            _fields_set=set(self.fields_set), **values
+        )
+        if self.private is not None:
+            state.__pydantic_private__ = copy.deepcopy(self.private)
+        return state
@@ -0,0 +1,256 @@
+"""
+Write-behind persistence for game state saves.
+
+Saving a game state to disk serializes the whole state and replaces the save
+file, which is too slow to do on every update while a player waits for the
+response. The writer takes a cheap snapshot of the state when it is saved and
+writes it from a background thread once saves for that file have been quiet
+for a debounce interval. Rapid successive saves of the same campaign, e.g. the
+several updates applied from one AI response, are coalesced into one write.
+A failed write keeps its snapshot pending and is retried with a growing delay
+until it, or a newer save of the same file, reaches the disk.
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from app.models.api import PersistenceStatusResponse
+from app.models.game_state.main import GameStateModel
+from app.repositories.game_state_snapshot import GameStateSnapshot
+
+logger = logging.getLogger(__name__)
+
+# Shortest wait before retrying a failed write
+MIN_RETRY_DELAY = 0.1
+
+
+class _PendingWrite:
+    """The latest unwritten snapshot for one save file."""
+
+    __slots__ = ("snapshot", "first_saved_at", "last_saved_at", "failures", "retry_at")
+
+    def __init__(self, snapshot: GameStateSnapshot, now: float) -> None:
+        self.snapshot = snapshot
+        self.first_saved_at = now
+        self.last_saved_at = now
+        # Consecutive failed writes of this snapshot and when to try again
+        self.failures = 0
+        self.retry_at = now
+
+
+class WriteBehindWriter:
+    """Coalesces game state saves and writes them from a background thread.
+
+    A pending save is written once no newer save of the same file arrived for
+    ``debounce_seconds``, or at the latest ``max_delay_seconds`` after the
+    first unwritten save so a busy session still reaches the disk. Failed
+    writes are retried after ``debounce_seconds``, doubling on each failure
+    up to ``max_delay_seconds``.
+    """
+
+    def __init__(
+        self,
+        write: Callable[[GameStateModel, str], None],
+        debounce_seconds: float = 1.0,
+        max_delay_seconds: Optional[float] = None,
+    ) -> None:
+        self._write = write
+        self.debounce_seconds = debounce_seconds
+        self.max_delay_seconds = (
+            max_delay_seconds if max_delay_seconds is not None else debounce_seconds * 5
+        )
+        self._pending: Dict[str, _PendingWrite] = {}
+        # Last snapshot per file, shared with the next one to keep captures cheap
+        self._snapshots: Dict[str, GameStateSnapshot] = {}
+        self._in_flight = 0
+        self._flush_waiters = 0
+        self._condition = threading.Condition()
+        self._closed = False
+
+        self._saves = 0
+        self._coalesced = 0
+        self._writes = 0
+        self._failures = 0
+        self._last_error: Optional[str] = None
+        self._last_write_at: Optional[float] = None
+
+        self._thread = threading.Thread(
+            target=self._run, name="game-state-writer", daemon=True
+        )
+        self._thread.start()
+
+    def schedule(self, state: GameStateModel, path: str) -> None:
+        """Record a save of ``state`` to ``path`` to be written later."""
+        now = time.monotonic()
+        with self._condition:
+            snapshot = GameStateSnapshot.capture(state, self._snapshots.get(path))
+            self._snapshots[path] = snapshot
+            pending = self._pending.get(path)
+            if pending is None:
+                self._pending[path] = _PendingWrite(snapshot, now)
+            else:
+                pending.snapshot = snapshot
+                pending.last_saved_at = now
+                self._coalesced += 1
+            self._saves += 1
+            self._condition.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Write all pending saves now and wait until they are on disk.
+
+        Saves whose last write failed are retried once their retry delay
+        has passed; they stay pending if the retry fails again.
+
+        Returns:
+            True if everything was written before the timeout, False on
+            timeout or once a write failed
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            # While a flush is waiting every pending save is due immediately
+            self._flush_waiters += 1
+            self._condition.notify_all()
+            failures = self._failures
+            try:
+                while self._pending or self._in_flight:
+                    if self._failures != failures and not self._in_flight:
+                        return False
+                    remaining = (
+                        None if deadline is None else deadline - time.monotonic()
+                    )
+                    if remaining is not None and remaining <= 0:
+                        return False
+                    if not self._thread.is_alive():
+                        # Writer stopped (e.g. after close); write in this thread
+                        now = time.monotonic()
+                        self._write_due(now)
+                        if self._pending and self._failures == failures:
+                            next_due = min(
+                                self._due_at(p) for p in self._pending.values()
+                            )
+                            wait = next_due - now
+                            if remaining is not None:
+                                wait = min(wait, remaining)
+                            if wait > 0:
+                                self._condition.wait(wait)
+                        continue
+                    self._condition.wait(remaining)
+            finally:
+                self._flush_waiters -= 1
+        return True
+
+    def close(self) -> None:
+        """Flush pending saves and stop the background thread."""
+        if not self.flush():
+            logger.error(
+                f"{len(self._pending)} game state saves could not be written: "
+                f"{self._last_error}"
+            )
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join(timeout=5)
+
+    def durability_lag(self) -> float:
+        """Seconds the oldest unwritten save has been waiting (0 if none)."""
+        with self._condition:
+            if not self._pending:
+                return 0.0
+            oldest = min(p.first_saved_at for p in self._pending.values())
+        return max(0.0, time.monotonic() - oldest)
+
+    def status(self) -> PersistenceStatusResponse:
+        """Report pending saves, durability lag and write counters."""
+        lag = self.durability_lag()
+        with self._condition:
+            return PersistenceStatusResponse(
+                mode="write_behind",
+                pending_saves=len(self._pending) + self._in_flight,
+                durability_lag_seconds=lag,
+                saves=self._saves,
+                writes=self._writes,
+                coalesced_saves=self._coalesced,
+                failed_writes=self._failures,
+                last_error=self._last_error,
+                seconds_since_last_write=(
+                    None
+                    if self._last_write_at is None
+                    else time.monotonic() - self._last_write_at
+                ),
+            )
+
+    def _due_at(self, pending: _PendingWrite) -> float:
+        if pending.failures:
+            return pending.retry_at
+        if self._flush_waiters:
+            return float("-inf")
+        return min(
+            pending.last_saved_at + self.debounce_seconds,
+            pending.first_saved_at + self.max_delay_seconds,
+        )
+
+    def _run(self) -> None:
+        with self._condition:
+            while not self._closed:
+                now = time.monotonic()
+                self._write_due(now)
+                if self._pending:
+                    next_due = min(self._due_at(p) for p in self._pending.values())
+                    self._condition.wait(max(0.0, next_due - time.monotonic()))
+                else:
+                    self._condition.wait()
+
+    def _write_due(self, now: float) -> None:
+        """Write the pending saves that are due; called with the lock held."""
+        due = [path for path, p in self._pending.items() if self._due_at(p) <= now]
+        for path in due:
+            pending = self._pending.pop(path)
+            self._in_flight += 1
+            self._condition.release()
+            try:
+                # Restoring copies the mutable sections out of the snapshot
+                self._write(pending.snapshot.restore(), path)
+                error = None
+            except Exception as e:
+                error = str(e)
+                logger.error(f"Write-behind save to {path} failed: {e}")
+            finally:
+                self._condition.acquire()
+                self._in_flight -= 1
+            if error is None:
+                self._writes += 1
+                self._last_write_at = time.monotonic()
+                logger.debug(
+                    f"Game state written to {path} "
+                    f"({time.monotonic() - pending.first_saved_at:.2f}s after first save)"
+                )
+            else:
+                self._failures += 1
+                self._last_error = error
+                self._requeue(path, pending)
+        if due:
+            self._condition.notify_all()
+
+    def _requeue(self, path: str, failed: _PendingWrite) -> None:
+        """Keep a snapshot whose write failed until a write of the file succeeds.
+
+        Called with the lock held. A newer save of the file replaces the
+        failed snapshot, but is as late on the disk as the failed one.
+        """
+        newer = self._pending.get(path)
+        if newer is not None:
+            newer.first_saved_at = min(newer.first_saved_at, failed.first_saved_at)
+            return
+        failed.failures += 1
+        delay = max(
+            MIN_RETRY_DELAY,
+            min(
+                self.debounce_seconds * 2 ** (failed.failures - 1),
+                self.max_delay_seconds,
+            ),
+        )
+        failed.retry_at = time.monotonic() + delay
+        self._pending[path] = failed
+        logger.warning(f"Retrying the save to {path} in {delay:.1f}s")
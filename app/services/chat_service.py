@@ -41,8 +41,18 @@ class ChatService(IChatService):
 
         message = self._create_message(role, content, **kwargs)
         game_state = self.game_state_repo.get_game_state()
+        tts = self.tts_integration_service
+        if tts:
+            tts.apply_completed(game_state)
+            if role == "user":
+                # The player moved on from the narrations still being made
+                tts.cancel_pending_narrations()
         game_state.chat_history.append(message)
 
+        # Narration of AI messages is synthesized in the background
+        narration_text = self._narration_text(message)
+        narration_pending = bool(tts and tts.will_narrate(narration_text))
+
         # Emit event
         event = NarrativeAddedEvent(
             correlation_id=kwargs.get("correlation_id"),
@@ -51,15 +61,28 @@ class ChatService(IChatService):
             gm_thought=kwargs.get("gm_thought"),
             audio_path=message.audio_path,
             message_id=message.id,
+            narration_pending=narration_pending,
         )
         emit_event(self.event_queue, event)
 
+        if tts and narration_pending and narration_text:
+            tts.request_narration(narration_text, message.id)
+
         logger.debug(f"Added {role} message to chat history.")
 
     def get_chat_history(self) -> list[ChatMessageModel]:
         """Get the current chat history."""
-        game_state = self.game_state_repo.get_game_state()
-        return game_state.chat_history.copy()
+        # Narration audio is saved by the session registry once it is ready
+        return self.game_state_repo.get_game_state().chat_history.copy()
+
+    @staticmethod
+    def _narration_text(message: ChatMessageModel) -> Optional[str]:
+        """Text narrated for a message (only AI messages are narrated)."""
+        if message.role != "assistant":
+            return None
+        if message.detailed_content is not None:
+            return message.detailed_content
+        return message.content
 
     def _validate_role(self, role: str) -> bool:
         """Validate that the role is allowed."""
@@ -107,35 +130,6 @@ class ChatService(IChatService):
                         "Could not parse AI JSON to extract narrative/thought for history."
                     )
 
-        # Generate TTS for AI assistant messages only if narration is enabled
-        if role == "assistant" and self.tts_integration_service:
-            # Check if narration is enabled in the game state
-            game_state = self.game_state_repo.get_game_state()
-            if game_state and game_state.narration_enabled:
-                # Use detailed_content if available, otherwise use content
-                detailed_content_value = message_data.get("detailed_content")
-                tts_text = (
-                    detailed_content_value
-                    if detailed_content_value is not None
-                    else content
-                )
-                if tts_text and tts_text.strip():
-                    try:
-                        audio_path = (
-                            self.tts_integration_service.generate_tts_for_message(
-                                tts_text, message_id
-                            )
-                        )
-                        if audio_path:
-                            message_data["audio_path"] = audio_path
-                            logger.info(
-                                f"Generated TTS audio for AI message: {audio_path}"
-                            )
-                    except Exception as e:
-                        logger.error(
-                            f"Failed to generate TTS for AI message {message_id}: {e}"
-                        )
-
         # Create and return ChatMessageModel instance from the collected data
         # This is not "casting" - it's properly constructing a new ChatMessageModel object
         return ChatMessageModel(**message_data)
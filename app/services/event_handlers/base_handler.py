@@ -2,9 +2,22 @@
 Base handler for game events with enhanced RAG integration.
 """
 
+import asyncio
 import logging
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional, Tuple, Union
+from contextlib import nullcontext
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
 from uuid import uuid4
 
 from app.core.ai_interfaces import IAIResponseProcessor, IRAGService
@@ -19,6 +32,7 @@ from app.core.repository_interfaces import (
     ICharacterTemplateRepository,
     IGameStateRepository,
 )
+from app.core.session_context import get_current_session_id
 from app.core.system_interfaces import IEventQueue
 from app.domain.combat.combat_utilities import CombatFormatter, CombatValidator
 from app.models.character.combined import CombinedCharacterModel
@@ -31,14 +45,58 @@ from app.models.events.system import BackendProcessingEvent, GameErrorEvent
 from app.models.events.utils import ErrorContextModel
 from app.providers.ai.base import BaseAIService
 from app.providers.ai.prompt_builder import build_ai_prompt_context
+from app.providers.ai.response_cache import fresh_ai_requests
 from app.providers.ai.schemas import AIResponse
 from app.services.chat_service import ChatFormatter
+from app.services.history_summarizer import HistorySummarizer
 from app.services.shared_state_manager import SharedStateManager
 from app.settings import get_settings
-from app.utils.event_helpers import emit_with_logging
+from app.utils.event_helpers import NarrativeChunkEmitter, emit_with_logging
 
 logger = logging.getLogger(__name__)
 
+# AI response, pending player dice requests, status code, needs backend trigger
+AIStepResult = Tuple[Optional[AIResponse], List[DiceRequestModel], int, bool]
+
+
+class AIStepRequest(NamedTuple):
+    """An AI step a handler needs performed (see BaseEventHandler._run_steps)."""
+
+    ai_service: BaseAIService
+    initial_instruction: Optional[str] = None
+    use_stored_context: bool = False
+    messages_override: Optional[List[MessageDict]] = None
+    player_action_for_rag_query: Optional[str] = None
+
+
+# Handler logic written as a generator: it yields the AI steps it needs, is
+# sent their results and returns the response
+HandlerSteps = Generator[AIStepRequest, AIStepResult, GameEventResponseModel]
+
+
+T = TypeVar("T")
+
+
+async def _to_thread_uninterrupted(func: Callable[..., T], *args: Any) -> T:
+    """
+    Run func in a worker thread, waiting for it to return even if cancelled.
+
+    A thread cannot be interrupted, so on cancellation this waits for func
+    before re-raising: callers never touch state func is still changing.
+    """
+    hop = asyncio.ensure_future(asyncio.to_thread(func, *args))
+    try:
+        return await asyncio.shield(hop)
+    except asyncio.CancelledError:
+        while not hop.done():
+            try:
+                await asyncio.wait({hop})
+            except asyncio.CancelledError:
+                pass
+        if not hop.cancelled():
+            hop.exception()  # Mark as retrieved, the cancellation wins
+        raise
+
 
 # Maximum depth for automatic AI continuation to prevent infinite loops
 # This needs to be high enough to handle complex combat sequences:
@@ -63,6 +121,7 @@ class BaseEventHandler(ABC):
         campaign_service: ICampaignService,
         event_queue: IEventQueue,
         rag_service: Optional[IRAGService] = None,
+        history_summarizer: Optional[HistorySummarizer] = None,
     ):
         self.game_state_repo = game_state_repo
         self.character_service = character_service
@@ -73,18 +132,89 @@ class BaseEventHandler(ABC):
         self.campaign_service = campaign_service
         self.event_queue = event_queue
         self.rag_service = rag_service
+        self.history_summarizer = history_summarizer
 
         # Will be set by GameOrchestrator
         self._shared_state_manager: Optional["SharedStateManager"] = None
 
-        # Correlation ID for related events in the same action sequence
-        self._current_correlation_id: Optional[str] = None
+        # Correlation ID for related events in the same action sequence,
+        # tracked per game session since handlers are shared between sessions
+        self._correlation_ids: Dict[Optional[str], Optional[str]] = {}
+
+    @property
+    def _current_correlation_id(self) -> Optional[str]:
+        return self._correlation_ids.get(get_current_session_id())
+
+    @_current_correlation_id.setter
+    def _current_correlation_id(self, correlation_id: Optional[str]) -> None:
+        self._correlation_ids[get_current_session_id()] = correlation_id
 
     @abstractmethod
     def handle(self, *args: Any, **kwargs: Any) -> GameEventResponseModel:
         """Handle the specific event type."""
         pass
 
+    def _run_steps(self, steps: HandlerSteps) -> GameEventResponseModel:
+        """Run handler steps in the current thread, including the AI calls."""
+        outcome = self._advance_steps(steps)
+        while isinstance(outcome, AIStepRequest):
+            try:
+                result = self._call_ai_and_process_step(*outcome)
+            except Exception as e:
+                outcome = self._advance_steps(steps, error=e)
+            else:
+                outcome = self._advance_steps(steps, result)
+        return outcome
+
+    async def _arun_steps(self, steps: HandlerSteps) -> GameEventResponseModel:
+        """
+        Run handler steps without holding a thread during AI calls.
+
+        The handler code between AI steps runs in worker threads; the AI steps
+        run on the event loop (see _acall_ai_and_process_step). On cancellation
+        the current thread hop is allowed to finish before the steps close.
+        """
+        try:
+            outcome = await _to_thread_uninterrupted(self._advance_steps, steps)
+            while isinstance(outcome, AIStepRequest):
+                try:
+                    result = await self._acall_ai_and_process_step(*outcome)
+                except Exception as e:
+                    outcome = await _to_thread_uninterrupted(
+                        self._advance_steps, steps, None, e
+                    )
+                else:
+                    outcome = await _to_thread_uninterrupted(
+                        self._advance_steps, steps, result
+                    )
+            return outcome
+        except asyncio.CancelledError:
+            # E.g. the client disconnected; don't leave the session busy
+            if self._shared_state_manager:
+                await _to_thread_uninterrupted(
+                    self._shared_state_manager.set_ai_processing, False
+                )
+            raise
+        finally:
+            steps.close()
+
+    @staticmethod
+    def _advance_steps(
+        steps: HandlerSteps,
+        result: Optional[AIStepResult] = None,
+        error: Optional[Exception] = None,
+    ) -> Union[AIStepRequest, GameEventResponseModel]:
+        """Resume handler steps until the next AI step or the response."""
+        try:
+            if error is not None:
+                return steps.throw(error)
+            if result is None:
+                return next(steps)
+            return steps.send(result)
+        except StopIteration as done:
+            response: GameEventResponseModel = done.value
+            return response
+
     def get_character_template_repository(self) -> ICharacterTemplateRepository:
         """Get the character template repository from campaign service."""
         return self.campaign_service.get_character_template_repository()
@@ -203,187 +333,308 @@ class BaseEventHandler(ABC):
         messages_override: Optional[List[MessageDict]] = None,
         player_action_for_rag_query: Optional[str] = None,
         continuation_depth: int = 0,
-    ) -> Tuple[Optional[AIResponse], List[DiceRequestModel], int, bool]:
+    ) -> AIStepResult:
         """Call AI and process the response."""
-        logger.info(
-            f"Starting AI cycle (instruction: {initial_instruction or 'none'}, depth: {continuation_depth})"
-        )
+        self._begin_ai_step(initial_instruction, continuation_depth)
+        result: AIStepResult = (None, [], 500, False)
 
-        # For continuation calls, we're already in the processing state
-        if continuation_depth == 0:
-            # Check shared state manager - processing flag should already be set by handler
-            if self._shared_state_manager:
-                if self._shared_state_manager.is_ai_processing():
-                    logger.debug("AI processing flag already set by handler")
-                else:
-                    logger.warning(
-                        "AI processing flag not set - this should not happen"
+        try:
+            messages = self._get_ai_step_messages(
+                initial_instruction,
+                use_stored_context,
+                messages_override,
+                player_action_for_rag_query,
+            )
+            logger.info("Sending request to AI service")
+            # A retry must not get the answer that failed from the cache again
+            with fresh_ai_requests() if use_stored_context else nullcontext():
+                if get_settings().ai.streaming:
+                    chunk_emitter = NarrativeChunkEmitter(
+                        self.event_queue, self._current_correlation_id
                     )
-            else:
-                logger.warning("SharedStateManager not available")
+                    ai_response_obj = ai_service.get_streaming_response(
+                        messages, chunk_emitter
+                    )
+                    chunk_emitter.flush()
+                else:
+                    ai_response_obj = ai_service.get_response(messages)
+            result = self._process_ai_step_response(ai_response_obj)
+        except Exception as e:
+            result = self._handle_ai_step_error(e, initial_instruction)
+        finally:
+            self._end_ai_step(result, continuation_depth)
 
-            # Generate a new correlation ID for this action sequence
-            self._current_correlation_id = str(uuid4())
-            logger.debug(
-                f"Generated correlation ID for action sequence: {self._current_correlation_id}"
+        final_result = self._finish_ai_flow(result, continuation_depth)
+        if final_result is None:
+            # Recursively call to continue the flow
+            return self._call_ai_and_process_step(
+                ai_service, continuation_depth=continuation_depth + 1
             )
+        return final_result
 
-            # Emit BackendProcessingEvent(is_processing=True) at start
-            event = BackendProcessingEvent(
-                is_processing=True, correlation_id=self._current_correlation_id
+    async def _acall_ai_and_process_step(
+        self,
+        ai_service: BaseAIService,
+        initial_instruction: Optional[str] = None,
+        use_stored_context: bool = False,
+        messages_override: Optional[List[MessageDict]] = None,
+        player_action_for_rag_query: Optional[str] = None,
+        continuation_depth: int = 0,
+    ) -> AIStepResult:
+        """
+        Async variant of _call_ai_and_process_step.
+
+        Prompt building and response processing run in worker threads, while
+        the AI request itself is awaited on the event loop, so no thread is
+        held while the model generates. Cancelling the task aborts the request
+        and still clears the processing flag.
+        """
+        await _to_thread_uninterrupted(
+            self._begin_ai_step, initial_instruction, continuation_depth
+        )
+        result: AIStepResult = (None, [], 500, False)
+
+        try:
+            messages = await _to_thread_uninterrupted(
+                self._get_ai_step_messages,
+                initial_instruction,
+                use_stored_context,
+                messages_override,
+                player_action_for_rag_query,
+            )
+            logger.info("Sending request to AI service")
+            # A retry must not get the answer that failed from the cache again
+            with fresh_ai_requests() if use_stored_context else nullcontext():
+                ai_response_obj = await self._arequest_ai_response(ai_service, messages)
+            result = await _to_thread_uninterrupted(
+                self._process_ai_step_response, ai_response_obj
+            )
+        except Exception as e:
+            result = await _to_thread_uninterrupted(
+                self._handle_ai_step_error, e, initial_instruction
+            )
+        finally:
+            await _to_thread_uninterrupted(
+                self._end_ai_step, result, continuation_depth
             )
-            emit_with_logging(self.event_queue, event, "is_processing=True")
-        ai_response_obj: Optional[AIResponse] = None
-        pending_player_requests: List[DiceRequestModel] = []
-        status_code = 500
-        needs_backend_trigger_for_next_distinct_step = False
 
+        final_result = await _to_thread_uninterrupted(
+            self._finish_ai_flow, result, continuation_depth
+        )
+        if final_result is None:
+            return await self._acall_ai_and_process_step(
+                ai_service, continuation_depth=continuation_depth + 1
+            )
+        return final_result
+
+    async def _arequest_ai_response(
+        self, ai_service: BaseAIService, messages: List[MessageDict]
+    ) -> Optional[AIResponse]:
+        """Request the AI response on the event loop."""
+        if not asyncio.iscoroutinefunction(getattr(ai_service, "aget_response", None)):
+            # Services exposing only the blocking API
+            return await asyncio.to_thread(ai_service.get_response, messages)
+        if not get_settings().ai.streaming:
+            return await ai_service.aget_response(messages)
+
+        chunk_emitter = NarrativeChunkEmitter(
+            self.event_queue, self._current_correlation_id
+        )
         try:
-            # Build AI prompt and get response
-            if use_stored_context and messages_override:
-                messages = messages_override
-                logger.info("Using stored context for AI request retry")
-            else:
-                messages = self._build_ai_prompt_context(
-                    initial_instruction, player_action_for_rag_query
-                )
-                # Store the context for potential retry (only if not already using stored context)
-                if self._shared_state_manager:
-                    self._shared_state_manager.store_ai_request_context(
-                        messages, initial_instruction
-                    )
+            return await ai_service.aget_streaming_response(messages, chunk_emitter)
+        finally:
+            chunk_emitter.flush()
 
-            logger.info("Sending request to AI service")
-            ai_response_obj = ai_service.get_response(messages)
-
-            if ai_response_obj is None:
-                logger.error("AI service returned None.")
-                error_msg = "(Error: The AI service appears to be rate limiting requests. This typically happens when too many requests are sent in a short time. Please wait 30-60 seconds before clicking 'Retry Last Request' to allow the rate limit to reset.)"
-                self.chat_service.add_message("system", error_msg, is_dice_result=True)
-                status_code = 500
-                # Ensure needs_backend_trigger is False on error to prevent rapid retries
-                needs_backend_trigger_for_next_distinct_step = False
+    def _begin_ai_step(
+        self, initial_instruction: Optional[str], continuation_depth: int
+    ) -> None:
+        """Start an AI step, opening a new action sequence at depth 0."""
+        logger.info(
+            f"Starting AI cycle (instruction: {initial_instruction or 'none'}, depth: {continuation_depth})"
+        )
+
+        # For continuation calls, we're already in the processing state
+        if continuation_depth != 0:
+            return
+
+        # Check shared state manager - processing flag should already be set by handler
+        if self._shared_state_manager:
+            if self._shared_state_manager.is_ai_processing():
+                logger.debug("AI processing flag already set by handler")
             else:
-                logger.info("Successfully received AIResponse.")
-                # Keep stored context available for retry - don't clear on success
+                logger.warning("AI processing flag not set - this should not happen")
+        else:
+            logger.warning("SharedStateManager not available")
 
-                # Process AI response
-                pending_player_requests, npc_action_requires_ai_follow_up = (
-                    self.ai_response_processor.process_response(
-                        ai_response_obj, self._current_correlation_id
-                    )
-                )
-                status_code = 200
+        # Generate a new correlation ID for this action sequence
+        self._current_correlation_id = str(uuid4())
+        logger.debug(
+            f"Generated correlation ID for action sequence: {self._current_correlation_id}"
+        )
 
-                # Events are now emitted directly, no need to collect steps
+        # Emit BackendProcessingEvent(is_processing=True) at start
+        event = BackendProcessingEvent(
+            is_processing=True, correlation_id=self._current_correlation_id
+        )
+        emit_with_logging(self.event_queue, event, "is_processing=True")
 
-                # Determine if backend trigger is needed
-                needs_backend_trigger_for_next_distinct_step = (
-                    self._determine_backend_trigger_needed(
-                        npc_action_requires_ai_follow_up, pending_player_requests
-                    )
-                )
+    def _get_ai_step_messages(
+        self,
+        initial_instruction: Optional[str],
+        use_stored_context: bool,
+        messages_override: Optional[List[MessageDict]],
+        player_action_for_rag_query: Optional[str],
+    ) -> List[MessageDict]:
+        """Build the AI prompt, or reuse the stored context for a retry."""
+        if use_stored_context and messages_override:
+            logger.info("Using stored context for AI request retry")
+            return messages_override
 
-        except Exception as e:
-            logger.error(f"Exception during AI step processing: {e}", exc_info=True)
-            error_msg = f"(Error processing AI step: {e}. You can try clicking 'Retry Last Request' if this was due to a parsing error.)"
+        messages = self._build_ai_prompt_context(
+            initial_instruction, player_action_for_rag_query
+        )
+        # Store the context for potential retry (only if not already using stored context)
+        if self._shared_state_manager:
+            self._shared_state_manager.store_ai_request_context(
+                messages, initial_instruction
+            )
+        return messages
+
+    def _process_ai_step_response(
+        self, ai_response_obj: Optional[AIResponse]
+    ) -> AIStepResult:
+        """Apply a received AI response and decide whether the flow continues."""
+        if ai_response_obj is None:
+            logger.error("AI service returned None.")
+            error_msg = "(Error: The AI service appears to be rate limiting requests. This typically happens when too many requests are sent in a short time. Please wait 30-60 seconds before clicking 'Retry Last Request' to allow the rate limit to reset.)"
             self.chat_service.add_message("system", error_msg, is_dice_result=True)
+            # Ensure needs_backend_trigger is False on error to prevent rapid retries
+            return None, [], 500, False
+
+        logger.info("Successfully received AIResponse.")
+        # Keep stored context available for retry - don't clear on success
 
-            # Emit GameErrorEvent
-            # Build ErrorContext with proper fields
-            error_context = ErrorContextModel(event_type="ai_processing")
-            if initial_instruction:
-                error_context.ai_response = initial_instruction[
-                    :200
-                ]  # First 200 chars of instruction
-
-            error_event = GameErrorEvent(
-                error_message=str(e),
-                error_type="ai_service_error",
-                severity="error",
-                recoverable=True,
-                context=error_context,
+        # Process AI response
+        pending_player_requests, npc_action_requires_ai_follow_up = (
+            self.ai_response_processor.process_response(
+                ai_response_obj, self._current_correlation_id
+            )
+        )
+
+        # Events are now emitted directly, no need to collect steps
+
+        # Determine if backend trigger is needed
+        needs_backend_trigger = self._determine_backend_trigger_needed(
+            npc_action_requires_ai_follow_up, pending_player_requests
+        )
+        return ai_response_obj, pending_player_requests, 200, needs_backend_trigger
+
+    def _handle_ai_step_error(
+        self, e: Exception, initial_instruction: Optional[str]
+    ) -> AIStepResult:
+        """Report an exception raised during an AI step."""
+        logger.error(f"Exception during AI step processing: {e}", exc_info=True)
+        error_msg = f"(Error processing AI step: {e}. You can try clicking 'Retry Last Request' if this was due to a parsing error.)"
+        self.chat_service.add_message("system", error_msg, is_dice_result=True)
+
+        # Emit GameErrorEvent
+        # Build ErrorContext with proper fields
+        error_context = ErrorContextModel(event_type="ai_processing")
+        if initial_instruction:
+            error_context.ai_response = initial_instruction[
+                :200
+            ]  # First 200 chars of instruction
+
+        error_event = GameErrorEvent(
+            error_message=str(e),
+            error_type="ai_service_error",
+            severity="error",
+            recoverable=True,
+            context=error_context,
+        )
+        emit_with_logging(
+            self.event_queue, error_event, f"for AI processing error: {e}"
+        )
+
+        return None, [], 500, False
+
+    def _end_ai_step(self, result: AIStepResult, continuation_depth: int) -> None:
+        """Finish an AI step, closing the action sequence at depth 0."""
+        status_code, needs_backend_trigger = result[2], result[3]
+        # Only clear the processing flag and emit event on the outermost call
+        if continuation_depth == 0:
+            if self._shared_state_manager:
+                self._shared_state_manager.set_ai_processing(False)
+
+            # Emit BackendProcessingEvent(is_processing=False) at end
+            event = BackendProcessingEvent(
+                is_processing=False,
+                needs_backend_trigger=needs_backend_trigger,
+                correlation_id=self._current_correlation_id,
             )
             emit_with_logging(
-                self.event_queue, error_event, f"for AI processing error: {e}"
+                self.event_queue,
+                event,
+                f"is_processing=False, needs_backend_trigger={needs_backend_trigger}",
             )
 
-            status_code = 500
-            ai_response_obj = None
-            pending_player_requests = []
-            needs_backend_trigger_for_next_distinct_step = False
-        finally:
-            # Only clear the processing flag and emit event on the outermost call
-            if continuation_depth == 0:
-                if self._shared_state_manager:
-                    self._shared_state_manager.set_ai_processing(False)
-
-                # Emit BackendProcessingEvent(is_processing=False) at end
-                event = BackendProcessingEvent(
-                    is_processing=False,
-                    needs_backend_trigger=needs_backend_trigger_for_next_distinct_step,
-                    correlation_id=self._current_correlation_id,
-                )
-                emit_with_logging(
-                    self.event_queue,
-                    event,
-                    f"is_processing=False, needs_backend_trigger={needs_backend_trigger_for_next_distinct_step}",
-                )
+            # Clear correlation ID after the action sequence is complete
+            self._current_correlation_id = None
+        logger.info(
+            f"AI cycle complete (status: {status_code}, depth: {continuation_depth})"
+        )
 
-                # Clear correlation ID after the action sequence is complete
-                self._current_correlation_id = None
-            logger.info(
-                f"AI cycle complete (status: {status_code}, depth: {continuation_depth})"
-            )
+    def _finish_ai_flow(
+        self, result: AIStepResult, continuation_depth: int
+    ) -> Optional[AIStepResult]:
+        """
+        Check whether the AI flow continues automatically after a step.
 
-        # If we need a backend trigger and there are no pending player requests,
-        # automatically continue the AI flow (with depth limit to prevent infinite loops)
-        if (
-            needs_backend_trigger_for_next_distinct_step
-            and not pending_player_requests
-            and status_code == 200
+        If we need a backend trigger and there are no pending player requests,
+        the AI flow continues (with depth limit to prevent infinite loops).
+        When the depth limit is hit the current turn is ended instead.
+
+        Returns:
+            None if another AI step follows, otherwise the result of the flow
+        """
+        ai_response_obj, pending_player_requests, status_code, needs_backend_trigger = (
+            result
+        )
+        if not (
+            needs_backend_trigger and not pending_player_requests and status_code == 200
         ):
-            if continuation_depth < MAX_AI_CONTINUATION_DEPTH:
-                logger.info(
-                    f"Backend trigger needed and no player requests pending. Auto-continuing AI flow (depth: {continuation_depth + 1})..."
-                )
+            return result
 
-                # Check if we need to add NPC turn instruction for the continuation
-                continuation_instruction = self._get_continuation_instruction()
-                if continuation_instruction:
-                    self.chat_service.add_message(
-                        "user", continuation_instruction, is_dice_result=False
-                    )
+        if continuation_depth < MAX_AI_CONTINUATION_DEPTH:
+            logger.info(
+                f"Backend trigger needed and no player requests pending. Auto-continuing AI flow (depth: {continuation_depth + 1})..."
+            )
 
-                # Recursively call to continue the flow
-                return self._call_ai_and_process_step(
-                    ai_service, continuation_depth=continuation_depth + 1
-                )
-            else:
-                # Hit depth limit - force end the current turn to prevent getting stuck
-                logger.warning(
-                    f"AI continuation depth limit reached ({MAX_AI_CONTINUATION_DEPTH}). Forcing turn end to prevent infinite loop."
+            # Check if we need to add NPC turn instruction for the continuation
+            continuation_instruction = self._get_continuation_instruction()
+            if continuation_instruction:
+                self.chat_service.add_message(
+                    "user", continuation_instruction, is_dice_result=False
                 )
+            return None
 
-                # Add error message to chat
-                error_msg = f"(System: AI processing depth limit reached. Forcibly ending {self._get_current_turn_character_name()}'s turn to prevent infinite loop. If this was unexpected, you may retry or continue manually.)"
-                self.chat_service.add_message("system", error_msg, is_dice_result=True)
+        # Hit depth limit - force end the current turn to prevent getting stuck
+        logger.warning(
+            f"AI continuation depth limit reached ({MAX_AI_CONTINUATION_DEPTH}). Forcing turn end to prevent infinite loop."
+        )
 
-                # Force end the current turn if in combat
-                if CombatValidator.is_combat_active(self.game_state_repo):
-                    self.combat_service.advance_turn()
-                    # No need to manually save - advance_turn should handle state updates
-                    logger.info("Forced turn advancement due to depth limit")
+        # Add error message to chat
+        error_msg = f"(System: AI processing depth limit reached. Forcibly ending {self._get_current_turn_character_name()}'s turn to prevent infinite loop. If this was unexpected, you may retry or continue manually.)"
+        self.chat_service.add_message("system", error_msg, is_dice_result=True)
 
-                # Clear the backend trigger flag
-                needs_backend_trigger_for_next_distinct_step = False
+        # Force end the current turn if in combat
+        if CombatValidator.is_combat_active(self.game_state_repo):
+            self.combat_service.advance_turn()
+            # No need to manually save - advance_turn should handle state updates
+            logger.info("Forced turn advancement due to depth limit")
 
-        return (
-            ai_response_obj,
-            pending_player_requests,
-            status_code,
-            needs_backend_trigger_for_next_distinct_step,
-        )
+        # Clear the backend trigger flag
+        return ai_response_obj, pending_player_requests, status_code, False
 
     def _build_ai_prompt_context(
         self,
@@ -399,6 +650,12 @@ class BaseEventHandler(ABC):
         """
         game_state = self.game_state_repo.get_game_state()
 
+        # Summaries written in the background since the last prompt
+        if self.history_summarizer and self.history_summarizer.apply_completed(
+            game_state
+        ):
+            self.game_state_repo.save_game_state(game_state)
+
         # Call the prompt building function
         # Pass player_action_for_rag_query for RAG context generation
         # Pass initial_instruction as the system instruction for this step
@@ -12,7 +12,7 @@ from app.models.dice import DiceRollResultResponseModel, DiceRollSubmissionModel
 from app.models.events.game_events import GameEventResponseModel
 from app.utils.validation.action_validators import DiceSubmissionValidator
 
-from .base_handler import BaseEventHandler
+from .base_handler import AIStepRequest, BaseEventHandler, HandlerSteps
 
 logger = logging.getLogger(__name__)
 
@@ -24,17 +24,25 @@ class DiceSubmissionHandler(BaseEventHandler, IDiceSubmissionHandler):
         self, roll_data: List[DiceRollSubmissionModel]
     ) -> GameEventResponseModel:
         """Handle submitted dice rolls and return response data."""
+        return self._run_steps(self._handle_steps(roll_data))
+
+    async def ahandle(
+        self, roll_data: List[DiceRollSubmissionModel]
+    ) -> GameEventResponseModel:
+        """Handle submitted dice rolls without holding a thread during AI calls."""
+        return await self._arun_steps(self._handle_steps(roll_data))
+
+    def _handle_steps(self, roll_data: List[DiceRollSubmissionModel]) -> HandlerSteps:
         logger.info("Handling dice submission...")
 
-        # Check if AI is busy
-        if self._shared_state_manager and self._shared_state_manager.is_ai_processing():
+        # Claim the AI processing flag unless AI is busy
+        if (
+            self._shared_state_manager
+            and not self._shared_state_manager.try_set_ai_processing()
+        ):
             logger.warning("AI is busy. Dice submission rejected.")
             return self._create_error_response("AI is busy", status_code=429)
 
-        # Set AI processing flag
-        if self._shared_state_manager:
-            self._shared_state_manager.set_ai_processing(True)
-
         # Get AI service
         try:
             ai_service = self._get_ai_service()
@@ -77,9 +85,7 @@ class DiceSubmissionHandler(BaseEventHandler, IDiceSubmissionHandler):
                 return response_data
 
             logger.info("Player rolls processed, calling AI for next step...")
-            _, _, status, needs_backend_trigger = self._call_ai_and_process_step(
-                ai_service
-            )
+            _, _, status, needs_backend_trigger = yield AIStepRequest(ai_service)
 
             response_data = self._create_frontend_response(
                 needs_backend_trigger, status_code=status
@@ -110,17 +116,27 @@ class DiceSubmissionHandler(BaseEventHandler, IDiceSubmissionHandler):
         self, roll_results: List[DiceRollResultResponseModel]
     ) -> GameEventResponseModel:
         """Handle submission of already-completed roll results."""
+        return self._run_steps(self._handle_completed_rolls_steps(roll_results))
+
+    async def ahandle_completed_rolls(
+        self, roll_results: List[DiceRollResultResponseModel]
+    ) -> GameEventResponseModel:
+        """Handle completed roll results without holding a thread during AI calls."""
+        return await self._arun_steps(self._handle_completed_rolls_steps(roll_results))
+
+    def _handle_completed_rolls_steps(
+        self, roll_results: List[DiceRollResultResponseModel]
+    ) -> HandlerSteps:
         logger.info("Handling completed roll submission...")
 
-        # Check if AI is busy
-        if self._shared_state_manager and self._shared_state_manager.is_ai_processing():
+        # Claim the AI processing flag unless AI is busy
+        if (
+            self._shared_state_manager
+            and not self._shared_state_manager.try_set_ai_processing()
+        ):
             logger.warning("AI is busy. Completed roll submission rejected.")
             return self._create_error_response("AI is busy", status_code=429)
 
-        # Set AI processing flag
-        if self._shared_state_manager:
-            self._shared_state_manager.set_ai_processing(True)
-
         # Get AI service
         try:
             ai_service = self._get_ai_service()
@@ -164,9 +180,7 @@ class DiceSubmissionHandler(BaseEventHandler, IDiceSubmissionHandler):
                 return response_data
 
             logger.info("Completed roll results processed, calling AI for next step...")
-            _, _, status, needs_backend_trigger = self._call_ai_and_process_step(
-                ai_service
-            )
+            _, _, status, needs_backend_trigger = yield AIStepRequest(ai_service)
 
             response_data = self._create_frontend_response(
                 needs_backend_trigger, status_code=status
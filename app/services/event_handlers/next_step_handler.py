@@ -8,7 +8,7 @@ from typing import Optional
 from app.core.handler_interfaces import INextStepHandler
 from app.models.events.game_events import GameEventResponseModel
 
-from .base_handler import BaseEventHandler
+from .base_handler import AIStepRequest, BaseEventHandler, HandlerSteps
 
 logger = logging.getLogger(__name__)
 
@@ -59,20 +59,26 @@ class NextStepHandler(BaseEventHandler, INextStepHandler):
 
     def handle(self) -> GameEventResponseModel:
         """Handle triggering the next step and return response data."""
+        return self._run_steps(self._handle_steps())
+
+    async def ahandle(self) -> GameEventResponseModel:
+        """Handle the next step without holding a thread during AI calls."""
+        return await self._arun_steps(self._handle_steps())
+
+    def _handle_steps(self) -> HandlerSteps:
         logger.info("Handling next step trigger...")
 
-        # Check if AI is busy
-        if self._shared_state_manager and self._shared_state_manager.is_ai_processing():
+        # Claim the AI processing flag unless AI is busy
+        if (
+            self._shared_state_manager
+            and not self._shared_state_manager.try_set_ai_processing()
+        ):
             logger.warning("AI is busy. Next step rejected.")
             # Don't clear the backend trigger flag if AI is busy
             return self._create_error_response(
                 "AI is busy", status_code=429, preserve_backend_trigger=True
             )
 
-        # Set AI processing flag
-        if self._shared_state_manager:
-            self._shared_state_manager.set_ai_processing(True)
-
         # Only clear the backend trigger flag after we confirm we can process
         if self._shared_state_manager:
             self._shared_state_manager.set_needs_backend_trigger(False)
@@ -89,10 +95,8 @@ class NextStepHandler(BaseEventHandler, INextStepHandler):
 
             # Process AI step using shared base functionality
             # Pass npc_instruction as initial_instruction instead of adding to chat history
-            ai_response_obj, _, status, needs_backend_trigger = (
-                self._call_ai_and_process_step(
-                    ai_service, initial_instruction=npc_instruction
-                )
+            ai_response_obj, _, status, needs_backend_trigger = yield AIStepRequest(
+                ai_service, initial_instruction=npc_instruction
             )
 
             response = self._create_frontend_response(
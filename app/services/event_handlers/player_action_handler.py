@@ -9,7 +9,7 @@ from app.domain.combat.combat_utilities import CombatValidator
 from app.models.events.game_events import GameEventResponseModel, PlayerActionEventModel
 from app.utils.validation.action_validators import PlayerActionValidator
 
-from .base_handler import BaseEventHandler
+from .base_handler import AIStepRequest, BaseEventHandler, HandlerSteps
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +19,15 @@ class PlayerActionHandler(BaseEventHandler, IPlayerActionHandler):
 
     def handle(self, action_data: PlayerActionEventModel) -> GameEventResponseModel:
         """Handle a player action and return response data."""
+        return self._run_steps(self._handle_steps(action_data))
+
+    async def ahandle(
+        self, action_data: PlayerActionEventModel
+    ) -> GameEventResponseModel:
+        """Handle a player action without holding a thread during AI calls."""
+        return await self._arun_steps(self._handle_steps(action_data))
+
+    def _handle_steps(self, action_data: PlayerActionEventModel) -> HandlerSteps:
         logger.info("Handling player action...")
 
         # Get AI service
@@ -27,15 +36,14 @@ class PlayerActionHandler(BaseEventHandler, IPlayerActionHandler):
         except RuntimeError as e:
             return self._create_error_response(str(e))
 
-        # Check if AI is busy using shared state manager
-        if self._shared_state_manager and self._shared_state_manager.is_ai_processing():
+        # Claim the AI processing flag, rejecting the action if AI is busy
+        if (
+            self._shared_state_manager
+            and not self._shared_state_manager.try_set_ai_processing()
+        ):
             logger.warning("AI is busy. Player action rejected.")
             return self._create_error_response("AI is busy", status_code=429)
 
-        # Set AI processing flag
-        if self._shared_state_manager:
-            self._shared_state_manager.set_ai_processing(True)
-
         # Validate action - convert model to dict for validator
         validation_result = PlayerActionValidator.validate_action(
             action_data.model_dump()
@@ -74,7 +82,7 @@ class PlayerActionHandler(BaseEventHandler, IPlayerActionHandler):
             self.chat_service.add_message("user", player_message, is_dice_result=False)
 
             # Process AI step using shared base functionality, passing raw action for RAG
-            _, _, status, needs_backend_trigger = self._call_ai_and_process_step(
+            _, _, status, needs_backend_trigger = yield AIStepRequest(
                 ai_service, player_action_for_rag_query=raw_player_action
             )
 
@@ -9,7 +9,7 @@ from app.models.events.game_events import GameEventResponseModel
 from app.models.events.narrative import MessageSupersededEvent
 from app.utils.event_helpers import emit_with_logging
 
-from .base_handler import BaseEventHandler
+from .base_handler import AIStepRequest, BaseEventHandler, HandlerSteps
 
 logger = logging.getLogger(__name__)
 
@@ -19,17 +19,23 @@ class RetryHandler(BaseEventHandler, IRetryHandler):
 
     def handle(self) -> GameEventResponseModel:
         """Handle retry request and return response data."""
+        return self._run_steps(self._handle_steps())
+
+    async def ahandle(self) -> GameEventResponseModel:
+        """Handle a retry without holding a thread during AI calls."""
+        return await self._arun_steps(self._handle_steps())
+
+    def _handle_steps(self) -> HandlerSteps:
         logger.info("Handling retry request...")
 
-        # Check if AI is busy using shared state manager
-        if self._shared_state_manager and self._shared_state_manager.is_ai_processing():
+        # Claim the AI processing flag, rejecting the action if AI is busy
+        if (
+            self._shared_state_manager
+            and not self._shared_state_manager.try_set_ai_processing()
+        ):
             logger.warning("AI is busy. Retry rejected.")
             return self._create_error_response("AI is busy", status_code=429)
 
-        # Set AI processing flag
-        if self._shared_state_manager:
-            self._shared_state_manager.set_ai_processing(True)
-
         # Check if we can retry the last request
         if not self._can_retry_last_request():
             logger.warning("Cannot retry - no stored context or context too old")
@@ -78,7 +84,7 @@ class RetryHandler(BaseEventHandler, IRetryHandler):
                 )
 
             # Process AI step with retry instruction using stored context
-            _, _, status, needs_backend_trigger = self._call_ai_and_process_step(
+            _, _, status, needs_backend_trigger = yield AIStepRequest(
                 ai_service,
                 initial_instruction=retry_instruction,
                 use_stored_context=True,
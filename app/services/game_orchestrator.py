@@ -2,9 +2,8 @@
 Main game orchestrator that directly manages action handlers for game events.
 """
 
-import asyncio
 import logging
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from app.core.domain_interfaces import ICharacterService
 from app.core.handler_interfaces import (
@@ -15,6 +14,7 @@ from app.core.handler_interfaces import (
 )
 from app.core.orchestration_interfaces import IGameOrchestrator
 from app.core.repository_interfaces import IGameStateRepository
+from app.core.session_context import get_current_session_id
 from app.domain.combat.combat_utilities import CombatFormatter
 from app.models.character.combined import CombinedCharacterModel
 from app.models.character.instance import CharacterInstanceModel
@@ -26,6 +26,7 @@ from app.models.events.game_events import (
     PlayerActionEventModel,
 )
 from app.services.chat_service import ChatFormatter
+from app.services.session_registry import SessionRegistry
 from app.services.shared_state_manager import SharedStateManager
 
 logger = logging.getLogger(__name__)
@@ -53,11 +54,13 @@ class GameOrchestrator(IGameOrchestrator):
         dice_submission_handler: IDiceSubmissionHandler,
         next_step_handler: INextStepHandler,
         retry_handler: IRetryHandler,
+        session_registry: Optional[SessionRegistry] = None,
     ) -> None:
         # Store core dependencies
         self.game_state_repo = game_state_repo
         self.character_service = character_service
         self.shared_state_manager = shared_state_manager
+        self.session_registry = session_registry
 
         # Store injected handlers
         self.player_action_handler = player_action_handler
@@ -68,32 +71,6 @@ class GameOrchestrator(IGameOrchestrator):
         # Setup shared state manager for all handlers
         self._setup_shared_context()
 
-    def _handle_player_action(
-        self, action_data: PlayerActionEventModel
-    ) -> GameEventResponseModel:
-        """Handle a player action by delegating to player action handler."""
-        return self.player_action_handler.handle(action_data)
-
-    def _handle_dice_submission(
-        self, roll_data: List[DiceRollSubmissionModel]
-    ) -> GameEventResponseModel:
-        """Handle submitted dice rolls by delegating to dice submission handler."""
-        return self.dice_submission_handler.handle(roll_data)
-
-    def _handle_completed_roll_submission(
-        self, roll_results: List[DiceRollResultResponseModel]
-    ) -> GameEventResponseModel:
-        """Handle submission of already-completed roll results."""
-        return self.dice_submission_handler.handle_completed_rolls(roll_results)
-
-    def _handle_next_step_trigger(self) -> GameEventResponseModel:
-        """Handle triggering the next step."""
-        return self.next_step_handler.handle()
-
-    def _handle_retry(self) -> GameEventResponseModel:
-        """Handle retry request."""
-        return self.retry_handler.handle()
-
     async def handle_event(self, event: GameEventModel) -> GameEventResponseModel:
         """
         Process any game event.
@@ -110,13 +87,27 @@ class GameOrchestrator(IGameOrchestrator):
         Raises:
             ValueError: If event type is unknown or data is invalid
         """
+        if not self.session_registry:
+            return await self._dispatch_event(event)
+
+        session = self.session_registry.get_session(get_current_session_id())
+        if session.lock.locked() and self.shared_state_manager.is_ai_processing():
+            # Let the handler answer with its "AI busy" response instead of queueing
+            return await self._dispatch_event(event)
+
+        # Serialize events within a session; other sessions proceed concurrently
+        async with session.lock:
+            return await self._dispatch_event(event)
+
+    async def _dispatch_event(self, event: GameEventModel) -> GameEventResponseModel:
+        """Route an event to the handler for its type."""
         event_type = event.type
         event_data = event.data
 
         if event_type == GameEventType.PLAYER_ACTION:
             # Ensure event_data is the correct type
             if isinstance(event_data, PlayerActionEventModel):
-                return await asyncio.to_thread(self._handle_player_action, event_data)
+                return await self.player_action_handler.ahandle(event_data)
             else:
                 logger.error(
                     f"Invalid event data type for player_action: {type(event_data)}"
@@ -130,7 +121,7 @@ class GameOrchestrator(IGameOrchestrator):
                 rolls = event_data.rolls
             else:
                 rolls = []
-            return await asyncio.to_thread(self._handle_dice_submission, rolls)
+            return await self.dice_submission_handler.ahandle(rolls)
         elif event_type == GameEventType.COMPLETED_ROLL_SUBMISSION:
             # Extract roll results from event data
             if hasattr(event_data, "roll_results"):
@@ -140,13 +131,13 @@ class GameOrchestrator(IGameOrchestrator):
                 roll_results = event_data["roll_results"]
             else:
                 roll_results = []
-            return await asyncio.to_thread(
-                self._handle_completed_roll_submission, roll_results
+            return await self.dice_submission_handler.ahandle_completed_rolls(
+                roll_results
             )
         elif event_type == GameEventType.NEXT_STEP:
-            return await asyncio.to_thread(self._handle_next_step_trigger)
+            return await self.next_step_handler.ahandle()
         elif event_type == GameEventType.RETRY:
-            return await asyncio.to_thread(self._handle_retry)
+            return await self.retry_handler.ahandle()
         else:
             raise ValueError(f"Unknown event type: {event_type.value}")
 
@@ -0,0 +1,273 @@
+"""
+Rolling summarization of chat history that no longer fits in prompts.
+
+When a campaign's history outgrows the prompt token budget, the prompt
+builder drops the oldest messages. The summarizer condenses the dropped
+messages into summary blocks, one segment of messages at a time, so the
+prompt keeps the gist of the whole campaign at a constant size. Once there
+are more than ``max_blocks`` summaries the oldest ones are merged.
+
+Summaries are written by the AI in a background thread, off the request
+path. Finished summaries are applied to the game state (and saved with the
+campaign) the next time a prompt is built for that campaign.
+"""
+
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from app.core.session_context import get_current_session_id
+from app.models.common import MessageDict
+from app.models.game_state.main import GameStateModel
+from app.models.shared import ChatMessageModel, HistorySummaryModel
+from app.providers.ai.base import BaseAIService
+from app.providers.ai.response_cache import idempotent_ai_requests
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_INSTRUCTIONS = (
+    "You keep the campaign log of a Dungeons & Dragons game. Summarize the "
+    "given part of the game in at most 150 words of plain prose. Keep the "
+    "names of characters, places and items, decisions taken, promises made, "
+    "combat outcomes and unresolved threads. Leave out dice mechanics and "
+    "anything the players could not know. Answer with the summary only."
+)
+
+# Characters of a chat message included in a summarization request
+MAX_MESSAGE_CHARS = 2000
+
+
+class _SummaryUpdate(NamedTuple):
+    """A finished summary and the summaries it was based on."""
+
+    # last_message_id of each summary the game state had when requested
+    based_on: Tuple[str, ...]
+    # Number of leading summaries the new one replaces (0 appends it)
+    replaces: int
+    # None drops the replaced summaries
+    summary: Optional[HistorySummaryModel]
+
+
+def covered_message_count(
+    chat_history: Sequence[ChatMessageModel],
+    summaries: Sequence[HistorySummaryModel],
+) -> int:
+    """Number of chat messages at the start of the history that are summarized."""
+    if not summaries:
+        return 0
+    last_id = summaries[-1].last_message_id
+    for index, msg in enumerate(chat_history):
+        if msg.id == last_id:
+            return index + 1
+    return 0
+
+
+class HistorySummarizer:
+    """Condenses old chat history into summaries in a background thread."""
+
+    def __init__(
+        self,
+        ai_service: BaseAIService,
+        segment_size: int = 16,
+        max_blocks: int = 8,
+    ) -> None:
+        """
+        Args:
+            ai_service: AI service writing the summaries
+            segment_size: Number of chat messages condensed into one summary
+            max_blocks: Summaries kept before the oldest ones are merged
+        """
+        self.ai_service = ai_service
+        self.segment_size = max(1, segment_size)
+        self.max_blocks = max(1, max_blocks)
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="history-summarizer"
+        )
+        self._pending: Dict[str, "Future[Optional[_SummaryUpdate]]"] = {}
+        self._completed: Dict[str, List[_SummaryUpdate]] = {}
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+
+    @staticmethod
+    def _key(game_state: GameStateModel) -> str:
+        return f"{get_current_session_id() or 'default'}:{game_state.campaign_id}"
+
+    def request(self, game_state: GameStateModel, dropped_messages: int) -> bool:
+        """
+        Start summarizing history dropped from the prompt, if needed.
+
+        At most one summary per campaign is written at a time. Merging old
+        summaries comes first, then the next whole segment of dropped
+        messages that is not summarized yet. Summaries of messages no longer
+        in the history are dropped and the history summarized again.
+
+        Args:
+            game_state: Game state the prompt was built from
+            dropped_messages: Number of chat messages at the start of the
+                history that did not fit in the prompt
+
+        Returns:
+            True if a summary was started
+        """
+        key = self._key(game_state)
+        summaries = list(game_state.history_summaries)
+        with self._lock:
+            if key in self._pending:
+                return False
+            # Results not applied yet would make this request redundant
+            if self._completed.get(key):
+                return False
+
+            based_on = tuple(summary.last_message_id for summary in summaries)
+            if len(summaries) > self.max_blocks:
+                merged = summaries[: len(summaries) - self.max_blocks + 1]
+                future = self._executor.submit(self._merge, based_on, merged)
+            else:
+                covered = covered_message_count(game_state.chat_history, summaries)
+                if summaries and covered == 0:
+                    # The summarized messages are gone from the history
+                    self._reset(key, based_on)
+                    based_on = ()
+                if dropped_messages - covered < self.segment_size:
+                    return False
+                segment = list(
+                    game_state.chat_history[covered : covered + self.segment_size]
+                )
+                future = self._executor.submit(self._summarize, based_on, segment)
+
+            self._pending[key] = future
+        future.add_done_callback(lambda done: self._on_done(key, done))
+        return True
+
+    def apply_completed(self, game_state: GameStateModel) -> bool:
+        """
+        Add finished summaries to the game state.
+
+        Summaries written for a state of the summaries that has changed in the
+        meantime are discarded.
+
+        Returns:
+            True if the game state changed and should be saved
+        """
+        with self._lock:
+            updates = self._completed.pop(self._key(game_state), [])
+
+        changed = False
+        for update in updates:
+            summaries = game_state.history_summaries
+            current = tuple(summary.last_message_id for summary in summaries)
+            if current != update.based_on:
+                logger.debug("Discarding a history summary made for older summaries")
+                continue
+            if update.summary is None:
+                game_state.history_summaries = summaries[update.replaces :]
+                logger.info(
+                    f"Dropped {update.replaces} summaries of messages no longer "
+                    "in the history"
+                )
+                changed = True
+                continue
+            if update.replaces:
+                game_state.history_summaries = [update.summary] + summaries[
+                    update.replaces :
+                ]
+            else:
+                game_state.history_summaries = summaries + [update.summary]
+            changed = True
+            logger.info(
+                f"Added summary of {update.summary.message_count} history messages "
+                f"({len(game_state.history_summaries)} summaries)"
+            )
+        return changed
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until no summary is being written.
+
+        Returns:
+            True if idle before the timeout
+        """
+        with self._idle:
+            return self._idle.wait_for(lambda: not self._pending, timeout)
+
+    def close(self) -> None:
+        """Stop the background thread, dropping summaries not started yet."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _reset(self, key: str, based_on: Tuple[str, ...]) -> None:
+        """Queue dropping all summaries of a campaign; the lock must be held."""
+        reset = _SummaryUpdate(based_on=based_on, replaces=len(based_on), summary=None)
+        self._completed.setdefault(key, []).append(reset)
+
+    def _on_done(self, key: str, future: "Future[Optional[_SummaryUpdate]]") -> None:
+        update = None
+        if not future.cancelled():
+            try:
+                update = future.result()
+            except Exception as e:
+                logger.error(f"History summarization failed: {e}", exc_info=True)
+        with self._idle:
+            self._pending.pop(key, None)
+            if update is not None:
+                self._completed.setdefault(key, []).append(update)
+            self._idle.notify_all()
+
+    def _summarize(
+        self, based_on: Tuple[str, ...], segment: List[ChatMessageModel]
+    ) -> Optional[_SummaryUpdate]:
+        transcript = "\n\n".join(self._format_message(msg) for msg in segment)
+        content = self._ask(f"Summarize this part of the game:\n\n{transcript}")
+        if content is None:
+            return None
+        return _SummaryUpdate(
+            based_on=based_on,
+            replaces=0,
+            summary=HistorySummaryModel(
+                first_message_id=segment[0].id,
+                last_message_id=segment[-1].id,
+                message_count=len(segment),
+                content=content,
+            ),
+        )
+
+    def _merge(
+        self, based_on: Tuple[str, ...], summaries: List[HistorySummaryModel]
+    ) -> Optional[_SummaryUpdate]:
+        parts = "\n\n".join(summary.content for summary in summaries)
+        content = self._ask(
+            f"Combine these consecutive summaries into one summary:\n\n{parts}"
+        )
+        if content is None:
+            return None
+        return _SummaryUpdate(
+            based_on=based_on,
+            replaces=len(summaries),
+            summary=HistorySummaryModel(
+                first_message_id=summaries[0].first_message_id,
+                last_message_id=summaries[-1].last_message_id,
+                message_count=sum(summary.message_count for summary in summaries),
+                content=content,
+            ),
+        )
+
+    def _ask(self, request: str) -> Optional[str]:
+        messages = [
+            MessageDict(role="system", content=SUMMARY_INSTRUCTIONS),
+            MessageDict(role="user", content=request),
+        ]
+        # Any summary of the same history will do, so it can be reused
+        with idempotent_ai_requests():
+            content = self.ai_service.get_text_response(messages)
+        if not content:
+            logger.warning("The AI returned no history summary")
+            return None
+        return content.strip()
+
+    @staticmethod
+    def _format_message(msg: ChatMessageModel) -> str:
+        speaker = {"user": "Player", "assistant": "Game Master"}.get(msg.role, "System")
+        content = msg.content
+        if len(content) > MAX_MESSAGE_CHARS:
+            content = content[:MAX_MESSAGE_CHARS] + "..."
+        return f"{speaker}: {content}"
@@ -0,0 +1,83 @@
+"""
+Preparation of the next AI prompt while the player is still acting.
+
+The frontend reports the action being typed (debounced) and asks for a
+prefetch when dice rolls are requested from the players. The RAG context and
+the context sections of the next prompt are then prepared ahead of time and
+used when the action or the rolls are submitted, as long as the query and
+the game state they were prepared for have not changed. The turn then only
+waits for the AI itself.
+"""
+
+import logging
+from typing import Optional
+
+from app.content.rag.rag_context_builder import rag_context_builder
+from app.core.repository_interfaces import IGameStateRepository
+from app.models.api import PrefetchResponse
+from app.providers.ai.prompt_builder import PromptBuilder
+from app.services.event_handlers.base_handler import BaseEventHandler
+from app.services.shared_state_manager import SharedStateManager
+
+logger = logging.getLogger(__name__)
+
+
+class PromptPrefetcher:
+    """Prepares the RAG context and prompt sections of the next turn."""
+
+    def __init__(
+        self,
+        game_state_repo: IGameStateRepository,
+        event_handler: BaseEventHandler,
+        shared_state_manager: Optional[SharedStateManager] = None,
+    ) -> None:
+        """
+        Args:
+            game_state_repo: Repository of the session's game state
+            event_handler: Handler whose services the prompt is built with
+            shared_state_manager: Used to skip prefetching while the AI runs
+        """
+        self.game_state_repo = game_state_repo
+        self.event_handler = event_handler
+        self.shared_state_manager = shared_state_manager
+        self.prompt_builder = PromptBuilder()
+
+    def prefetch(self, draft_text: Optional[str] = None) -> PrefetchResponse:
+        """
+        Prepare the next prompt of the current campaign.
+
+        Args:
+            draft_text: Action the player is typing, or None when the next
+                prompt follows the submission of requested dice rolls
+
+        Returns:
+            What was prepared
+        """
+        if self.shared_state_manager and self.shared_state_manager.is_ai_processing():
+            # The game state is about to change
+            return PrefetchResponse()
+
+        game_state = self.game_state_repo.get_game_state()
+        draft = draft_text.strip() if draft_text else None
+        if not draft and not game_state.pending_player_dice_requests:
+            # Nothing the player is about to submit
+            return PrefetchResponse()
+
+        rag_context = False
+        if self.event_handler.rag_service:
+            rag_context = rag_context_builder.prefetch_rag_context(
+                game_state,
+                self.event_handler.rag_service,
+                draft,
+                game_state.chat_history,
+            )
+        prompt_context = self.prompt_builder.prefetch_context(
+            game_state, self.event_handler
+        )
+
+        if rag_context or prompt_context:
+            logger.debug(
+                f"Prefetched next prompt (RAG context: {rag_context}, "
+                f"prompt context: {prompt_context})"
+            )
+        return PrefetchResponse(rag_context=rag_context, prompt_context=prompt_context)
@@ -0,0 +1,278 @@
+"""
+Registry of active game sessions for serving several tables from one process.
+
+A session is identified by a client supplied id (see app.core.session_context).
+Its game state, event stream and AI processing flags live in the shared
+repository, event queue and shared state manager, which scope their data by
+the session bound to the current context. The registry owns the per-session
+lock that serializes game events and evicts idle sessions to disk. At most
+``max_sessions`` sessions are held; the least recently used one is evicted to
+make room for a new one. Evictions write to disk, so idle sessions are swept
+by a background thread and the registry lock is never held during the write.
+Narration audio is saved to the chat history under the session lock as soon
+as it is ready, and before a session is evicted.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Dict, List, Optional
+
+from app.core.repository_interfaces import IGameStateRepository
+from app.core.session_context import session_scope
+from app.core.system_interfaces import IEventQueue
+from app.exceptions import SessionLimitError
+from app.services.shared_state_manager import SharedStateManager
+from app.services.tts_integration_service import TTSIntegrationService
+
+logger = logging.getLogger(__name__)
+
+
+class GameSession:
+    """Runtime bookkeeping for one active game session."""
+
+    def __init__(self, session_id: Optional[str]) -> None:
+        self.session_id = session_id
+        # Serializes game events for this session; other sessions run concurrently
+        self.lock = asyncio.Lock()
+        self.created_at = time.time()
+        self.last_accessed = self.created_at
+
+    def touch(self) -> None:
+        """Record activity on this session."""
+        self.last_accessed = time.time()
+
+    def idle_seconds(self, now: Optional[float] = None) -> float:
+        """Seconds since the session was last accessed."""
+        return (now if now is not None else time.time()) - self.last_accessed
+
+
+class SessionRegistry:
+    """Tracks active sessions and evicts idle ones from memory to disk."""
+
+    def __init__(
+        self,
+        game_state_repo: IGameStateRepository,
+        event_queue: IEventQueue,
+        shared_state_manager: SharedStateManager,
+        idle_timeout: float = 1800,
+        sweep_interval: float = 60,
+        tts_integration_service: Optional[TTSIntegrationService] = None,
+        max_sessions: int = 256,
+    ) -> None:
+        self.game_state_repo = game_state_repo
+        self.event_queue = event_queue
+        self.shared_state_manager = shared_state_manager
+        self.tts_integration_service = tts_integration_service
+        self.idle_timeout = idle_timeout
+        self.sweep_interval = sweep_interval
+        self.max_sessions = max(1, max_sessions)
+
+        # The default session serves clients without a session id and is never evicted
+        self._default_session = GameSession(None)
+        self._sessions: Dict[str, GameSession] = {}
+        self._lock = threading.Lock()
+        self._sweeper: Optional[threading.Thread] = None
+        self._closed = threading.Event()
+        # Event loop serving the sessions, on which their locks are taken
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        if tts_integration_service is not None:
+            tts_integration_service.set_completion_handler(self._narration_completed)
+
+    def get_session(self, session_id: Optional[str]) -> GameSession:
+        """Get or create the session with the given id and mark it active.
+
+        Making room for a new session writes evicted sessions to disk; use
+        aget_session() on the event loop.
+
+        Raises:
+            SessionLimitError: If the session is new and every session held
+                is busy
+        """
+        if session_id is None:
+            self._default_session.touch()
+            return self._default_session
+
+        session = self._get_or_create(session_id)
+        if session is None:
+            self._make_room()
+            session = self._get_or_create(session_id)
+            if session is None:
+                raise SessionLimitError(self.max_sessions)
+        session.touch()
+        return session
+
+    async def aget_session(self, session_id: Optional[str]) -> GameSession:
+        """Like get_session(), making room for a new session in a worker thread."""
+        self._loop = asyncio.get_running_loop()
+        if session_id is not None:
+            session = self._get_or_create(session_id)
+            if session is not None:
+                session.touch()
+                return session
+        return await asyncio.to_thread(self.get_session, session_id)
+
+    def close(self) -> None:
+        """Stop the background sweep of idle sessions."""
+        self._closed.set()
+        if self._sweeper is not None:
+            self._sweeper.join(timeout=5)
+
+    def _get_or_create(self, session_id: str) -> Optional[GameSession]:
+        """Get or create a session; None if a new one would exceed the limit."""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                if len(self._sessions) >= self.max_sessions:
+                    return None
+                session = GameSession(session_id)
+                self._sessions[session_id] = session
+                logger.info(f"Created game session '{session_id}'")
+                self._start_sweeper()
+        return session
+
+    def _start_sweeper(self) -> None:
+        """Start the idle sweep thread; called with the lock held."""
+        if self._sweeper is None and not self._closed.is_set():
+            self._sweeper = threading.Thread(
+                target=self._sweep, name="session-sweeper", daemon=True
+            )
+            self._sweeper.start()
+
+    def _sweep(self) -> None:
+        """Evict idle sessions every sweep interval until closed."""
+        while not self._closed.wait(self.sweep_interval):
+            try:
+                evicted = self.evict_idle()
+            except Exception as e:
+                logger.error(f"Idle session sweep failed: {e}", exc_info=True)
+                continue
+            if evicted:
+                logger.info(f"Evicted {len(evicted)} idle game sessions")
+
+    def _make_room(self) -> None:
+        """Evict the least recently used sessions until one more fits."""
+        with self._lock:
+            by_last_access = sorted(
+                self._sessions, key=lambda sid: self._sessions[sid].last_accessed
+            )
+        for session_id in by_last_access:
+            with self._lock:
+                if len(self._sessions) < self.max_sessions:
+                    return
+            self.evict(session_id)
+
+    def active_session_ids(self) -> List[str]:
+        """Ids of all sessions currently held in memory."""
+        with self._lock:
+            return list(self._sessions.keys())
+
+    def evict_idle(self, now: Optional[float] = None) -> List[str]:
+        """Evict every session idle for longer than the configured timeout.
+
+        Sessions that are processing an event are skipped.
+
+        Returns:
+            Ids of the sessions that were evicted
+        """
+        now = now if now is not None else time.time()
+        with self._lock:
+            candidates = [
+                session_id
+                for session_id, session in self._sessions.items()
+                if session.idle_seconds(now) > self.idle_timeout
+            ]
+        return [sid for sid in candidates if self.evict(sid)]
+
+    def evict(self, session_id: str) -> bool:
+        """Persist a session's state to disk and release its resources.
+
+        Returns:
+            True if the session was evicted, False if it is busy or unknown
+        """
+        with self._lock:
+            session = self._sessions.get(session_id)
+        if session is None:
+            return False
+        with session_scope(session_id):
+            busy = session.lock.locked() or self.shared_state_manager.is_ai_processing()
+        with self._lock:
+            # Release the session before writing so no lock is held during I/O
+            busy = busy or session.lock.locked()
+            if busy or self._sessions.get(session_id) is not session:
+                logger.debug(f"Session '{session_id}' is busy, skipping eviction")
+                return False
+            del self._sessions[session_id]
+
+        try:
+            with session_scope(session_id):
+                # No narration may finish after its audio is saved
+                if self.tts_integration_service is not None:
+                    self.tts_integration_service.cancel_pending_narrations()
+                self._save_narration_audio()
+            self.game_state_repo.evict_session(session_id)
+        except Exception as e:
+            logger.error(f"Failed to persist session '{session_id}': {e}")
+            with self._lock:
+                self._sessions.setdefault(session_id, session)
+            return False
+
+        self.event_queue.drop_session(session_id)
+        self.shared_state_manager.drop_session(session_id)
+        if self.tts_integration_service is not None:
+            self.tts_integration_service.drop_session(session_id)
+        logger.info(f"Evicted game session '{session_id}'")
+        return True
+
+    def evict_all(self) -> None:
+        """Persist and release every session, e.g. on shutdown."""
+        with session_scope(None):
+            self._save_narration_audio()
+        for session_id in self.active_session_ids():
+            self.evict(session_id)
+
+    def _narration_completed(self, session_id: Optional[str]) -> None:
+        """Save the audio of a finished narration once the session is idle.
+
+        Runs in a narration worker. The save is scheduled on the event loop
+        under the session lock, so it does not interleave with an event. If
+        no loop is serving, the audio is saved with the session's next message
+        or on eviction.
+        """
+        loop = self._loop
+        session = self._find(session_id)
+        if session is None or loop is None or loop.is_closed():
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._asave_narration_audio(session), loop)
+        except RuntimeError:
+            # The loop closed in the meantime
+            return
+
+    async def _asave_narration_audio(self, session: GameSession) -> None:
+        async with session.lock:
+            # An evicted session saved its audio already
+            if self._find(session.session_id) is not session:
+                return
+            with session_scope(session.session_id):
+                await asyncio.to_thread(self._save_narration_audio)
+
+    def _find(self, session_id: Optional[str]) -> Optional[GameSession]:
+        """The active session with the given id, without creating it."""
+        if session_id is None:
+            return self._default_session
+        with self._lock:
+            return self._sessions.get(session_id)
+
+    def _save_narration_audio(self) -> None:
+        """Add finished narration audio to the current session's chat history."""
+        tts = self.tts_integration_service
+        if tts is None:
+            return
+        try:
+            game_state = self.game_state_repo.get_game_state()
+            if tts.apply_completed(game_state):
+                self.game_state_repo.save_game_state(game_state)
+        except Exception as e:
+            logger.error(f"Failed to save narration audio: {e}", exc_info=True)
@@ -1,66 +1,137 @@
 """
-Simple shared state management for the single-user game application.
+Simple shared state management for the game application.
 
-Since this is a single-user application, we maintain a single global state
-without complex threading or atomic operations.
+Each game session (see app.core.session_context) gets its own set of flags,
+so several tables can be served by one process without sharing the AI
+processing flag or the retry context. Callers without a session use the
+default session, which matches the original single-user behavior.
+
+The flags are kept in an ISharedStateStore. The in-memory store serves a
+single worker; a shared store (see app.core.sqlite_backend) lets several
+workers behind a load balancer see the same flags.
 """
 
+import threading
 import time
-from typing import List, Optional
+from typing import Dict, List, Optional
 
+from app.core.session_context import get_current_session_id
+from app.core.system_interfaces import ISharedStateStore
 from app.models.common import MessageDict
-from app.models.events.game_events import AIRequestContextModel
+from app.models.events.game_events import (
+    AIRequestContextModel,
+    SharedSessionStateModel,
+)
 
 
-class SharedStateManager:
-    """Simple shared state manager for single-user game application."""
+class InMemorySharedStateStore(ISharedStateStore):
+    """Keeps shared session state in process memory."""
 
     def __init__(self) -> None:
-        # Simple instance variables - no threading complexity
-        self.ai_processing = False
-        self.needs_backend_trigger = False
-        self.last_ai_request_context: Optional[AIRequestContextModel] = None
-        self.last_ai_request_timestamp: Optional[float] = None
+        self._states: Dict[Optional[str], SharedSessionStateModel] = {}
+        self._lock = threading.Lock()
+
+    def load(self, session_id: Optional[str]) -> Optional[SharedSessionStateModel]:
+        return self._states.get(session_id)
+
+    def save(self, session_id: Optional[str], state: SharedSessionStateModel) -> None:
+        self._states[session_id] = state
+
+    def try_set_ai_processing(self, session_id: Optional[str]) -> bool:
+        with self._lock:
+            state = self._states.setdefault(session_id, SharedSessionStateModel())
+            if state.ai_processing:
+                return False
+            state.ai_processing = True
+            return True
+
+    def delete(self, session_id: Optional[str]) -> None:
+        self._states.pop(session_id, None)
+
+    def clear(self) -> None:
+        self._states.clear()
+
+
+class SharedStateManager:
+    """Shared state manager holding one set of flags per game session."""
+
+    def __init__(self, store: Optional[ISharedStateStore] = None) -> None:
+        self._store = store or InMemorySharedStateStore()
+
+    def _flags(self) -> SharedSessionStateModel:
+        """Get the flags of the session bound to the current context."""
+        return self._store.load(get_current_session_id()) or SharedSessionStateModel()
+
+    def _save_flags(self, flags: SharedSessionStateModel) -> None:
+        self._store.save(get_current_session_id(), flags)
+
+    @property
+    def ai_processing(self) -> bool:
+        return self._flags().ai_processing
+
+    @property
+    def needs_backend_trigger(self) -> bool:
+        return self._flags().needs_backend_trigger
+
+    @property
+    def last_ai_request_context(self) -> Optional[AIRequestContextModel]:
+        return self._flags().last_ai_request_context
+
+    @property
+    def last_ai_request_timestamp(self) -> Optional[float]:
+        return self._flags().last_ai_request_timestamp
 
     def set_ai_processing(self, processing: bool) -> None:
         """Set AI processing flag."""
-        self.ai_processing = processing
+        flags = self._flags()
+        flags.ai_processing = processing
+        self._save_flags(flags)
+
+    def try_set_ai_processing(self) -> bool:
+        """Set AI processing flag unless it is set; False means the AI is busy."""
+        return self._store.try_set_ai_processing(get_current_session_id())
 
     def is_ai_processing(self) -> bool:
         """Get AI processing flag."""
-        return self.ai_processing
+        return self._flags().ai_processing
 
     def set_needs_backend_trigger(self, needs_trigger: bool) -> None:
         """Set backend trigger flag."""
-        self.needs_backend_trigger = needs_trigger
+        flags = self._flags()
+        flags.needs_backend_trigger = needs_trigger
+        self._save_flags(flags)
 
     def get_needs_backend_trigger(self) -> bool:
         """Get backend trigger flag."""
-        return self.needs_backend_trigger
+        return self._flags().needs_backend_trigger
 
     def store_ai_request_context(
         self, messages: List[MessageDict], initial_instruction: Optional[str] = None
     ) -> None:
         """Store AI request context for retry."""
-        self.last_ai_request_context = AIRequestContextModel(
+        flags = self._flags()
+        flags.last_ai_request_context = AIRequestContextModel(
             messages=messages.copy(),  # Simple copy, no deep copy complexity
             initial_instruction=initial_instruction,
         )
-        self.last_ai_request_timestamp = time.time()
+        flags.last_ai_request_timestamp = time.time()
+        self._save_flags(flags)
 
     def get_ai_request_context(self) -> Optional[AIRequestContextModel]:
         """Get stored AI request context."""
-        return self.last_ai_request_context
+        return self._flags().last_ai_request_context
 
     def can_retry_last_request(self, max_age_seconds: int = 300) -> bool:
         """Check if retry is possible."""
-        if not self.last_ai_request_context or not self.last_ai_request_timestamp:
+        flags = self._flags()
+        if not flags.last_ai_request_context or not flags.last_ai_request_timestamp:
             return False
-        return (time.time() - self.last_ai_request_timestamp) <= max_age_seconds
+        return (time.time() - flags.last_ai_request_timestamp) <= max_age_seconds
+
+    def drop_session(self, session_id: str) -> None:
+        """Forget the flags of a session this process no longer serves."""
+        self._store.release(session_id)
 
     def reset_state(self) -> None:
         """Reset all state to initial values. Useful for testing."""
-        self.ai_processing = False
-        self.needs_backend_trigger = False
-        self.last_ai_request_context = None
-        self.last_ai_request_timestamp = None
+        self._store.clear()
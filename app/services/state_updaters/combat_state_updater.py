@@ -50,6 +50,8 @@ class CombatStateUpdater:
             add_combatants_to_active_combat(
                 game_state, update, event_queue, correlation_id, character_service
             )
+            # Only the new creatures need their knowledge retrieved
+            game_state.combat.knowledge.track_combatants(game_state.combat.combatants)
             return
 
         # Validate that we have party members before starting combat
@@ -82,6 +84,8 @@ class CombatStateUpdater:
             f"Combat started with {len(game_state.combat.combatants)} participants (Initiative Pending)."
         )
         game_state.combat._combat_just_started_flag = True
+        # Knowledge of the combatants is retrieved once, for the whole combat
+        game_state.combat.knowledge.track_combatants(game_state.combat.combatants)
 
         # Emit CombatStartedEvent
         # Build combatants list for the event
@@ -166,6 +170,7 @@ class CombatStateUpdater:
         )
         emit_with_logging(event_queue, event, f"with reason: {reason}")
 
+        # Replacing the combat state also drops the combat knowledge
         game_state.combat = CombatStateModel()
 
         # Clear stored RAG context when combat ends since context changes significantly
@@ -209,6 +214,7 @@ class CombatStateUpdater:
 
         # Remove the combatant
         del combat.combatants[removed_index]
+        combat.knowledge.track_combatants(combat.combatants)
 
         reason = reason or "Removed"
         logger.info(
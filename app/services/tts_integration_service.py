@@ -1,13 +1,30 @@
 """
 TTS Integration Service for automatic speech synthesis of AI narratives.
+
+Narration of AI messages is synthesized by a pool of background workers, off
+the AI turn: the chat message is sent at once with ``narration_pending`` and
+a NarrationReadyEvent follows when its audio is ready. With segment
+streaming, each sentence is sent as a NarrationSegmentEvent as soon as it is
+synthesized, so playback does not wait for the whole narrative. Audio paths
+are added to the chat history by the completion handler (the session registry
+saves them as soon as the session is not processing an event), otherwise the
+next time a message is added. Cancelled narrations stop between segments.
 """
 
+import contextvars
 import logging
-from typing import List, Optional
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
 
 from app.core.external_interfaces import ITTSIntegrationService, ITTSService
 from app.core.repository_interfaces import IGameStateRepository
+from app.core.session_context import get_current_session_id
+from app.core.system_interfaces import IEventQueue
+from app.models.events.narrative import NarrationReadyEvent, NarrationSegmentEvent
+from app.models.game_state.main import GameStateModel
 from app.models.utils import VoiceInfoModel
+from app.utils.event_helpers import emit_with_logging
 
 logger = logging.getLogger(__name__)
 
@@ -19,9 +36,50 @@ class TTSIntegrationService(ITTSIntegrationService):
         self,
         tts_service: Optional[ITTSService],
         game_state_repo: IGameStateRepository,
+        event_queue: Optional[IEventQueue] = None,
+        max_workers: int = 1,
+        stream_segments: bool = True,
     ):
+        """
+        Args:
+            tts_service: Speech synthesis provider (None disables narration)
+            game_state_repo: Repository of the game state holding the settings
+            event_queue: Queue receiving NarrationReadyEvents
+            max_workers: Narrations synthesized at the same time
+            stream_segments: Send each sentence as soon as it is synthesized
+        """
         self.tts_service = tts_service
         self.game_state_repo = game_state_repo
+        self.event_queue = event_queue
+        self.stream_segments = stream_segments
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, max_workers), thread_name_prefix="tts-narration"
+        )
+        # Message ID -> (session key, job, cancel token) of narrations not
+        # finished yet
+        self._pending: Dict[str, Tuple[str, "Future[None]", threading.Event]] = {}
+        # Session key -> {message ID: audio path} not in the chat history yet
+        self._completed: Dict[str, Dict[str, str]] = {}
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        # Called with the session ID when a narration's audio is ready
+        self._on_completed: Optional[Callable[[Optional[str]], None]] = None
+
+    def set_completion_handler(
+        self, handler: Optional[Callable[[Optional[str]], None]]
+    ) -> None:
+        """
+        Set a callback run when the audio of a narration is ready.
+
+        It is called from the narration worker with the ID of the session the
+        message belongs to, e.g. to add the audio to its chat history at once
+        with apply_completed().
+        """
+        self._on_completed = handler
+
+    @staticmethod
+    def _session_key() -> str:
+        return get_current_session_id() or "default"
 
     def is_narration_enabled(self) -> bool:
         """Check if narration is enabled following the hierarchy:
@@ -70,11 +128,18 @@ class TTSIntegrationService(ITTSIntegrationService):
             logger.info(
                 f"Narration {'enabled' if enabled else 'disabled'} for current game session"
             )
+            if enabled and self.tts_service:
+                self.tts_service.warm_up()
             return True
         except Exception as e:
             logger.error(f"Error setting narration status: {e}")
             return False
 
+    def warm_up_if_enabled(self) -> None:
+        """Start loading the TTS model if narration is enabled."""
+        if self.tts_service and self.is_narration_enabled():
+            self.tts_service.warm_up()
+
     def generate_tts_for_message(
         self, message_content: str, message_id: str
     ) -> Optional[str]:
@@ -112,6 +177,182 @@ class TTSIntegrationService(ITTSIntegrationService):
             logger.error(f"Error generating TTS for message {message_id}: {e}")
             return None
 
+    def will_narrate(self, message_content: Optional[str]) -> bool:
+        """Whether an AI message with this content gets narrated."""
+        return bool(
+            self.tts_service
+            and message_content
+            and message_content.strip()
+            and self.is_narration_enabled()
+        )
+
+    def request_narration(self, message_content: str, message_id: str) -> bool:
+        """
+        Synthesize the narration of a message in the background.
+
+        A NarrationReadyEvent is emitted when the audio is ready, unless the
+        narration was cancelled in the meantime.
+
+        Returns:
+            True if the narration was queued
+        """
+        if not self.will_narrate(message_content):
+            return False
+        voice_id = self.get_current_voice()
+        key = self._session_key()
+        cancel = threading.Event()
+        # Workers emit events to the session the message belongs to
+        context = contextvars.copy_context()
+        with self._lock:
+            future = self._executor.submit(
+                context.run,
+                self._narrate,
+                key,
+                message_content,
+                message_id,
+                voice_id,
+                cancel,
+            )
+            self._pending[message_id] = (key, future, cancel)
+        logger.debug(f"Queued narration of message {message_id}")
+        return True
+
+    def cancel_pending_narrations(self) -> int:
+        """
+        Cancel the narrations of the session that are not finished.
+
+        Called when the player moves on: narrations that have not started are
+        dropped, and those being synthesized stop and are not delivered.
+
+        Returns:
+            Number of narrations cancelled
+        """
+        return self._cancel_session(self._session_key())
+
+    def drop_session(self, session_id: str) -> None:
+        """Cancel the narrations of an evicted session and forget its audio."""
+        self._cancel_session(session_id)
+        with self._lock:
+            self._completed.pop(session_id, None)
+
+    def _cancel_session(self, key: str) -> int:
+        with self._idle:
+            cancelled = [
+                message_id
+                for message_id, (session_key, _, _) in self._pending.items()
+                if session_key == key
+            ]
+            for message_id in cancelled:
+                _, future, cancel = self._pending.pop(message_id)
+                future.cancel()
+                cancel.set()
+            self._idle.notify_all()
+        if cancelled:
+            logger.info(f"Cancelled {len(cancelled)} pending narration(s)")
+        return len(cancelled)
+
+    def apply_completed(self, game_state: GameStateModel) -> bool:
+        """
+        Add the audio of finished narrations to the chat history.
+
+        Returns:
+            True if the game state changed and should be saved
+        """
+        with self._lock:
+            completed = self._completed.pop(self._session_key(), {})
+        changed = False
+        for index, message in enumerate(game_state.chat_history):
+            audio_path = completed.get(message.id)
+            if audio_path and message.audio_path != audio_path:
+                # Chat messages are immutable
+                game_state.chat_history[index] = message.model_copy(
+                    update={"audio_path": audio_path}
+                )
+                changed = True
+        return changed
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until no narration is pending.
+
+        Returns:
+            True if idle before the timeout
+        """
+        with self._idle:
+            return self._idle.wait_for(lambda: not self._pending, timeout)
+
+    def close(self) -> None:
+        """Stop the workers, dropping narrations not started yet."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _narrate(
+        self,
+        key: str,
+        message_content: str,
+        message_id: str,
+        voice_id: str,
+        cancel: threading.Event,
+    ) -> None:
+        if cancel.is_set():
+            # Cancelled as the worker picked it up; no longer pending
+            return
+        audio_path: Optional[str] = None
+        try:
+            if self.tts_service is not None and self.stream_segments:
+                audio_path = self.tts_service.synthesize_speech_segments(
+                    message_content,
+                    voice_id,
+                    lambda index, path: self._send_segment(message_id, index, path),
+                    cancel,
+                )
+            elif self.tts_service is not None:
+                audio_path = self.tts_service.synthesize_speech(
+                    message_content, voice_id
+                )
+        except Exception as e:
+            logger.error(f"Error generating TTS for message {message_id}: {e}")
+
+        if not audio_path and not cancel.is_set():
+            logger.warning(f"Failed to generate TTS audio for message {message_id}")
+
+        with self._idle:
+            # Cancelled narrations are no longer pending; delivering under the
+            # lock keeps a cancellation from slipping in before the event
+            delivered = self._pending.pop(message_id, None) is not None
+            if delivered and audio_path:
+                self._completed.setdefault(key, {})[message_id] = audio_path
+                if self.event_queue is not None:
+                    emit_with_logging(
+                        self.event_queue,
+                        NarrationReadyEvent(
+                            message_id=message_id, audio_path=audio_path
+                        ),
+                        f"Narration of message {message_id} ready: {audio_path}",
+                    )
+            elif audio_path:
+                logger.debug(f"Dropped narration of message {message_id}: cancelled")
+            self._idle.notify_all()
+
+        handler = self._on_completed
+        if delivered and audio_path and handler is not None:
+            try:
+                handler(get_current_session_id())
+            except Exception as e:
+                logger.error(f"Error handling narration of message {message_id}: {e}")
+
+    def _send_segment(self, message_id: str, index: int, audio_path: str) -> None:
+        with self._lock:
+            # Segments of cancelled narrations are not played
+            if message_id not in self._pending or self.event_queue is None:
+                return
+            emit_with_logging(
+                self.event_queue,
+                NarrationSegmentEvent(
+                    message_id=message_id, segment_index=index, audio_path=audio_path
+                ),
+                f"Narration segment {index} of message {message_id}: {audio_path}",
+            )
+
     def get_available_voices(self) -> List[VoiceInfoModel]:
         """Get available TTS voices."""
         if not self.tts_service:
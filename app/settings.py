@@ -14,7 +14,7 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 class AISettings(BaseSettings):
     """AI service configuration settings."""
 
-    provider: Literal["llamacpp_http", "openrouter"] = Field(
+    provider: Literal["llamacpp_http", "openrouter", "replay", "router"] = Field(
         default="llamacpp_http",
         description="AI provider to use",
         alias="AI_PROVIDER",
@@ -63,6 +63,23 @@ class AISettings(BaseSettings):
         description="Retry context timeout in seconds",
         alias="AI_RETRY_CONTEXT_TIMEOUT",
     )
+    http_max_connections: int = Field(
+        default=10,
+        gt=0,
+        description="Pooled keep-alive connections of the async AI client",
+        alias="AI_HTTP_MAX_CONNECTIONS",
+    )
+    http_keepalive_expiry: float = Field(
+        default=60.0,
+        gt=0,
+        description="Seconds an idle pooled AI connection is kept open",
+        alias="AI_HTTP_KEEPALIVE_EXPIRY",
+    )
+    streaming: bool = Field(
+        default=False,
+        description="Stream AI responses and send the narrative as it is generated",
+        alias="AI_STREAMING",
+    )
 
     # OpenRouter specific
     openrouter_api_key: Optional[SecretStr] = Field(
@@ -87,6 +104,107 @@ class AISettings(BaseSettings):
         description="Llama.cpp HTTP server URL",
         alias="LLAMA_SERVER_URL",
     )
+    llama_cache_prompt: bool = Field(
+        default=True,
+        description="Ask the Llama.cpp server to reuse the cached prompt prefix",
+        alias="LLAMA_CACHE_PROMPT",
+    )
+    llama_slot_id: Optional[int] = Field(
+        default=None,
+        ge=0,
+        description="Llama.cpp server slot to pin requests to (None lets the server choose)",
+        alias="LLAMA_SLOT_ID",
+    )
+    llama_constrained_decoding: bool = Field(
+        default=False,
+        description="Constrain Llama.cpp answers parsed from text to the AIResponse JSON schema",
+        alias="LLAMA_CONSTRAINED_DECODING",
+    )
+
+    # Routing over several servers (AI_PROVIDER=router)
+    router_backends: str = Field(
+        default="",
+        description="Comma-separated base URLs of the OpenAI-compatible servers to route to",
+        alias="AI_ROUTER_BACKENDS",
+    )
+    router_strategy: Literal["least_inflight", "fastest"] = Field(
+        default="least_inflight",
+        description="Backend choice: fewest requests in flight or best observed tokens/s",
+        alias="AI_ROUTER_STRATEGY",
+    )
+    router_hedge_percentile: Optional[float] = Field(
+        default=None,
+        gt=0.0,
+        lt=100.0,
+        description="Latency percentile after which a request is also sent to a second backend",
+        alias="AI_ROUTER_HEDGE_PERCENTILE",
+    )
+    router_unhealthy_seconds: float = Field(
+        default=30.0,
+        ge=0.0,
+        description="Seconds a failing or rate-limited backend is skipped",
+        alias="AI_ROUTER_UNHEALTHY_SECONDS",
+    )
+
+    # Recorded responses (AI_PROVIDER=replay serves them)
+    replay_dir: str = Field(
+        default="saves/ai_recordings",
+        description="Directory of recorded AI responses, keyed by prompt hash",
+        alias="AI_REPLAY_DIR",
+    )
+    replay_on_miss: Literal["pick", "error"] = Field(
+        default="pick",
+        description="Replay of unrecorded prompts: 'pick' serves a recording chosen by prompt hash, 'error' fails",
+        alias="AI_REPLAY_ON_MISS",
+    )
+    record_responses: bool = Field(
+        default=False,
+        description="Record the responses of the AI provider to AI_REPLAY_DIR",
+        alias="AI_RECORD_RESPONSES",
+    )
+
+    # Response cache for idempotent requests
+    response_cache_enabled: bool = Field(
+        default=False,
+        description="Reuse the answers of temperature-0 and idempotent AI requests",
+        alias="AI_RESPONSE_CACHE_ENABLED",
+    )
+    response_cache_dir: str = Field(
+        default="saves/ai_response_cache",
+        description="Directory of cached AI responses",
+        alias="AI_RESPONSE_CACHE_DIR",
+    )
+    response_cache_max_mb: float = Field(
+        default=64.0,
+        ge=0.0,
+        description="Size of the AI response cache before the least recently used responses are evicted",
+        alias="AI_RESPONSE_CACHE_MAX_MB",
+    )
+
+    # Structured output methods each model supports (strict parsing mode)
+    capabilities_file: Optional[str] = Field(
+        default="saves/ai_capabilities.json",
+        description="File remembering the structured output methods each model supports",
+        alias="AI_CAPABILITIES_FILE",
+    )
+    capabilities_reprobe_hours: float = Field(
+        default=24.0,
+        ge=0.0,
+        description="Hours before a structured output method that failed for a model is tried again",
+        alias="AI_CAPABILITIES_REPROBE_HOURS",
+    )
+
+    # History summarization model (defaults to the main model)
+    summary_base_url: Optional[str] = Field(
+        default=None,
+        description="OpenAI-compatible server for history summaries (e.g. a small local model)",
+        alias="AI_SUMMARY_BASE_URL",
+    )
+    summary_model_name: Optional[str] = Field(
+        default=None,
+        description="Model used for history summaries",
+        alias="AI_SUMMARY_MODEL_NAME",
+    )
 
     # Auto-continuation
     max_continuation_depth: int = Field(
@@ -100,7 +218,7 @@ class AISettings(BaseSettings):
     @classmethod
     def validate_provider(cls, v: str) -> str:
         """Ensure provider is valid."""
-        if v not in ["llamacpp_http", "openrouter"]:
+        if v not in ["llamacpp_http", "openrouter", "replay", "router"]:
             raise ValueError(f"Invalid AI provider: {v}")
         return v
 
@@ -134,6 +252,34 @@ class PromptSettings(BaseSettings):
         description="Token overhead per message",
         alias="TOKENS_PER_MESSAGE_OVERHEAD",
     )
+    layout: Literal["default", "cache_aware"] = Field(
+        default="default",
+        description="Prompt message order (cache_aware keeps the prefix stable)",
+        alias="PROMPT_LAYOUT",
+    )
+    history_chunk_size: int = Field(
+        default=16,
+        gt=0,
+        description="Messages dropped at a time when the cache_aware layout truncates history",
+        alias="PROMPT_HISTORY_CHUNK_SIZE",
+    )
+    history_summarization: bool = Field(
+        default=False,
+        description="Summarize history that no longer fits in the prompt budget",
+        alias="HISTORY_SUMMARIZATION_ENABLED",
+    )
+    history_summary_max_blocks: int = Field(
+        default=8,
+        ge=1,
+        description="Summaries kept before the oldest ones are merged",
+        alias="HISTORY_SUMMARY_MAX_BLOCKS",
+    )
+    prefetch_ttl_seconds: float = Field(
+        default=60.0,
+        ge=0,
+        description="How long prompt inputs prefetched while the player types stay usable (0 disables prefetching)",
+        alias="PROMPT_PREFETCH_TTL_SECONDS",
+    )
 
 
 class DatabaseSettings(BaseSettings):
@@ -275,6 +421,22 @@ class RAGSettings(BaseSettings):
         description="Cache TTL in seconds",
         alias="RAG_CACHE_TTL",
     )
+    entity_gazetteer_enabled: bool = Field(
+        default=True,
+        description="Recognize the spells, monsters, items, classes and races of the content packs in actions",
+        alias="RAG_ENTITY_GAZETTEER",
+    )
+    entity_refresh_seconds: float = Field(
+        default=30.0,
+        ge=0.0,
+        description="Seconds between checks for content pack changes by the entity gazetteer",
+        alias="RAG_ENTITY_REFRESH_SECONDS",
+    )
+    combat_knowledge_enabled: bool = Field(
+        default=True,
+        description="Retrieve the stat blocks and rules of a combat once and reuse them on every turn",
+        alias="RAG_COMBAT_KNOWLEDGE",
+    )
 
 
 class TTSSettings(BaseSettings):
@@ -300,12 +462,45 @@ class TTSSettings(BaseSettings):
         description="TTS cache directory name",
         alias="TTS_CACHE_DIR_NAME",
     )
+    cache_max_mb: int = Field(
+        default=512,
+        ge=0,
+        description="Size of the TTS cache above which the oldest audio is deleted (0: no limit)",
+        alias="TTS_CACHE_MAX_MB",
+    )
+    audio_format: Literal["wav", "ogg"] = Field(
+        default="wav",
+        description="Format of synthesized audio: wav, or ogg (Opus, much smaller)",
+        alias="TTS_AUDIO_FORMAT",
+    )
+    workers: int = Field(
+        default=1,
+        gt=0,
+        description="Narrations synthesized at the same time in the background",
+        alias="TTS_WORKERS",
+    )
+    stream_segments: bool = Field(
+        default=True,
+        description="Send narration sentence by sentence as it is synthesized",
+        alias="TTS_STREAM_SEGMENTS",
+    )
+    warmup: bool = Field(
+        default=True,
+        description="Load the TTS model and voices as soon as narration is enabled instead of on the first request",
+        alias="TTS_WARMUP",
+    )
+    max_batch: int = Field(
+        default=8,
+        gt=0,
+        description="Most queued TTS requests handled at once (short texts of a voice are synthesized together)",
+        alias="TTS_MAX_BATCH",
+    )
 
 
 class StorageSettings(BaseSettings):
     """Storage and repository configuration settings."""
 
-    game_state_repo_type: Literal["memory", "file"] = Field(
+    game_state_repo_type: Literal["memory", "file", "sqlite"] = Field(
         default="memory",
         description="Game state repository type",
         alias="GAME_STATE_REPO_TYPE",
@@ -330,6 +525,50 @@ class StorageSettings(BaseSettings):
         description="Base saves directory",
         alias="SAVES_DIR",
     )
+    save_format: Literal["json", "compact", "msgpack"] = Field(
+        default="json",
+        description="Encoding of save files (formats are auto-detected on load)",
+        alias="SAVE_FORMAT",
+    )
+    save_compression: Literal["none", "gzip", "zstd"] = Field(
+        default="none",
+        description="Compression of save files",
+        alias="SAVE_COMPRESSION",
+    )
+    save_write_behind_delay: float = Field(
+        default=1.0,
+        ge=0,
+        description="Seconds without new saves before a file save is written (0=write immediately)",
+        alias="SAVE_WRITE_BEHIND_DELAY",
+    )
+    session_idle_timeout: int = Field(
+        default=1800,
+        gt=0,
+        description="Seconds of inactivity before a game session is evicted to disk",
+        alias="SESSION_IDLE_TIMEOUT",
+    )
+    session_sweep_interval: int = Field(
+        default=60,
+        gt=0,
+        description="Minimum seconds between idle session sweeps",
+        alias="SESSION_SWEEP_INTERVAL",
+    )
+    session_max_active: int = Field(
+        default=256,
+        gt=0,
+        description="Most game sessions held in memory; the least recently used is evicted to disk",
+        alias="SESSION_MAX_ACTIVE",
+    )
+    shared_state_backend: Literal["memory", "sqlite"] = Field(
+        default="memory",
+        description="Backend for the event bus and session flags (sqlite for multiple workers)",
+        alias="SHARED_STATE_BACKEND",
+    )
+    state_db_path: str = Field(
+        default="saves/state.db",
+        description="SQLite database shared by workers for state, events and flags",
+        alias="STATE_DB_PATH",
+    )
 
 
 class SSESettings(BaseSettings):
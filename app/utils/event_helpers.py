@@ -6,10 +6,12 @@ throughout the application, handling null-safety and optional logging.
 """
 
 import logging
-from typing import Optional
+import time
+from typing import List, Optional
 
 from app.core.system_interfaces import IEventQueue
 from app.models.events.base import BaseGameEvent
+from app.models.events.narrative import NarrativeChunkEvent
 
 logger = logging.getLogger(__name__)
 
@@ -53,3 +55,44 @@ def emit_with_logging(
         log_message=f"Emitted {event.__class__.__name__}: {event_description}",
         log_level=logging.DEBUG,
     )
+
+
+class NarrativeChunkEmitter:
+    """
+    Emits narrative text streamed from the AI as NarrativeChunkEvents.
+
+    Streams deliver roughly a token at a time, so text is buffered and emitted
+    at most every ``min_interval`` seconds. Call flush() when the stream ends.
+    """
+
+    def __init__(
+        self,
+        event_queue: IEventQueue,
+        correlation_id: Optional[str],
+        min_interval: float = 0.05,
+    ) -> None:
+        self.event_queue = event_queue
+        self.correlation_id = correlation_id
+        self.min_interval = min_interval
+        self.chunk_count = 0
+        self._buffer: List[str] = []
+        self._last_emit = 0.0
+
+    def __call__(self, text: str) -> None:
+        self._buffer.append(text)
+        if time.monotonic() - self._last_emit >= self.min_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """Emit any buffered narrative text."""
+        if not self._buffer:
+            return
+        event = NarrativeChunkEvent(
+            correlation_id=self.correlation_id,
+            content="".join(self._buffer),
+            chunk_index=self.chunk_count,
+        )
+        self._buffer = []
+        self.chunk_count += 1
+        self._last_emit = time.monotonic()
+        emit_event(self.event_queue, event)
@@ -0,0 +1,139 @@
+"""
+Incremental extraction of the narrative field from a streamed AI response.
+
+The AI answers with a JSON object conforming to ``AIResponse``. While the
+response is still being generated the object is incomplete and cannot be
+parsed, but the ``narrative`` string can already be shown to the player. The
+parser consumes the raw text as it arrives and returns the decoded narrative
+text that became available with each chunk.
+"""
+
+import json
+from typing import List, Optional
+
+
+class NarrativeStreamParser:
+    """Decodes a top-level JSON string field from partial JSON text.
+
+    Only the value of ``field`` in the outermost object is decoded; strings
+    nested in other fields (e.g. dice request reasons) are skipped. Text
+    before the first ``{`` (such as a markdown code fence) is ignored.
+    """
+
+    def __init__(self, field: str = "narrative") -> None:
+        self.field = field
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._expect_key = False
+        self._key_chars: List[str] = []
+        self._capturing_key = False
+        self._last_key: Optional[str] = None
+        self._in_field = False
+        self._escape_buffer = ""
+        # High surrogate of a \\uXXXX pair split across two escapes
+        self._pending_surrogate = ""
+        self._parts: List[str] = []
+        self.complete = False
+
+    @property
+    def narrative(self) -> str:
+        """The narrative text decoded so far."""
+        return "".join(self._parts)
+
+    def feed(self, text: str) -> str:
+        """Consume the next chunk of raw response text.
+
+        Returns:
+            The narrative text decoded from this chunk (may be empty)
+        """
+        if self.complete:
+            return ""
+        decoded: List[str] = []
+        for char in text:
+            if self._in_field:
+                if self._feed_field_char(char, decoded):
+                    break
+            elif self._in_string:
+                self._feed_string_char(char)
+            else:
+                self._feed_structure_char(char)
+        delta = "".join(decoded)
+        if delta:
+            self._parts.append(delta)
+        return delta
+
+    def _feed_field_char(self, char: str, decoded: List[str]) -> bool:
+        """Decode one character of the narrative value; True once it ends."""
+        if self._escape_buffer:
+            self._escape_buffer += char
+            if self._escape_buffer[1] == "u" and len(self._escape_buffer) < 6:
+                return False
+            decoded.append(self._decode_escape(self._escape_buffer))
+            self._escape_buffer = ""
+        elif char == "\\":
+            self._escape_buffer = char
+        elif char == '"':
+            self._in_field = False
+            self.complete = True
+            return True
+        else:
+            decoded.append(char)
+        return False
+
+    def _decode_escape(self, escape: str) -> str:
+        try:
+            value: str = json.loads(f'"{escape}"')
+        except ValueError:
+            return escape
+        if self._pending_surrogate:
+            value = self._pending_surrogate + value
+            self._pending_surrogate = ""
+            try:
+                return value.encode("utf-16", "surrogatepass").decode("utf-16")
+            except UnicodeDecodeError:
+                return value.encode("utf-8", "replace").decode("utf-8")
+        if "\ud800" <= value <= "\udbff":
+            self._pending_surrogate = value
+            return ""
+        return value
+
+    def _feed_string_char(self, char: str) -> None:
+        if self._escaped:
+            self._escaped = False
+        elif char == "\\":
+            self._escaped = True
+        elif char == '"':
+            self._in_string = False
+            if self._capturing_key:
+                self._capturing_key = False
+                self._last_key = "".join(self._key_chars)
+            return
+        if self._capturing_key:
+            self._key_chars.append(char)
+
+    def _feed_structure_char(self, char: str) -> None:
+        if char in "{[":
+            self._depth += 1
+            self._expect_key = char == "{" and self._depth == 1
+        elif char in "}]":
+            self._depth -= 1
+            if self._depth <= 0:
+                # The outermost object ended without a narrative value
+                self._depth = 0
+                self.complete = self._last_key is not None
+        elif self._depth == 0:
+            return
+        elif char == '"':
+            self._in_string = True
+            if self._depth != 1:
+                return
+            if self._expect_key:
+                self._capturing_key = True
+                self._key_chars = []
+            elif self._last_key == self.field:
+                self._in_field = True
+        elif self._depth == 1 and char == ",":
+            self._expect_key = True
+        elif self._depth == 1 and char == ":":
+            self._expect_key = False
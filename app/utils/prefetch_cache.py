@@ -0,0 +1,89 @@
+"""
+Short-lived cache of results computed ahead of the request that needs them.
+
+A result is prefetched for a key (e.g. a campaign) together with a
+fingerprint of the inputs it was computed from. The request that follows
+takes the result only if its own fingerprint matches; otherwise, or once
+the result has expired, it computes the result itself. A result still
+being computed is waited for rather than computed a second time.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Generic, Hashable, NamedTuple, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class _Entry(NamedTuple):
+    fingerprint: Hashable
+    future: "Future[Any]"
+    created_at: float
+
+
+class PrefetchCache(Generic[T]):
+    """One prefetched result per key, each used at most once."""
+
+    def __init__(self, ttl_seconds: float = 60.0, max_entries: int = 64) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def start(self, key: str, fingerprint: Hashable) -> "Optional[Future[T]]":
+        """
+        Reserve the entry of ``key`` for a result about to be computed.
+
+        Returns:
+            A future the caller must complete with the result (or an
+            exception), or None if a fresh result for the same fingerprint is
+            already available or being computed
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if (
+                entry is not None
+                and entry.fingerprint == fingerprint
+                and now - entry.created_at < self.ttl_seconds
+            ):
+                return None
+            future: "Future[T]" = Future()
+            self._entries.pop(key, None)
+            self._entries[key] = _Entry(fingerprint, future, now)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return future
+
+    def take(
+        self, key: str, fingerprint: Hashable, timeout: Optional[float] = None
+    ) -> Optional[T]:
+        """
+        Remove and return the result prefetched for ``key``.
+
+        Returns:
+            The result if it was computed for ``fingerprint``, has not expired
+            and is ready within ``timeout`` seconds; None otherwise
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        if entry is None or entry.fingerprint != fingerprint:
+            return None
+        if time.monotonic() - entry.created_at >= self.ttl_seconds:
+            return None
+        try:
+            result: T = entry.future.result(timeout=timeout)
+        except Exception:
+            return None
+        return result
+
+    def clear(self) -> None:
+        """Drop all prefetched results."""
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,151 @@
+"""
+Pluggable serialization for save files.
+
+Save files (campaign game states, campaign instances and character instances)
+can be written as:
+
+- ``json``: pretty-printed JSON, readable and diff-friendly (default)
+- ``compact``: JSON without whitespace, encoded with orjson when installed
+- ``msgpack``: MessagePack binary encoding (requires ``msgpack``)
+
+optionally compressed with ``gzip`` or ``zstd`` (requires ``zstandard``).
+Files keep their names; the format is detected from the content on load, so
+saves written with any setting can always be read back.
+"""
+
+import gzip
+import importlib
+import json
+import os
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Literal, Optional, Tuple, Union
+
+from app.settings import Settings
+
+
+def _optional_import(name: str) -> Optional[ModuleType]:
+    """Import an optional dependency, returning None if it is not installed."""
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+
+orjson = _optional_import("orjson")
+msgpack = _optional_import("msgpack")
+zstandard = _optional_import("zstandard")
+
+SaveFormat = Literal["json", "compact", "msgpack"]
+SaveCompression = Literal["none", "gzip", "zstd"]
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+UTF8_BOM = b"\xef\xbb\xbf"
+
+
+def _decompress(raw: bytes) -> Tuple[str, bytes]:
+    """Strip any compression, returning the compression name and the payload."""
+    if raw.startswith(GZIP_MAGIC):
+        return "gzip", gzip.decompress(raw)
+    if raw.startswith(ZSTD_MAGIC):
+        if zstandard is None:
+            raise ValueError(
+                "Save file is zstd-compressed but zstandard is not installed"
+            )
+        # Frames written by stream APIs may not record their size, so use a reader
+        with zstandard.ZstdDecompressor().stream_reader(raw) as reader:
+            return "zstd", reader.read()
+    return "none", raw
+
+
+def _is_json(payload: bytes) -> bool:
+    return payload.lstrip(b" \t\r\n" + UTF8_BOM)[:1] in (b"{", b"[")
+
+
+def detect_save_format(raw: bytes) -> Tuple[str, str]:
+    """Detect the (compression, encoding) of raw save file content.
+
+    The encoding is reported as ``json`` or ``msgpack``; pretty and compact
+    JSON are not distinguished.
+    """
+    compression, payload = _decompress(raw)
+    return compression, "json" if _is_json(payload) else "msgpack"
+
+
+class SaveSerializer:
+    """Encodes save data according to the configured format and compression."""
+
+    def __init__(
+        self,
+        save_format: SaveFormat = "json",
+        compression: SaveCompression = "none",
+        compression_level: Optional[int] = None,
+    ) -> None:
+        if save_format == "msgpack" and msgpack is None:
+            raise ValueError("SAVE_FORMAT=msgpack requires the msgpack package")
+        if compression == "zstd" and zstandard is None:
+            raise ValueError("SAVE_COMPRESSION=zstd requires the zstandard package")
+        self.save_format = save_format
+        self.compression = compression
+        self.compression_level = compression_level
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "SaveSerializer":
+        """Create the serializer configured in the storage settings."""
+        return cls(settings.storage.save_format, settings.storage.save_compression)
+
+    def dumps(self, data: Any) -> bytes:
+        """Encode JSON-compatible data (e.g. ``model_dump(mode="json")``)."""
+        if self.save_format == "msgpack" and msgpack is not None:
+            raw: bytes = msgpack.packb(data, use_bin_type=True)
+        elif self.save_format == "compact":
+            if orjson is not None:
+                raw = orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+            else:
+                raw = json.dumps(
+                    data, separators=(",", ":"), ensure_ascii=False
+                ).encode("utf-8")
+        else:
+            raw = json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
+        if self.compression == "gzip":
+            # mtime=0 keeps the output deterministic for identical data
+            return gzip.compress(
+                raw, compresslevel=self.compression_level or 6, mtime=0
+            )
+        if self.compression == "zstd" and zstandard is not None:
+            return bytes(
+                zstandard.ZstdCompressor(level=self.compression_level or 3).compress(
+                    raw
+                )
+            )
+        return raw
+
+    def loads(self, raw: bytes) -> Any:
+        """Decode save data written with any format and compression."""
+        _, payload = _decompress(raw)
+        if _is_json(payload):
+            if payload.startswith(UTF8_BOM):
+                payload = payload[len(UTF8_BOM) :]
+            if orjson is not None:
+                return orjson.loads(payload)
+            return json.loads(payload)
+
+        if msgpack is None:
+            raise ValueError("Save file is MessagePack but msgpack is not installed")
+        return msgpack.unpackb(payload, raw=False)
+
+    def read(self, path: Union[str, Path]) -> Any:
+        """Read and decode a save file."""
+        with open(path, "rb") as f:
+            return self.loads(f.read())
+
+    def write(self, path: Union[str, Path], data: Any) -> None:
+        """Atomically write save data to a file."""
+        path = str(path)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        temp_path = path + ".tmp"
+        with open(temp_path, "wb") as f:
+            f.write(self.dumps(data))
+        os.replace(temp_path, path)
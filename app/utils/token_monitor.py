@@ -3,7 +3,9 @@ LangChain callback handlers for monitoring and debugging.
 """
 
 import logging
-from typing import Any, Optional
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, Optional
 from uuid import UUID
 
 from langchain_core.callbacks import BaseCallbackHandler
@@ -130,3 +132,38 @@ class CompletionTokenMonitor(BaseCallbackHandler):
             call_count=self.call_count,
             average_tokens_per_call=avg_tokens,
         )
+
+
+# Monitor of the AI request running in the current thread or task
+_request_monitor: ContextVar[Optional[CompletionTokenMonitor]] = ContextVar(
+    "request_token_monitor", default=None
+)
+
+
+@contextmanager
+def request_token_monitor(fresh: bool = False) -> Iterator[CompletionTokenMonitor]:
+    """
+    Monitor the tokens of the AI request made in this context.
+
+    Concurrent requests each count their own tokens. A monitor already opened
+    by the caller (e.g. the router around a backend call) is reused, unless
+    ``fresh`` asks for a new one.
+
+    Yields:
+        The monitor to pass as callback of the request's model calls
+    """
+    current = _request_monitor.get()
+    if current is not None and not fresh:
+        yield current
+        return
+    monitor = CompletionTokenMonitor()
+    token = _request_monitor.set(monitor)
+    try:
+        yield monitor
+    finally:
+        _request_monitor.reset(token)
+
+
+def current_token_monitor() -> Optional[CompletionTokenMonitor]:
+    """The token monitor of the AI request made in this context, if any."""
+    return _request_monitor.get()
@@ -6,6 +6,7 @@ import type {
   SaveGameResponse,
   PerformRollRequest,
   GameEventResponseModel,
+  PrefetchResponse,
   StartCampaignResponse,
 } from '@/types/unified'
 
@@ -46,6 +47,17 @@ export const gameApi = {
     })
   },
 
+  /**
+   * Prepare the next AI prompt while the player types or rolls dice
+   */
+  async prefetch(
+    draftText?: string
+  ): Promise<AxiosResponse<PrefetchResponse>> {
+    return apiClient.post<PrefetchResponse>('/api/game/prefetch', {
+      draft_text: draftText,
+    })
+  },
+
   /**
    * Perform an immediate dice roll
    */
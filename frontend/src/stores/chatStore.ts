@@ -7,7 +7,11 @@
  * - System messages (combat events, dice rolls, etc.)
  *
  * The store receives messages through SSE events (narrative_added) and
- * maintains them in chronological order for display in the chat UI.
+ * maintains them in chronological order for display in the chat UI. While a
+ * response is streamed, narrative_chunk events build a provisional message
+ * that is replaced by the complete one. Narration audio synthesized in the
+ * background arrives later: sentence by sentence as narration_segment events,
+ * then as a whole in a narration_ready event.
  *
  * @module chatStore
  */
@@ -16,6 +20,9 @@ import eventService from '@/services/eventService'
 import type {
   ChatMessageModel,
   NarrativeAddedEvent,
+  NarrativeChunkEvent,
+  NarrationReadyEvent,
+  NarrationSegmentEvent,
   MessageSupersededEvent,
   GameStateSnapshotEvent,
 } from '@/types/unified'
@@ -26,8 +33,14 @@ interface UIChatMessage extends Omit<ChatMessageModel, 'is_dice_result'> {
   type: 'assistant' | 'user' | 'system'
   sequence_number?: number
   superseded?: boolean
+  streaming?: boolean
+  narration_pending?: boolean
+  narration_segments?: string[]
 }
 
+const streamingMessageId = (correlationId?: string): string =>
+  `streaming-${correlationId ?? 'none'}`
+
 export const useChatStore = defineStore('chat', {
   state: () => ({
     /**
@@ -99,6 +112,43 @@ export const useChatStore = defineStore('chat', {
       this.addNarrative(event)
     },
 
+    /**
+     * Append streamed narrative text to the provisional message of a response
+     */
+    handleNarrativeChunkEvent(event: NarrativeChunkEvent): void {
+      const id = streamingMessageId(event.correlation_id)
+      const message = this.messages.find(m => m.id === id)
+      if (!message) {
+        this.messages.push({
+          id,
+          type: 'assistant',
+          role: 'assistant',
+          content: event.content,
+          timestamp: event.timestamp,
+          sequence_number: event.sequence_number,
+          superseded: false,
+          streaming: true,
+        })
+      } else if (event.chunk_index === 0) {
+        // The response was restarted
+        message.content = event.content
+      } else {
+        message.content += event.content
+      }
+    },
+
+    /**
+     * Remove provisional messages of streamed responses
+     */
+    clearStreamingMessages(correlationId?: string): void {
+      this.messages = this.messages.filter(
+        m =>
+          !m.streaming ||
+          (correlationId !== undefined &&
+            m.id !== streamingMessageId(correlationId))
+      )
+    },
+
     /**
      * Add a narrative message from an event
      */
@@ -115,6 +165,12 @@ export const useChatStore = defineStore('chat', {
           : undefined,
         sequence_number: event.sequence_number,
         superseded: false, // New messages are not superseded
+        narration_pending: event.narration_pending,
+      }
+
+      // The complete message replaces the streamed one
+      if (event.role === 'assistant') {
+        this.clearStreamingMessages(event.correlation_id)
       }
 
       // Check for duplicates by message_id
@@ -124,6 +180,34 @@ export const useChatStore = defineStore('chat', {
       }
     },
 
+    /**
+     * Collect the sentences of a narration still being synthesized, so
+     * playback can start before the whole audio is ready
+     */
+    handleNarrationSegmentEvent(event: NarrationSegmentEvent): void {
+      const message = this.messages.find(m => m.id === event.message_id)
+      if (!message || message.superseded || !message.narration_pending) {
+        return
+      }
+      if (!message.narration_segments) {
+        message.narration_segments = []
+      }
+      message.narration_segments[event.segment_index] =
+        `/static/${event.audio_path}`
+    },
+
+    /**
+     * Attach narration audio synthesized after the message was added
+     */
+    handleNarrationReadyEvent(event: NarrationReadyEvent): void {
+      const message = this.messages.find(m => m.id === event.message_id)
+      if (!message || message.superseded) {
+        return
+      }
+      message.audio_path = `/static/${event.audio_path}`
+      message.narration_pending = false
+    },
+
     /**
      * Handle message superseded events
      */
@@ -18,6 +18,7 @@ import type {
 } from '@/types/unified'
 import type { UIDiceRequest, UIDiceRollResult } from '@/types/ui'
 import { logger } from '@/utils/logger'
+import { gameApi } from '@/services/gameApi'
 
 export const useDiceStore = defineStore('dice', () => {
   /**
@@ -192,6 +193,13 @@ export const useDiceStore = defineStore('dice', () => {
     const key = `${requestId}-${characterId}`
     completedRolls.value.set(key, rollResult)
     logger.debug('Added completed roll:', key, rollResult)
+
+    // Prepare the next prompt while the remaining rolls are made
+    if (completedRolls.value.size === 1) {
+      gameApi.prefetch().catch(error => {
+        logger.debug('Prompt prefetch failed:', error)
+      })
+    }
   }
 
   function getCompletedRoll(
@@ -24,6 +24,9 @@ import { useChatStore } from './chatStore'
 import { logger } from '@/utils/logger'
 import type {
   NarrativeAddedEvent,
+  NarrativeChunkEvent,
+  NarrationReadyEvent,
+  NarrationSegmentEvent,
   MessageSupersededEvent,
   CombatStartedEvent,
   CombatEndedEvent,
@@ -120,6 +123,18 @@ class EventRouter {
       this.stores.chat?.handleNarrativeEvent(event)
     })
 
+    eventService.on('narrative_chunk', (event: NarrativeChunkEvent) => {
+      this.stores.chat?.handleNarrativeChunkEvent(event)
+    })
+
+    eventService.on('narration_segment', (event: NarrationSegmentEvent) => {
+      this.stores.chat?.handleNarrationSegmentEvent(event)
+    })
+
+    eventService.on('narration_ready', (event: NarrationReadyEvent) => {
+      this.stores.chat?.handleNarrationReadyEvent(event)
+    })
+
     eventService.on('message_superseded', (event: MessageSupersededEvent) => {
       this.stores.chat?.handleMessageSupersededEvent(event)
     })
@@ -258,6 +273,10 @@ class EventRouter {
     // UI/System events
     eventService.on('backend_processing', (event: BackendProcessingEvent) => {
       this.stores.ui?.handleBackendProcessing(event)
+      if (!event.is_processing) {
+        // Drop narrative that was streamed but never completed
+        this.stores.chat?.clearStreamingMessages()
+      }
     })
 
     eventService.on('game_error', (event: GameErrorEvent) => {
@@ -28,6 +28,10 @@ export interface UIChatMessage
   type: 'assistant' | 'user' | 'system' | 'dice'
   sequence_number?: number
   superseded?: boolean
+  // Audio still being synthesized; it follows in a narration_ready event
+  narration_pending?: boolean
+  // Sentences of the pending narration, playable before the whole audio
+  narration_segments?: string[]
   severity?: 'info' | 'warning' | 'error' | 'success'
   details?: Record<string, unknown>
 }
@@ -92,6 +92,10 @@ export interface PlayerActionRequest {
   character_id?: string
 }
 
+export interface PrefetchRequest {
+  draft_text?: string
+}
+
 export interface RAGQueryRequest {
   query: string
   campaign_id?: string
@@ -144,6 +148,13 @@ export interface AdventureCharacterData {
   experience: number
 }
 
+export interface AIBackendsResponse {
+  strategy?: string
+  hedge_percentile?: number
+  hedged_requests: number
+  backends: AIBackendStatsModel[]
+}
+
 export interface AdventureInfo {
   campaign_id?: string
   campaign_name?: string
@@ -237,6 +248,23 @@ export interface CreateCampaignFromTemplateResponse {
   message: string
 }
 
+export interface PersistenceStatusResponse {
+  mode: 'memory' | 'sync' | 'write_behind'
+  pending_saves: number
+  durability_lag_seconds: number
+  saves: number
+  writes: number
+  coalesced_saves: number
+  failed_writes: number
+  last_error?: string
+  seconds_since_last_write?: number
+}
+
+export interface PrefetchResponse {
+  rag_context: boolean
+  prompt_context: boolean
+}
+
 export interface RAGQueryResponse {
   results: RAGResults
   query_info: Record<string, any>
@@ -832,11 +860,19 @@ export interface D5eRuleSection {
 // ============================================
 
 export interface StorageSettings {
-  game_state_repo_type: 'memory' | 'file'
+  game_state_repo_type: 'memory' | 'file' | 'sqlite'
   campaigns_dir: string
   character_templates_dir: string
   campaign_templates_dir: string
   saves_dir: string
+  save_format: 'json' | 'compact' | 'msgpack'
+  save_compression: 'none' | 'gzip' | 'zstd'
+  save_write_behind_delay: number
+  session_idle_timeout: number
+  session_sweep_interval: number
+  session_max_active: number
+  shared_state_backend: 'memory' | 'sqlite'
+  state_db_path: string
 }
 
 export interface RAGSettings {
@@ -854,6 +890,9 @@ export interface RAGSettings {
   metadata_filtering_enabled: boolean
   relevance_feedback_enabled: boolean
   cache_ttl: number
+  entity_gazetteer_enabled: boolean
+  entity_refresh_seconds: number
+  combat_knowledge_enabled: boolean
 }
 
 export interface TTSSettings {
@@ -861,10 +900,16 @@ export interface TTSSettings {
   voice: string
   kokoro_lang_code: string
   cache_dir_name: string
+  cache_max_mb: number
+  audio_format: 'wav' | 'ogg'
+  workers: number
+  stream_segments: boolean
+  warmup: boolean
+  max_batch: number
 }
 
 export interface AISettings {
-  provider: 'llamacpp_http' | 'openrouter'
+  provider: 'llamacpp_http' | 'openrouter' | 'replay' | 'router'
   response_parsing_mode: 'strict' | 'flexible'
   temperature: number
   max_tokens: number
@@ -876,6 +921,23 @@ export interface AISettings {
   openrouter_model_name?: string
   openrouter_base_url: string
   llama_server_url: string
+  llama_cache_prompt: boolean
+  llama_slot_id?: number
+  llama_constrained_decoding: boolean
+  router_backends: string
+  router_strategy: 'least_inflight' | 'fastest'
+  router_hedge_percentile?: number
+  router_unhealthy_seconds: number
+  replay_dir: string
+  replay_on_miss: 'pick' | 'error'
+  record_responses: boolean
+  response_cache_enabled: boolean
+  response_cache_dir: string
+  response_cache_max_mb: number
+  capabilities_file: string
+  capabilities_reprobe_hours: number
+  summary_base_url?: string
+  summary_model_name?: string
   max_continuation_depth: number
 }
 
@@ -907,6 +969,11 @@ export interface PromptSettings {
   max_tokens_budget: number
   last_x_history_messages: number
   tokens_per_message_overhead: number
+  layout: 'default' | 'cache_aware'
+  history_chunk_size: number
+  history_summarization: boolean
+  history_summary_max_blocks: number
+  prefetch_ttl_seconds: number
 }
 
 export interface Settings {
@@ -946,6 +1013,20 @@ export interface NPCModel {
   last_location: string
 }
 
+export interface AIBackendStatsModel {
+  name: string
+  base_url: string
+  healthy: boolean
+  unhealthy_for_seconds: number
+  in_flight: number
+  requests: number
+  failures: number
+  p50_latency_seconds?: number
+  p95_latency_seconds?: number
+  tokens_per_second?: number
+  last_error?: string
+}
+
 export interface KnowledgeResult {
   content: string
   source: string
@@ -1354,6 +1435,13 @@ export interface ChatMessageModel {
   audio_path?: string
 }
 
+export interface HistorySummaryModel {
+  first_message_id: string
+  last_message_id: string
+  message_count: number
+  content: string
+}
+
 export interface GameStateModel {
   version: number
   campaign_id?: string
@@ -1364,6 +1452,7 @@ export interface GameStateModel {
   party: Record<string, CharacterInstanceModel>
   current_location: LocationModel
   chat_history: ChatMessageModel[]
+  history_summaries: HistorySummaryModel[]
   pending_player_dice_requests: DiceRequestModel[]
   combat: CombatStateModel
   campaign_goal: string
@@ -1440,6 +1529,38 @@ export interface NarrativeAddedEvent extends BaseGameEvent {
   gm_thought?: string
   audio_path?: string
   message_id?: string
+  narration_pending: boolean
+}
+
+export interface NarrativeChunkEvent extends BaseGameEvent {
+  event_id: string
+  timestamp: string
+  sequence_number: number
+  event_type: 'narrative_chunk'
+  correlation_id?: string
+  content: string
+  chunk_index: number
+}
+
+export interface NarrationReadyEvent extends BaseGameEvent {
+  event_id: string
+  timestamp: string
+  sequence_number: number
+  event_type: 'narration_ready'
+  correlation_id?: string
+  message_id: string
+  audio_path: string
+}
+
+export interface NarrationSegmentEvent extends BaseGameEvent {
+  event_id: string
+  timestamp: string
+  sequence_number: number
+  event_type: 'narration_segment'
+  correlation_id?: string
+  message_id: string
+  segment_index: number
+  audio_path: string
 }
 
 export interface MessageSupersededEvent extends BaseGameEvent {
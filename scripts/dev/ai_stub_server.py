@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Deterministic OpenAI-compatible stub server for offline load testing.
+
+Serves ``/v1/chat/completions`` like a Llama.cpp or OpenRouter endpoint, with
+a fixed delay before the first token and a fixed generation speed, so the
+game loop can be benchmarked without a model. Responses are game master
+responses taken from the AI recordings in ``--recordings`` (chosen by prompt
+hash, like AI_PROVIDER=replay), or a canned response echoing the player.
+
+Both structured output (function calling) and plain or streamed JSON
+content are supported.
+
+Usage:
+    python scripts/dev/ai_stub_server.py --port 8081 --latency 0.5 --tokens-per-second 40
+
+    # Then run the game against it
+    AI_PROVIDER=llamacpp_http LLAMA_SERVER_URL=http://127.0.0.1:8081 python main.py
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import uuid
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+# Add project root to Python path
+project_root = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+sys.path.insert(0, project_root)
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from app.models.common import MessageDict
+from app.providers.ai.replay_service import ResponseRecordings, prompt_hash
+from app.providers.ai.schemas import AIResponse
+
+# Characters per simulated token
+CHARS_PER_TOKEN = 4
+
+
+def _text(content: Any) -> str:
+    """Text of a message content given as a string or a list of parts."""
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "".join(
+            part.get("text", "") if isinstance(part, dict) else str(part)
+            for part in content
+        )
+    return "" if content is None else str(content)
+
+
+def _split_tokens(text: str) -> List[str]:
+    return [
+        text[start : start + CHARS_PER_TOKEN]
+        for start in range(0, len(text), CHARS_PER_TOKEN)
+    ]
+
+
+class StubModel:
+    """Produces the deterministic answer to a chat completion request."""
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        tokens_per_second: float = 0.0,
+        recordings: Optional[ResponseRecordings] = None,
+    ) -> None:
+        """
+        Args:
+            latency: Seconds before the first token
+            tokens_per_second: Generation speed (0 generates instantly)
+            recordings: Recorded responses to answer with
+        """
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.recordings = recordings
+        self.requests = 0
+
+    def answer(self, messages: List[Dict[str, Any]]) -> AIResponse:
+        """Game master response to a prompt."""
+        prompt = [
+            MessageDict(
+                role=str(msg.get("role", "user")), content=_text(msg.get("content"))
+            )
+            for msg in messages
+        ]
+        if self.recordings is not None and len(self.recordings):
+            key = prompt_hash(prompt)
+            response = self.recordings.get(key) or self.recordings.pick(key)
+            if response is not None:
+                return response
+
+        last_user = next(
+            (msg.content for msg in reversed(prompt) if msg.role == "user"), ""
+        )
+        return AIResponse(
+            reasoning="Stub server response.",
+            narrative=(
+                "The game master considers the party's move "
+                f"({last_user[-200:].strip()}) and the story carries on."
+            ),
+        )
+
+    def token_delay(self) -> float:
+        return 1.0 / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+
+    def generation_time(self, num_tokens: int) -> float:
+        return self.latency + num_tokens * self.token_delay()
+
+
+def create_stub_app(model: StubModel, model_name: str = "stub-model") -> FastAPI:
+    """Create the stub server application."""
+    app = FastAPI(title="AI stub server")
+
+    @app.get("/v1/models")
+    async def list_models() -> Dict[str, Any]:
+        return {"object": "list", "data": [{"id": model_name, "object": "model"}]}
+
+    @app.post("/v1/chat/completions", response_model=None)
+    async def chat_completions(request: Request) -> Any:
+        body = await request.json()
+        model.requests += 1
+        response = model.answer(body.get("messages", []))
+        content = response.model_dump_json()
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        created = int(time.time())
+        tokens = _split_tokens(content)
+        prompt_tokens = sum(
+            len(_text(msg.get("content"))) // CHARS_PER_TOKEN
+            for msg in body.get("messages", [])
+        )
+
+        tools = body.get("tools") or []
+        if body.get("stream") and not tools:
+            return StreamingResponse(
+                _stream(model, completion_id, created, model_name, tokens),
+                media_type="text/event-stream",
+            )
+
+        await asyncio.sleep(model.generation_time(len(tokens)))
+        message: Dict[str, Any] = {"role": "assistant", "content": content}
+        finish_reason = "stop"
+        if tools:
+            # Structured output: answer with a call of the requested function
+            message = {
+                "role": "assistant",
+                "content": None,
+                "tool_calls": [
+                    {
+                        "id": f"call_{uuid.uuid4().hex[:8]}",
+                        "type": "function",
+                        "function": {
+                            "name": tools[0]["function"]["name"],
+                            "arguments": content,
+                        },
+                    }
+                ],
+            }
+            finish_reason = "tool_calls"
+
+        return JSONResponse(
+            {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model_name,
+                "choices": [
+                    {"index": 0, "message": message, "finish_reason": finish_reason}
+                ],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": len(tokens),
+                    "total_tokens": prompt_tokens + len(tokens),
+                },
+            }
+        )
+
+    return app
+
+
+async def _stream(
+    model: StubModel,
+    completion_id: str,
+    created: int,
+    model_name: str,
+    tokens: List[str],
+) -> AsyncIterator[str]:
+    """Server-sent events of a streamed completion."""
+
+    def event(delta: Dict[str, Any], finish_reason: Optional[str] = None) -> str:
+        chunk = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": model_name,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        }
+        return f"data: {json.dumps(chunk)}\n\n"
+
+    await asyncio.sleep(model.latency)
+    yield event({"role": "assistant", "content": ""})
+    delay = model.token_delay()
+    for token in tokens:
+        if delay:
+            await asyncio.sleep(delay)
+        yield event({"content": token})
+    yield event({}, finish_reason="stop")
+    yield "data: [DONE]\n\n"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument(
+        "--latency", type=float, default=0.5, help="Seconds before the first token"
+    )
+    parser.add_argument(
+        "--tokens-per-second",
+        type=float,
+        default=40.0,
+        help="Generation speed (0 answers instantly)",
+    )
+    parser.add_argument(
+        "--recordings",
+        default=None,
+        help="Directory of AI recordings to answer with (see AI_REPLAY_DIR)",
+    )
+    args = parser.parse_args()
+
+    import uvicorn
+
+    recordings = ResponseRecordings(args.recordings) if args.recordings else None
+    model = StubModel(args.latency, args.tokens_per_second, recordings)
+    print(
+        f"AI stub server on http://{args.host}:{args.port}/v1 - "
+        f"latency {args.latency}s, {args.tokens_per_second} tokens/s"
+    )
+    uvicorn.run(
+        create_stub_app(model), host=args.host, port=args.port, log_level="warning"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -419,6 +419,7 @@ class PydanticToTypeScript:
             elif model_name in [
                 "GameStateModel",
                 "ChatMessageModel",
+                "HistorySummaryModel",
                 "DiceExecutionModel",
                 "DiceRequestModel",
                 "DiceRollMessageModel",
@@ -546,12 +547,15 @@ def main() -> None:
         CreateCampaignFromTemplateRequest,
         PerformRollRequest,
         PlayerActionRequest,
+        PrefetchRequest,
         RAGQueryRequest,
         SubmitRollsRequest,
     )
     from app.models.api.responses import (
         AdventureCharacterData,
         AdventureInfo,
+        AIBackendsResponse,
+        AIBackendStatsModel,
         CharacterAdventuresResponse,
         CharacterCreationOptionsData,
         CharacterCreationOptionsMetadata,
@@ -563,6 +567,8 @@ def main() -> None:
         ContentUploadResponse,
         ContentUploadResult,
         CreateCampaignFromTemplateResponse,
+        PersistenceStatusResponse,
+        PrefetchResponse,
         RAGQueryResponse,
         SaveGameResponse,
         SSEHealthResponse,
@@ -617,7 +623,13 @@ def main() -> None:
         PartyMemberUpdatedEvent,
         QuestUpdatedEvent,
     )
-    from app.models.events.narrative import MessageSupersededEvent, NarrativeAddedEvent
+    from app.models.events.narrative import (
+        MessageSupersededEvent,
+        NarrationReadyEvent,
+        NarrationSegmentEvent,
+        NarrativeAddedEvent,
+        NarrativeChunkEvent,
+    )
     from app.models.events.system import BackendProcessingEvent, GameStateSnapshotEvent
     from app.models.events.utils import ErrorContextModel
     from app.models.game_state.main import GameStateModel
@@ -625,7 +637,7 @@ def main() -> None:
         KnowledgeResult,
         RAGResults,
     )
-    from app.models.shared import ChatMessageModel
+    from app.models.shared import ChatMessageModel, HistorySummaryModel
     from app.models.updates import (
         CombatantRemoveUpdateModel,
         CombatEndUpdateModel,
@@ -681,10 +693,13 @@ def main() -> None:
         CreateCampaignFromTemplateRequest,
         PerformRollRequest,
         PlayerActionRequest,
+        PrefetchRequest,
         RAGQueryRequest,
         SubmitRollsRequest,
         # API Response Models
         AdventureCharacterData,
+        AIBackendStatsModel,
+        AIBackendsResponse,
         AdventureInfo,
         CharacterAdventuresResponse,
         CharacterCreationOptionsData,
@@ -697,6 +712,8 @@ def main() -> None:
         ContentUploadResponse,
         ContentUploadResult,
         CreateCampaignFromTemplateResponse,
+        PersistenceStatusResponse,
+        PrefetchResponse,
         RAGQueryResponse,
         SaveGameResponse,
         SSEHealthResponse,
@@ -719,6 +736,7 @@ def main() -> None:
         AttackModel,
         # Core game mechanics
         ChatMessageModel,
+        HistorySummaryModel,
         DiceExecutionModel,
         DiceRequestModel,
         DiceRollMessageModel,
@@ -756,6 +774,9 @@ def main() -> None:
         BaseGameEvent,
         GameEventResponseModel,
         NarrativeAddedEvent,
+        NarrativeChunkEvent,
+        NarrationReadyEvent,
+        NarrationSegmentEvent,
         MessageSupersededEvent,
         CombatStartedEvent,
         CombatEndedEvent,
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Load test driving many concurrent simulated players through the game API.
+
+Each simulated player has its own game session (X-Session-ID header) and
+plays a number of turns: it sends an action, rolls and submits the dice the
+game master requests, and triggers the follow-up steps (e.g. NPC turns) the
+backend asks for. Latencies are reported per endpoint.
+
+Run the server against a model-free AI so that the orchestrator, RAG and
+persistence are measured on their own, e.g. with recorded responses or the
+stub server:
+
+    AI_PROVIDER=replay python main.py
+    # or
+    python scripts/dev/ai_stub_server.py --port 8081 --latency 0.5
+    AI_PROVIDER=llamacpp_http LLAMA_SERVER_URL=http://127.0.0.1:8081 python main.py
+
+    python scripts/dev/load_test.py --players 20 --turns 10 --campaign-id my_campaign
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+ACTIONS = [
+    "I look around the room for anything unusual.",
+    "I ask the innkeeper about the rumours in town.",
+    "I draw my sword and attack the nearest goblin.",
+    "I cast fireball at the group of bandits.",
+    "I try to pick the lock on the chest.",
+    "I search the body for clues.",
+    "We set up camp and keep watch in turns.",
+    "I persuade the guard to let us through.",
+]
+
+# Follow-up steps a turn may take before the players can act again
+MAX_STEPS_PER_TURN = 10
+
+
+class LoadTestStats:
+    """Latencies and failures of the requests made during the test."""
+
+    def __init__(self) -> None:
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+        self.turns = 0
+
+    def record(self, endpoint: str, seconds: float, status_code: int) -> None:
+        self.latencies[endpoint].append(seconds)
+        if status_code >= 400:
+            self.errors[endpoint][status_code] += 1
+
+    def report(self, elapsed: float) -> str:
+        lines = [
+            f"{'endpoint':<28}{'requests':>9}{'errors':>8}"
+            f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}"
+        ]
+        for endpoint, samples in sorted(self.latencies.items()):
+            ordered = sorted(samples)
+
+            def percentile(p: float) -> float:
+                return ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000
+
+            errors = sum(self.errors[endpoint].values())
+            lines.append(
+                f"{endpoint:<28}{len(samples):>9}{errors:>8}"
+                f"{statistics.median(ordered) * 1000:>9.1f}{percentile(0.95):>9.1f}"
+                f"{percentile(0.99):>9.1f}{ordered[-1] * 1000:>9.1f}"
+            )
+        for endpoint, codes in sorted(self.errors.items()):
+            if codes:
+                detail = ", ".join(f"{code}: {n}" for code, n in sorted(codes.items()))
+                lines.append(f"  {endpoint} errors by status: {detail}")
+        lines.append(
+            f"{self.turns} turns in {elapsed:.1f}s ({self.turns / elapsed:.2f} turns/s)"
+        )
+        return "\n".join(lines)
+
+
+class SimulatedPlayer:
+    """Plays turns in its own game session."""
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        stats: LoadTestStats,
+        session_id: str,
+        think_time: float,
+    ) -> None:
+        self.client = client
+        self.stats = stats
+        self.headers = {"X-Session-ID": session_id}
+        self.think_time = think_time
+
+    async def request(
+        self, endpoint: str, json: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        start = time.perf_counter()
+        try:
+            response = await self.client.post(endpoint, json=json, headers=self.headers)
+        except httpx.HTTPError:
+            self.stats.record(endpoint, time.perf_counter() - start, 599)
+            return None
+        self.stats.record(endpoint, time.perf_counter() - start, response.status_code)
+        try:
+            data: Dict[str, Any] = response.json()
+        except ValueError:
+            return None
+        return data
+
+    async def play(self, turns: int, campaign_id: Optional[str], offset: int) -> None:
+        if campaign_id:
+            await self.request(f"/api/campaigns/{campaign_id}/start")
+
+        for turn in range(turns):
+            action = ACTIONS[(offset + turn) % len(ACTIONS)]
+            result = await self.request(
+                "/api/player_action", {"action_type": "free_text", "value": action}
+            )
+            for _ in range(MAX_STEPS_PER_TURN):
+                if not result:
+                    break
+                if result.get("dice_requests"):
+                    result = await self.roll_dice(result["dice_requests"])
+                elif result.get("needs_backend_trigger"):
+                    result = await self.request("/api/trigger_next_step")
+                else:
+                    break
+            self.stats.turns += 1
+            if self.think_time:
+                await asyncio.sleep(self.think_time)
+
+    async def roll_dice(
+        self, dice_requests: List[Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]:
+        """Roll every requested die and submit the results."""
+        roll_results = []
+        for dice_request in dice_requests:
+            for character_id in dice_request.get("character_ids", []):
+                roll = await self.request(
+                    "/api/perform_roll",
+                    {
+                        "character_id": character_id,
+                        "roll_type": dice_request.get("type", "custom"),
+                        "dice_formula": dice_request.get("dice_formula", "1d20"),
+                        "skill": dice_request.get("skill"),
+                        "ability": dice_request.get("ability"),
+                        "dc": dice_request.get("dc"),
+                        "reason": dice_request.get("reason", ""),
+                        "request_id": dice_request.get("request_id"),
+                    },
+                )
+                if roll and "total_result" in roll:
+                    roll_results.append(roll)
+        if not roll_results:
+            return None
+        return await self.request("/api/submit_rolls", {"roll_results": roll_results})
+
+
+async def run_load_test(args: argparse.Namespace) -> None:
+    stats = LoadTestStats()
+    run_id = uuid.uuid4().hex[:8]
+    limits = httpx.Limits(
+        max_connections=args.players, max_keepalive_connections=args.players
+    )
+    async with httpx.AsyncClient(
+        base_url=args.base_url, timeout=args.timeout, limits=limits
+    ) as client:
+        players = [
+            SimulatedPlayer(client, stats, f"load-{run_id}-{index}", args.think_time)
+            for index in range(args.players)
+        ]
+        print(
+            f"Running {args.players} players x {args.turns} turns against {args.base_url}"
+        )
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(
+                player.play(args.turns, args.campaign_id, index)
+                for index, player in enumerate(players)
+            )
+        )
+        elapsed = time.perf_counter() - start
+
+        print(stats.report(elapsed))
+        try:
+            persistence = (await client.get("/api/game_state/persistence")).json()
+            print(f"Persistence: {persistence}")
+        except (httpx.HTTPError, ValueError):
+            pass
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--base-url", default="http://127.0.0.1:5000")
+    parser.add_argument("--players", type=int, default=10)
+    parser.add_argument("--turns", type=int, default=5)
+    parser.add_argument(
+        "--campaign-id", default=None, help="Campaign each player starts first"
+    )
+    parser.add_argument(
+        "--think-time", type=float, default=0.0, help="Seconds between turns"
+    )
+    parser.add_argument("--timeout", type=float, default=120.0)
+    asyncio.run(run_load_test(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Convert the save files of a saves/ tree to another save format.
+
+Rewrites campaign game states, campaign instances and character instances
+with the given format and compression (see SAVE_FORMAT and SAVE_COMPRESSION).
+Files keep their names and are replaced atomically. Templates are left as
+pretty-printed JSON since they are meant to be edited by hand.
+
+Usage:
+    python scripts/migrate_saves.py saves --format compact --compression zstd
+    python scripts/migrate_saves.py saves --format json  # back to readable JSON
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+from typing import Iterator, List
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from app.utils.save_serializer import SaveSerializer, detect_save_format  # noqa: E402
+
+
+def find_save_files(saves_dir: Path) -> Iterator[Path]:
+    """Yield the save files managed by the save serializer."""
+    default_state = saves_dir / "game_state_default_active.json"
+    if default_state.is_file():
+        yield default_state
+    campaigns_dir = saves_dir / "campaigns"
+    if campaigns_dir.is_dir():
+        for name in ("active_game_state.json", "instance.json"):
+            yield from sorted(campaigns_dir.glob(f"*/{name}"))
+    instances_dir = saves_dir / "character_instances"
+    if instances_dir.is_dir():
+        yield from sorted(instances_dir.glob("*.json"))
+
+
+def migrate(saves_dir: Path, serializer: SaveSerializer, dry_run: bool) -> int:
+    """Rewrite every save file, returning the number of failures."""
+    failures = 0
+    total_before = total_after = 0
+    for path in find_save_files(saves_dir):
+        raw = path.read_bytes()
+        try:
+            compression, encoding = detect_save_format(raw)
+            data = serializer.loads(raw)
+            converted = serializer.dumps(data)
+        except Exception as e:
+            print(f"  FAILED {path}: {e}")
+            failures += 1
+            continue
+
+        total_before += len(raw)
+        total_after += len(converted)
+        print(
+            f"  {path}: {encoding}/{compression} {len(raw)} -> {len(converted)} bytes"
+        )
+        if not dry_run:
+            serializer.write(path, data)
+
+    print(f"Total: {total_before} -> {total_after} bytes")
+    return failures
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("saves_dir", type=Path, help="Saves directory to convert")
+    parser.add_argument(
+        "--format", choices=["json", "compact", "msgpack"], default="compact"
+    )
+    parser.add_argument(
+        "--compression", choices=["none", "gzip", "zstd"], default="none"
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Report sizes without writing"
+    )
+    args = parser.parse_args(argv)
+
+    if not args.saves_dir.is_dir():
+        print(f"Saves directory not found: {args.saves_dir}")
+        return 1
+
+    serializer = SaveSerializer(args.format, args.compression)
+    print(
+        f"Converting {args.saves_dir} to {args.format}/{args.compression}"
+        + (" (dry run)" if args.dry_run else "")
+    )
+    return 1 if migrate(args.saves_dir, serializer, args.dry_run) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
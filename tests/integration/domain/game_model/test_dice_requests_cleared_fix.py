@@ -11,8 +11,8 @@ from fastapi import FastAPI
 
 # Use centralized app fixture from tests/conftest.py
 from app.core.container import ServiceContainer, get_container
-from app.core.event_queue import EventQueue
 from app.core.repository_interfaces import IGameStateRepository
+from app.core.system_interfaces import IEventQueue
 from app.models.api import PlayerActionRequest, SubmitRollsRequest
 from app.models.character.instance import CharacterInstanceModel
 from app.models.dice import DiceRequestModel, DiceRollSubmissionModel
@@ -44,7 +44,7 @@ class TestPlayerDiceRequestsClearedFix:
     def collect_events(self, container: ServiceContainer) -> List[BaseGameEvent]:
         """Collect all events from the event queue."""
         events = []
-        event_queue: EventQueue = container.get_event_queue()
+        event_queue: IEventQueue = container.get_event_queue()
 
         while not event_queue.is_empty():
             event = event_queue.get_event(block=False)
@@ -146,7 +146,7 @@ class TestPlayerDiceRequestsClearedFix:
             )
 
             # Clear event queue
-            event_queue: EventQueue = container.get_event_queue()
+            event_queue: IEventQueue = container.get_event_queue()
             event_queue.clear()
 
             # Trigger the AI to create dice requests
@@ -305,7 +305,7 @@ class TestPlayerDiceRequestsClearedFix:
             )
 
             # Clear event queue
-            event_queue: EventQueue = container.get_event_queue()
+            event_queue: IEventQueue = container.get_event_queue()
             event_queue.clear()
 
             # Submit two out of three rolls
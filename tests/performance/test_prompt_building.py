@@ -0,0 +1,89 @@
+"""
+Performance tests for building prompts of campaigns with a long chat history.
+"""
+
+import time
+from typing import Any, List
+from unittest.mock import Mock
+
+import pytest
+
+from app.models.game_state.main import GameStateModel
+from app.models.shared.chat import ChatMessageModel
+from app.providers.ai import prompt_builder
+from app.providers.ai.history_token_cache import HistoryTokenCaches
+from app.providers.ai.prefix_reuse import PrefixReuseTracker
+from app.providers.ai.prompt_builder import PromptBuilder
+
+NUM_MESSAGES = 5000
+
+
+class WhitespaceTokenizer:
+    """Stands in for tiktoken when its encoding cannot be downloaded."""
+
+    def encode(self, text: str) -> List[str]:
+        return text.split()
+
+
+def make_message(index: int) -> ChatMessageModel:
+    return ChatMessageModel(
+        id=f"msg-{index}",
+        role="user" if index % 2 == 0 else "assistant",
+        content=f"Turn {index}: the party explores the ruins. " * 8,
+        timestamp="2025-05-28T10:00:00Z",
+    )
+
+
+class TestPromptBuildingPerformance:
+    """Prompt building cost for a 5,000-message campaign."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        # tiktoken may be missing, leaving the tokenizer unset
+        if getattr(prompt_builder, "tokenizer", None) is None:
+            monkeypatch.setattr(prompt_builder, "tokenizer", WhitespaceTokenizer())
+        prompt_builder._count_text_tokens.cache_clear()
+        monkeypatch.setattr(
+            prompt_builder, "history_token_caches", HistoryTokenCaches()
+        )
+        monkeypatch.setattr(
+            prompt_builder, "prefix_reuse_tracker", PrefixReuseTracker()
+        )
+        # Leave room for about a third of the history
+        monkeypatch.setattr(prompt_builder, "MAX_PROMPT_TOKENS_BUDGET", 100_000)
+
+    def build(self, game_state: GameStateModel, layout: str) -> Any:
+        handler = Mock()
+        handler.rag_service = None
+        start = time.perf_counter()
+        messages = PromptBuilder(layout=layout).build_ai_prompt_context(
+            game_state, handler
+        )
+        return messages, (time.perf_counter() - start) * 1000
+
+    @pytest.mark.parametrize("layout", ["default", "cache_aware"])
+    def test_incremental_builds_skip_unchanged_history(self, layout: str) -> None:
+        game_state = GameStateModel(campaign_id=f"benchmark-{layout}")
+        game_state.chat_history = [make_message(i) for i in range(NUM_MESSAGES)]
+
+        cold_messages, cold_ms = self.build(game_state, layout)
+
+        warm_times = []
+        for turn in range(5):
+            game_state.chat_history.append(make_message(NUM_MESSAGES + 2 * turn))
+            game_state.chat_history.append(make_message(NUM_MESSAGES + 2 * turn + 1))
+            warm_messages, warm_ms = self.build(game_state, layout)
+            warm_times.append(warm_ms)
+
+        warm_ms = sorted(warm_times)[len(warm_times) // 2]
+        print(f"\nPrompt building ({layout}) - {NUM_MESSAGES} messages:")
+        print(f"  First build: {cold_ms:.1f} ms ({len(cold_messages)} messages)")
+        print(
+            f"  Next builds (median): {warm_ms:.1f} ms ({len(warm_messages)} messages)"
+        )
+
+        # History was trimmed to the budget
+        assert len(warm_messages) < NUM_MESSAGES
+        # Later builds only format and tokenize the new messages
+        assert warm_ms < cold_ms / 2
+        assert warm_ms < 250
@@ -74,6 +74,7 @@ class IsolatedTestCase(TestCase):
 
 # Import event types only after ensuring clean environment
 from app.core.event_queue import EventQueue
+from app.core.system_interfaces import IEventQueue
 from app.models.character.instance import CharacterInstanceModel
 from app.models.events.base import BaseGameEvent
 from app.models.events.combat import CombatantHpChangedEvent, CombatStartedEvent
@@ -214,7 +215,7 @@ class EventRecorder:
                 return True
         return False
 
-    def attach_to_queue(self, event_queue: EventQueue) -> None:
+    def attach_to_queue(self, event_queue: IEventQueue) -> None:
         """Attach recorder to an event queue to automatically record events."""
         # Monkey patch the put_event method
         original_put = event_queue.put_event
@@ -226,7 +227,7 @@ class EventRecorder:
         event_queue.put_event = recording_put  # type: ignore[method-assign]
 
     @contextmanager
-    def capture_events(self, event_queue: EventQueue) -> Iterator["EventRecorder"]:
+    def capture_events(self, event_queue: IEventQueue) -> Iterator["EventRecorder"]:
         """Context manager to capture events from an event queue."""
         # Subscribe to all events
         subscription_id = event_queue.subscribe_all(self.record_event)
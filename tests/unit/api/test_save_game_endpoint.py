@@ -1,9 +1,11 @@
 """Unit tests for the save game state endpoint."""
 
+import asyncio
 import tempfile
 from unittest.mock import Mock, patch
 
 import pytest
+from fastapi import HTTPException
 from fastapi.testclient import TestClient
 
 from app.models.api.responses import SaveGameResponse
@@ -135,3 +137,18 @@ class TestSaveGameEndpoint:
 
             files = os.listdir(tmpdir)
             assert len(files) > 0  # At least one save file created
+
+    def test_save_game_state_reports_failed_write(self) -> None:
+        """Test a save that does not reach disk is reported as failed."""
+        from app.api.game_routes import save_game_state
+        from app.models.game_state.main import GameStateModel
+
+        game_state_repo = Mock()
+        game_state_repo.get_game_state.return_value = GameStateModel()
+        game_state_repo.flush.return_value = False
+
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(save_game_state(game_state_repo=game_state_repo))
+
+        assert exc_info.value.status_code == 503
+        game_state_repo.save_game_state.assert_called_once()
@@ -6,7 +6,7 @@ from app.content.rag.combat_context_augmentor import CombatContextAugmentor
 from app.models.combat.combatant import CombatantModel
 from app.models.combat.state import CombatStateModel
 from app.models.game_state.main import GameStateModel
-from app.models.rag import QueryType, RAGQuery
+from app.models.rag import KnowledgeResult, QueryType, RAGQuery
 
 
 class TestCombatContextAugmentor:
@@ -110,6 +110,26 @@ class TestCombatContextAugmentor:
         # Original query should still be there
         assert result[-1].query_text == "test query"
 
+    def test_no_query_for_creatures_in_the_combat_knowledge(
+        self, augmentor: CombatContextAugmentor, game_state_with_combat: GameStateModel
+    ) -> None:
+        """Test creatures retrieved with the combat knowledge are not queried."""
+        knowledge = game_state_with_combat.combat.knowledge
+        knowledge.track_combatants(game_state_with_combat.combat.combatants)
+        for creature in knowledge.pending_creatures():
+            knowledge.set_creature(
+                creature, [KnowledgeResult(content="Goblin", source="monsters")]
+            )
+        original_queries = [
+            RAGQuery(query_text="test query", query_type=QueryType.GENERAL)
+        ]
+
+        result = augmentor.augment_queries_with_combat_context(
+            original_queries, game_state_with_combat
+        )
+
+        assert result == original_queries
+
     def test_extract_multiple_creature_types(
         self, augmentor: CombatContextAugmentor
     ) -> None:
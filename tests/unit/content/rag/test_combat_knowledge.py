@@ -0,0 +1,215 @@
+"""
+Tests for the knowledge of a combat, retrieved once and reused on every turn.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Optional
+from unittest.mock import Mock
+
+import pytest
+
+_rag_env = os.environ.get("RAG_ENABLED", "true")
+if _rag_env.lower() == "false":
+    pytest.skip("RAG is disabled", allow_module_level=True)
+
+from app.content.rag.db_knowledge_base_manager import DbKnowledgeBaseManager
+from app.content.rag.query_engine import SimpleQueryEngine
+from app.content.rag.rag_context_builder import RAGContextBuilder
+from app.content.rag.rag_service import RAGService
+from app.core.session_context import session_scope
+from app.models.character.instance import CharacterInstanceModel
+from app.models.combat.combatant import InitialCombatantData
+from app.models.game_state.main import GameStateModel
+from app.models.rag import CombatKnowledgeModel, KnowledgeResult, RAGResults
+from app.models.updates import CombatEndUpdateModel, CombatStartUpdateModel
+from app.services.state_updaters.combat_state_updater import CombatStateUpdater
+
+
+def search(query: str, kb_types: List[str], **_: Any) -> RAGResults:
+    return RAGResults(
+        results=[
+            KnowledgeResult(
+                content=f"About {query}",
+                source=kb_types[0],
+                relevance_score=0.5,
+                metadata={"name": query},
+            )
+        ]
+    )
+
+
+def npc(combatant_id: str, name: str) -> InitialCombatantData:
+    return InitialCombatantData(id=combatant_id, name=name, hp=7, ac=15)
+
+
+@pytest.fixture
+def game_state() -> GameStateModel:
+    return GameStateModel(
+        campaign_id="test-campaign",
+        current_location={"name": "Old Mill", "description": "A ruined mill"},
+        party={
+            "hero1": CharacterInstanceModel(
+                id="hero1",
+                name="Test Hero",
+                template_id="hero-template",
+                campaign_id="test-campaign",
+                level=1,
+                current_hp=20,
+                max_hp=20,
+            )
+        },
+    )
+
+
+@pytest.fixture
+def kb_manager() -> Mock:
+    kb_manager = Mock(spec=DbKnowledgeBaseManager)
+    kb_manager.search.side_effect = search
+    return kb_manager
+
+
+@pytest.fixture
+def service(kb_manager: Mock) -> RAGService:
+    return RAGService(kb_manager=kb_manager, query_engine=SimpleQueryEngine())
+
+
+def start_combat(game_state: GameStateModel, *combatants: InitialCombatantData) -> None:
+    character = Mock()
+    character.template.name = "Test Hero"
+    character.template.base_stats.DEX = 14
+    character.template.portrait_path = None
+    character_service = Mock()
+    character_service.get_character.return_value = character
+    CombatStateUpdater.start_combat(
+        game_state,
+        CombatStartUpdateModel(combatants=list(combatants)),
+        Mock(),
+        character_service=character_service,
+    )
+
+
+def searched(kb_manager: Mock) -> List[str]:
+    queries = [call.kwargs["query"] for call in kb_manager.search.call_args_list]
+    kb_manager.search.reset_mock()
+    return queries
+
+
+def test_combat_knowledge_is_retrieved_once_per_combat(
+    game_state: GameStateModel, service: RAGService, kb_manager: Mock
+) -> None:
+    start_combat(game_state, npc("g1", "Goblin 1"), npc("g2", "Goblin 2"))
+    assert game_state.combat.knowledge.pending_creatures() == ["goblin"]
+
+    action = "I attack the goblin with my sword"
+    # Searched on every turn: the location, the weapon and the action itself
+    turn = ["Old Mill", "sword", action]
+    for _ in range(3):
+        service.get_relevant_knowledge(action, game_state, ["dnd_5e_srd"])
+    calls = kb_manager.search.call_args_list
+
+    assert searched(kb_manager) == [
+        "goblin",
+        "melee attack rules",
+        "ranged attack rules",
+        *turn * 3,
+    ]
+    assert all("monsters" not in call.kwargs["kb_types"] for call in calls[3:])
+
+    # Only the creatures joining are retrieved
+    start_combat(game_state, npc("w1", "Wolf"))
+    service.get_relevant_knowledge(action, game_state, ["dnd_5e_srd"])
+    assert searched(kb_manager) == ["wolf", *turn]
+
+    knowledge = game_state.combat.knowledge
+    assert knowledge.format_for_prompt() == (
+        "COMBAT KNOWLEDGE:\n"
+        "monsters:\n- About goblin\n- About wolf\n\n"
+        "rules:\n- About melee attack rules\n- About ranged attack rules"
+    )
+
+
+def test_combat_knowledge_follows_the_combatants(
+    game_state: GameStateModel, service: RAGService, kb_manager: Mock
+) -> None:
+    start_combat(game_state, npc("g1", "Goblin"), npc("o1", "Orc"))
+    builder = RAGContextBuilder()
+    context = builder._retrieve_rag_context("I hide", game_state, service)
+    assert context.startswith("COMBAT KNOWLEDGE:\nmonsters:\n- About goblin\n")
+
+    CombatStateUpdater.remove_combatant_from_state(game_state, "o1", "fled", Mock())
+    assert set(game_state.combat.knowledge.creatures) == {"goblin"}
+    assert "About orc" not in builder._retrieve_rag_context(
+        "I hide", game_state, service
+    )
+
+    game_state.combat.combatants[-1].current_hp = 0
+    CombatStateUpdater.end_combat(
+        game_state, CombatEndUpdateModel(reason="victory"), Mock()
+    )
+    assert service.get_combat_knowledge(game_state) is None
+    assert game_state.combat.knowledge.creatures == {}
+
+
+def test_concurrent_turn_and_prefetch_retrieve_once(
+    game_state: GameStateModel, service: RAGService, kb_manager: Mock
+) -> None:
+    start_combat(game_state, npc("g1", "Goblin"), npc("o1", "Orc"))
+    searching = threading.Event()
+
+    def slow_search(query: str, kb_types: List[str], **kwargs: Any) -> RAGResults:
+        searching.set()
+        time.sleep(0.02)
+        return search(query, kb_types, **kwargs)
+
+    kb_manager.search.side_effect = slow_search
+    builder = RAGContextBuilder()
+
+    def prefetch() -> str:
+        searching.wait(timeout=5)
+        # A prompt built while the turn fills the knowledge
+        return builder._retrieve_rag_context("I hide", game_state, service)
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        turn = pool.submit(builder._retrieve_rag_context, "I hide", game_state, service)
+        prefetched = pool.submit(prefetch)
+        assert turn.result() == prefetched.result()
+
+    queries = searched(kb_manager)
+    assert queries.count("goblin") == 1
+    assert queries.count("orc") == 1
+
+
+def test_sessions_fill_their_combat_knowledge_concurrently(
+    game_state: GameStateModel, service: RAGService, kb_manager: Mock
+) -> None:
+    other_state = game_state.model_copy(deep=True)
+    start_combat(game_state, npc("g1", "Goblin"))
+    start_combat(other_state, npc("w1", "Wolf"))
+    searching, released = threading.Event(), threading.Event()
+
+    def blocking_search(query: str, kb_types: List[str], **kwargs: Any) -> RAGResults:
+        if query == "goblin":
+            searching.set()
+            released.wait(timeout=5)
+        return search(query, kb_types, **kwargs)
+
+    kb_manager.search.side_effect = blocking_search
+
+    def fill(session_id: str, state: GameStateModel) -> Optional[CombatKnowledgeModel]:
+        with session_scope(session_id):
+            return service.get_combat_knowledge(state)
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        blocked = pool.submit(fill, "table-a", game_state)
+        assert searching.wait(timeout=5)
+        # Another table does not wait for the retrieval of the first one
+        other = pool.submit(fill, "table-b", other_state)
+        try:
+            assert other.result(timeout=2) is not None
+            assert not blocked.done()
+        finally:
+            released.set()
+        assert blocked.result() is not None
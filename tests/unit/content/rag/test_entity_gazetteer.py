@@ -0,0 +1,290 @@
+"""
+Tests for the gazetteer of content pack entity names.
+"""
+
+import os
+from pathlib import Path
+from typing import Any, Collection, Dict, Iterator, List, Optional, Type
+from unittest.mock import Mock
+
+import pytest
+
+_rag_env = os.environ.get("RAG_ENABLED", "true")
+if _rag_env.lower() == "false":
+    pytest.skip("RAG is disabled", allow_module_level=True)
+
+from app.content.connection import DatabaseManager
+from app.content.models import (
+    Base,
+    BaseContent,
+    CharacterClass,
+    ContentPack,
+    Equipment,
+    Monster,
+    Race,
+    Spell,
+)
+from app.content.rag.db_knowledge_base_manager import DbKnowledgeBaseManager
+from app.content.rag.entity_gazetteer import EntityGazetteer
+from app.content.rag.query_engine import SimpleQueryEngine
+from app.content.rag.rag_service import RAGService
+from app.models.rag import QueryType, RAGResults
+
+REQUIRED_COLUMNS: Dict[Type[BaseContent], Dict[str, Any]] = {
+    Spell: {"level": 1},
+    CharacterClass: {"hit_die": 10},
+    Monster: {
+        "size": "Small",
+        "type": "humanoid",
+        "hit_points": 7,
+        "strength": 8,
+        "dexterity": 14,
+        "constitution": 10,
+        "intelligence": 10,
+        "wisdom": 8,
+        "charisma": 8,
+        "challenge_rating": 0.25,
+        "xp": 50,
+    },
+}
+
+
+def add_pack(
+    db: DatabaseManager,
+    pack_id: str,
+    entities: Dict[Type[BaseContent], List[str]],
+    is_active: bool = True,
+) -> None:
+    with db.get_session() as session:
+        session.add(
+            ContentPack(id=pack_id, name=pack_id, version="1.0", is_active=is_active)
+        )
+        for model, names in entities.items():
+            for name in names:
+                index = name.lower().replace(",", "").replace(" ", "-")
+                session.add(
+                    model(
+                        index=index,
+                        name=name,
+                        url=f"/api/{index}",
+                        content_pack_id=pack_id,
+                        **REQUIRED_COLUMNS.get(model, {}),
+                    )
+                )
+
+
+@pytest.fixture
+def db(tmp_path: Path) -> Iterator[DatabaseManager]:
+    manager = DatabaseManager(f"sqlite:///{tmp_path / 'content.db'}")
+    manager.create_all_tables(Base.metadata)
+    add_pack(
+        manager,
+        "srd",
+        {
+            Spell: ["Fireball", "Magic Missile", "Light", "Tasha's Hideous Laughter"],
+            Monster: ["Goblin", "Rat", "Giant Rat"],
+            Equipment: ["Crossbow, light", "Net", "Longsword"],
+            CharacterClass: ["Paladin"],
+            Race: ["Half-Elf"],
+        },
+    )
+    yield manager
+    manager.dispose()
+
+
+def names(gazetteer: EntityGazetteer, text: str) -> List[str]:
+    return [match.entity.name for match in gazetteer.find(text)]
+
+
+def test_names_are_found_as_whole_words(db: DatabaseManager) -> None:
+    gazetteer = EntityGazetteer(db, fuzzy=False)
+
+    matches = gazetteer.find("The Goblin hides a net in the cabinet")
+
+    assert [(m.entity.name, m.entity.table, m.text) for m in matches] == [
+        ("Goblin", "monsters", "Goblin"),
+        ("Net", "equipment", "net"),
+    ]
+    assert matches[0].entity.index == "goblin"
+    assert (matches[1].start, matches[1].end) == (19, 22)
+
+
+def test_longest_name_wins(db: DatabaseManager) -> None:
+    gazetteer = EntityGazetteer(db, fuzzy=False)
+
+    assert names(gazetteer, "a giant rat and a rat") == ["Giant Rat", "Rat"]
+
+
+def test_aliases(db: DatabaseManager) -> None:
+    gazetteer = EntityGazetteer(db, fuzzy=False)
+
+    assert names(gazetteer, "three goblins with light crossbows") == [
+        "Goblin",
+        "Crossbow, light",
+    ]
+    assert names(gazetteer, "a half elf casts tashas hideous laughter") == [
+        "Half-Elf",
+        "Tasha's Hideous Laughter",
+    ]
+
+
+def test_close_spellings_are_fuzzy_matches(db: DatabaseManager) -> None:
+    gazetteer = EntityGazetteer(db)
+
+    matches = gazetteer.find("The paladn casts magic misile at the Goblin")
+
+    assert [(m.entity.name, m.text, m.fuzzy) for m in matches] == [
+        ("Paladin", "paladn", True),
+        ("Magic Missile", "magic misile", True),
+        ("Goblin", "Goblin", False),
+    ]
+    assert names(gazetteer, "I fire my longswrod") == ["Longsword"]
+
+
+def test_fuzzy_matches_need_a_supporting_context(db: DatabaseManager) -> None:
+    add_pack(
+        db,
+        "extra",
+        {Equipment: ["Dagger", "Candle", "Sickle"], Monster: ["Skeleton"]},
+    )
+    engine = SimpleQueryEngine(gazetteer=EntityGazetteer(db))
+
+    def found(action: str, combatants: Collection[str] = ()) -> List[str]:
+        matches = engine.match_patterns(action)
+        return [
+            m.entity.name for m in engine.find_entities(action, matches, combatants)
+        ]
+
+    # Ordinary words one typo from a name
+    assert found("I sense danger ahead") == []
+    assert found("I turn the handle of the door") == []
+    assert found("I tickle the sleeping dwarf") == []
+    # A keyword of the action relates to the entity
+    assert found("I attack with my daggre") == ["Dagger"]
+    # Capitalized within the sentence
+    assert found("I light the Candel") == ["Candle"]
+    # A creature of the current combat
+    assert found("I hide from the skeletn") == []
+    assert found("I hide from the skeletn", {"skeleton"}) == ["Skeleton"]
+
+
+def test_inactive_and_new_packs(db: DatabaseManager) -> None:
+    add_pack(db, "dormant", {Monster: ["Owlbear"]}, is_active=False)
+    gazetteer = EntityGazetteer(db, refresh_interval=0, fuzzy=False)
+    assert names(gazetteer, "an owlbear and a beholder") == []
+
+    add_pack(db, "homebrew", {Monster: ["Beholder"]})
+
+    assert names(gazetteer, "an owlbear and a beholder") == ["Beholder"]
+    assert gazetteer.entity_count == 13
+
+
+def test_lookup_follows_the_content_pack_priority(db: DatabaseManager) -> None:
+    add_pack(db, "homebrew", {Monster: ["Goblin (Homebrew)"]})
+    add_pack(db, "dormant", {Monster: ["Goblin (Dormant)", "Owlbear"]}, False)
+    gazetteer = EntityGazetteer(db)
+
+    def goblin(priority: Optional[List[str]] = None) -> Optional[str]:
+        entity = gazetteer.lookup("Goblins", ["monsters"], priority)
+        return entity.content_pack_id if entity else None
+
+    assert goblin() == "homebrew"
+    assert goblin(["srd", "homebrew"]) == "srd"
+    assert goblin(["dormant", "srd"]) == "dormant"
+    assert goblin(["elsewhere"]) is None
+    assert gazetteer.lookup("owlbear", ["monsters"]) is None
+    assert gazetteer.lookup("goblin", ["spells"]) is None
+    assert names(gazetteer, "an owlbear") == []
+
+
+def test_named_entities_are_fetched_without_searching(db: DatabaseManager) -> None:
+    gazetteer = EntityGazetteer(db)
+    kb_manager = DbKnowledgeBaseManager(db)
+    kb_manager.search = Mock(return_value=RAGResults())  # type: ignore[method-assign]
+    service = RAGService(
+        kb_manager=kb_manager,
+        query_engine=SimpleQueryEngine(gazetteer=gazetteer),
+        gazetteer=gazetteer,
+    )
+    game_state = Mock(in_combat=True, current_location=None, active_lore_id=None)
+
+    results = service.get_relevant_knowledge(
+        "I cast magic missile at the giant rat", game_state, ["srd"]
+    ).results
+
+    assert [(r.metadata["name"], r.metadata["lookup"]) for r in results] == [
+        ("Magic Missile", "exact"),
+        ("Giant Rat", "exact"),
+    ]
+    searches = [call.kwargs for call in kb_manager.search.call_args_list]
+    assert [search["query"] for search in searches] == [
+        "spell casting rules components",
+        "I cast magic missile at the giant rat",
+    ]
+    assert searches[-1]["kb_types"] == ["lore", "rules"]
+
+
+def test_knowledge_base_is_searched_for_entities_not_fetched(
+    db: DatabaseManager,
+) -> None:
+    gazetteer = EntityGazetteer(db)
+    kb_manager = DbKnowledgeBaseManager(db)
+    kb_manager.search = Mock(return_value=RAGResults())  # type: ignore[method-assign]
+    get_entities = kb_manager.get_entities
+    # Giant Rat is named but missing from the content database
+    kb_manager.get_entities = Mock(  # type: ignore[method-assign]
+        side_effect=lambda keys: [
+            result
+            for result in get_entities(keys)
+            if result.metadata["name"] != "Giant Rat"
+        ]
+    )
+    service = RAGService(
+        kb_manager=kb_manager,
+        query_engine=SimpleQueryEngine(gazetteer=gazetteer),
+        gazetteer=gazetteer,
+    )
+    game_state = Mock(in_combat=True, current_location=None, active_lore_id=None)
+
+    service.get_relevant_knowledge(
+        "I throw my net at the goblin and the giant rat", game_state, ["srd"]
+    )
+
+    general = kb_manager.search.call_args_list[-1].kwargs
+    assert general["query"] == "I throw my net at the goblin and the giant rat"
+    assert "monsters" in general["kb_types"]
+    assert "equipment" not in general["kb_types"]
+
+
+def test_named_entities_are_queried_in_their_table(db: DatabaseManager) -> None:
+    engine = SimpleQueryEngine(gazetteer=EntityGazetteer(db))
+    game_state = Mock()
+    game_state.in_combat = False
+    game_state.current_location = None
+
+    queries = engine.analyze_action("I cast magic missile at the giant rat", game_state)
+
+    spell = next(q for q in queries if q.query_text == "magic missile")
+    assert spell.query_type == QueryType.SPELL_CASTING
+    assert spell.knowledge_base_types == ["spells"]
+    assert spell.context == {
+        "spell_name": "magic missile",
+        "entity_index": "magic-missile",
+        "entity_table": "spells",
+        "creature": "giant rat",
+    }
+    creature = next(q for q in queries if q.query_text == "giant rat")
+    assert creature.knowledge_base_types == ["monsters"]
+    general = queries[-1]
+    assert general.query_type == QueryType.GENERAL
+    assert {"spells", "monsters"} <= set(general.knowledge_base_types)
+
+
+def test_one_word_spell_names_need_a_casting_context(db: DatabaseManager) -> None:
+    engine = SimpleQueryEngine(gazetteer=EntityGazetteer(db))
+
+    assert engine.find_entities("I light a torch", engine.match_patterns("")) == []
+    matches = engine.match_patterns("I cast light on my torch")
+    assert [
+        m.entity.name for m in engine.find_entities("I cast light on my torch", matches)
+    ] == ["Light"]
@@ -0,0 +1,86 @@
+"""
+Tests for the multi-pattern matcher used to classify player actions.
+"""
+
+import os
+from unittest.mock import Mock
+
+import pytest
+
+_rag_env = os.environ.get("RAG_ENABLED", "true")
+if _rag_env.lower() == "false":
+    pytest.skip("RAG is disabled", allow_module_level=True)
+
+from app.content.rag.pattern_matcher import PatternMatch, PatternMatcher
+from app.content.rag.query_engine import SimpleQueryEngine
+from app.models.rag import QueryType
+
+
+def test_overlapping_patterns_are_all_found() -> None:
+    matcher = PatternMatcher({"equipment": {"sword", "longsword", "long"}})
+
+    matches = matcher.find_all("i draw my longsword")
+
+    assert matches == [
+        PatternMatch("long", "equipment", 10, 14),
+        PatternMatch("longsword", "equipment", 10, 19),
+        PatternMatch("sword", "equipment", 14, 19),
+    ]
+
+
+def test_pattern_is_reported_for_each_of_its_categories() -> None:
+    matcher = PatternMatcher({"spell": {"shield"}, "equipment": {"shield", "armor"}})
+
+    matches = matcher.scan("i raise my shield")
+
+    assert matches.patterns("spell") == ["shield"]
+    assert matches.patterns("equipment") == ["shield"]
+    assert matcher.pattern_count == 2
+
+
+def test_matches_agree_with_substring_search() -> None:
+    pattern_sets = {
+        "a": {"he", "she", "his", "hers"},
+        "b": {"ers", "r", "sh"},
+        "c": {"x"},
+    }
+    matcher = PatternMatcher(pattern_sets)
+    text = "ushers and shepherds share his herbs"
+
+    matches = matcher.scan(text)
+
+    for category, patterns in pattern_sets.items():
+        found = sorted(p for p in patterns if p in text)
+        assert sorted(matches.patterns(category)) == found
+        assert matches.has(category) == bool(found)
+    for match in matches.matches:
+        assert text[match.start : match.end] == match.pattern
+
+
+def test_patterns_are_listed_in_order_of_occurrence() -> None:
+    matcher = PatternMatcher({"creature": {"goblin", "dragon", "orc"}})
+
+    matches = matcher.scan("the dragon and the goblin flee from the dragon")
+
+    assert matches.patterns("creature") == ["dragon", "goblin"]
+    assert matches.first("creature") == "dragon"
+    assert matches.first("spell") is None
+    assert matches.found("goblin") and not matches.found("orc")
+
+
+def test_replaced_pattern_set_is_picked_up() -> None:
+    engine = SimpleQueryEngine()
+    game_state = Mock()
+    game_state.combat = None
+    game_state.current_location = None
+
+    matches = engine.match_patterns("I cast frostbloom")
+    assert "frostbloom" not in matches.patterns("spell")
+    engine.spell_patterns = engine.spell_patterns | {"frostbloom"}
+
+    queries = engine.analyze_action("I cast frostbloom", game_state)
+
+    assert any(
+        q.query_type == QueryType.SPELL_CASTING and "frostbloom" in q.query_text
+        for q in queries
+    )
@@ -152,7 +152,8 @@ class TestAISettings:
         from pydantic import ValidationError
 
         with pytest.raises(
-            ValidationError, match="Input should be 'llamacpp_http' or 'openrouter'"
+            ValidationError,
+            match="Input should be 'llamacpp_http', 'openrouter', 'replay' or 'router'",
         ):
             AISettings()
 
@@ -0,0 +1,206 @@
+"""
+Unit tests for the SQLite backend that shares state between workers.
+
+Each test opens two independent instances on the same database file to stand
+in for two worker processes.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from app.core.session_context import session_scope
+from app.core.sqlite_backend import (
+    SqliteEventQueue,
+    SqliteSharedStateStore,
+    SqliteStateDatabase,
+)
+from app.exceptions import StaleStateError
+from app.models.common import MessageDict
+from app.models.events.narrative import NarrativeAddedEvent
+from app.repositories.game_state_repository import SqliteGameStateRepository
+from app.services.shared_state_manager import SharedStateManager
+
+
+@pytest.fixture
+def db_path(tmp_path: Path) -> str:
+    return str(tmp_path / "state.db")
+
+
+class TestSqliteEventQueue:
+    """Events put by one worker are delivered by another."""
+
+    def test_event_crosses_workers_in_order(self, db_path: str) -> None:
+        producer = SqliteEventQueue(SqliteStateDatabase(db_path))
+        consumer = SqliteEventQueue(SqliteStateDatabase(db_path))
+
+        producer.put_event(NarrativeAddedEvent(role="assistant", content="first"))
+        producer.put_event(NarrativeAddedEvent(role="assistant", content="second"))
+
+        assert consumer.qsize() == 2
+        first = consumer.get_event(block=False)
+        second = consumer.get_event(block=False)
+        assert isinstance(first, NarrativeAddedEvent)
+        assert isinstance(second, NarrativeAddedEvent)
+        assert (first.content, second.content) == ("first", "second")
+        assert first.sequence_number < second.sequence_number
+        assert producer.is_empty()
+
+    def test_events_are_isolated_per_session(self, db_path: str) -> None:
+        queue = SqliteEventQueue(SqliteStateDatabase(db_path))
+        with session_scope("table-a"):
+            queue.put_event(NarrativeAddedEvent(role="assistant", content="A"))
+
+        assert queue.get_event(block=False) is None
+        with session_scope("table-a"):
+            assert queue.peek() is not None
+
+    def test_dropped_session_keeps_rows_other_workers_serve(self, db_path: str) -> None:
+        database = SqliteStateDatabase(db_path)
+        queue = SqliteEventQueue(database)
+        manager = SharedStateManager(SqliteSharedStateStore(database))
+        with session_scope("table-a"):
+            queue.put_event(NarrativeAddedEvent(role="assistant", content="A"))
+            manager.store_ai_request_context([MessageDict(role="user", content="hi")])
+
+        # This worker evicts the session while another one still serves it
+        queue.drop_session("table-a")
+        manager.drop_session("table-a")
+        with session_scope("table-a"):
+            assert queue.qsize() == 1
+            assert manager.can_retry_last_request()
+
+        # Rows nobody touched for longer than their maximum age are removed
+        SqliteEventQueue(database, max_age=-1).drop_session("table-b")
+        SharedStateManager(SqliteSharedStateStore(database, max_age=-1)).drop_session(
+            "table-b"
+        )
+        with session_scope("table-a"):
+            assert queue.is_empty()
+            assert not manager.can_retry_last_request()
+
+    def test_blocking_get_times_out(self, db_path: str) -> None:
+        queue = SqliteEventQueue(SqliteStateDatabase(db_path))
+        assert queue.get_event(timeout=0.1) is None
+
+
+class TestSqliteSharedState:
+    """Processing flags set by one worker are seen by another."""
+
+    def test_ai_processing_flag_is_shared(self, db_path: str) -> None:
+        worker_a = SharedStateManager(
+            SqliteSharedStateStore(SqliteStateDatabase(db_path))
+        )
+        worker_b = SharedStateManager(
+            SqliteSharedStateStore(SqliteStateDatabase(db_path))
+        )
+
+        with session_scope("table-a"):
+            worker_a.set_ai_processing(True)
+            worker_a.store_ai_request_context([MessageDict(role="user", content="hi")])
+            assert worker_b.is_ai_processing()
+            assert worker_b.can_retry_last_request()
+
+        assert not worker_b.is_ai_processing()
+        worker_b.reset_state()
+        with session_scope("table-a"):
+            assert not worker_a.is_ai_processing()
+
+    def test_only_one_worker_claims_ai_processing(self, db_path: str) -> None:
+        worker_a = SharedStateManager(
+            SqliteSharedStateStore(SqliteStateDatabase(db_path))
+        )
+        worker_b = SharedStateManager(
+            SqliteSharedStateStore(SqliteStateDatabase(db_path))
+        )
+
+        with session_scope("table-a"):
+            assert worker_a.try_set_ai_processing()
+            assert not worker_b.try_set_ai_processing()
+            assert worker_b.is_ai_processing()
+
+            worker_a.set_ai_processing(False)
+            assert worker_b.try_set_ai_processing()
+
+        # Other sessions have their own flag
+        assert worker_a.try_set_ai_processing()
+
+
+class TestSqliteGameStateRepository:
+    """Game state saved by one worker is read by another."""
+
+    def test_save_is_visible_to_other_worker(
+        self, db_path: str, tmp_path: Path
+    ) -> None:
+        saves = str(tmp_path / "saves")
+        worker_a = SqliteGameStateRepository(SqliteStateDatabase(db_path), saves)
+        worker_b = SqliteGameStateRepository(SqliteStateDatabase(db_path), saves)
+
+        with session_scope("table-a"):
+            assert worker_b.get_game_state().campaign_id is None
+            state = worker_a.get_game_state()
+            state.campaign_id = "campaign_a"
+            state.campaign_name = "Shared Campaign"
+            worker_a.save_game_state(state)
+
+            assert worker_b.get_game_state().campaign_name == "Shared Campaign"
+
+        # Other sessions are unaffected
+        assert worker_b.get_game_state().campaign_id is None
+
+    def test_concurrent_save_does_not_overwrite(
+        self, db_path: str, tmp_path: Path
+    ) -> None:
+        saves = str(tmp_path / "saves")
+        worker_a = SqliteGameStateRepository(SqliteStateDatabase(db_path), saves)
+        worker_b = SqliteGameStateRepository(SqliteStateDatabase(db_path), saves)
+
+        with session_scope("table-a"):
+            state_a = worker_a.get_game_state()
+            state_b = worker_b.get_game_state()
+            state_a.campaign_name = "From A"
+            worker_a.save_game_state(state_a)
+
+            state_b.campaign_name = "From B"
+            with pytest.raises(StaleStateError):
+                worker_b.save_game_state(state_b)
+
+            # After reloading, worker B saves on top of worker A's save
+            reloaded = worker_b.get_game_state()
+            assert reloaded.campaign_name == "From A"
+            reloaded.campaign_name = "From B"
+            worker_b.save_game_state(reloaded)
+            assert worker_a.get_game_state().campaign_name == "From B"
+
+    def test_load_campaign_from_other_worker(
+        self, db_path: str, tmp_path: Path
+    ) -> None:
+        saves = str(tmp_path / "saves")
+        worker_a = SqliteGameStateRepository(SqliteStateDatabase(db_path), saves)
+        worker_b = SqliteGameStateRepository(SqliteStateDatabase(db_path), saves)
+
+        state = worker_a.get_game_state()
+        state.campaign_id = "campaign_a"
+        state.campaign_name = "Shared Campaign"
+        worker_a.save_game_state(state)
+
+        with session_scope("table-b"):
+            loaded = worker_b.load_campaign_state("campaign_a")
+            assert loaded is not None
+            assert worker_a.get_game_state().campaign_name == "Shared Campaign"
+        assert worker_b.load_campaign_state("missing") is None
+
+    def test_evicted_session_is_reloaded_from_store(
+        self, db_path: str, tmp_path: Path
+    ) -> None:
+        repo = SqliteGameStateRepository(
+            SqliteStateDatabase(db_path), str(tmp_path / "saves")
+        )
+        with session_scope("table-a"):
+            state = repo.get_game_state()
+            state.campaign_name = "Kept"
+            repo.save_game_state(state)
+
+        assert repo.evict_session("table-a")
+        with session_scope("table-a"):
+            assert repo.get_game_state().campaign_name == "Kept"
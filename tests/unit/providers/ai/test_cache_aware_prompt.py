@@ -0,0 +1,209 @@
+"""
+Unit tests for the cache-aware prompt layout and prefix reuse tracking.
+"""
+
+from typing import List
+from unittest.mock import Mock
+
+import pytest
+from langchain_core.messages import BaseMessage, HumanMessage
+
+from app.models.common import MessageDict
+from app.models.game_state.main import GameStateModel
+from app.models.shared.chat import ChatMessageModel, HistorySummaryModel
+from app.providers.ai import prompt_builder
+from app.providers.ai.history_token_cache import HistoryTokenCaches
+from app.providers.ai.manager import get_llamacpp_cache_hints
+from app.providers.ai.prefix_reuse import PrefixReuseTracker
+from app.providers.ai.prompt_builder import PromptBuilder
+from app.settings import AISettings, Settings
+
+
+def make_game_state(num_messages: int) -> GameStateModel:
+    game_state = GameStateModel(
+        campaign_id="campaign",
+        campaign_goal="Find the lost crown",
+        event_summary=["The party arrived in town"],
+    )
+    for index in range(num_messages):
+        game_state.chat_history.append(
+            ChatMessageModel(
+                id=f"msg-{index}",
+                role="user" if index % 2 == 0 else "assistant",
+                content=f"Message number {index} " + "words " * 20,
+                timestamp="2025-05-28T10:00:00Z",
+            )
+        )
+    return game_state
+
+
+def make_handler() -> Mock:
+    handler = Mock()
+    handler.rag_service = None
+    return handler
+
+
+def contents(messages: List[MessageDict]) -> List[str]:
+    return [str(msg.content) for msg in messages]
+
+
+@pytest.fixture(autouse=True)
+def fresh_caches(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(prompt_builder, "prefix_reuse_tracker", PrefixReuseTracker())
+    monkeypatch.setattr(prompt_builder, "history_token_caches", HistoryTokenCaches())
+
+
+class TestCacheAwareLayout:
+    def test_stable_sections_come_first(self) -> None:
+        builder = PromptBuilder(layout="cache_aware")
+        messages = builder.build_ai_prompt_context(
+            make_game_state(8), make_handler(), initial_instruction="Continue."
+        )
+        texts = contents(messages)
+
+        assert messages[0].role == "system"
+        assert texts[1].startswith("CONTEXT INJECTION:")
+        assert texts[2].startswith("Message number 0")
+        assert texts[-2].startswith("CURRENT STATUS:")
+        assert texts[-1] == "Continue."
+
+    def test_history_growth_keeps_the_prefix(self) -> None:
+        builder = PromptBuilder(layout="cache_aware")
+        before = contents(
+            builder.build_ai_prompt_context(make_game_state(8), make_handler())
+        )
+        after = contents(
+            builder.build_ai_prompt_context(make_game_state(10), make_handler())
+        )
+
+        # Everything up to the end of the old history is unchanged
+        history_end = len(before) - 1
+        assert after[:history_end] == before[:history_end]
+
+    def test_history_is_dropped_in_aligned_chunks(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        builder = PromptBuilder(layout="cache_aware", history_chunk_size=8)
+        # Count words so the test does not depend on the tokenizer download
+        monkeypatch.setattr(
+            builder,
+            "_calculate_message_tokens",
+            lambda msg: len(str(msg.content).split()),
+        )
+
+        def history(num_messages: int) -> List[BaseMessage]:
+            return [
+                HumanMessage(content=f"Message number {index} " + "words " * 20)
+                for index in range(num_messages)
+            ]
+
+        message_tokens = builder._calculate_message_tokens(history(1)[0])
+        summary_tokens = builder._calculate_message_tokens(
+            builder._format_history_summary(history(8))
+        )
+        # Room for the summary block and 20 history messages
+        budget = 20 * message_tokens + summary_tokens
+
+        def first_kept(num_messages: int) -> str:
+            kept, summary = builder._trim_history_in_chunks(
+                history(num_messages), budget
+            )
+            assert len(summary) == 1
+            assert str(summary[0].content).startswith("EARLIER HISTORY SUMMARY:")
+            return str(kept[0].content)
+
+        assert builder._trim_history_in_chunks(history(20), budget)[1] == []
+        # The cut stays at message 8 while history grows by a few messages
+        assert first_kept(24).startswith("Message number 8 ")
+        assert first_kept(28).startswith("Message number 8 ")
+        # Once the kept history no longer fits, a whole chunk is dropped
+        assert first_kept(29).startswith("Message number 16 ")
+
+    def test_default_layout_is_unchanged(self) -> None:
+        builder = PromptBuilder(layout="default")
+        texts = contents(
+            builder.build_ai_prompt_context(make_game_state(8), make_handler())
+        )
+        assert texts[1].startswith("Message number 0")
+        assert any(text.startswith("CONTEXT INJECTION:") for text in texts[2:])
+
+
+class TestHistorySummaries:
+    @pytest.fixture
+    def builder(self, monkeypatch: pytest.MonkeyPatch) -> PromptBuilder:
+        builder = PromptBuilder(layout="default")
+        monkeypatch.setattr(
+            builder,
+            "_calculate_message_tokens",
+            lambda msg: len(str(msg.content).split()),
+        )
+        fixed_tokens = sum(
+            len(text.split())
+            for text in contents(
+                builder.build_ai_prompt_context(make_game_state(4), make_handler())
+            )
+        )
+        # Room for the last 4 messages, a summary and 16 more messages
+        monkeypatch.setattr(
+            prompt_builder, "MAX_PROMPT_TOKENS_BUDGET", fixed_tokens + 16 * 23 + 60
+        )
+        return builder
+
+    def test_summaries_replace_dropped_history(self, builder: PromptBuilder) -> None:
+        game_state = make_game_state(40)
+        game_state.history_summaries = [
+            HistorySummaryModel(
+                first_message_id="msg-0",
+                last_message_id="msg-7",
+                message_count=8,
+                content="The party met the king.",
+            )
+        ]
+        handler = make_handler()
+        texts = contents(builder.build_ai_prompt_context(game_state, handler))
+
+        assert texts[1].startswith("EARLIER HISTORY SUMMARY:")
+        assert "The party met the king." in texts[1]
+        # Messages between the summary and the kept history are counted
+        first_kept = int(texts[2].split()[2])
+        assert f"{first_kept - 8} later messages" in texts[1]
+        handler.history_summarizer.request.assert_called_once_with(
+            game_state, first_kept
+        )
+
+    def test_no_summary_block_without_summaries(self, builder: PromptBuilder) -> None:
+        texts = contents(
+            builder.build_ai_prompt_context(make_game_state(40), make_handler())
+        )
+        assert texts[1].startswith("Message number")
+
+
+class TestPrefixReuseTracker:
+    def test_first_prompt_has_no_reuse(self) -> None:
+        tracker = PrefixReuseTracker()
+        assert tracker.record("s", [("system", "a")], [10]) is None
+
+    def test_reports_common_prefix(self) -> None:
+        tracker = PrefixReuseTracker()
+        tracker.record("s", [("system", "a"), ("human", "b")], [10, 5])
+        reuse = tracker.record(
+            "s", [("system", "a"), ("human", "c"), ("human", "d")], [10, 5, 5]
+        )
+        assert reuse is not None
+        assert reuse.reused_messages == 1
+        assert reuse.ratio == pytest.approx(0.5)
+
+    def test_sessions_are_tracked_separately(self) -> None:
+        tracker = PrefixReuseTracker(max_sessions=1)
+        tracker.record("a", [("system", "a")], [10])
+        tracker.record("b", [("system", "a")], [10])
+        # Session "a" was evicted to stay within max_sessions
+        assert tracker.record("a", [("system", "a")], [10]) is None
+
+
+def test_llamacpp_cache_hints() -> None:
+    settings = Settings(ai=AISettings(LLAMA_SLOT_ID=1))
+    assert get_llamacpp_cache_hints(settings) == {"cache_prompt": True, "id_slot": 1}
+
+    settings = Settings(ai=AISettings(LLAMA_CACHE_PROMPT=False))
+    assert get_llamacpp_cache_hints(settings) is None
@@ -0,0 +1,152 @@
+"""
+Tests for remembering the structured output methods each model supports.
+"""
+
+import time
+from pathlib import Path
+from typing import List
+from unittest.mock import MagicMock, Mock, patch
+
+from langchain_core.messages import AIMessage
+
+from app.models.common import MessageDict
+from app.providers.ai.capabilities import (
+    StructuredOutputCapabilities,
+    is_unsupported_error,
+)
+from app.providers.ai.openai_service import OpenAIService
+from app.providers.ai.schemas import AIResponse
+from app.settings import Settings
+
+PROVIDER = "http://127.0.0.1:8080/v1"
+MODEL = "local-llamacpp-model"
+
+
+class UnsupportedError(Exception):
+    """What the OpenAI client raises for a request the server rejects."""
+
+    status_code = 400
+
+
+class TestStructuredOutputCapabilities:
+    def test_failed_method_is_skipped_until_reprobed(self, tmp_path: Path) -> None:
+        capabilities = StructuredOutputCapabilities(
+            str(tmp_path / "capabilities.json"), reprobe_seconds=3600
+        )
+        capabilities.record_failure(PROVIDER, MODEL, "function_calling")
+        capabilities.record_success(PROVIDER, MODEL, "json_mode")
+
+        assert capabilities.methods_to_try(PROVIDER, MODEL) == ["json_mode"]
+        assert capabilities.methods_to_try(PROVIDER, "other-model") == [
+            "function_calling",
+            "json_mode",
+        ]
+
+        capabilities.reprobe_seconds = 0
+        assert capabilities.methods_to_try(PROVIDER, MODEL) == [
+            "function_calling",
+            "json_mode",
+        ]
+
+    def test_capabilities_are_persisted(self, tmp_path: Path) -> None:
+        path = str(tmp_path / "capabilities.json")
+        StructuredOutputCapabilities(path, 3600).record_failure(
+            PROVIDER, MODEL, "function_calling"
+        )
+        StructuredOutputCapabilities(path, 3600).record_success(
+            PROVIDER, MODEL, "json_mode"
+        )
+
+        reloaded = StructuredOutputCapabilities(path, 3600)
+
+        assert reloaded.methods_to_try(PROVIDER, MODEL) == ["json_mode"]
+        assert reloaded.working_method(PROVIDER, MODEL) == "json_mode"
+
+    def test_success_clears_an_old_failure(self) -> None:
+        capabilities = StructuredOutputCapabilities(None, reprobe_seconds=3600)
+        capabilities.record_failure(PROVIDER, MODEL, "function_calling")
+        capabilities._entries[f"{PROVIDER}|{MODEL}"]["failed"] = {
+            "function_calling": time.time() - 7200
+        }
+
+        capabilities.record_success(PROVIDER, MODEL, "function_calling")
+
+        assert capabilities.methods_to_try(PROVIDER, MODEL)[0] == "function_calling"
+        assert capabilities.working_method(PROVIDER, MODEL) == "function_calling"
+
+    def test_only_rejections_count_as_unsupported(self) -> None:
+        assert is_unsupported_error(UnsupportedError("tools not supported"))
+        assert is_unsupported_error(UnsupportedError("Unknown field response_format"))
+        assert is_unsupported_error(NotImplementedError())
+        assert not is_unsupported_error(TimeoutError())
+
+    def test_unrelated_rejections_do_not_count(self) -> None:
+        assert not is_unsupported_error(
+            UnsupportedError("This model's maximum context length is 8192 tokens")
+        )
+        assert not is_unsupported_error(UnsupportedError())
+
+
+@patch("app.providers.ai.openai_service.ChatOpenAI")
+def test_strict_mode_skips_methods_the_model_rejected(
+    mock_chat_openai: MagicMock,
+) -> None:
+    mock_llm = Mock()
+    mock_chat_openai.return_value = mock_llm
+    methods: List[str] = []
+
+    def with_structured_output(schema: object, method: str, **kwargs: object) -> Mock:
+        methods.append(method)
+        structured_llm = Mock()
+        if method == "function_calling":
+            structured_llm.invoke.side_effect = UnsupportedError("tools not supported")
+        else:
+            structured_llm.invoke.return_value = {
+                "parsed": AIResponse(reasoning="r", narrative="The door opens."),
+                "raw": AIMessage(content=""),
+            }
+        return structured_llm
+
+    mock_llm.with_structured_output.side_effect = with_structured_output
+    service = OpenAIService(
+        settings=Settings(),
+        api_key=None,
+        base_url=PROVIDER,
+        model_name=MODEL,
+        parsing_mode="strict",
+        capabilities=StructuredOutputCapabilities(None, reprobe_seconds=3600),
+    )
+    prompt = [MessageDict(role="user", content="I open the door")]
+
+    first = service.get_response(prompt)
+    second = service.get_response(prompt)
+
+    assert first is not None and second is not None
+    assert second.narrative == "The door opens."
+    assert methods == ["function_calling", "json_mode", "json_mode"]
+
+
+@patch("app.providers.ai.openai_service.ChatOpenAI")
+def test_unexpected_result_is_not_remembered(mock_chat_openai: MagicMock) -> None:
+    mock_llm = Mock()
+    mock_chat_openai.return_value = mock_llm
+    mock_llm.with_structured_output.return_value.invoke.return_value = "not a dict"
+    mock_llm.invoke.return_value = AIMessage(
+        content='{"reasoning": "r", "narrative": "The door opens."}'
+    )
+    capabilities = StructuredOutputCapabilities(None, reprobe_seconds=3600)
+    service = OpenAIService(
+        settings=Settings(),
+        api_key=None,
+        base_url=PROVIDER,
+        model_name=MODEL,
+        parsing_mode="strict",
+        capabilities=capabilities,
+    )
+
+    service.get_response([MessageDict(role="user", content="I open the door")])
+
+    assert capabilities.methods_to_try(PROVIDER, MODEL) == [
+        "function_calling",
+        "json_mode",
+    ]
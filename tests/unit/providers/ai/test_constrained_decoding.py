@@ -0,0 +1,64 @@
+"""
+Tests for constraining Llama.cpp answers to the AIResponse JSON schema.
+"""
+
+from unittest.mock import MagicMock, Mock, patch
+
+from langchain_core.messages import AIMessage
+
+from app.models.common import MessageDict
+from app.providers.ai import metrics as ai_metrics
+from app.providers.ai.manager import get_llamacpp_response_schema
+from app.providers.ai.openai_service import OpenAIService
+from app.providers.ai.schemas import ai_response_json_schema
+from app.settings import AISettings, Settings
+
+
+def test_schema_constrains_without_annotations() -> None:
+    schema = ai_response_json_schema()
+
+    assert schema["required"][:2] == ["reasoning", "narrative"]
+    assert "description" not in schema["properties"]["narrative"]
+    assert "DiceRequestModel" in schema["$defs"]
+    assert "title" not in schema["$defs"]["DiceRequestModel"]
+    assert ai_response_json_schema() is schema
+
+
+def test_schema_is_only_sent_when_enabled() -> None:
+    assert get_llamacpp_response_schema(Settings()) is None
+    enabled = Settings(ai=AISettings(LLAMA_CONSTRAINED_DECODING=True))
+    assert get_llamacpp_response_schema(enabled) == ai_response_json_schema()
+
+
+@patch("app.providers.ai.openai_service.ChatOpenAI")
+def test_flexible_request_sends_the_schema(mock_chat_openai: MagicMock) -> None:
+    mock_llm = Mock()
+    mock_chat_openai.return_value = mock_llm
+    constrained_llm = Mock()
+    mock_llm.bind.return_value = constrained_llm
+    constrained_llm.invoke.return_value = AIMessage(
+        content='{"reasoning": "r", "narrative": "The door opens.", "dice_requests": []}'
+    )
+
+    service = OpenAIService(
+        settings=Settings(),
+        api_key=None,
+        base_url="http://127.0.0.1:8080/v1",
+        model_name="constrained-model",
+        parsing_mode="flexible",
+        extra_body={"cache_prompt": True},
+        response_schema=ai_response_json_schema(),
+    )
+    result = service.get_response([MessageDict(role="user", content="I open it")])
+
+    assert result is not None and result.narrative == "The door opens."
+    extra_body = mock_llm.bind.call_args.kwargs["extra_body"]
+    assert extra_body["cache_prompt"] is True
+    assert extra_body["json_schema"] is ai_response_json_schema()
+    mock_llm.invoke.assert_not_called()
+    assert (
+        ai_metrics.response_parses.get(
+            model="constrained-model", decoding="constrained", outcome="success"
+        )
+        == 1
+    )
@@ -0,0 +1,95 @@
+"""
+Unit tests for the per-campaign history token cache.
+"""
+
+from typing import List, Optional
+
+from langchain_core.messages import BaseMessage, HumanMessage
+
+from app.models.shared.chat import ChatMessageModel
+from app.providers.ai.history_token_cache import HistoryTokenCache, HistoryTokenCaches
+
+
+class CountingFormatter:
+    """Formats messages and counts one token per word, recording each call."""
+
+    def __init__(self) -> None:
+        self.formatted: List[str] = []
+        self.counted = 0
+
+    def format(self, msg: ChatMessageModel) -> Optional[BaseMessage]:
+        self.formatted.append(msg.id)
+        if msg.content.startswith("(Error"):
+            return None
+        return HumanMessage(content=msg.content)
+
+    def count(self, message: BaseMessage) -> int:
+        self.counted += 1
+        return len(str(message.content).split())
+
+
+def make_history(num_messages: int) -> List[ChatMessageModel]:
+    return [
+        ChatMessageModel(
+            id=f"msg-{index}",
+            role="user",
+            content=" ".join(["word"] * (index + 1)),
+            timestamp="2025-05-28T10:00:00Z",
+        )
+        for index in range(num_messages)
+    ]
+
+
+class TestHistoryTokenCache:
+    def test_only_new_messages_are_processed(self) -> None:
+        cache = HistoryTokenCache()
+        formatter = CountingFormatter()
+        history = make_history(5)
+
+        view = cache.update(history, formatter.format, formatter.count)
+        assert view.prefix_tokens == [0, 1, 3, 6, 10, 15]
+
+        history += make_history(7)[5:]
+        view = cache.update(history, formatter.format, formatter.count)
+        assert formatter.formatted == [f"msg-{index}" for index in range(7)]
+        assert formatter.counted == 7
+        assert view.tokens(5, 7) == 13
+        assert view.tokens_for(view.messages[6]) == 7
+
+    def test_edited_message_is_reformatted(self) -> None:
+        cache = HistoryTokenCache()
+        formatter = CountingFormatter()
+        history = make_history(4)
+        cache.update(history, formatter.format, formatter.count)
+
+        history[1] = history[1].model_copy(update={"content": "edited"})
+        view = cache.update(history, formatter.format, formatter.count)
+        # Only the edited message is formatted again; later ones are reused
+        assert formatter.formatted[4:] == ["msg-1"]
+        assert view.prefix_tokens == [0, 1, 2, 5, 9]
+
+    def test_excluded_messages_are_skipped(self) -> None:
+        cache = HistoryTokenCache()
+        formatter = CountingFormatter()
+        history = make_history(3)
+        history[1] = history[1].model_copy(update={"content": "(Error: failed)"})
+
+        view = cache.update(history, formatter.format, formatter.count)
+        assert len(view.messages) == 2
+        assert view.formatted_before == [0, 1, 1, 2]
+
+        # Removing the excluded message keeps the formatted messages
+        view = cache.update([history[0], history[2]], formatter.format, formatter.count)
+        assert formatter.counted == 2
+        assert view.formatted_before == [0, 1, 2]
+
+
+def test_caches_are_bounded() -> None:
+    caches = HistoryTokenCaches(max_campaigns=2)
+    first = caches.get("a")
+    caches.get("b")
+    assert caches.get("a") is first
+    caches.get("c")
+    # "b" was the least recently used campaign
+    assert caches.get("a") is first
+    assert len(caches._caches) == 2
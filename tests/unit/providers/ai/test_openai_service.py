@@ -2,15 +2,19 @@
 Tests for the OpenAIService.
 """
 
-from typing import Any
-from unittest.mock import MagicMock, Mock, patch
+import asyncio
+from typing import Any, List, Optional, Tuple
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
-from langchain_core.messages import AIMessage
+import httpx
+from langchain_core.messages import AIMessage, AIMessageChunk
 
 from app.models.common import MessageDict
+from app.providers.ai import metrics as ai_metrics
 from app.providers.ai.openai_service import OpenAIService
 from app.providers.ai.schemas import AIResponse
 from app.settings import Settings
+from app.utils.token_monitor import CompletionTokenMonitor
 
 
 class TestOpenAIService:
@@ -265,14 +269,15 @@ class TestOpenAIService:
         # Track call count
         call_count = 0
 
-        def side_effect(messages: Any) -> AIMessage:
+        def side_effect(messages: Any, config: Any) -> AIMessage:
             nonlocal call_count
             call_count += 1
             if call_count == 1:
                 # First attempt: simulate rate limiting
                 # Set token monitor values to simulate rate limiting
-                service.token_monitor.last_completion_tokens = 0
-                service.token_monitor.last_prompt_tokens = 100
+                monitor = config["callbacks"][0]
+                monitor.last_completion_tokens = 0
+                monitor.last_prompt_tokens = 100
                 return AIMessage(content="")  # Empty response
             else:
                 # Second attempt: success
@@ -418,19 +423,309 @@ class TestOpenAIService:
 
     @patch("app.providers.ai.openai_service.ChatOpenAI")
     def test_token_monitor_integration(self, mock_chat_openai: MagicMock) -> None:
-        """Test that token monitor callback is properly integrated."""
+        """Test that each request passes its own token monitor callback."""
+        mock_llm = Mock()
+        mock_chat_openai.return_value = mock_llm
+        mock_llm.invoke.return_value = AIMessage(
+            content='{"narrative": "Hi", "dice_requests": []}'
+        )
         service = OpenAIService(
             settings=Settings(),
             api_key="test",
             base_url="http://test",
             model_name="test",
+            parsing_mode="flexible",
         )
+        messages = [MessageDict(role="user", content="test")]
 
-        # Verify token monitor is in callbacks
-        assert service.token_monitor in service.callbacks
-        assert len(service.callbacks) == 1
+        service.get_response(messages)
+        service.get_response(messages)
 
-        # Verify it's passed to ChatOpenAI
-        call_kwargs = mock_chat_openai.call_args.kwargs
-        assert "callbacks" in call_kwargs
-        assert service.token_monitor in call_kwargs["callbacks"]
+        # No monitor is shared through the client
+        assert "callbacks" not in mock_chat_openai.call_args.kwargs
+        monitors = [
+            call.args[1]["callbacks"][0] for call in mock_llm.invoke.call_args_list
+        ]
+        assert all(isinstance(m, CompletionTokenMonitor) for m in monitors)
+        assert monitors[0] is not monitors[1]
+
+    @patch("app.providers.ai.openai_service.ChatOpenAI")
+    def test_concurrent_requests_count_tokens_separately(
+        self, mock_chat_openai: MagicMock
+    ) -> None:
+        """Test that concurrent requests do not overwrite each other's tokens."""
+        mock_llm = Mock()
+        mock_chat_openai.return_value = mock_llm
+        service = OpenAIService(
+            settings=Settings(),
+            api_key="test",
+            base_url="http://test",
+            model_name="test",
+            parsing_mode="flexible",
+        )
+        service.settings.ai.max_retries = 1
+
+        async def ainvoke(messages: Any, config: Any) -> AIMessage:
+            monitor = config["callbacks"][0]
+            if messages[0].content == "limited":
+                monitor.last_prompt_tokens = 100
+                monitor.last_completion_tokens = 0
+                # The other request completes while this one waits
+                await asyncio.sleep(0.05)
+                return AIMessage(content="")
+            await asyncio.sleep(0.01)
+            monitor.last_completion_tokens = 50
+            return AIMessage(content='{"narrative": "Fine", "dice_requests": []}')
+
+        mock_llm.ainvoke = ainvoke
+        delays: List[Optional[float]] = []
+        retry_delay = service._retry_delay_after_empty
+
+        def record_delay(
+            attempt: int, delay: float, monitor: CompletionTokenMonitor
+        ) -> Tuple[Optional[float], float]:
+            delays.append(monitor.last_completion_tokens)
+            return retry_delay(attempt, delay, monitor)
+
+        async def run() -> List[Optional[AIResponse]]:
+            with patch.object(service, "_retry_delay_after_empty", record_delay):
+                results = await asyncio.gather(
+                    service.aget_response(
+                        [MessageDict(role="user", content="limited")]
+                    ),
+                    service.aget_response([MessageDict(role="user", content="fine")]),
+                )
+            await service.aclose()
+            return list(results)
+
+        limited, fine = asyncio.run(run())
+
+        assert limited is None
+        assert fine is not None
+        # The rate-limited request still sees its own 0 completion tokens
+        assert delays == [0]
+
+    @patch("app.providers.ai.openai_service.ChatOpenAI")
+    def test_async_client_of_previous_loop_is_closed(
+        self, mock_chat_openai: MagicMock
+    ) -> None:
+        """Test that the async client is closed when replaced for a new loop."""
+        mock_llm = Mock()
+        mock_chat_openai.return_value = mock_llm
+        mock_llm.ainvoke = AsyncMock(
+            return_value=AIMessage(content='{"narrative": "Hi", "dice_requests": []}')
+        )
+        service = OpenAIService(
+            settings=Settings(),
+            api_key="test",
+            base_url="http://test",
+            model_name="test",
+            parsing_mode="flexible",
+        )
+        messages = [MessageDict(role="user", content="test")]
+
+        asyncio.run(service.aget_response(messages))
+        first_client = mock_chat_openai.call_args.kwargs["http_async_client"]
+
+        async def second_loop() -> None:
+            await service.aget_response(messages)
+            await service.aclose()
+
+        asyncio.run(second_loop())
+
+        second_client = mock_chat_openai.call_args.kwargs["http_async_client"]
+        assert second_client is not first_client
+        assert first_client.is_closed
+        assert second_client.is_closed
+
+    @patch("app.providers.ai.openai_service.ChatOpenAI")
+    def test_streaming_response_reports_narrative_chunks(
+        self, mock_chat_openai: MagicMock
+    ) -> None:
+        """Test that streamed narrative is reported before parsing the response."""
+        mock_llm = Mock()
+        mock_chat_openai.return_value = mock_llm
+        raw = '{"reasoning": "r", "narrative": "The goblin attacks!", "dice_requests": []}'
+        mock_llm.stream.return_value = iter(
+            AIMessageChunk(content=raw[i : i + 5]) for i in range(0, len(raw), 5)
+        )
+
+        service = OpenAIService(
+            settings=Settings(),
+            api_key="test",
+            base_url="http://test",
+            model_name="test",
+        )
+        chunks: list[str] = []
+        result = service.get_streaming_response(
+            [MessageDict(role="user", content="test")], chunks.append
+        )
+
+        assert result is not None
+        assert result.narrative == "The goblin attacks!"
+        assert "".join(chunks) == "The goblin attacks!"
+        assert len(chunks) > 1
+        mock_llm.invoke.assert_not_called()
+
+    @patch("app.providers.ai.openai_service.ChatOpenAI")
+    def test_streaming_response_falls_back_to_blocking_request(
+        self, mock_chat_openai: MagicMock
+    ) -> None:
+        """Test that an unparseable stream is retried without streaming."""
+        mock_llm = Mock()
+        mock_chat_openai.return_value = mock_llm
+        mock_llm.stream.return_value = iter([AIMessageChunk(content="not json")])
+        mock_llm.invoke.return_value = AIMessage(
+            content='{"narrative": "Recovered", "dice_requests": []}'
+        )
+
+        service = OpenAIService(
+            settings=Settings(),
+            api_key="test",
+            base_url="http://test",
+            model_name="test",
+            parsing_mode="flexible",
+        )
+        result = service.get_streaming_response(
+            [MessageDict(role="user", content="test")], Mock()
+        )
+
+        assert result is not None
+        assert result.narrative == "Recovered"
+
+    @patch("app.providers.ai.openai_service.ChatOpenAI")
+    def test_metrics_record_structured_output_fallbacks(
+        self, mock_chat_openai: MagicMock
+    ) -> None:
+        """Test that a response parsed after function calling failed is traced."""
+        mock_llm = Mock()
+        mock_chat_openai.return_value = mock_llm
+        mock_structured_llm = Mock()
+        mock_llm.with_structured_output.return_value = mock_structured_llm
+        raw = AIMessage(content='{"narrative": "Parsed anyway", "dice_requests": []}')
+        raw.usage_metadata = {
+            "input_tokens": 120,
+            "output_tokens": 30,
+            "total_tokens": 150,
+        }
+        mock_structured_llm.invoke.side_effect = [
+            Exception("function calling unsupported"),
+            {"parsed": None, "raw": raw},
+        ]
+
+        service = OpenAIService(
+            settings=Settings(),
+            api_key="test",
+            base_url="http://test",
+            model_name="metrics-fallback-model",
+            parsing_mode="strict",
+        )
+        result = service.get_response([MessageDict(role="user", content="test")])
+
+        model = "metrics-fallback-model"
+        assert result is not None
+        assert ai_metrics.model_calls.get(model=model, method="function_calling") == 1
+        assert ai_metrics.model_calls.get(model=model, method="json_mode") == 1
+        assert ai_metrics.response_paths.get(model=model, path="json_mode_raw") == 1
+        assert ai_metrics.prompt_tokens.get(model=model) == 120
+        assert ai_metrics.completion_tokens.get(model=model) == 30
+        assert ai_metrics.request_duration.count(model=model, outcome="success") == 1
+
+    @patch("app.providers.ai.openai_service.ChatOpenAI")
+    def test_metrics_trace_stream_fallback_as_one_request(
+        self, mock_chat_openai: MagicMock
+    ) -> None:
+        """Test that a stream and its blocking fallback are one traced request."""
+        mock_llm = Mock()
+        mock_chat_openai.return_value = mock_llm
+        mock_llm.stream.return_value = iter([AIMessageChunk(content="not json")])
+        mock_llm.invoke.return_value = AIMessage(
+            content='{"narrative": "Recovered", "dice_requests": []}'
+        )
+
+        service = OpenAIService(
+            settings=Settings(),
+            api_key="test",
+            base_url="http://test",
+            model_name="metrics-stream-model",
+            parsing_mode="flexible",
+        )
+        service.get_streaming_response(
+            [MessageDict(role="user", content="test")], Mock()
+        )
+
+        model = "metrics-stream-model"
+        assert ai_metrics.request_duration.count(model=model, outcome="success") == 1
+        assert ai_metrics.time_to_first_token.count(model=model) == 1
+        assert ai_metrics.model_calls.get(model=model, method="stream") == 1
+        assert ai_metrics.response_paths.get(model=model, path="flexible") == 1
+
+    @patch("app.providers.ai.openai_service.ChatOpenAI")
+    def test_aget_response_uses_pooled_async_client(
+        self, mock_chat_openai: MagicMock
+    ) -> None:
+        """Test that async requests go through one shared async HTTP client."""
+        mock_llm = Mock()
+        mock_chat_openai.return_value = mock_llm
+        mock_llm.ainvoke = AsyncMock(
+            return_value=AIMessage(
+                content='{"narrative": "Async", "dice_requests": []}'
+            )
+        )
+
+        service = OpenAIService(
+            settings=Settings(),
+            api_key="test",
+            base_url="http://test",
+            model_name="test",
+            parsing_mode="flexible",
+        )
+        messages = [MessageDict(role="user", content="test")]
+
+        async def run() -> List[Optional[AIResponse]]:
+            results = [await service.aget_response(messages) for _ in range(3)]
+            await service.aclose()
+            return results
+
+        results = asyncio.run(run())
+
+        assert [r.narrative for r in results if r] == ["Async"] * 3
+        mock_llm.invoke.assert_not_called()
+        # The sync client plus a single async client for the event loop
+        assert mock_chat_openai.call_count == 2
+        http_client = mock_chat_openai.call_args.kwargs["http_async_client"]
+        assert isinstance(http_client, httpx.AsyncClient)
+
+    @patch("app.providers.ai.openai_service.ChatOpenAI")
+    @patch("time.sleep")
+    def test_aget_response_retries_with_async_sleep(
+        self, mock_time_sleep: MagicMock, mock_chat_openai: MagicMock
+    ) -> None:
+        """Test that async retries back off without blocking the thread."""
+        mock_llm = Mock()
+        mock_chat_openai.return_value = mock_llm
+        mock_llm.ainvoke = AsyncMock(
+            side_effect=[
+                AIMessage(content="not json"),
+                AIMessage(content='{"narrative": "Second try", "dice_requests": []}'),
+            ]
+        )
+        service = OpenAIService(
+            settings=Settings(),
+            api_key="test",
+            base_url="http://test",
+            model_name="test",
+            parsing_mode="flexible",
+        )
+
+        with patch(
+            "app.providers.ai.openai_service.asyncio.sleep", new=AsyncMock()
+        ) as mock_async_sleep:
+            result = asyncio.run(
+                service.aget_response([MessageDict(role="user", content="test")])
+            )
+
+        assert result is not None
+        assert result.narrative == "Second try"
+        mock_async_sleep.assert_awaited_once()
+        mock_time_sleep.assert_not_called()
@@ -0,0 +1,129 @@
+"""
+Tests for recording and replaying AI responses.
+"""
+
+import asyncio
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from unittest.mock import Mock
+
+from fastapi.testclient import TestClient
+
+from app.models.common import MessageDict
+from app.providers.ai.replay_service import (
+    RecordingAIService,
+    ReplayAIService,
+    ResponseRecordings,
+    prompt_hash,
+)
+from app.providers.ai.schemas import AIResponse
+from scripts.dev.ai_stub_server import StubModel, create_stub_app
+
+
+def make_prompt(action: str) -> List[MessageDict]:
+    return [
+        MessageDict(role="system", content="You are the game master."),
+        MessageDict(role="user", content=action),
+    ]
+
+
+def make_response(narrative: str) -> AIResponse:
+    return AIResponse(reasoning="Test", narrative=narrative)
+
+
+def record(directory: Path, *pairs: tuple[str, str]) -> None:
+    ai_service = Mock()
+    recorder = RecordingAIService(ai_service, ResponseRecordings(str(directory)))
+    for action, narrative in pairs:
+        ai_service.get_response.return_value = make_response(narrative)
+        recorder.get_response(make_prompt(action))
+
+
+class TestRecordAndReplay:
+    def test_recorded_response_is_replayed(self, tmp_path: Path) -> None:
+        record(tmp_path, ("I open the door", "The door creaks open."))
+
+        replay = ReplayAIService(ResponseRecordings(str(tmp_path)))
+        response = replay.get_response(make_prompt("I open the door"))
+
+        assert response is not None
+        assert response.narrative == "The door creaks open."
+        assert (
+            tmp_path / f"{prompt_hash(make_prompt('I open the door'))}.json"
+        ).exists()
+        assert (replay.hits, replay.misses) == (1, 0)
+
+    def test_unrecorded_prompt_picks_a_recording_deterministically(
+        self, tmp_path: Path
+    ) -> None:
+        record(tmp_path, ("I open the door", "Creak."), ("I knock", "Knock knock."))
+        replay = ReplayAIService(ResponseRecordings(str(tmp_path)), on_miss="pick")
+
+        first = replay.get_response(make_prompt("I sing a song"))
+        second = replay.get_response(make_prompt("I sing a song"))
+
+        assert first is not None and first == second
+        assert replay.misses == 2
+
+    def test_unrecorded_prompt_fails_in_error_mode(self, tmp_path: Path) -> None:
+        record(tmp_path, ("I open the door", "Creak."))
+        replay = ReplayAIService(ResponseRecordings(str(tmp_path)), on_miss="error")
+
+        assert replay.get_response(make_prompt("I sing a song")) is None
+
+    def test_streaming_replays_the_narrative_in_chunks(self, tmp_path: Path) -> None:
+        narrative = "The dragon lands in front of you and roars at the party."
+        record(tmp_path, ("I wait", narrative))
+        replay = ReplayAIService(ResponseRecordings(str(tmp_path)))
+        chunks: List[str] = []
+
+        response = asyncio.run(
+            replay.aget_streaming_response(make_prompt("I wait"), chunks.append)
+        )
+
+        assert response is not None
+        assert len(chunks) > 1
+        assert "".join(chunks) == narrative
+
+    def test_failed_responses_are_not_recorded(self, tmp_path: Path) -> None:
+        ai_service = Mock()
+        ai_service.get_response.return_value = None
+        recorder = RecordingAIService(ai_service, ResponseRecordings(str(tmp_path)))
+
+        assert recorder.get_response(make_prompt("I open the door")) is None
+        assert len(ResponseRecordings(str(tmp_path))) == 0
+
+
+class TestStubServer:
+    def post(
+        self, recordings: Optional[ResponseRecordings] = None, **body: object
+    ) -> Any:
+        client = TestClient(create_stub_app(StubModel(recordings=recordings)))
+        response = client.post(
+            "/v1/chat/completions",
+            json={"messages": [{"role": "user", "content": "I open the door"}], **body},
+        )
+        assert response.status_code == 200
+        return response
+
+    def test_answers_function_calls_with_a_game_master_response(self) -> None:
+        tools = [{"type": "function", "function": {"name": "AIResponse"}}]
+        data: Dict[str, Any] = self.post(tools=tools).json()
+
+        message = data["choices"][0]["message"]
+        arguments = message["tool_calls"][0]["function"]["arguments"]
+        assert "I open the door" in AIResponse.model_validate_json(arguments).narrative
+
+    def test_streams_recorded_responses(self, tmp_path: Path) -> None:
+        record(tmp_path, ("I open the door", "Creak."))
+
+        text = self.post(ResponseRecordings(str(tmp_path)), stream=True).text
+
+        events = [line[len("data: ") :] for line in text.splitlines() if line]
+        assert events[-1] == "[DONE]"
+        content = "".join(
+            json.loads(event)["choices"][0]["delta"].get("content", "")
+            for event in events[:-1]
+        )
+        assert AIResponse.model_validate_json(content).narrative == "Creak."
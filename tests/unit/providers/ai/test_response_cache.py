@@ -0,0 +1,150 @@
+"""
+Tests for the content-addressed AI response cache.
+"""
+
+import asyncio
+from pathlib import Path
+from typing import List
+from unittest.mock import AsyncMock, Mock
+
+from app.models.common import MessageDict
+from app.providers.ai.response_cache import (
+    AIResponseCache,
+    CachedAIResponse,
+    CachingAIService,
+    fresh_ai_requests,
+    idempotent_ai_requests,
+)
+from app.providers.ai.schemas import AIResponse
+
+
+def make_prompt(action: str) -> List[MessageDict]:
+    return [
+        MessageDict(role="system", content="You are the game master."),
+        MessageDict(role="user", content=action),
+    ]
+
+
+def make_ai_service(temperature: float) -> Mock:
+    ai_service = Mock()
+    ai_service.model_name = "test-model"
+    ai_service.parsing_mode = "strict"
+    ai_service.temperature = temperature
+    ai_service.get_response.return_value = AIResponse(
+        reasoning="Test", narrative="The door creaks open."
+    )
+    ai_service.aget_response = AsyncMock(
+        return_value=ai_service.get_response.return_value
+    )
+    return ai_service
+
+
+class TestCachingAIService:
+    def test_temperature_zero_requests_are_served_from_the_cache(
+        self, tmp_path: Path
+    ) -> None:
+        ai_service = make_ai_service(temperature=0.0)
+        service = CachingAIService(ai_service, AIResponseCache(str(tmp_path), 10**6))
+
+        first = service.get_response(make_prompt("I open the door"))
+        second = service.get_response(make_prompt("I open the door"))
+
+        assert first == second
+        ai_service.get_response.assert_called_once()
+        assert (service.hits, service.misses) == (1, 1)
+
+    def test_cache_persists_across_instances(self, tmp_path: Path) -> None:
+        ai_service = make_ai_service(temperature=0.0)
+        CachingAIService(
+            ai_service, AIResponseCache(str(tmp_path), 10**6)
+        ).get_response(make_prompt("I open the door"))
+
+        service = CachingAIService(ai_service, AIResponseCache(str(tmp_path), 10**6))
+        response = asyncio.run(service.aget_response(make_prompt("I open the door")))
+
+        assert response is not None
+        ai_service.aget_response.assert_not_called()
+
+    def test_sampled_requests_are_not_cached_unless_idempotent(
+        self, tmp_path: Path
+    ) -> None:
+        ai_service = make_ai_service(temperature=0.7)
+        service = CachingAIService(ai_service, AIResponseCache(str(tmp_path), 10**6))
+
+        service.get_response(make_prompt("I open the door"))
+        service.get_response(make_prompt("I open the door"))
+        assert ai_service.get_response.call_count == 2
+
+        with idempotent_ai_requests():
+            service.get_response(make_prompt("I open the door"))
+            service.get_response(make_prompt("I open the door"))
+        assert ai_service.get_response.call_count == 3
+
+    def test_key_includes_the_model(self, tmp_path: Path) -> None:
+        cache = AIResponseCache(str(tmp_path), 10**6)
+        ai_service = make_ai_service(temperature=0.0)
+        CachingAIService(ai_service, cache).get_response(make_prompt("I open the door"))
+
+        ai_service.model_name = "other-model"
+        CachingAIService(ai_service, cache).get_response(make_prompt("I open the door"))
+
+        assert ai_service.get_response.call_count == 2
+
+    def test_cached_streaming_response_reports_the_narrative(
+        self, tmp_path: Path
+    ) -> None:
+        ai_service = make_ai_service(temperature=0.0)
+        service = CachingAIService(ai_service, AIResponseCache(str(tmp_path), 10**6))
+        service.get_response(make_prompt("I open the door"))
+        chunks: List[str] = []
+
+        service.get_streaming_response(make_prompt("I open the door"), chunks.append)
+
+        assert chunks == ["The door creaks open."]
+        ai_service.get_streaming_response.assert_not_called()
+
+    def test_failed_requests_are_not_cached(self, tmp_path: Path) -> None:
+        ai_service = make_ai_service(temperature=0.0)
+        ai_service.get_response.return_value = None
+        cache = AIResponseCache(str(tmp_path), 10**6)
+
+        CachingAIService(ai_service, cache).get_response(make_prompt("I open the door"))
+
+        assert len(cache) == 0
+
+    def test_fresh_requests_replace_the_cached_answer(self, tmp_path: Path) -> None:
+        ai_service = make_ai_service(temperature=0.0)
+        service = CachingAIService(ai_service, AIResponseCache(str(tmp_path), 10**6))
+        service.get_response(make_prompt("I open the door"))
+
+        retried = AIResponse(reasoning="Retry", narrative="The door is locked.")
+        ai_service.aget_response.return_value = retried
+
+        async def retry() -> object:
+            with fresh_ai_requests():
+                return await service.aget_response(make_prompt("I open the door"))
+
+        assert asyncio.run(retry()) == retried
+        # Later identical requests get the new answer
+        assert service.get_response(make_prompt("I open the door")) == retried
+        ai_service.get_response.assert_called_once()
+
+
+def test_least_recently_used_responses_are_evicted(tmp_path: Path) -> None:
+    def entry(narrative: str) -> CachedAIResponse:
+        return CachedAIResponse(
+            AIResponse(reasoning="Test", narrative=narrative), None, 1.0
+        )
+
+    cache = AIResponseCache(str(tmp_path), 10**6)
+    cache.put("a", entry("First"))
+    entry_size = cache.total_bytes
+    cache.max_bytes = int(entry_size * 2.5)
+    cache.put("b", entry("Other"))
+    assert cache.get("a") is not None
+
+    cache.put("c", entry("Third"))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert sorted(path.stem for path in tmp_path.glob("*.json")) == ["a", "c"]
@@ -0,0 +1,185 @@
+"""
+Tests for routing AI requests over several backends.
+"""
+
+import asyncio
+import time
+from typing import List, Optional
+
+import pytest
+
+from app.models.common import MessageDict
+from app.providers.ai.openai_service import OpenAIService
+from app.providers.ai.router_service import AIBackend, RoutingAIService
+from app.providers.ai.schemas import AIResponse
+from app.utils.token_monitor import request_token_monitor
+
+PROMPT = [MessageDict(role="user", content="I open the door")]
+
+
+class FakeServer:
+    """Stands in for the OpenAIService of one backend."""
+
+    def __init__(self, narrative: Optional[str], delay: float = 0.0) -> None:
+        self.narrative = narrative
+        self.delay = delay
+        self.calls = 0
+        self.model_name = "local-llamacpp-model"
+        self.parsing_mode = "strict"
+        self.temperature = 0.7
+        self.base_url = "http://127.0.0.1/v1"
+
+    def _answer(self) -> Optional[AIResponse]:
+        self.calls += 1
+        with request_token_monitor() as monitor:
+            if self.narrative is None:
+                # What the token monitor reports for a rate-limited request
+                monitor.last_prompt_tokens = 100
+                monitor.last_completion_tokens = 0
+                monitor.rate_limit_detected = True
+                return None
+            monitor.last_completion_tokens = 50
+            return AIResponse(reasoning="Test", narrative=self.narrative)
+
+    def get_response(self, messages: List[MessageDict]) -> Optional[AIResponse]:
+        time.sleep(self.delay)
+        return self._answer()
+
+    async def aget_response(self, messages: List[MessageDict]) -> Optional[AIResponse]:
+        await asyncio.sleep(self.delay)
+        return self._answer()
+
+
+def make_backend(name: str, server: FakeServer) -> AIBackend:
+    return AIBackend(name, server)  # type: ignore[arg-type]
+
+
+def make_router(*servers: FakeServer, **kwargs: object) -> RoutingAIService:
+    backends = [make_backend(f"server-{i}", s) for i, s in enumerate(servers)]
+    return RoutingAIService(backends, **kwargs)  # type: ignore[arg-type]
+
+
+class TestBackendSelection:
+    def test_requests_are_spread_over_the_backends(self) -> None:
+        first, second = FakeServer("A"), FakeServer("B")
+        router = make_router(first, second)
+
+        for _ in range(4):
+            router.get_response(PROMPT)
+
+        assert (first.calls, second.calls) == (2, 2)
+
+    def test_fastest_strategy_prefers_the_best_tokens_per_second(self) -> None:
+        router = make_router(FakeServer("A"), FakeServer("B"), strategy="fastest")
+        router.backends[0].tokens_per_second = 20.0
+        router.backends[1].tokens_per_second = 80.0
+
+        assert router._pick(set()) is router.backends[1]
+
+    def test_busy_backend_is_avoided(self) -> None:
+        router = make_router(FakeServer("A"), FakeServer("B"))
+        router.backends[0].in_flight = 3
+
+        assert router._pick(set()) is router.backends[1]
+
+
+class TestHealth:
+    def test_rate_limited_backend_is_skipped(self) -> None:
+        limited, healthy = FakeServer(None), FakeServer("The door opens.")
+        router = make_router(limited, healthy, unhealthy_seconds=60)
+
+        responses = [router.get_response(PROMPT) for _ in range(3)]
+
+        assert all(
+            r is not None and r.narrative == "The door opens." for r in responses
+        )
+        assert limited.calls == 1
+        stats = router.get_stats().backends[0]
+        assert not stats.healthy
+        assert stats.failures == 1
+        assert stats.last_error is not None and "rate limited" in stats.last_error
+
+    def test_concurrent_requests_report_their_own_tokens(self) -> None:
+        server = FakeServer("The door opens.")
+        router = make_router(server, unhealthy_seconds=60)
+
+        async def limited(service: OpenAIService) -> Optional[AIResponse]:
+            with request_token_monitor() as monitor:
+                monitor.last_prompt_tokens = 100
+                monitor.last_completion_tokens = 0
+                monitor.rate_limit_detected = True
+                # The other request completes in the meantime
+                await asyncio.sleep(0.05)
+                return None
+
+        async def run() -> None:
+            backend = router.backends[0]
+            await asyncio.gather(
+                router._arun(backend, limited),
+                router._arun(backend, lambda service: service.aget_response(PROMPT)),
+            )
+
+        asyncio.run(run())
+
+        stats = router.get_stats().backends[0]
+        assert stats.last_error is not None and "rate limited" in stats.last_error
+        assert stats.tokens_per_second is not None and stats.tokens_per_second > 0
+
+    def test_all_backends_failing_returns_none(self) -> None:
+        router = make_router(FakeServer(None), FakeServer(None))
+
+        assert router.get_response(PROMPT) is None
+
+
+class TestHedging:
+    @pytest.fixture
+    def slow_and_fast(self) -> RoutingAIService:
+        router = make_router(
+            FakeServer("Slow", delay=1.0),
+            FakeServer("Fast", delay=0.0),
+            hedge_percentile=90,
+        )
+        # Recent requests all took 10ms
+        for backend in router.backends:
+            backend.latencies.extend([0.01] * 10)
+        # The slow backend is picked first
+        router.backends[1].requests = 1
+        return router
+
+    def test_slow_request_is_hedged_on_another_backend(
+        self, slow_and_fast: RoutingAIService
+    ) -> None:
+        started = time.perf_counter()
+        response = slow_and_fast.get_response(PROMPT)
+
+        assert response is not None and response.narrative == "Fast"
+        assert time.perf_counter() - started < 0.5
+        assert slow_and_fast.hedged_requests == 1
+
+    def test_async_hedge_cancels_the_slower_request(
+        self, slow_and_fast: RoutingAIService
+    ) -> None:
+        response = asyncio.run(slow_and_fast.aget_response(PROMPT))
+
+        assert response is not None and response.narrative == "Fast"
+        assert slow_and_fast.hedged_requests == 1
+        slow = slow_and_fast.backends[0]
+        assert slow.in_flight == 0 and slow.failures == 0
+
+    def test_no_hedging_without_enough_latency_samples(self) -> None:
+        router = make_router(FakeServer("A"), FakeServer("B"), hedge_percentile=90)
+
+        assert router._hedge_delay() is None
+
+
+def test_router_reports_backend_stats() -> None:
+    server = FakeServer("A")
+    router = make_router(server, FakeServer("B"))
+    router.get_response(PROMPT)
+
+    stats = router.get_stats()
+
+    assert stats.strategy == "least_inflight"
+    assert stats.backends[0].requests == 1
+    assert stats.backends[0].p50_latency_seconds is not None
+    assert stats.backends[0].tokens_per_second is not None
@@ -0,0 +1,76 @@
+"""
+Tests for the content-addressed cache of synthesized speech.
+"""
+
+import os
+from pathlib import Path
+
+from app.providers.tts.audio_cache import TTSAudioCache
+
+
+def write_audio(directory: Path, filename: str, size: int, mtime: float = 0) -> None:
+    path = directory / filename
+    path.write_bytes(b"\0" * size)
+    if mtime:
+        os.utime(path, (mtime, mtime))
+
+
+def test_key_depends_on_text_voice_language_and_model() -> None:
+    key = TTSAudioCache.key("Hello there.", "af_heart", "a", "0.9.4")
+
+    assert key == TTSAudioCache.key("Hello there.", "af_heart", "a", "0.9.4")
+    assert key != TTSAudioCache.key("Hello there!", "af_heart", "a", "0.9.4")
+    assert key != TTSAudioCache.key("Hello there.", "am_onyx", "a", "0.9.4")
+    assert key != TTSAudioCache.key("Hello there.", "af_heart", "b", "0.9.4")
+    assert key != TTSAudioCache.key("Hello there.", "af_heart", "a", "1.0.0")
+
+
+def test_cached_file_is_found(tmp_path: Path) -> None:
+    cache = TTSAudioCache(str(tmp_path))
+    write_audio(tmp_path, "line.wav", 100)
+
+    assert not cache.get("line.wav")
+    cache.add("line.wav")
+
+    assert cache.get("line.wav")
+    assert cache.total_bytes == 100
+
+
+def test_least_recently_used_files_are_evicted(tmp_path: Path) -> None:
+    cache = TTSAudioCache(str(tmp_path), max_bytes=250)
+    for name in ("first.wav", "second.wav"):
+        write_audio(tmp_path, name, 100)
+        cache.add(name)
+    # The first file is used again, so the second one is the oldest
+    assert cache.get("first.wav")
+
+    write_audio(tmp_path, "third.wav", 100)
+    cache.add("third.wav")
+
+    assert sorted(os.listdir(tmp_path)) == ["first.wav", "third.wav"]
+    assert not cache.get("second.wav")
+    assert cache.total_bytes == 200
+
+
+def test_existing_files_are_indexed_oldest_first(tmp_path: Path) -> None:
+    write_audio(tmp_path, "old.wav", 100, mtime=1_000)
+    write_audio(tmp_path, "recent.wav", 100, mtime=2_000)
+    write_audio(tmp_path, "partial.wav.tmp", 100)
+    cache = TTSAudioCache(str(tmp_path), max_bytes=250)
+    assert cache.total_bytes == 200
+
+    write_audio(tmp_path, "new.wav", 100)
+    cache.add("new.wav")
+
+    assert not (tmp_path / "old.wav").exists()
+    assert cache.get("recent.wav") and cache.get("new.wav")
+
+
+def test_file_deleted_outside_the_cache_is_a_miss(tmp_path: Path) -> None:
+    cache = TTSAudioCache(str(tmp_path))
+    write_audio(tmp_path, "line.wav", 100)
+    cache.add("line.wav")
+    (tmp_path / "line.wav").unlink()
+
+    assert not cache.get("line.wav")
+    assert cache.total_bytes == 0
@@ -0,0 +1,54 @@
+"""
+Tests for Kokoro speech synthesis, with a pipeline standing in for the model.
+"""
+
+import re
+from pathlib import Path
+from typing import Any, Iterator, List, Tuple
+
+import pytest
+
+pytest.importorskip("soundfile")
+# Isolated test modules unload numpy, which cannot be imported again then
+np = pytest.importorskip("numpy", exc_type=ImportError)
+
+from app.providers.tts.kokoro_service import KokoroTTSService  # noqa: E402
+
+
+class SplittingPipeline:
+    """Splits its input like KPipeline and yields silence for each part."""
+
+    def __init__(self) -> None:
+        self.parts: List[str] = []
+
+    def __call__(
+        self, text: str, voice: str, split_pattern: str = r"\n+", **_: Any
+    ) -> Iterator[Tuple[str, str, Any]]:
+        for part in re.split(split_pattern, text):
+            if part.strip():
+                self.parts.append(part)
+                yield part, "", np.zeros(2400, dtype=np.float32)
+
+
+def test_paragraph_is_synthesized_sentence_by_sentence(tmp_path: Path) -> None:
+    service = KokoroTTSService(cache_dir=str(tmp_path / "tts_cache"))
+    pipeline = SplittingPipeline()
+    service._kokoro_imported = True
+    service.pipeline = pipeline
+    segments: List[Tuple[int, str]] = []
+    try:
+        path = service.synthesize_speech_segments(
+            "The door creaks open. A cold wind blows! Who goes there?",
+            "af_heart",
+            lambda index, segment_path: segments.append((index, segment_path)),
+        )
+    finally:
+        service.close()
+
+    assert pipeline.parts == [
+        "The door creaks open.",
+        "A cold wind blows!",
+        "Who goes there?",
+    ]
+    assert [index for index, _ in segments] == [0, 1, 2]
+    assert path is not None
@@ -0,0 +1,112 @@
+"""
+Tests for the worker thread shared by every speech synthesis request.
+"""
+
+import contextvars
+import threading
+from typing import List
+
+from app.providers.tts.synthesis_worker import SynthesisJob, TTSSynthesisWorker
+
+session: contextvars.ContextVar[str] = contextvars.ContextVar("session", default="")
+
+
+class BlockingSynthesizer:
+    """Holds the first batch until released, so later jobs queue up."""
+
+    def __init__(self) -> None:
+        self.batches: List[List[str]] = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self, jobs: List[SynthesisJob]) -> None:
+        self.started.set()
+        self.release.wait(timeout=5)
+        self.batches.append([job.text for job in jobs])
+        for job in jobs:
+            job.report_segment(0, f"tts_cache/{job.text}.wav")
+            job.future.set_result(f"tts_cache/{job.text}.wav")
+
+
+def test_queued_jobs_are_handed_over_together() -> None:
+    synthesizer = BlockingSynthesizer()
+    worker = TTSSynthesisWorker(synthesizer, max_batch=2)
+
+    first = worker.submit("first", "af_heart")
+    assert synthesizer.started.wait(timeout=5)
+    rest = [worker.submit(text, "af_heart") for text in ("second", "third", "fourth")]
+    synthesizer.release.set()
+
+    assert first.result(timeout=5) == "tts_cache/first.wav"
+    assert [f.result(timeout=5) for f in rest] == [
+        "tts_cache/second.wav",
+        "tts_cache/third.wav",
+        "tts_cache/fourth.wav",
+    ]
+    assert synthesizer.batches == [["first"], ["second", "third"], ["fourth"]]
+    worker.close()
+
+
+def test_cancelled_job_is_not_synthesized() -> None:
+    synthesizer = BlockingSynthesizer()
+    worker = TTSSynthesisWorker(synthesizer)
+
+    first = worker.submit("first", "af_heart")
+    assert synthesizer.started.wait(timeout=5)
+    cancelled = worker.submit("second", "af_heart")
+    assert cancelled.cancel()
+    synthesizer.release.set()
+
+    assert first.result(timeout=5) == "tts_cache/first.wav"
+    worker.close()
+    assert worker._thread is not None
+    worker._thread.join(timeout=5)
+    assert synthesizer.batches == [["first"]]
+
+
+def test_job_cancelled_by_its_token_is_not_synthesized() -> None:
+    synthesizer = BlockingSynthesizer()
+    worker = TTSSynthesisWorker(synthesizer)
+    cancel = threading.Event()
+
+    first = worker.submit("first", "af_heart")
+    assert synthesizer.started.wait(timeout=5)
+    abandoned = worker.submit("second", "af_heart", cancel=cancel)
+    cancel.set()
+    synthesizer.release.set()
+
+    assert first.result(timeout=5) == "tts_cache/first.wav"
+    assert abandoned.result(timeout=5) is None
+    assert synthesizer.batches == [["first"]]
+    worker.close()
+
+
+def test_segments_are_reported_in_the_context_of_the_caller() -> None:
+    synthesizer = BlockingSynthesizer()
+    synthesizer.release.set()
+    worker = TTSSynthesisWorker(synthesizer)
+    sessions = []
+
+    session.set("game-1")
+    future = worker.submit(
+        "line", "af_heart", lambda index, path: sessions.append(session.get())
+    )
+
+    assert future.result(timeout=5) == "tts_cache/line.wav"
+    assert sessions == ["game-1"]
+    worker.close()
+
+
+def test_warm_up_runs_before_the_first_job() -> None:
+    calls = []
+
+    def synthesize(jobs: List[SynthesisJob]) -> None:
+        calls.append("synthesize")
+        jobs[0].future.set_result(None)
+
+    worker = TTSSynthesisWorker(synthesize, warm_up=lambda: calls.append("warm_up"))
+
+    worker.submit("line", "af_heart").result(timeout=5)
+
+    assert calls == ["warm_up", "synthesize"]
+    worker.close()
@@ -2,13 +2,17 @@
 Unit tests for TTS Integration Service including hierarchy behavior.
 """
 
-from typing import Dict
+import threading
+from typing import Callable, Dict, List, Optional
 from unittest.mock import Mock
 
 import pytest
 from _pytest.logging import LogCaptureFixture
 
+from app.core.session_context import session_scope
+from app.models.events.narrative import NarrationReadyEvent, NarrationSegmentEvent
 from app.models.game_state.main import GameStateModel
+from app.models.shared import ChatMessageModel
 from app.models.utils import VoiceInfoModel
 from app.services.tts_integration_service import TTSIntegrationService
 
@@ -86,7 +90,10 @@ class TestTTSIntegrationService:
         assert tts_integration_service.get_current_voice() == "af_heart"
 
     def test_set_narration_enabled_success(
-        self, tts_integration_service: TTSIntegrationService, mock_game_state_repo: Mock
+        self,
+        tts_integration_service: TTSIntegrationService,
+        mock_tts_service: Mock,
+        mock_game_state_repo: Mock,
     ) -> None:
         """Test enabling narration updates game state."""
         game_state = GameStateModel(narration_enabled=False, tts_voice="af_heart")
@@ -97,6 +104,25 @@ class TestTTSIntegrationService:
         assert result is True
         assert game_state.narration_enabled is True
         mock_game_state_repo.save_game_state.assert_called_once_with(game_state)
+        mock_tts_service.warm_up.assert_called_once_with()
+
+    def test_tts_model_is_warmed_up_only_with_narration_enabled(
+        self,
+        tts_integration_service: TTSIntegrationService,
+        mock_tts_service: Mock,
+        mock_game_state_repo: Mock,
+    ) -> None:
+        """Test the model is not loaded while narration is disabled."""
+        game_state = GameStateModel(narration_enabled=False, tts_voice="af_heart")
+        mock_game_state_repo.get_game_state.return_value = game_state
+
+        tts_integration_service.warm_up_if_enabled()
+        tts_integration_service.set_narration_enabled(False)
+        mock_tts_service.warm_up.assert_not_called()
+
+        game_state.narration_enabled = True
+        tts_integration_service.warm_up_if_enabled()
+        mock_tts_service.warm_up.assert_called_once_with()
 
     def test_set_narration_enabled_no_game_state(
         self, tts_integration_service: TTSIntegrationService, mock_game_state_repo: Mock
@@ -332,3 +358,203 @@ class TestTTSErrorHandling:
 
         assert result is None
         assert "Error generating TTS for message msg1" in caplog.text
+
+
+class TestBackgroundNarration:
+    """Test narration synthesized off the AI turn."""
+
+    @pytest.fixture
+    def game_state(self) -> GameStateModel:
+        return GameStateModel(
+            narration_enabled=True,
+            tts_voice="af_heart",
+            chat_history=[
+                ChatMessageModel(
+                    id="msg1",
+                    role="assistant",
+                    content="The door creaks open.",
+                    timestamp="2025-01-01T00:00:00Z",
+                )
+            ],
+        )
+
+    @pytest.fixture
+    def event_queue(self) -> Mock:
+        return Mock()
+
+    def make_service(
+        self,
+        game_state: GameStateModel,
+        event_queue: Mock,
+        tts_service: Mock,
+        stream_segments: bool = False,
+    ) -> TTSIntegrationService:
+        repo = Mock()
+        repo.get_game_state.return_value = game_state
+        return TTSIntegrationService(
+            tts_service, repo, event_queue, stream_segments=stream_segments
+        )
+
+    def test_narration_ready_event_follows_the_message(
+        self, game_state: GameStateModel, event_queue: Mock
+    ) -> None:
+        tts_service = Mock()
+        tts_service.synthesize_speech.return_value = "tts_cache/msg1.wav"
+        service = self.make_service(game_state, event_queue, tts_service)
+
+        assert service.request_narration("The door creaks open.", "msg1")
+        assert service.wait_idle(timeout=5)
+
+        event = event_queue.put_event.call_args[0][0]
+        assert isinstance(event, NarrationReadyEvent)
+        assert (event.message_id, event.audio_path) == ("msg1", "tts_cache/msg1.wav")
+        assert service.apply_completed(game_state)
+        assert game_state.chat_history[0].audio_path == "tts_cache/msg1.wav"
+        service.close()
+
+    def test_segments_are_sent_before_the_whole_narration(
+        self, game_state: GameStateModel, event_queue: Mock
+    ) -> None:
+        def synthesize(
+            text: str,
+            voice_id: str,
+            on_segment: Callable[[int, str], None],
+            cancel: threading.Event,
+        ) -> str:
+            on_segment(0, "tts_cache/msg1_0.wav")
+            on_segment(1, "tts_cache/msg1_1.wav")
+            return "tts_cache/msg1.wav"
+
+        tts_service = Mock()
+        tts_service.synthesize_speech_segments.side_effect = synthesize
+        service = self.make_service(
+            game_state, event_queue, tts_service, stream_segments=True
+        )
+
+        service.request_narration("The door creaks open. It is dark.", "msg1")
+        assert service.wait_idle(timeout=5)
+
+        events = [call[0][0] for call in event_queue.put_event.call_args_list]
+        assert [type(e) for e in events] == [
+            NarrationSegmentEvent,
+            NarrationSegmentEvent,
+            NarrationReadyEvent,
+        ]
+        assert [(e.segment_index, e.audio_path) for e in events[:2]] == [
+            (0, "tts_cache/msg1_0.wav"),
+            (1, "tts_cache/msg1_1.wav"),
+        ]
+        assert events[2].audio_path == "tts_cache/msg1.wav"
+        tts_service.synthesize_speech.assert_not_called()
+        service.close()
+
+    def test_cancelled_narration_is_not_delivered(
+        self, game_state: GameStateModel, event_queue: Mock
+    ) -> None:
+        started, release = threading.Event(), threading.Event()
+
+        def synthesize(text: str, voice_id: str) -> str:
+            started.set()
+            release.wait(timeout=5)
+            return "tts_cache/audio.wav"
+
+        tts_service = Mock()
+        tts_service.synthesize_speech.side_effect = synthesize
+        service = self.make_service(game_state, event_queue, tts_service)
+
+        service.request_narration("The door creaks open.", "msg1")
+        service.request_narration("A goblin appears.", "msg2")
+        assert started.wait(timeout=5)
+        # The player acts while the first narration is being synthesized
+        assert service.cancel_pending_narrations() == 2
+        release.set()
+        service.close()
+        service._executor.shutdown(wait=True)
+
+        assert tts_service.synthesize_speech.call_count == 1
+        event_queue.put_event.assert_not_called()
+        assert not service.apply_completed(game_state)
+
+    def test_cancel_stops_the_narration_being_synthesized(
+        self, game_state: GameStateModel, event_queue: Mock
+    ) -> None:
+        started = threading.Event()
+        segments: List[int] = []
+
+        def synthesize(
+            text: str,
+            voice_id: str,
+            on_segment: Callable[[int, str], None],
+            cancel: threading.Event,
+        ) -> Optional[str]:
+            for index in range(100):
+                if cancel.is_set():
+                    return None
+                segments.append(index)
+                started.set()
+                cancel.wait(timeout=0.05)
+            return "tts_cache/msg1.wav"
+
+        tts_service = Mock()
+        tts_service.synthesize_speech_segments.side_effect = synthesize
+        service = self.make_service(
+            game_state, event_queue, tts_service, stream_segments=True
+        )
+
+        service.request_narration("The door creaks open.", "msg1")
+        assert started.wait(timeout=5)
+        assert service.cancel_pending_narrations() == 1
+        service.close()
+        service._executor.shutdown(wait=True)
+
+        assert len(segments) < 100
+        assert not any(
+            isinstance(call[0][0], NarrationReadyEvent)
+            for call in event_queue.put_event.call_args_list
+        )
+
+    def test_dropped_session_forgets_its_narrations(
+        self, game_state: GameStateModel, event_queue: Mock
+    ) -> None:
+        tts_service = Mock()
+        tts_service.synthesize_speech.return_value = "tts_cache/msg1.wav"
+        service = self.make_service(game_state, event_queue, tts_service)
+
+        with session_scope("table-a"):
+            service.request_narration("The door creaks open.", "msg1")
+            assert service.wait_idle(timeout=5)
+        service.drop_session("table-a")
+
+        with session_scope("table-a"):
+            assert not service.apply_completed(game_state)
+        service.close()
+
+    def test_completion_handler_gets_the_session_of_the_message(
+        self, game_state: GameStateModel, event_queue: Mock
+    ) -> None:
+        tts_service = Mock()
+        tts_service.synthesize_speech.return_value = "tts_cache/msg1.wav"
+        service = self.make_service(game_state, event_queue, tts_service)
+        completed: List[Optional[str]] = []
+        handled = threading.Event()
+
+        def on_completed(session_id: Optional[str]) -> None:
+            completed.append(session_id)
+            handled.set()
+
+        service.set_completion_handler(on_completed)
+        with session_scope("table-a"):
+            service.request_narration("The door creaks open.", "msg1")
+
+        assert handled.wait(timeout=5)
+        assert completed == ["table-a"]
+        service.close()
+
+    def test_nothing_is_queued_when_narration_is_disabled(
+        self, game_state: GameStateModel, event_queue: Mock
+    ) -> None:
+        game_state.narration_enabled = False
+        service = self.make_service(game_state, event_queue, Mock())
+
+        assert not service.request_narration("The door creaks open.", "msg1")
+        service.close()
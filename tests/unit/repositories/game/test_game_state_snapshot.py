@@ -0,0 +1,123 @@
+"""
+Unit tests for structural-sharing game state snapshots.
+"""
+
+from pathlib import Path
+
+from app.models.character.instance import CharacterInstanceModel
+from app.models.game_state.main import GameStateModel
+from app.models.shared import ChatMessageModel
+from app.repositories.game_state_repository import InMemoryGameStateRepository
+from app.repositories.game_state_snapshot import CHAT_SEGMENT_SIZE, GameStateSnapshot
+
+
+def _message(index: int) -> ChatMessageModel:
+    return ChatMessageModel(
+        id=f"msg_{index}",
+        role="assistant",
+        content=f"Message {index}",
+        timestamp="2025-01-01T00:00:00Z",
+    )
+
+
+def _character(char_id: str) -> CharacterInstanceModel:
+    return CharacterInstanceModel(
+        id=char_id,
+        name=char_id.title(),
+        template_id=f"{char_id}_template",
+        campaign_id="campaign",
+        current_hp=10,
+        max_hp=10,
+        level=1,
+    )
+
+
+def _state(messages: int = CHAT_SEGMENT_SIZE * 3 + 5) -> GameStateModel:
+    return GameStateModel(
+        campaign_id="campaign",
+        chat_history=[_message(i) for i in range(messages)],
+        party={"fighter": _character("fighter"), "wizard": _character("wizard")},
+        world_lore=["Old lore"],
+    )
+
+
+class TestGameStateSnapshot:
+    """Snapshots share unchanged structure and stay isolated from the live state."""
+
+    def test_restore_round_trips_state(self) -> None:
+        state = _state()
+        state._last_rag_context = "context"
+
+        restored = GameStateSnapshot.capture(state).restore()
+
+        assert restored == state
+        assert restored is not state
+        assert restored.party["fighter"] is not state.party["fighter"]
+        assert restored._last_rag_context == "context"
+
+    def test_snapshot_is_isolated_from_later_mutations(self) -> None:
+        state = _state()
+        snapshot = GameStateSnapshot.capture(state)
+
+        state.party["fighter"].current_hp = 1
+        state.world_lore.append("New lore")
+        state.chat_history.pop()
+
+        restored = snapshot.restore()
+        assert restored.party["fighter"].current_hp == 10
+        assert restored.world_lore == ["Old lore"]
+        assert len(restored.chat_history) == CHAT_SEGMENT_SIZE * 3 + 5
+
+    def test_unchanged_parts_are_shared_with_previous_snapshot(self) -> None:
+        state = _state()
+        first = GameStateSnapshot.capture(state)
+
+        state.party["fighter"].current_hp = 4
+        state.chat_history.append(_message(1000))
+        second = GameStateSnapshot.capture(state, previous=first)
+
+        # Sealed chat segments and untouched entries are reused
+        assert len(second.chat_segments) == 3
+        assert all(
+            new is old for new, old in zip(second.chat_segments, first.chat_segments)
+        )
+        assert second.entries["party"]["wizard"] is first.entries["party"]["wizard"]
+        assert second.sections["world_lore"] is first.sections["world_lore"]
+        # Only the touched character was copied again
+        assert (
+            second.entries["party"]["fighter"] is not first.entries["party"]["fighter"]
+        )
+        assert second.party["fighter"].current_hp == 4
+        assert second.chat_tail[-1].id == "msg_1000"
+
+    def test_rewritten_chat_segment_is_not_reused(self) -> None:
+        state = _state()
+        first = GameStateSnapshot.capture(state)
+
+        del state.chat_history[CHAT_SEGMENT_SIZE * 2 - 1 :]
+        state.chat_history.append(_message(2000))
+        second = GameStateSnapshot.capture(state, previous=first)
+
+        assert second.chat_segments[0] is first.chat_segments[0]
+        assert second.chat_segments[1] is not first.chat_segments[1]
+        assert second.restore().chat_history[-1].id == "msg_2000"
+
+
+def test_in_memory_repository_saves_share_structure(tmp_path: Path) -> None:
+    repo = InMemoryGameStateRepository(str(tmp_path))
+    state = _state()
+    repo.save_game_state(state)
+    first = repo._campaign_saves["campaign"]
+
+    state.chat_history.append(_message(1000))
+    repo.save_game_state(state)
+    second = repo._campaign_saves["campaign"]
+
+    assert second.chat_segments[0] is first.chat_segments[0]
+    assert second.entries["party"] == first.entries["party"]
+
+    loaded = repo.load_campaign_state("campaign")
+    assert loaded is not None
+    assert loaded.chat_history[-1].id == "msg_1000"
+    loaded.party["fighter"].current_hp = 0
+    assert repo._campaign_saves["campaign"].party["fighter"].current_hp == 10
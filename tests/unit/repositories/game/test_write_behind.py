@@ -0,0 +1,156 @@
+"""
+Unit tests for write-behind game state persistence.
+"""
+
+import json
+import time
+from pathlib import Path
+from typing import Iterator, List, Tuple
+
+import pytest
+
+from app.models.game_state.main import GameStateModel
+from app.repositories.game_state_repository import FileGameStateRepository
+from app.repositories.write_behind import WriteBehindWriter
+
+
+class RecordingWriter:
+    """Collects writes instead of touching the disk."""
+
+    def __init__(self) -> None:
+        self.writes: List[Tuple[str, GameStateModel]] = []
+
+    def __call__(self, state: GameStateModel, path: str) -> None:
+        self.writes.append((path, state))
+
+
+@pytest.fixture
+def recorder() -> RecordingWriter:
+    return RecordingWriter()
+
+
+@pytest.fixture
+def writer(recorder: RecordingWriter) -> Iterator[WriteBehindWriter]:
+    writer = WriteBehindWriter(recorder, debounce_seconds=60)
+    yield writer
+    writer.close()
+
+
+class TestWriteBehindWriter:
+    def test_rapid_saves_are_coalesced(
+        self, writer: WriteBehindWriter, recorder: RecordingWriter
+    ) -> None:
+        state = GameStateModel(campaign_id="campaign")
+        for turn in range(10):
+            state.session_count = turn
+            writer.schedule(state, "campaign.json")
+
+        assert recorder.writes == []
+        assert writer.status().pending_saves == 1
+
+        assert writer.flush(timeout=5)
+        assert len(recorder.writes) == 1
+        # The write holds the state as of the last save
+        assert recorder.writes[0][1].session_count == 9
+
+        status = writer.status()
+        assert status.saves == 10
+        assert status.writes == 1
+        assert status.coalesced_saves == 9
+        assert status.durability_lag_seconds == 0.0
+
+    def test_later_mutations_do_not_leak_into_pending_write(
+        self, writer: WriteBehindWriter, recorder: RecordingWriter
+    ) -> None:
+        state = GameStateModel(campaign_id="campaign", world_lore=["saved"])
+        writer.schedule(state, "campaign.json")
+        state.world_lore.append("unsaved")
+
+        writer.flush(timeout=5)
+        assert recorder.writes[0][1].world_lore == ["saved"]
+
+    def test_durability_lag_grows_until_written(
+        self, writer: WriteBehindWriter
+    ) -> None:
+        writer.schedule(GameStateModel(campaign_id="campaign"), "campaign.json")
+        time.sleep(0.05)
+        assert writer.durability_lag() >= 0.05
+        writer.flush(timeout=5)
+        assert writer.durability_lag() == 0.0
+
+    def test_writes_after_debounce(self, recorder: RecordingWriter) -> None:
+        writer = WriteBehindWriter(recorder, debounce_seconds=0.05)
+        try:
+            writer.schedule(GameStateModel(campaign_id="a"), "a.json")
+            writer.schedule(GameStateModel(campaign_id="b"), "b.json")
+            deadline = time.monotonic() + 5
+            while len(recorder.writes) < 2 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert sorted(path for path, _ in recorder.writes) == ["a.json", "b.json"]
+        finally:
+            writer.close()
+
+    def test_failed_write_is_retried_until_written(self) -> None:
+        failures = [OSError("disk full"), OSError("disk full")]
+        recorder = RecordingWriter()
+
+        def flaky_write(state: GameStateModel, path: str) -> None:
+            if failures:
+                raise failures.pop(0)
+            recorder(state, path)
+
+        writer = WriteBehindWriter(flaky_write, debounce_seconds=0.01)
+        try:
+            writer.schedule(GameStateModel(campaign_id="campaign"), "campaign.json")
+            # The flush reports the failure and the save stays pending
+            assert not writer.flush(timeout=5)
+            status = writer.status()
+            assert status.pending_saves == 1
+            assert status.last_error == "disk full"
+
+            # Retried in the background with a growing delay
+            deadline = time.monotonic() + 5
+            while not recorder.writes and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert [path for path, _ in recorder.writes] == ["campaign.json"]
+            assert recorder.writes[0][1].campaign_id == "campaign"
+            status = writer.status()
+            assert (status.failed_writes, status.writes) == (2, 1)
+            assert status.pending_saves == 0
+        finally:
+            writer.close()
+
+
+class TestFileRepositoryWriteBehind:
+    def test_save_is_deferred_until_flush(self, tmp_path: Path) -> None:
+        repo = FileGameStateRepository(str(tmp_path), write_behind_delay=60)
+        try:
+            repo.save_game_state(
+                GameStateModel(campaign_id="campaign", campaign_name="Deferred")
+            )
+            save_path = Path(repo._get_campaign_save_path("campaign"))
+            assert not save_path.exists()
+            assert repo.get_persistence_status().mode == "write_behind"
+
+            repo.flush()
+            assert json.loads(save_path.read_text())["campaign_name"] == "Deferred"
+        finally:
+            repo.close()
+
+    def test_load_sees_pending_save(self, tmp_path: Path) -> None:
+        repo = FileGameStateRepository(str(tmp_path), write_behind_delay=60)
+        try:
+            repo.save_game_state(
+                GameStateModel(campaign_id="campaign", campaign_name="Pending")
+            )
+            loaded = repo.load_campaign_state("campaign")
+            assert loaded is not None
+            assert loaded.campaign_name == "Pending"
+        finally:
+            repo.close()
+
+    def test_synchronous_by_default(self, tmp_path: Path) -> None:
+        repo = FileGameStateRepository(str(tmp_path))
+        repo.save_game_state(GameStateModel(campaign_id="campaign"))
+        assert Path(repo._get_campaign_save_path("campaign")).exists()
+        assert repo.get_persistence_status().mode == "sync"
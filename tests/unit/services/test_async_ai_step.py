@@ -0,0 +1,193 @@
+"""
+Unit tests for running AI steps on the event loop instead of worker threads.
+"""
+
+import asyncio
+import threading
+from pathlib import Path
+from typing import Any, List, Optional
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from app.core.event_queue import EventQueue
+from app.core.session_context import session_scope
+from app.models.common import MessageDict
+from app.providers.ai.base import BaseAIService
+from app.providers.ai.response_cache import AIResponseCache, CachingAIService
+from app.providers.ai.schemas import AIResponse
+from app.repositories.game_state_repository import InMemoryGameStateRepository
+from app.services.event_handlers.next_step_handler import NextStepHandler
+from app.services.shared_state_manager import SharedStateManager
+
+
+class BlockingAsyncAIService(BaseAIService):
+    """Async AI service that answers once released, recording where it ran."""
+
+    def __init__(self) -> None:
+        self.release = asyncio.Event()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.threads: List[threading.Thread] = []
+
+    def get_response(self, messages: List[MessageDict]) -> Optional[AIResponse]:
+        raise AssertionError("The blocking API should not be used")
+
+    async def aget_response(self, messages: List[MessageDict]) -> Optional[AIResponse]:
+        self.threads.append(threading.current_thread())
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await self.release.wait()
+        finally:
+            self.in_flight -= 1
+        return AIResponse(narrative="The torch flickers.", reasoning="Test")
+
+
+@pytest.fixture
+def handler(tmp_path: Path) -> NextStepHandler:
+    ai_response_processor = Mock()
+    ai_response_processor.process_response.return_value = ([], False)
+    handler = NextStepHandler(
+        game_state_repo=InMemoryGameStateRepository(str(tmp_path)),
+        character_service=Mock(),
+        dice_service=Mock(),
+        combat_service=Mock(),
+        chat_service=Mock(),
+        ai_response_processor=ai_response_processor,
+        campaign_service=Mock(),
+        event_queue=EventQueue(),
+    )
+    handler._shared_state_manager = SharedStateManager()
+    return handler
+
+
+def run_with_ai(handler: NextStepHandler, ai_service: BaseAIService) -> Any:
+    """Patch the handler to use the given AI service and a trivial prompt."""
+    return patch.multiple(
+        handler,
+        _get_ai_service=Mock(return_value=ai_service),
+        _build_ai_prompt_context=Mock(
+            return_value=[MessageDict(role="user", content="Next")]
+        ),
+    )
+
+
+def test_concurrent_turns_wait_on_the_event_loop(handler: NextStepHandler) -> None:
+    ai_service = BlockingAsyncAIService()
+
+    async def play(session_id: str) -> int:
+        with session_scope(session_id):
+            response = await handler.ahandle()
+        return response.status_code or 200
+
+    async def run() -> List[int]:
+        turns = [asyncio.create_task(play(f"table-{i}")) for i in range(8)]
+        while ai_service.in_flight < len(turns):
+            await asyncio.sleep(0.01)
+        ai_service.release.set()
+        return list(await asyncio.gather(*turns))
+
+    with run_with_ai(handler, ai_service):
+        assert asyncio.run(run()) == [200] * 8
+
+    # All turns were waiting at once, each on the event loop thread
+    assert ai_service.max_in_flight == 8
+    assert set(ai_service.threads) == {threading.main_thread()}
+
+
+def test_cancelled_turn_clears_processing_flag(handler: NextStepHandler) -> None:
+    ai_service = BlockingAsyncAIService()
+    shared_state = handler._shared_state_manager
+    assert shared_state is not None
+
+    async def run() -> None:
+        task = asyncio.create_task(handler.ahandle())
+        while not ai_service.in_flight:
+            await asyncio.sleep(0.01)
+        assert shared_state.is_ai_processing()
+
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    with run_with_ai(handler, ai_service):
+        asyncio.run(run())
+    assert not shared_state.is_ai_processing()
+
+
+def test_cancel_during_thread_hop_waits_for_the_hop(
+    handler: NextStepHandler,
+) -> None:
+    ai_service = BlockingAsyncAIService()
+    entered = threading.Event()
+    release = threading.Event()
+    finished: List[bool] = []
+
+    def slow_get_ai_service() -> BaseAIService:
+        entered.set()
+        release.wait(timeout=5)
+        finished.append(True)
+        return ai_service
+
+    async def run() -> None:
+        task = asyncio.create_task(handler.ahandle())
+        while not entered.is_set():
+            await asyncio.sleep(0.01)
+
+        task.cancel()
+        await asyncio.sleep(0.05)
+        # The handler steps are still running in the thread
+        assert not task.done()
+        release.set()
+        # The cancellation is not replaced by "generator already executing"
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert finished == [True]
+
+    with run_with_ai(handler, ai_service):
+        with patch.object(handler, "_get_ai_service", slow_get_ai_service):
+            asyncio.run(run())
+    assert ai_service.in_flight == 0
+    assert handler._shared_state_manager is not None
+    assert not handler._shared_state_manager.is_ai_processing()
+
+
+def test_sync_handle_still_uses_blocking_api(handler: NextStepHandler) -> None:
+    ai_service = Mock()
+    ai_service.get_response.return_value = AIResponse(narrative="Sync")
+
+    with run_with_ai(handler, ai_service):
+        response = handler.handle()
+
+    assert response.status_code in (None, 200)
+    ai_service.get_response.assert_called_once()
+
+
+def test_retry_bypasses_the_response_cache(
+    handler: NextStepHandler, tmp_path: Path
+) -> None:
+    ai_service = Mock(spec=["aget_response", "model_name", "temperature"])
+    ai_service.model_name = "test-model"
+    ai_service.temperature = 0
+    ai_service.aget_response = AsyncMock(
+        return_value=AIResponse(narrative="The torch flickers.", reasoning="Test")
+    )
+    cached_ai_service = CachingAIService(
+        ai_service, AIResponseCache(str(tmp_path / "cache"), 10**6)
+    )
+    messages = [MessageDict(role="user", content="Next")]
+
+    async def run(use_stored_context: bool) -> None:
+        await handler._acall_ai_and_process_step(
+            cached_ai_service,
+            use_stored_context=use_stored_context,
+            messages_override=messages,
+        )
+
+    with run_with_ai(handler, cached_ai_service):
+        asyncio.run(run(use_stored_context=False))
+        asyncio.run(run(use_stored_context=False))
+        assert ai_service.aget_response.await_count == 1
+        asyncio.run(run(use_stored_context=True))
+    assert ai_service.aget_response.await_count == 2
@@ -137,25 +137,44 @@ class TestChatServiceEvents(unittest.TestCase):
         # Verify no event was emitted
         self.mock_event_queue.put_event.assert_not_called()
 
-    def test_event_includes_tts_audio_path(self) -> None:
-        """Test that TTS audio path is included in event when available."""
-        # Setup TTS service mock
+    def test_narration_is_requested_after_the_event(self) -> None:
+        """Test that narration does not delay the message event."""
         mock_tts = Mock()
-        mock_tts.generate_tts_for_message.return_value = "tts_cache/message_123.mp3"
+        mock_tts.will_narrate.return_value = True
+        mock_tts.request_narration.side_effect = lambda text, message_id: (
+            self.mock_event_queue.put_event.assert_called_once()
+        )
         self.chat_service.tts_integration_service = mock_tts
 
-        # Enable narration in the game state
-        game_state = self.mock_game_state_repo.get_game_state()
-        game_state.narration_enabled = True
-        self.mock_game_state_repo.save_game_state(game_state)
-
-        # Add assistant message
         content = "The dragon roars!"
         self.chat_service.add_message("assistant", content)
 
-        # Verify event includes audio path
         emitted_event = self.mock_event_queue.put_event.call_args[0][0]
-        self.assertEqual(emitted_event.audio_path, "tts_cache/message_123.mp3")
+        self.assertTrue(emitted_event.narration_pending)
+        self.assertIsNone(emitted_event.audio_path)
+        mock_tts.request_narration.assert_called_once_with(
+            content, emitted_event.message_id
+        )
+
+    def test_player_message_cancels_pending_narrations(self) -> None:
+        """Test that the player moving on cancels narrations not finished."""
+        mock_tts = Mock()
+        mock_tts.will_narrate.return_value = False
+        self.chat_service.tts_integration_service = mock_tts
+
+        self.chat_service.add_message("user", "I run past the dragon!")
+
+        mock_tts.cancel_pending_narrations.assert_called_once()
+        mock_tts.request_narration.assert_not_called()
+
+    def test_reading_history_does_not_change_the_state(self) -> None:
+        """Test that narration audio is only added on the write path."""
+        mock_tts = Mock()
+        self.chat_service.tts_integration_service = mock_tts
+
+        self.chat_service.get_chat_history()
+
+        mock_tts.apply_completed.assert_not_called()
 
     def test_event_includes_message_id(self) -> None:
         """Test that events include the same message ID as stored in chat history."""
@@ -0,0 +1,142 @@
+"""
+Unit tests for the background history summarizer.
+"""
+
+from typing import Iterator, List
+from unittest.mock import Mock
+
+import pytest
+
+from app.models.game_state.main import GameStateModel
+from app.models.shared import ChatMessageModel, HistorySummaryModel
+from app.services.history_summarizer import HistorySummarizer
+
+
+def make_game_state(num_messages: int) -> GameStateModel:
+    return GameStateModel(
+        campaign_id="campaign",
+        chat_history=[
+            ChatMessageModel(
+                id=f"msg-{index}",
+                role="user" if index % 2 == 0 else "assistant",
+                content=f"Message {index}",
+                timestamp="2025-05-28T10:00:00Z",
+            )
+            for index in range(num_messages)
+        ],
+    )
+
+
+def make_summary(first: int, last: int, content: str) -> HistorySummaryModel:
+    return HistorySummaryModel(
+        first_message_id=f"msg-{first}",
+        last_message_id=f"msg-{last}",
+        message_count=last - first + 1,
+        content=content,
+    )
+
+
+@pytest.fixture
+def ai_service() -> Mock:
+    service = Mock()
+    service.get_text_response.side_effect = lambda messages: (
+        f"Summary {service.get_text_response.call_count}"
+    )
+    return service
+
+
+@pytest.fixture
+def summarizer(ai_service: Mock) -> Iterator[HistorySummarizer]:
+    summarizer = HistorySummarizer(ai_service, segment_size=8, max_blocks=2)
+    yield summarizer
+    summarizer.close()
+
+
+def summarize(summarizer: HistorySummarizer, game_state: GameStateModel) -> None:
+    assert summarizer.wait_idle(timeout=5)
+    assert summarizer.apply_completed(game_state)
+
+
+class TestHistorySummarizer:
+    def test_dropped_history_is_summarized_segment_by_segment(
+        self, summarizer: HistorySummarizer, ai_service: Mock
+    ) -> None:
+        game_state = make_game_state(40)
+
+        assert summarizer.request(game_state, dropped_messages=20)
+        summarize(summarizer, game_state)
+        assert summarizer.request(game_state, dropped_messages=20)
+        summarize(summarizer, game_state)
+
+        assert [
+            (s.first_message_id, s.last_message_id, s.message_count)
+            for s in game_state.history_summaries
+        ] == [("msg-0", "msg-7", 8), ("msg-8", "msg-15", 8)]
+        # The transcript of the segment is sent to the AI
+        request: List[str] = [
+            str(msg.content) for msg in ai_service.get_text_response.call_args[0][0]
+        ]
+        assert "Player: Message 8" in request[1]
+        assert "Game Master: Message 15" in request[1]
+
+        # Only 4 dropped messages are left, less than a segment
+        assert not summarizer.request(game_state, dropped_messages=20)
+
+    def test_oldest_summaries_are_merged(
+        self, summarizer: HistorySummarizer, ai_service: Mock
+    ) -> None:
+        game_state = make_game_state(40)
+        game_state.history_summaries = [
+            make_summary(0, 7, "First"),
+            make_summary(8, 15, "Second"),
+            make_summary(16, 23, "Third"),
+        ]
+
+        assert summarizer.request(game_state, dropped_messages=32)
+        summarize(summarizer, game_state)
+
+        merged, third = game_state.history_summaries
+        assert (merged.first_message_id, merged.last_message_id) == ("msg-0", "msg-15")
+        assert merged.message_count == 16
+        assert third.content == "Third"
+        request = str(ai_service.get_text_response.call_args[0][0][1].content)
+        assert "First" in request and "Second" in request
+
+    def test_summary_for_changed_summaries_is_discarded(
+        self, summarizer: HistorySummarizer
+    ) -> None:
+        game_state = make_game_state(40)
+        assert summarizer.request(game_state, dropped_messages=20)
+        assert summarizer.wait_idle(timeout=5)
+
+        game_state.history_summaries = [make_summary(0, 3, "Written elsewhere")]
+        assert not summarizer.apply_completed(game_state)
+        assert len(game_state.history_summaries) == 1
+
+    def test_failed_summary_is_not_applied(
+        self, summarizer: HistorySummarizer, ai_service: Mock
+    ) -> None:
+        ai_service.get_text_response.side_effect = None
+        ai_service.get_text_response.return_value = None
+        game_state = make_game_state(40)
+
+        assert summarizer.request(game_state, dropped_messages=20)
+        assert summarizer.wait_idle(timeout=5)
+        assert not summarizer.apply_completed(game_state)
+        # The segment is requested again on the next prompt
+        assert summarizer.request(game_state, dropped_messages=20)
+
+    def test_summaries_of_messages_gone_from_history_are_reset(
+        self, summarizer: HistorySummarizer
+    ) -> None:
+        game_state = make_game_state(40)
+        game_state.history_summaries = [make_summary(100, 107, "Lost")]
+
+        assert summarizer.request(game_state, dropped_messages=20)
+        summarize(summarizer, game_state)
+
+        assert [
+            (s.first_message_id, s.last_message_id, s.content)
+            for s in game_state.history_summaries
+        ] == [("msg-0", "msg-7", "Summary 1")]
+        assert summarizer.request(game_state, dropped_messages=20)
@@ -0,0 +1,208 @@
+"""
+Unit tests for preparing the next prompt while the player is acting.
+"""
+
+from typing import Iterator, Optional
+from unittest.mock import Mock
+
+import pytest
+
+from app.content.rag.rag_context_builder import rag_context_builder
+from app.models.combat.combatant import CombatantModel
+from app.models.dice import DiceRequestModel
+from app.models.game_state.main import GameStateModel
+from app.models.rag import KnowledgeResult, RAGResults
+from app.models.shared.chat import ChatMessageModel
+from app.providers.ai import prompt_builder
+from app.providers.ai.history_token_cache import HistoryTokenCaches
+from app.providers.ai.prompt_builder import PromptBuilder
+from app.services.prompt_prefetcher import PromptPrefetcher
+from app.utils.prefetch_cache import PrefetchCache
+
+
+def make_game_state() -> GameStateModel:
+    return GameStateModel(
+        campaign_id="campaign",
+        campaign_goal="Find the lost crown",
+        chat_history=[
+            ChatMessageModel(
+                id="msg-0",
+                role="assistant",
+                content="A goblin blocks the road.",
+                timestamp="2025-05-28T10:00:00Z",
+            )
+        ],
+    )
+
+
+@pytest.fixture(autouse=True)
+def fresh_caches(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    monkeypatch.setattr(prompt_builder, "history_token_caches", HistoryTokenCaches())
+    monkeypatch.setattr(prompt_builder, "prefetched_context_sections", PrefetchCache())
+    rag_context_builder.prefetched_contexts.clear()
+    yield
+    rag_context_builder.prefetched_contexts.clear()
+
+
+@pytest.fixture
+def game_state() -> GameStateModel:
+    return make_game_state()
+
+
+@pytest.fixture
+def handler() -> Mock:
+    handler = Mock()
+    handler.history_summarizer = None
+    handler.rag_service.get_relevant_knowledge.return_value = RAGResults(
+        results=[
+            KnowledgeResult(
+                content="Fireball: 8d6 fire damage in a 20-foot radius",
+                source="spells",
+                relevance_score=0.9,
+            )
+        ]
+    )
+    return handler
+
+
+@pytest.fixture
+def prefetcher(game_state: GameStateModel, handler: Mock) -> PromptPrefetcher:
+    repo = Mock()
+    repo.get_game_state.return_value = game_state
+    shared_state = Mock()
+    shared_state.is_ai_processing.return_value = False
+    return PromptPrefetcher(repo, handler, shared_state)
+
+
+def build_prompt(
+    game_state: GameStateModel, handler: Mock, action: Optional[str]
+) -> str:
+    messages = PromptBuilder().build_ai_prompt_context(game_state, handler, action)
+    return "\n".join(str(msg.content) for msg in messages)
+
+
+class TestPromptPrefetcher:
+    def test_draft_rag_context_is_used_by_the_action(
+        self, prefetcher: PromptPrefetcher, game_state: GameStateModel, handler: Mock
+    ) -> None:
+        response = prefetcher.prefetch("I cast  fireball at the goblin ")
+        assert response.rag_context and response.prompt_context
+
+        prompt = build_prompt(game_state, handler, "I cast fireball at the goblin")
+
+        assert "8d6 fire damage" in prompt
+        handler.rag_service.get_relevant_knowledge.assert_called_once()
+
+    def test_changed_action_retrieves_again(
+        self, prefetcher: PromptPrefetcher, game_state: GameStateModel, handler: Mock
+    ) -> None:
+        prefetcher.prefetch("I cast fireball")
+
+        build_prompt(game_state, handler, "I cast fireball at the goblin")
+
+        assert handler.rag_service.get_relevant_knowledge.call_count == 2
+        queries = [
+            call.args[0]
+            for call in handler.rag_service.get_relevant_knowledge.call_args_list
+        ]
+        assert queries[-1] == "I cast fireball at the goblin"
+
+    def test_changed_lore_or_combatants_retrieve_again(
+        self, prefetcher: PromptPrefetcher, game_state: GameStateModel, handler: Mock
+    ) -> None:
+        retrievals = handler.rag_service.get_relevant_knowledge
+
+        prefetcher.prefetch("I search the room")
+        game_state.active_lore_id = "forgotten_realms"
+        build_prompt(game_state, handler, "I search the room")
+        assert retrievals.call_count == 2
+
+        prefetcher.prefetch("I search the room")
+        game_state.combat.combatants.append(
+            CombatantModel(
+                id="g1",
+                name="Goblin",
+                initiative=12,
+                current_hp=7,
+                max_hp=7,
+                armor_class=15,
+                is_player=False,
+            )
+        )
+        build_prompt(game_state, handler, "I search the room")
+        assert retrievals.call_count == 4
+
+    def test_context_sections_are_reused_until_the_state_changes(
+        self,
+        prefetcher: PromptPrefetcher,
+        game_state: GameStateModel,
+        handler: Mock,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        builds = Mock(wraps=PromptBuilder.build_context_sections)
+        monkeypatch.setattr(
+            PromptBuilder,
+            "build_context_sections",
+            lambda self, *args: builds(self, *args),
+        )
+
+        prefetcher.prefetch("I search the room")
+        build_prompt(game_state, handler, "I search the room")
+        assert builds.call_count == 1
+
+        prefetcher.prefetch("I search the room again")
+        game_state.campaign_goal = "Escape the dungeon"
+        prompt = build_prompt(game_state, handler, "I search the room again")
+        assert builds.call_count == 3
+        assert "Escape the dungeon" in prompt
+
+    def test_pending_dice_rolls_prefetch_the_last_action(
+        self, prefetcher: PromptPrefetcher, game_state: GameStateModel, handler: Mock
+    ) -> None:
+        game_state.chat_history.append(
+            ChatMessageModel(
+                id="msg-1",
+                role="user",
+                content='Thorin: "I cast fireball"',
+                timestamp="2025-05-28T10:00:00Z",
+            )
+        )
+        game_state.pending_player_dice_requests = [
+            DiceRequestModel(
+                request_id="roll-1",
+                character_ids=["thorin"],
+                type="saving_throw",
+                dice_formula="1d20",
+                reason="Dexterity save",
+            )
+        ]
+
+        assert prefetcher.prefetch().rag_context
+        build_prompt(game_state, handler, None)
+
+        handler.rag_service.get_relevant_knowledge.assert_called_once()
+        assert handler.rag_service.get_relevant_knowledge.call_args.args[0] == (
+            "I cast fireball"
+        )
+
+    def test_nothing_is_prefetched_while_the_ai_is_busy(
+        self, game_state: GameStateModel, handler: Mock
+    ) -> None:
+        repo = Mock()
+        repo.get_game_state.return_value = game_state
+        shared_state = Mock()
+        shared_state.is_ai_processing.return_value = True
+        prefetcher = PromptPrefetcher(repo, handler, shared_state)
+
+        response = prefetcher.prefetch("I attack the goblin")
+
+        assert not response.rag_context and not response.prompt_context
+        handler.rag_service.get_relevant_knowledge.assert_not_called()
+
+
+def test_prefetched_result_expires() -> None:
+    cache: PrefetchCache[str] = PrefetchCache(ttl_seconds=0)
+    future = cache.start("campaign", "query")
+    assert future is not None
+    future.set_result("context")
+    assert cache.take("campaign", "query") is None
@@ -0,0 +1,280 @@
+"""
+Unit tests for session-scoped game state and the session registry.
+"""
+
+import asyncio
+import json
+import time
+from pathlib import Path
+from typing import Iterator
+from unittest.mock import Mock
+
+import pytest
+
+from app.core.event_queue import EventQueue
+from app.core.session_context import session_scope, set_current_session_id
+from app.exceptions import SessionLimitError
+from app.models.events.narrative import NarrativeAddedEvent
+from app.models.shared import ChatMessageModel
+from app.repositories.game_state_repository import InMemoryGameStateRepository
+from app.services.session_registry import SessionRegistry
+from app.services.shared_state_manager import SharedStateManager
+from app.services.tts_integration_service import TTSIntegrationService
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> InMemoryGameStateRepository:
+    return InMemoryGameStateRepository(base_save_dir=str(tmp_path / "saves"))
+
+
+@pytest.fixture
+def registry(repo: InMemoryGameStateRepository) -> Iterator[SessionRegistry]:
+    registry = SessionRegistry(
+        repo,
+        EventQueue(),
+        SharedStateManager(),
+        idle_timeout=60,
+        sweep_interval=3600,
+    )
+    yield registry
+    registry.close()
+
+
+class TestSessionScopedState:
+    """Services keep separate data for each session."""
+
+    def test_game_state_is_isolated_per_session(
+        self, repo: InMemoryGameStateRepository
+    ) -> None:
+        with session_scope("table-a"):
+            state = repo.get_game_state()
+            state.campaign_id = "campaign_a"
+            repo.save_game_state(state)
+
+        with session_scope("table-b"):
+            assert repo.get_game_state().campaign_id is None
+
+        with session_scope("table-a"):
+            assert repo.get_game_state().campaign_id == "campaign_a"
+
+        # The default session is untouched
+        assert repo.get_game_state().campaign_id is None
+
+    def test_event_streams_are_isolated_per_session(self) -> None:
+        queue = EventQueue()
+        with session_scope("table-a"):
+            queue.put_event(NarrativeAddedEvent(role="assistant", content="A"))
+
+        with session_scope("table-b"):
+            assert queue.get_event(block=False) is None
+
+        assert queue.qsize() == 0
+        with session_scope("table-a"):
+            event = queue.get_event(block=False)
+            assert isinstance(event, NarrativeAddedEvent)
+            assert event.content == "A"
+
+    def test_ai_processing_flag_is_per_session(self) -> None:
+        manager = SharedStateManager()
+        with session_scope("table-a"):
+            manager.set_ai_processing(True)
+
+        with session_scope("table-b"):
+            assert not manager.is_ai_processing()
+        assert not manager.is_ai_processing()
+
+        with session_scope("table-a"):
+            assert manager.is_ai_processing()
+
+    @pytest.mark.parametrize("session_id", ["", "a" * 65, "../table", "table a"])
+    def test_invalid_session_ids_are_rejected(self, session_id: str) -> None:
+        with pytest.raises(ValueError):
+            set_current_session_id(session_id)
+
+
+class TestSessionRegistry:
+    """Session lifecycle and idle eviction."""
+
+    def test_get_session_returns_same_instance(self, registry: SessionRegistry) -> None:
+        session = registry.get_session("table-a")
+        assert registry.get_session("table-a") is session
+        assert registry.active_session_ids() == ["table-a"]
+
+    def test_default_session_is_not_tracked(self, registry: SessionRegistry) -> None:
+        registry.get_session(None)
+        assert registry.active_session_ids() == []
+
+    def test_idle_session_is_evicted_to_disk_and_restored(
+        self, registry: SessionRegistry, repo: InMemoryGameStateRepository
+    ) -> None:
+        session = registry.get_session("table-a")
+        with session_scope("table-a"):
+            state = repo.get_game_state()
+            state.campaign_id = "campaign_a"
+            state.campaign_name = "Evicted Campaign"
+            repo.save_game_state(state)
+
+        evicted = registry.evict_idle(now=session.last_accessed + 61)
+
+        assert evicted == ["table-a"]
+        assert registry.active_session_ids() == []
+        save_path = Path(repo._get_campaign_save_path("campaign_a"))
+        assert json.loads(save_path.read_text())["campaign_name"] == "Evicted Campaign"
+        assert "campaign_a" not in repo._campaign_saves
+
+        # Accessing the session again reloads it from disk
+        with session_scope("table-a"):
+            assert repo.get_game_state().campaign_name == "Evicted Campaign"
+
+    def test_recent_session_is_kept(self, registry: SessionRegistry) -> None:
+        session = registry.get_session("table-a")
+        assert registry.evict_idle(now=session.last_accessed + 30) == []
+        assert registry.active_session_ids() == ["table-a"]
+
+    def test_busy_session_is_not_evicted(self, registry: SessionRegistry) -> None:
+        session = registry.get_session("table-a")
+        with session_scope("table-a"):
+            registry.shared_state_manager.set_ai_processing(True)
+
+        assert registry.evict_idle(now=session.last_accessed + 61) == []
+        assert registry.active_session_ids() == ["table-a"]
+
+    def test_least_recently_used_session_makes_room(
+        self, repo: InMemoryGameStateRepository
+    ) -> None:
+        registry = SessionRegistry(
+            repo, EventQueue(), SharedStateManager(), max_sessions=2
+        )
+        registry.get_session("table-a").last_accessed = 200
+        registry.get_session("table-b").last_accessed = 100
+
+        registry.get_session("table-c")
+        assert sorted(registry.active_session_ids()) == ["table-a", "table-c"]
+
+        for session_id in ("table-a", "table-c"):
+            with session_scope(session_id):
+                registry.shared_state_manager.set_ai_processing(True)
+        with pytest.raises(SessionLimitError):
+            registry.get_session("table-d")
+        assert sorted(registry.active_session_ids()) == ["table-a", "table-c"]
+
+    def test_idle_sessions_are_swept_in_the_background(
+        self, repo: InMemoryGameStateRepository
+    ) -> None:
+        registry = SessionRegistry(
+            repo,
+            EventQueue(),
+            SharedStateManager(),
+            idle_timeout=0,
+            sweep_interval=0.01,
+        )
+        try:
+            asyncio.run(registry.aget_session("table-a"))
+            deadline = time.monotonic() + 5
+            while registry.active_session_ids() and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert registry.active_session_ids() == []
+        finally:
+            registry.close()
+
+    def test_eviction_writes_without_holding_the_registry_lock(
+        self, registry: SessionRegistry, repo: InMemoryGameStateRepository
+    ) -> None:
+        locked_during_write = []
+        evict_session = repo.evict_session
+
+        def recording_evict(session_id: str) -> bool:
+            locked_during_write.append(registry._lock.locked())
+            return evict_session(session_id)
+
+        repo.evict_session = recording_evict  # type: ignore[method-assign]
+        registry.get_session("table-a")
+        with session_scope("table-a"):
+            repo.get_game_state()
+
+        assert registry.evict("table-a")
+        assert locked_during_write == [False]
+
+
+class TestNarrationAudio:
+    """Finished narration audio reaches the saved chat history."""
+
+    @pytest.fixture
+    def tts(self, repo: InMemoryGameStateRepository) -> Iterator[TTSIntegrationService]:
+        tts_service = Mock()
+        tts_service.synthesize_speech.return_value = "tts_cache/msg1.wav"
+        tts = TTSIntegrationService(tts_service, repo, stream_segments=False)
+        yield tts
+        tts.close()
+
+    @pytest.fixture
+    def narrating_registry(
+        self, repo: InMemoryGameStateRepository, tts: TTSIntegrationService
+    ) -> Iterator[SessionRegistry]:
+        registry = SessionRegistry(
+            repo,
+            EventQueue(),
+            SharedStateManager(),
+            sweep_interval=3600,
+            tts_integration_service=tts,
+        )
+        yield registry
+        registry.close()
+
+    @staticmethod
+    def start_game(repo: InMemoryGameStateRepository) -> None:
+        state = repo.get_game_state()
+        state.campaign_id = "campaign_a"
+        state.narration_enabled = True
+        state.chat_history.append(
+            ChatMessageModel(
+                id="msg1",
+                role="assistant",
+                content="The door creaks open.",
+                timestamp="2025-01-01T00:00:00Z",
+            )
+        )
+        repo.save_game_state(state)
+
+    def test_audio_is_saved_as_soon_as_it_is_ready(
+        self,
+        narrating_registry: SessionRegistry,
+        repo: InMemoryGameStateRepository,
+        tts: TTSIntegrationService,
+    ) -> None:
+        async def narrate() -> None:
+            await narrating_registry.aget_session("table-a")
+            with session_scope("table-a"):
+                self.start_game(repo)
+                tts.request_narration("The door creaks open.", "msg1")
+            # No other message is added to the session
+            deadline = time.monotonic() + 5
+            while time.monotonic() < deadline:
+                with session_scope("table-a"):
+                    if repo.get_game_state().chat_history[-1].audio_path:
+                        return
+                await asyncio.sleep(0.01)
+
+        asyncio.run(narrate())
+
+        with session_scope("table-a"):
+            message = repo.get_game_state().chat_history[-1]
+        assert message.audio_path == "tts_cache/msg1.wav"
+
+    def test_eviction_saves_finished_narration_audio(
+        self,
+        narrating_registry: SessionRegistry,
+        repo: InMemoryGameStateRepository,
+        tts: TTSIntegrationService,
+    ) -> None:
+        narrating_registry.get_session("table-a")
+        with session_scope("table-a"):
+            self.start_game(repo)
+            tts.request_narration("The door creaks open.", "msg1")
+        assert tts.wait_idle(timeout=5)
+
+        assert narrating_registry.evict("table-a")
+
+        save_path = Path(repo._get_campaign_save_path("campaign_a"))
+        saved = json.loads(save_path.read_text())
+        assert saved["chat_history"][-1]["audio_path"] == "tts_cache/msg1.wav"
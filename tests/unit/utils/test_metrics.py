@@ -0,0 +1,60 @@
+"""
+Tests for the metrics registry and its Prometheus text rendering.
+"""
+
+import pytest
+
+from app.utils.metrics import MetricsRegistry
+
+
+def test_counters_and_histograms_render_in_prometheus_format() -> None:
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests", ["path"])
+    latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+
+    requests.inc(path="/a")
+    requests.inc(2, path="/b")
+    for value in (0.05, 0.5, 3.0):
+        latency.observe(value)
+
+    text = registry.render()
+
+    assert "# TYPE requests_total counter" in text
+    assert 'requests_total{path="/a"} 1' in text
+    assert 'requests_total{path="/b"} 2' in text
+    assert "# TYPE latency_seconds histogram" in text
+    assert 'latency_seconds_bucket{le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{le="1"} 2' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 3' in text
+    assert "latency_seconds_sum 3.55" in text
+    assert "latency_seconds_count 3" in text
+
+
+def test_gauge_goes_up_and_down() -> None:
+    registry = MetricsRegistry()
+    depth = registry.gauge("queue_depth", "Queued jobs")
+
+    depth.inc()
+    depth.inc()
+    depth.dec()
+
+    assert depth.get() == 1
+    assert "# TYPE queue_depth gauge" in registry.render()
+    assert "queue_depth 1" in registry.render()
+
+
+def test_registering_a_name_again_returns_the_same_metric() -> None:
+    registry = MetricsRegistry()
+
+    first = registry.counter("events_total", "Events")
+    first.inc()
+
+    assert registry.counter("events_total", "Events") is first
+    assert first.get() == 1
+
+
+def test_labels_must_match_the_metric() -> None:
+    counter = MetricsRegistry().counter("events_total", "Events", ["kind"])
+
+    with pytest.raises(ValueError):
+        counter.inc(other="x")
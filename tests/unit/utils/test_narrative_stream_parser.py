@@ -0,0 +1,50 @@
+"""
+Unit tests for incremental narrative extraction from streamed AI responses.
+"""
+
+import json
+
+import pytest
+
+from app.utils.narrative_stream_parser import NarrativeStreamParser
+
+RESPONSE = {
+    "reasoning": 'The "narrative": field is next {',
+    "dice_requests": [{"reason": "x", "narrative": "nested"}],
+    "narrative": 'The door creaks.\n"Who goes there?" 🐉 café',
+    "hp_changes": [],
+}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 5, 64])
+def test_narrative_is_decoded_across_chunk_boundaries(chunk_size: int) -> None:
+    raw = "```json\n" + json.dumps(RESPONSE) + "\n```"
+    parser = NarrativeStreamParser()
+
+    deltas = [
+        parser.feed(raw[i : i + chunk_size]) for i in range(0, len(raw), chunk_size)
+    ]
+
+    assert "".join(deltas) == RESPONSE["narrative"]
+    assert parser.narrative == RESPONSE["narrative"]
+    assert parser.complete
+
+
+def test_narrative_is_available_before_the_object_completes() -> None:
+    parser = NarrativeStreamParser()
+    assert parser.feed('{"narrative": "You ent') == "You ent"
+    assert not parser.complete
+    assert parser.feed('er the cave", "dice_requests": [') == "er the cave"
+    assert parser.complete
+
+
+def test_unescaped_unicode_is_passed_through() -> None:
+    parser = NarrativeStreamParser()
+    parser.feed(json.dumps({"narrative": "Ünïcode 🐉"}, ensure_ascii=False))
+    assert parser.narrative == "Ünïcode 🐉"
+
+
+def test_response_without_narrative_yields_nothing() -> None:
+    parser = NarrativeStreamParser()
+    assert parser.feed('{"reasoning": "none", "dice_requests": []}') == ""
+    assert parser.narrative == ""
@@ -0,0 +1,74 @@
+"""
+Unit tests for the pluggable save file serializer.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict
+
+import pytest
+
+from app.models.game_state.main import GameStateModel
+from app.repositories.game_state_repository import FileGameStateRepository
+from app.utils.save_serializer import SaveSerializer, detect_save_format
+
+SAMPLE: Dict[str, Any] = {
+    "id": "campaign",
+    "name": "Ünïcode campaign",
+    "party": {"hero": {"current_hp": 12, "spell_slots_used": {"1": 2}}},
+    "chat_history": [{"role": "assistant", "content": "Hello"}] * 3,
+}
+
+FORMATS = [
+    ("json", "none"),
+    ("compact", "none"),
+    ("compact", "gzip"),
+    ("compact", "zstd"),
+    ("json", "gzip"),
+]
+
+
+@pytest.mark.parametrize("save_format,compression", FORMATS)
+def test_round_trip_and_detection(save_format: Any, compression: Any) -> None:
+    raw = SaveSerializer(save_format, compression).dumps(SAMPLE)
+
+    # Any serializer reads any format
+    assert SaveSerializer().loads(raw) == SAMPLE
+    assert detect_save_format(raw) == (compression, "json")
+
+
+def test_default_format_is_readable_json() -> None:
+    raw = SaveSerializer().dumps(SAMPLE)
+    assert json.loads(raw) == SAMPLE
+    assert b"\n  " in raw
+
+
+def test_compact_format_is_smaller() -> None:
+    pretty = SaveSerializer("json").dumps(SAMPLE)
+    compact = SaveSerializer("compact").dumps(SAMPLE)
+    compressed = SaveSerializer("compact", "zstd").dumps(SAMPLE)
+    assert len(compressed) < len(compact) < len(pretty)
+
+
+def test_reads_json_with_byte_order_mark() -> None:
+    raw = b"\xef\xbb\xbf" + json.dumps(SAMPLE).encode("utf-8")
+    assert SaveSerializer().loads(raw) == SAMPLE
+
+
+def test_file_repository_reads_saves_written_in_another_format(
+    tmp_path: Path,
+) -> None:
+    writer = FileGameStateRepository(
+        str(tmp_path), serializer=SaveSerializer("compact", "zstd")
+    )
+    writer.save_game_state(
+        GameStateModel(campaign_id="campaign", campaign_name="Compressed")
+    )
+    save_path = Path(writer._get_campaign_save_path("campaign"))
+    assert detect_save_format(save_path.read_bytes()) == ("zstd", "json")
+
+    # A repository configured for plain JSON still loads the compressed save
+    reader = FileGameStateRepository(str(tmp_path))
+    loaded = reader.load_campaign_state("campaign")
+    assert loaded is not None
+    assert loaded.campaign_name == "Compressed"